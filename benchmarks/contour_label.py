@@ -0,0 +1,80 @@
+"""
+Benchmark contour label engines on a global 500 hPa geopotential height field.
+
+Usage::
+
+    python benchmarks/contour_label.py --resolution 0.25 --repeat 3
+"""
+import argparse
+import time
+
+import numpy as np
+import xarray as xr
+import matplotlib
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+
+from cedarkit.maps.domains import GlobalMapTemplate
+from cedarkit.maps.chart import Panel
+from cedarkit.maps.graph import add_contour_label
+
+
+def create_height_field(resolution: float) -> xr.DataArray:
+    lats = np.arange(90, -90 - resolution / 2, -resolution)
+    lons = np.arange(0, 360, resolution)
+    lon_grid, lat_grid = np.meshgrid(np.deg2rad(lons), np.deg2rad(lats))
+    rng = np.random.default_rng(500)
+    values = 5200 + 700 * np.cos(lat_grid) ** 2
+    for wave in range(3, 9):
+        phase = rng.uniform(0, 2 * np.pi)
+        amplitude = rng.uniform(20, 80)
+        values += amplitude * np.sin(wave * lon_grid + phase) * np.sin(2 * lat_grid) ** 2
+    values += rng.normal(0, 2, values.shape)
+    return xr.DataArray(
+        values / 10,
+        coords={"latitude": lats, "longitude": lons},
+        dims=["latitude", "longitude"],
+        name="gh",
+    )
+
+
+def run(field: xr.DataArray, engine: str) -> tuple:
+    panel = Panel(domain=GlobalMapTemplate())
+    layer = panel.charts[0].layers[0]
+    contour = layer.ax.contour(
+        field.longitude, field.latitude, field.values,
+        levels=np.arange(500, 600, 4),
+        colors="blue",
+        linewidths=0.5,
+        transform=layer.projection,
+    )
+    panel.fig.canvas.draw()
+
+    start = time.perf_counter()
+    labels = add_contour_label(layer.ax, contour, fontsize=7, engine=engine, fmt="{:.0f}".format)
+    label_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    panel.fig.canvas.draw()
+    draw_time = time.perf_counter() - start
+    plt.close(panel.fig)
+    return label_time, draw_time, len(labels)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--resolution", type=float, default=0.25)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    field = create_height_field(args.resolution)
+    print(f"field shape: {field.shape}")
+    for engine in ("clabel", "grid"):
+        results = [run(field, engine) for _ in range(args.repeat)]
+        label_time = min(r[0] for r in results)
+        draw_time = min(r[1] for r in results)
+        print(f"{engine:>6}: label {label_time:.3f}s, draw {draw_time:.3f}s, {results[0][2]} labels")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,3 +5,11 @@ try:
 except PackageNotFoundError:
     # package is not installed
     pass
+
+
+def __getattr__(name):
+    # ``warmup`` is imported lazily, so that importing the package does not import plotting modules.
+    if name == "warmup":
+        from cedarkit.maps.preload import warmup
+        return warmup
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
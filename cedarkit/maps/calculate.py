@@ -1,8 +1,13 @@
-from typing import Tuple, NamedTuple
+from typing import Tuple, NamedTuple, List, Optional, Union, Sequence
 from dataclasses import dataclass
 import math
 import sys
 
+import numpy as np
+import xarray as xr
+
+from cedarkit.maps.util import AreaRange, select_area
+
 
 @dataclass
 class LevelSetting:
@@ -10,6 +15,49 @@ class LevelSetting:
     max_value: float
     step: float
 
+    def to_levels(self) -> np.ndarray:
+        """
+        Levels from ``min_value`` to ``max_value`` (included) with ``step``.
+        """
+        count = int(round((self.max_value - self.min_value) / self.step)) + 1
+        levels = self.min_value + np.arange(count) * self.step
+        # remove floating point noise such as 5.55e-17 for 0
+        decimals = max(0, 2 - int(math.floor(math.log10(self.step))))
+        return np.round(levels, decimals)
+
+
+LEVEL_STEP_TABLES = np.array([1.0, 2.0, 2.5, 4.0, 5.0, 10.0, 20.0, 25.0, 40.0, 50.0, 100.0, 200.0, 250.0, 400.0, 500.0])
+
+
+@dataclass
+class LevelSettings:
+    """
+    Level settings for many fields. Arrays have the same shape as input min and max values.
+    """
+    min_value: np.ndarray
+    max_value: np.ndarray
+    step: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.step)
+
+    def __getitem__(self, index) -> LevelSetting:
+        return LevelSetting(
+            min_value=float(self.min_value[index]),
+            max_value=float(self.max_value[index]),
+            step=float(self.step[index]),
+        )
+
+    def to_list(self) -> List[LevelSetting]:
+        return [
+            LevelSetting(min_value=min_value, max_value=max_value, step=step)
+            for min_value, max_value, step in zip(
+                self.min_value.ravel().tolist(),
+                self.max_value.ravel().tolist(),
+                self.step.ravel().tolist(),
+            )
+        ]
+
 
 def calculate_levels_automatic(min_value: float, max_value: float, max_count: int, outside: bool) -> LevelSetting:
     """
@@ -34,11 +82,10 @@ def calculate_levels_automatic(min_value: float, max_value: float, max_count: in
     """
     assert min_value < max_value
 
-    tables = [1.0, 2.0, 2.5, 4.0, 5.0, 10.0, 20.0, 25.0, 40.0, 50.0, 100.0, 200.0, 250.0, 400.0, 500.0]
     final_min = 0.0
     final_max = 0.0
 
-    count = len(tables)
+    count = len(LEVEL_STEP_TABLES)
 
     # 计算得到一个合适的系数，与表中数值相乘作为可选步长
     d = math.pow(10.0, math.floor(math.log10(max_value - min_value)) - 2)
@@ -54,7 +101,7 @@ def calculate_levels_automatic(min_value: float, max_value: float, max_count: in
         max_func = math.floor
 
     for i in range(count):
-        current_step_size = tables[i] * d
+        current_step_size = float(LEVEL_STEP_TABLES[i]) * d
 
         # 根据当前步长计算取值范围
         current_min = min_func(min_value / current_step_size) * current_step_size
@@ -77,3 +124,307 @@ def calculate_levels_automatic(min_value: float, max_value: float, max_count: in
             final_min = current_min
 
     return LevelSetting(min_value=final_min, max_value=final_max, step=step_size)
+
+
+def calculate_levels_automatic_array(
+        min_values: Union[np.ndarray, Sequence[float]],
+        max_values: Union[np.ndarray, Sequence[float]],
+        max_count: int,
+        outside: bool,
+) -> LevelSettings:
+    """
+    Vectorized version of ``calculate_levels_automatic`` for arrays of min and max values.
+
+    All candidate steps in ``LEVEL_STEP_TABLES`` are evaluated for all values in one numpy pass.
+    Results are the same as calling ``calculate_levels_automatic`` for each pair of values.
+    Items with ``min_value >= max_value`` or non-finite values get NaN instead of raising an error.
+
+    Parameters
+    ----------
+    min_values
+    max_values
+    max_count
+    outside
+
+    Returns
+    -------
+    LevelSettings
+    """
+    min_values, max_values = np.broadcast_arrays(
+        np.asarray(min_values, dtype=float),
+        np.asarray(max_values, dtype=float),
+    )
+    shape = min_values.shape
+    min_values = min_values.reshape(-1, 1)
+    max_values = max_values.reshape(-1, 1)
+
+    valid = np.isfinite(min_values) & np.isfinite(max_values) & (min_values < max_values)
+    value_range = np.where(valid, max_values - min_values, 1.0)
+
+    # np.power differs from math.pow in the last bit for negative exponents, so math.pow is used
+    # for each unique exponent to keep results identical to ``calculate_levels_automatic``.
+    exponents, inverse = np.unique(np.floor(np.log10(value_range)) - 2, return_inverse=True)
+    d = np.array([math.pow(10.0, e) for e in exponents])[inverse].reshape(-1, 1)
+    step_sizes = LEVEL_STEP_TABLES * d
+
+    if outside:
+        min_func = np.floor
+        max_func = np.ceil
+    else:
+        min_func = np.ceil
+        max_func = np.floor
+
+    with np.errstate(invalid="ignore"):
+        current_min = min_func(min_values / step_sizes) * step_sizes
+        current_max = max_func(max_values / step_sizes) * step_sizes
+        is_fit = (current_max - current_min) / step_sizes <= float(max_count - 1)
+
+    # steps increase along the table, so the first fit step is chosen, or the last step if none fits.
+    count = len(LEVEL_STEP_TABLES)
+    index = np.where(is_fit.any(axis=1), is_fit.argmax(axis=1), count - 1)[:, np.newaxis]
+
+    valid = valid[:, 0]
+
+    def take(values: np.ndarray) -> np.ndarray:
+        result = np.take_along_axis(values, index, axis=1)[:, 0]
+        return np.where(valid, result, np.nan).reshape(shape)
+
+    return LevelSettings(
+        min_value=take(current_min),
+        max_value=take(current_max),
+        step=take(step_sizes),
+    )
+
+
+def get_field_min_max(
+        field: xr.DataArray,
+        dim: Optional[Union[str, Sequence[str]]] = None,
+        area: Optional[AreaRange] = None,
+        chunk_size: int = 1000000,
+) -> Tuple[xr.DataArray, xr.DataArray]:
+    """
+    Min and max values of a field, ignoring NaN.
+
+    Min and max are reduced together chunk by chunk, so the field is read from memory only once.
+
+    Parameters
+    ----------
+    field
+    dim
+        dimensions to reduce. Default is the last two (latitude and longitude) dimensions,
+        so one value is returned for each item of other dimensions such as forecast time.
+    area
+        plotting area. Values are reduced on the area subset (a view of the field, see ``select_area``),
+        so the same subset used by plotting is read only once.
+    chunk_size
+        approximate value count of each chunk.
+
+    Returns
+    -------
+    Tuple[xr.DataArray, xr.DataArray]
+        min and max values, NaN if all values are NaN.
+    """
+    if area is not None:
+        field = select_area(field, area)
+    if dim is None:
+        dim = field.dims[-2:]
+    elif isinstance(dim, str):
+        dim = (dim,)
+    dim = tuple(dim)
+    keep_dims = tuple(d for d in field.dims if d not in dim)
+
+    # reduced dimensions are moved to the end (a view), and chunks are taken along the first reduced dimension.
+    values = field.transpose(*keep_dims, *dim).values
+    axis = len(keep_dims)
+    reduce_axes = tuple(range(axis, values.ndim))
+    row_size = int(np.prod(values.shape[:axis] + values.shape[axis + 1:]))
+    rows = max(1, chunk_size // max(1, row_size))
+
+    min_value = np.full(values.shape[:axis], np.nan)
+    max_value = np.full(values.shape[:axis], np.nan)
+    for start in range(0, values.shape[axis], rows):
+        chunk = values[(slice(None),) * axis + (slice(start, start + rows),)]
+        # fmin and fmax ignore NaN, and give NaN only if all values are NaN.
+        min_value = np.fmin(min_value, np.fmin.reduce(chunk, axis=reduce_axes))
+        max_value = np.fmax(max_value, np.fmax.reduce(chunk, axis=reduce_axes))
+
+    coords = {
+        name: coord for name, coord in field.coords.items()
+        if not set(coord.dims) & set(dim)
+    }
+
+    def to_data_array(result: np.ndarray) -> xr.DataArray:
+        return xr.DataArray(result, dims=keep_dims, coords=coords, name=field.name)
+
+    return to_data_array(min_value), to_data_array(max_value)
+
+
+def calculate_levels_automatic_for_field(
+        field: xr.DataArray,
+        max_count: int,
+        outside: bool,
+        dim: Optional[Union[str, Sequence[str]]] = None,
+        area: Optional[AreaRange] = None,
+) -> LevelSettings:
+    """
+    Calculate levels from min and max values of a field, see ``get_field_min_max`` and
+    ``calculate_levels_automatic_array``.
+
+    Parameters
+    ----------
+    field
+    max_count
+    outside
+    dim
+    area
+
+    Returns
+    -------
+    LevelSettings
+        arrays with shape of the reduced field.
+
+    Examples
+    --------
+    Levels for each forecast time of a (time, latitude, longitude) field in East Asia area:
+
+    >>> settings = calculate_levels_automatic_for_field(
+    ...     t_2m, max_count=16, outside=True, area=EastAsiaMapTemplate().total_area(),
+    ... )
+    >>> settings[0]
+    LevelSetting(min_value=-36.0, max_value=40.0, step=4.0)
+    """
+    min_value, max_value = get_field_min_max(field, dim=dim, area=area)
+    return calculate_levels_automatic_array(
+        min_values=min_value.values,
+        max_values=max_value.values,
+        max_count=max_count,
+        outside=outside,
+    )
+
+
+def estimate_quantiles(
+        values: np.ndarray,
+        quantiles: Union[Sequence[float], np.ndarray],
+        method: str = "sample",
+        sample_size: int = 100000,
+        bins: int = 1024,
+        chunk_size: int = 1000000,
+) -> np.ndarray:
+    """
+    Estimate quantiles of values without sorting the whole array. NaN values are ignored.
+
+    Parameters
+    ----------
+    values
+    quantiles
+        quantiles in [0, 1].
+    method
+
+        * sample: exact quantiles of a strided sample with about ``sample_size`` values.
+        * histogram: quantiles interpolated from a histogram with ``bins`` bins, accumulated chunk by chunk.
+
+    sample_size
+    bins
+    chunk_size
+        value count of each chunk for histogram method.
+
+    Returns
+    -------
+    np.ndarray
+        quantile values, NaN if all values are NaN.
+    """
+    quantiles = np.asarray(quantiles, dtype=float)
+    values = np.ravel(values)
+
+    if method == "sample":
+        stride = max(1, int(math.ceil(values.size / sample_size)))
+        sample = values[::stride]
+        sample = sample[np.isfinite(sample)]
+        if sample.size == 0:
+            return np.full(quantiles.shape, np.nan)
+        return np.quantile(sample, quantiles)
+    elif method == "histogram":
+        # histogram range is estimated from a strided sample so that outliers don't widen bins.
+        # Values outside the range are counted in two tail bins.
+        sample = values[::max(1, int(math.ceil(values.size / sample_size)))]
+        sample = sample[np.isfinite(sample)]
+        if sample.size == 0:
+            return np.full(quantiles.shape, np.nan)
+        low, high = np.quantile(sample, [quantiles.min() / 2, (1 + quantiles.max()) / 2])
+        margin = (high - low) * 0.1
+        if margin == 0:
+            return np.full(quantiles.shape, low)
+        edges = np.linspace(low - margin, high + margin, bins + 1)
+
+        counts = np.zeros(bins + 2, dtype=np.int64)
+        for start in range(0, values.size, chunk_size):
+            chunk = values[start:start + chunk_size]
+            chunk = chunk[np.isfinite(chunk)]
+            counts[1:-1] += np.histogram(chunk, bins=edges)[0]
+            counts[0] += np.count_nonzero(chunk < edges[0])
+            counts[-1] += np.count_nonzero(chunk > edges[-1])
+
+        # quantiles in tail bins are clipped to the histogram range.
+        cumulative = np.cumsum(counts[:-1]) / counts.sum()
+        return np.interp(quantiles, cumulative, edges)
+    else:
+        raise ValueError(f"method is not supported: {method}")
+
+
+def calculate_levels_robust(
+        field: Union[xr.DataArray, np.ndarray],
+        lower_percentile: float = 2,
+        upper_percentile: float = 98,
+        max_count: int = 16,
+        outside: bool = True,
+        method: str = "sample",
+        sample_size: int = 100000,
+        bins: int = 1024,
+        area: Optional[AreaRange] = None,
+) -> Optional[np.ndarray]:
+    """
+    Calculate contour levels from estimated percentiles of a field instead of exact min and max values,
+    so levels are not affected by outliers and are stable across lead times.
+
+    Parameters
+    ----------
+    field
+    lower_percentile
+        percentile in [0, 100] used as min value.
+    upper_percentile
+        percentile in [0, 100] used as max value.
+    max_count
+    outside
+    method
+        quantile estimation method, see ``estimate_quantiles``.
+    sample_size
+    bins
+    area
+        visible area. Only values of the area subset are used for DataArray fields.
+
+    Returns
+    -------
+    Optional[np.ndarray]
+        levels, or None if levels can't be calculated (such as all values are NaN or equal).
+    """
+    if isinstance(field, xr.DataArray):
+        if area is not None:
+            field = select_area(field, area)
+        values = field.values
+    else:
+        values = np.asarray(field)
+
+    min_value, max_value = estimate_quantiles(
+        values,
+        quantiles=[lower_percentile / 100, upper_percentile / 100],
+        method=method,
+        sample_size=sample_size,
+        bins=bins,
+    )
+    if not (np.isfinite(min_value) and np.isfinite(max_value) and min_value < max_value):
+        return None
+
+    setting = calculate_levels_automatic(
+        float(min_value), float(max_value), max_count=max_count, outside=outside
+    )
+    return setting.to_levels()
@@ -1,3 +1,4 @@
-from .layer import Layer
-from .chart import Chart
+from .layer import Layer, PathSimplifyOption, LayerMetrics
+from .chart import Chart, get_graph_levels
 from .panel import Panel, Schema
+from .sequence import LeadTimeSequence
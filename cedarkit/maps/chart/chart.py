@@ -1,8 +1,11 @@
-from typing import List, Optional, Any, TYPE_CHECKING
+from typing import List, Optional, Any, Union, TYPE_CHECKING
+
+import numpy as np
 from cartopy import crs as ccrs
 
-from cedarkit.maps.style import Style, ContourStyle, BarbStyle
-from cedarkit.maps.util import AxesRect
+from cedarkit.maps.style import Style, ContourStyle, BarbStyle, ImageStyle, QuiverStyle, StreamlineStyle
+from cedarkit.maps.contour import ContourGeometry, compute_contour_geometry
+from cedarkit.maps.util import AxesRect, AreaRange
 from cedarkit.maps.template import XYTemplate
 
 from .layer import Layer
@@ -83,7 +86,21 @@ class Chart:
         layer.set_axes(ax)
         return layer
 
-    def plot(self, data, style: "Style", layer: Optional[List[Any]] = None) -> List[Any]:
+    def get_visible_area(self) -> Optional[AreaRange]:
+        """
+        Total area of all layers for map domains, or None for other domains.
+        """
+        if hasattr(self.domain, "total_area"):
+            return self.domain.total_area()
+        return None
+
+    def plot(
+            self,
+            data,
+            style: "Style",
+            layer: Optional[List[Any]] = None,
+            levels: Optional[Union[List, np.ndarray]] = None,
+    ) -> List[Any]:
         """
         Plot data with style in layers.
 
@@ -91,31 +108,129 @@ class Chart:
         ----------
         data
             plot data. Different plot method may require different type of data.
-            Such as contour needs one field, and barb needs a list with two fields.
+            Such as contour needs one field (or ``ContourGeometry`` created by ``Layer.compute_contour``),
+            barb, quiver and streamline need a list with two fields, and image needs one field on a regular grid.
         style
             plot style which is used to select plot method.
         layer
             which layer to be plotted on. If not set then all layers will be plotted on.
+        levels
+            contour levels, default is ``style.get_levels`` with data in visible area.
+            Set levels to use the same automatic levels in several plots.
 
         Returns
         -------
         List[Any]
-            plot results for each used layer.
+            plot results for each used layer. Contour sets keep levels used in plot, see ``get_graph_levels``.
         """
         results = []
         if layer is None:
             layers = self.layers
         else:
             layers = [self.layers[i] for i in layer]
+        if isinstance(style, ContourStyle) and not isinstance(data, ContourGeometry):
+            # levels are calculated once so that all layers use the same levels.
+            if levels is None:
+                levels = style.get_levels(data, area=self.get_visible_area())
+            if levels is not None and len(layers) > 1:
+                # contour once, each layer draws contours in its map box, see ``Layer.plot_contour_geometry``.
+                data = layers[0].compute_contour(data, style=style, levels=levels)
         for layer in layers:
-            if isinstance(style, ContourStyle):
+            if isinstance(data, ContourGeometry):
+                result = layer.plot_contour_geometry(geometry=data, style=style)
+            elif isinstance(style, ContourStyle):
                 if style.fill:
-                    result = layer.contourf(data=data, style=style)
+                    result = layer.contourf(data=data, style=style, levels=levels)
                 else:
-                    result = layer.contour(data=data, style=style)
+                    result = layer.contour(data=data, style=style, levels=levels)
             elif isinstance(style, BarbStyle):
                 result = layer.barb(x=data[0], y=data[1], style=style)
+            elif isinstance(style, QuiverStyle):
+                result = layer.quiver(x=data[0], y=data[1], style=style)
+            elif isinstance(style, StreamlineStyle):
+                result = layer.streamline(x=data[0], y=data[1], style=style)
+            elif isinstance(style, ImageStyle):
+                result = layer.image(data=data, style=style)
             else:
                 raise NotImplementedError(f"style is not implemented: {type(style)}")
             results.append(result)
         return results
+
+    def update_plot(
+            self,
+            results: List[Any],
+            data,
+            style: "Style",
+            layer: Optional[List[Any]] = None
+    ) -> List[Any]:
+        """
+        Update plot results created by ``plot`` with new data, keeping map and other artists.
+
+        Contours and images are updated in place. Plots without incremental update support (such as barbs and streamlines)
+        are removed and plotted again.
+
+        Parameters
+        ----------
+        results
+            results returned by ``plot`` with the same ``style`` and ``layer``.
+        data
+            new plot data.
+        style
+        layer
+
+        Returns
+        -------
+        List[Any]
+            plot results for each used layer.
+        """
+        if layer is None:
+            layers = self.layers
+        else:
+            layers = [self.layers[i] for i in layer]
+
+        if isinstance(style, ContourStyle) and not isinstance(data, ContourGeometry) and len(layers) > 1:
+            # contour once with the same levels for all layers.
+            data = compute_contour_geometry(
+                data,
+                levels=results[0].levels,
+                filled=results[0].filled,
+                extend=results[0].extend,
+                option=layers[0].contour_option,
+            )
+
+        new_results = []
+        for current_layer, result in zip(layers, results):
+            if isinstance(style, ContourStyle):
+                result = current_layer.update_contour(contour=result, data=data, style=style)
+            elif isinstance(style, ImageStyle):
+                result = current_layer.update_image(image=result, data=data, style=style)
+            else:
+                result.remove()
+                result = self.plot(data=data, style=style, layer=[self.layers.index(current_layer)])[0]
+            new_results.append(result)
+        return new_results
+
+
+def get_graph_levels(graphs: List[Any]) -> Optional[np.ndarray]:
+    """
+    Get contour levels used in plot results returned by ``Chart.plot`` or ``Panel.plot``,
+    such as automatic levels of a ``ContourStyle``, which are required by colorbars.
+
+    Parameters
+    ----------
+    graphs
+        plot results, which may be nested lists.
+
+    Returns
+    -------
+    Optional[np.ndarray]
+        levels of the first contour set, or None if no contour set is found.
+    """
+    for graph in graphs:
+        if isinstance(graph, list):
+            levels = get_graph_levels(graph)
+        else:
+            levels = getattr(graph, "levels", None)
+        if levels is not None:
+            return levels
+    return None
@@ -0,0 +1,312 @@
+"""
+Frame writers for image sequences.
+
+Frames are RGBA ``uint8`` arrays with shape (height, width, 4). Encoding runs in background threads
+(or in an ffmpeg subprocess), so the next frame can be rendered while previous frames are encoded.
+"""
+import collections
+import queue
+import subprocess
+import threading
+from concurrent.futures import ThreadPoolExecutor, Future
+from pathlib import Path
+from typing import Optional, Union, List
+
+import numpy as np
+import matplotlib as mpl
+from PIL import Image
+
+
+class FrameWriter:
+    """
+    Base class of frame writers.
+    """
+    def write(self, frame: np.ndarray):
+        raise NotImplementedError
+
+    def close(self):
+        ...
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+class PngSeriesWriter(FrameWriter):
+    """
+    Write frames to numbered PNG files.
+
+    Parameters
+    ----------
+    pattern
+        file path pattern with ``index`` field, such as ``output/t2m_{index:03d}.png``.
+    start_index
+    max_workers
+        encoding thread count.
+    """
+    def __init__(self, pattern: Union[str, Path], start_index: int = 0, max_workers: int = 2):
+        self.pattern = str(pattern)
+        self.index = start_index
+        self.executor = ThreadPoolExecutor(max_workers=max_workers)
+        self.futures: List[Future] = []
+        self.paths: List[Path] = []
+
+    def write(self, frame: np.ndarray):
+        path = Path(self.pattern.format(index=self.index))
+        self.index += 1
+        self.paths.append(path)
+        self.futures.append(self.executor.submit(_save_png, frame, path))
+
+    def close(self):
+        self.executor.shutdown(wait=True)
+        for future in self.futures:
+            future.result()
+        self.futures = []
+
+
+class PillowAnimationWriter(FrameWriter):
+    """
+    Write frames to animated GIF or WebP file with Pillow.
+
+    Frames are converted (quantized for GIF) in background threads and the file is written on ``close``.
+
+    Parameters
+    ----------
+    path
+        output file path, format is determined by suffix (``.gif`` or ``.webp``).
+    fps
+        frames per second.
+    loop
+        loop count, 0 means infinite loop.
+    max_workers
+        conversion thread count.
+    save_kwargs
+        additional options for ``PIL.Image.Image.save``.
+    """
+    def __init__(
+            self,
+            path: Union[str, Path],
+            fps: float = 2,
+            loop: int = 0,
+            max_workers: int = 2,
+            **save_kwargs,
+    ):
+        self.path = Path(path)
+        self.fps = fps
+        self.loop = loop
+        self.save_kwargs = save_kwargs
+        self.executor = ThreadPoolExecutor(max_workers=max_workers)
+        self.futures: List[Future] = []
+        self.is_gif = self.path.suffix.lower() == ".gif"
+
+    def write(self, frame: np.ndarray):
+        self.futures.append(self.executor.submit(_convert_frame, frame, self.is_gif))
+
+    def close(self):
+        self.executor.shutdown(wait=True)
+        images = [future.result() for future in self.futures]
+        self.futures = []
+        if len(images) == 0:
+            return
+        images[0].save(
+            self.path,
+            save_all=True,
+            append_images=images[1:],
+            duration=int(1000 / self.fps),
+            loop=self.loop,
+            **self.save_kwargs,
+        )
+
+
+class FFMpegWriter(FrameWriter):
+    """
+    Write frames to video file (such as MP4) by piping raw frames into ffmpeg.
+
+    Frames are queued and written to ffmpeg in a background thread. If ffmpeg exits early (such as unknown codec
+    or full disk), ``write`` and ``close`` raise ``RuntimeError`` with the last lines of ffmpeg error output.
+
+    Parameters
+    ----------
+    path
+    fps
+    codec
+    pix_fmt
+    extra_args
+        additional ffmpeg output arguments.
+    ffmpeg_path
+        default is ``rcParams["animation.ffmpeg_path"]``.
+    """
+    def __init__(
+            self,
+            path: Union[str, Path],
+            fps: float = 2,
+            codec: str = "libx264",
+            pix_fmt: str = "yuv420p",
+            extra_args: Optional[List[str]] = None,
+            ffmpeg_path: Optional[str] = None,
+    ):
+        self.path = Path(path)
+        self.fps = fps
+        self.codec = codec
+        self.pix_fmt = pix_fmt
+        self.extra_args = extra_args if extra_args is not None else []
+        self.ffmpeg_path = ffmpeg_path if ffmpeg_path is not None else mpl.rcParams["animation.ffmpeg_path"]
+
+        self.process: Optional[subprocess.Popen] = None
+        self.frame_size = None
+        self.queue: "queue.Queue[Optional[bytes]]" = queue.Queue(maxsize=4)
+        self.thread: Optional[threading.Thread] = None
+        self.stderr_thread: Optional[threading.Thread] = None
+        self.stderr_lines: "collections.deque[bytes]" = collections.deque(maxlen=20)
+        self.error: Optional[BaseException] = None
+
+    def write(self, frame: np.ndarray):
+        if self.process is None:
+            self._start(width=frame.shape[1], height=frame.shape[0])
+        if frame.shape[:2] != self.frame_size:
+            raise ValueError(f"frame size changed: {frame.shape[:2]} != {self.frame_size}")
+        self._put(np.ascontiguousarray(frame).tobytes())
+
+    def close(self):
+        if self.process is None:
+            return
+        self._put(None)
+        self.thread.join()
+        if self.error is not None:
+            self._raise_error()
+        try:
+            self.process.stdin.close()
+        except BrokenPipeError as e:
+            self.error = e
+        return_code = self.process.wait()
+        self.stderr_thread.join()
+        if return_code != 0 or self.error is not None:
+            self._raise_error()
+        self.process = None
+
+    def _put(self, data: Optional[bytes]):
+        """
+        Put data into queue. Raise error if ffmpeg exits or the feed thread fails.
+        """
+        while True:
+            if self.error is not None or self.process.poll() is not None:
+                self._raise_error()
+            try:
+                self.queue.put(data, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
+    def _raise_error(self):
+        """
+        Stop ffmpeg and raise error with ffmpeg error output.
+        """
+        process = self.process
+        self.process = None
+        if process.poll() is None:
+            process.kill()
+        try:
+            process.stdin.close()
+        except OSError:
+            pass
+        return_code = process.wait()
+        self.stderr_thread.join()
+        try:
+            # stop the feed thread if it is waiting for data.
+            self.queue.put_nowait(None)
+        except queue.Full:
+            pass
+
+        message = f"ffmpeg exited with code {return_code}"
+        stderr = b"".join(self.stderr_lines).decode(errors="replace").strip()
+        if stderr != "":
+            message += f": {stderr}"
+        raise RuntimeError(message) from self.error
+
+    def _start(self, width: int, height: int):
+        self.frame_size = (height, width)
+        command = [
+            self.ffmpeg_path, "-y",
+            "-f", "rawvideo",
+            "-pix_fmt", "rgba",
+            "-s", f"{width}x{height}",
+            "-r", str(self.fps),
+            "-i", "pipe:",
+            # yuv420p requires even width and height
+            "-vf", "pad=ceil(iw/2)*2:ceil(ih/2)*2",
+            "-vcodec", self.codec,
+            "-pix_fmt", self.pix_fmt,
+            *self.extra_args,
+            str(self.path),
+        ]
+        self.process = subprocess.Popen(
+            command,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+        )
+        self.thread = threading.Thread(target=self._feed, args=(self.process.stdin,), daemon=True)
+        self.thread.start()
+        self.stderr_thread = threading.Thread(target=self._read_stderr, args=(self.process.stderr,), daemon=True)
+        self.stderr_thread.start()
+
+    def _feed(self, stdin):
+        try:
+            while True:
+                data = self.queue.get()
+                if data is None:
+                    break
+                stdin.write(data)
+        except BaseException as e:
+            # raised in ``write`` or ``close``.
+            self.error = e
+
+    def _read_stderr(self, stderr):
+        # keep last lines of ffmpeg log, reading also prevents ffmpeg from blocking on a full pipe.
+        for line in stderr:
+            self.stderr_lines.append(line)
+        stderr.close()
+
+
+def get_frame_writer(output: Union[str, Path], fps: float = 2, **kwargs) -> FrameWriter:
+    """
+    Create frame writer according to output path.
+
+    * ``*.gif``, ``*.webp``: ``PillowAnimationWriter``
+    * ``*.mp4``, ``*.mkv``, ``*.webm``: ``FFMpegWriter``
+    * path with ``{index}`` field, such as ``t2m_{index:03d}.png``: ``PngSeriesWriter``
+
+    Parameters
+    ----------
+    output
+    fps
+    kwargs
+        options for writer class.
+
+    Returns
+    -------
+    FrameWriter
+    """
+    output = str(output)
+    suffix = Path(output).suffix.lower()
+    if "{index" in output:
+        return PngSeriesWriter(pattern=output, **kwargs)
+    elif suffix in (".gif", ".webp"):
+        return PillowAnimationWriter(path=output, fps=fps, **kwargs)
+    elif suffix in (".mp4", ".mkv", ".webm"):
+        return FFMpegWriter(path=output, fps=fps, **kwargs)
+    else:
+        raise ValueError(f"output format is not supported: {output}")
+
+
+def _save_png(frame: np.ndarray, path: Path):
+    Image.fromarray(frame).save(path, format="png")
+
+
+def _convert_frame(frame: np.ndarray, is_gif: bool) -> Image.Image:
+    image = Image.fromarray(frame)
+    if is_gif:
+        image = image.convert("RGB").quantize(colors=256)
+    return image
@@ -1,21 +1,42 @@
-from typing import Optional, TYPE_CHECKING
+import time
+from dataclasses import dataclass
+from typing import Optional, Union, Tuple, TYPE_CHECKING
 
 import xarray as xr
 import numpy as np
 import matplotlib.axes
 import matplotlib.contour
+import matplotlib.image
 import matplotlib.quiver
 import cartopy.crs as ccrs
+import cartopy.mpl.geoaxes
 
-from cedarkit.maps.style import ContourStyle, BarbStyle, ContourLabelStyle
+from cedarkit.maps.style import (
+    ContourStyle,
+    BarbStyle,
+    ContourLabelStyle,
+    ImageStyle,
+    QuiverStyle,
+    StreamlineStyle,
+)
+from cedarkit.maps.contour import ContourGeometry, ContourGeneratorOption, compute_contour_geometry
 from cedarkit.maps.graph import (
     add_contourf,
     add_contour,
+    add_contour_geometry,
     add_contour_label,
     add_barb,
+    add_quiver,
+    add_streamline,
+    StreamlineSet,
+    update_contour_data,
+    simplify_contour,
+    add_image,
+    update_image_data,
 )
 from cedarkit.maps.util import (
     AreaRange,
+    MapBoxTitle,
     set_map_box_area,
     set_map_box_axis,
     draw_map_box_gridlines,
@@ -25,6 +46,36 @@ if TYPE_CHECKING:
     from cedarkit.maps.chart import Chart
 
 
+@dataclass
+class PathSimplifyOption:
+    """
+    Contour path simplification after contouring in a ``Layer``.
+
+    Attributes
+    ----------
+    tolerance
+        simplification tolerance in output pixels.
+    vertex_budget
+        max vertex count of each contour set. Tolerance is increased until the budget is met.
+    dpi
+        output dpi used to convert pixels to data coordinates, default is figure dpi.
+    """
+    tolerance: float = 0.5
+    vertex_budget: Optional[int] = None
+    dpi: Optional[float] = None
+
+
+@dataclass
+class LayerMetrics:
+    """
+    Plot metrics of a ``Layer``, accumulated for all simplified contour sets.
+    """
+    contour_count: int = 0
+    vertices_before: int = 0
+    vertices_after: int = 0
+    simplify_time: float = 0.0
+
+
 class Layer:
     """
     A layer is a map box in a ``Chart``. Each layer has a ``matplotlib.axes.Axes`` attribute to draw plots.
@@ -37,6 +88,15 @@ class Layer:
         ``ccrs.Projection`` for all plots in this layer.
     chart
         ``Chart`` who owns this ``Layer``.
+    title
+        title texts added by ``AxesComponentPainter.add_title``, updated in place by later calls.
+    simplify_option
+        contour path simplification option, no simplification if not set.
+    contour_option
+        contourpy generator option, such as the threaded algorithm. If set, contours are generated with contourpy
+        directly and drawn as ``ContourGeometry``, otherwise matplotlib default contour generator is used.
+    metrics
+        contour vertex metrics.
     """
     def __init__(
             self,
@@ -45,6 +105,10 @@ class Layer:
     ):
         self.ax: Optional[matplotlib.axes.Axes] = None
         self.projection = projection
+        self.title: Optional[MapBoxTitle] = None
+        self.simplify_option: Optional[PathSimplifyOption] = None
+        self.contour_option: Optional[ContourGeneratorOption] = None
+        self.metrics = LayerMetrics()
 
         if chart is not None:
             self.set_chart(chart)
@@ -110,35 +174,268 @@ class Layer:
     # Plot methods
     # ---------------
 
-    def contourf(self, data: xr.DataArray, style: ContourStyle, **kwargs) -> matplotlib.contour.QuadContourSet:
+    def contourf(
+            self,
+            data: xr.DataArray,
+            style: ContourStyle,
+            levels: Optional[np.ndarray] = None,
+            **kwargs
+    ) -> matplotlib.contour.QuadContourSet:
+        if levels is None:
+            levels = style.get_levels(data)
+        if self._use_contour_option(levels, kwargs):
+            return self.plot_contour_geometry(self.compute_contour(data, style, levels=levels), style, **kwargs)
+        if style.colors is not None and levels is not None and not {"cmap", "norm", "colors"} & kwargs.keys():
+            levels, cmap, norm = style.get_colormap_norm(levels)
+            kwargs.update(cmap=cmap, norm=norm)
+        else:
+            kwargs.setdefault("cmap", style.colors)
         contour = add_contourf(
             self.ax,
             field=data,
-            levels=style.levels,
+            levels=levels,
             projection=self.projection,
-            cmap=style.colors,
             **kwargs
         )
+        self.simplify_contour(contour)
         if style.label:
             label = Layer.contour_label(self.ax, contour, style.label_style)
         return contour
 
-    def contour(self, data: xr.DataArray, style: ContourStyle, **kwargs) -> matplotlib.contour.QuadContourSet:
+    def contour(
+            self,
+            data: xr.DataArray,
+            style: ContourStyle,
+            levels: Optional[np.ndarray] = None,
+            **kwargs
+    ) -> matplotlib.contour.QuadContourSet:
+        if levels is None:
+            levels = style.get_levels(data)
+        if self._use_contour_option(levels, kwargs):
+            return self.plot_contour_geometry(self.compute_contour(data, style, levels=levels), style, **kwargs)
         contour = add_contour(
             self.ax,
             field=data,
-            levels=style.levels,
+            levels=levels,
             projection=self.projection,
             colors=style.colors,
             linewidths=style.linewidths,
             linestyles=style.linestyles,
             **kwargs
         )
+        self.simplify_contour(contour)
         if style.label:
             label = Layer.contour_label(self.ax, contour, style.label_style)
 
         return contour
 
+    def compute_contour(
+            self,
+            data: xr.DataArray,
+            style: ContourStyle,
+            levels: Optional[np.ndarray] = None,
+    ) -> ContourGeometry:
+        """
+        Compute contour lines or filled contours (if ``style.fill``) of a field without drawing.
+        Axes is not required.
+
+        The result is in field coordinates (lon/lat), which can be exported with ``cedarkit.maps.export``
+        and drawn with ``plot_contour_geometry`` without contouring again.
+
+        Parameters
+        ----------
+        data
+        style
+        levels
+            contour levels, default is ``style.get_levels(data)``.
+
+        Returns
+        -------
+        ContourGeometry
+        """
+        if levels is None:
+            levels = style.get_levels(data)
+        return compute_contour_geometry(
+            data,
+            levels=levels,
+            filled=style.fill,
+            extend="both" if style.fill else "neither",
+            option=self.contour_option,
+        )
+
+    def plot_contour_geometry(
+            self,
+            geometry: ContourGeometry,
+            style: ContourStyle,
+            **kwargs
+    ) -> matplotlib.contour.ContourSet:
+        """
+        Draw contour geometry created by ``compute_contour``, the same as ``contourf`` or ``contour``
+        with the same field.
+
+        Parameters
+        ----------
+        geometry
+        style
+        kwargs
+
+        Returns
+        -------
+        matplotlib.contour.ContourSet
+        """
+        geometry = self.select_contour_geometry(geometry)
+        if geometry.filled:
+            _, cmap, norm = style.get_colormap_norm(geometry.levels, extend=geometry.extend)
+            contour = add_contour_geometry(
+                self.ax,
+                geometry=geometry,
+                projection=self.projection,
+                cmap=cmap,
+                norm=norm,
+                **kwargs
+            )
+        else:
+            contour = add_contour_geometry(
+                self.ax,
+                geometry=geometry,
+                projection=self.projection,
+                colors=style.colors,
+                linewidths=style.linewidths,
+                linestyles=style.linestyles,
+                **kwargs
+            )
+        self.simplify_contour(contour)
+        if style.label:
+            label = Layer.contour_label(self.ax, contour, style.label_style)
+        return contour
+
+    def update_contour(
+            self,
+            contour: matplotlib.contour.QuadContourSet,
+            data: Union[xr.DataArray, ContourGeometry],
+            style: ContourStyle,
+    ) -> matplotlib.contour.QuadContourSet:
+        """
+        Update contour set created by ``contourf`` or ``contour`` with new data on the same grid.
+        Only contour paths (and labels if enabled in style) are replaced.
+
+        Parameters
+        ----------
+        contour
+        data
+            new field, or contour geometry created by ``compute_contour`` with the same levels.
+        style
+            style used to create the contour set.
+
+        Returns
+        -------
+        matplotlib.contour.QuadContourSet
+        """
+        if self.projection is not None:
+            transform = self.projection._as_mpl_transform(self.ax)
+        else:
+            transform = self.ax.transData
+        if isinstance(data, ContourGeometry):
+            data = self.select_contour_geometry(data)
+        update_contour_data(contour, field=data, transform=transform, option=self.contour_option)
+        self.simplify_contour(contour)
+        if style.label:
+            label = Layer.contour_label(self.ax, contour, style.label_style)
+        return contour
+
+    def get_data_extent(self) -> Optional[Tuple[float, float, float, float]]:
+        """
+        Map box extent (x_min, x_max, y_min, y_max) in data coordinates, used to select contours drawn in this layer.
+        None if data coordinates are not the map projection coordinates.
+        """
+        ax = self.ax
+        if (
+                not isinstance(ax, cartopy.mpl.geoaxes.GeoAxes)
+                or self.projection is None
+                or ax.projection != self.projection
+        ):
+            return None
+        return ax.get_extent()
+
+    def select_contour_geometry(self, geometry: ContourGeometry) -> ContourGeometry:
+        """
+        Select contours drawn in this layer, see ``ContourGeometry.select``.
+        Longitudes of ``PlateCarree`` data are periodic, so a 0..360 field is selected for a map box
+        with negative longitudes.
+        """
+        extent = self.get_data_extent()
+        if extent is None:
+            return geometry
+        x_period = 360 if isinstance(self.projection, ccrs.PlateCarree) else None
+        return geometry.select(extent, x_period=x_period)
+
+    def set_simplify_option(self, option: Optional[PathSimplifyOption]):
+        self.simplify_option = option
+
+    def set_contour_option(self, option: Optional[ContourGeneratorOption]):
+        self.contour_option = option
+
+    def _use_contour_option(self, levels: Optional[np.ndarray], kwargs: dict) -> bool:
+        """
+        Whether contours are generated with ``contour_option``. Automatic levels and options only supported by
+        xarray plot methods (such as ``ylim``) use the default matplotlib contour generator.
+        """
+        return (
+            self.contour_option is not None
+            and levels is not None
+            and np.ndim(levels) == 1
+            and not {"ylim", "y_invert", "cmap", "norm", "colors"} & kwargs.keys()
+        )
+
+    def get_simplify_tolerance(self, tolerance: float, dpi: Optional[float] = None) -> float:
+        """
+        Convert tolerance in output pixels to plot data coordinates (``projection`` coordinates).
+
+        Parameters
+        ----------
+        tolerance
+            tolerance in pixels.
+        dpi
+            output dpi, default is figure dpi.
+
+        Returns
+        -------
+        float
+        """
+        ax = self.ax
+        fig = ax.get_figure()
+        if dpi is None:
+            dpi = fig.dpi
+        if self.projection is not None and hasattr(ax, "get_extent"):
+            x0, x1, y0, y1 = ax.get_extent(crs=self.projection)
+        else:
+            x0, x1 = ax.get_xlim()
+            y0, y1 = ax.get_ylim()
+        scale = dpi / fig.dpi
+        width = ax.bbox.width * scale
+        height = ax.bbox.height * scale
+        return tolerance * min(abs(x1 - x0) / width, abs(y1 - y0) / height)
+
+    def simplify_contour(self, contour: matplotlib.contour.QuadContourSet):
+        """
+        Simplify contour paths with ``simplify_option`` and update ``metrics``. Nothing is done if option is not set.
+        """
+        option = self.simplify_option
+        if option is None:
+            return
+        start_time = time.perf_counter()
+        tolerance = self.get_simplify_tolerance(option.tolerance, dpi=option.dpi)
+        vertices_before, vertices_after, _ = simplify_contour(
+            contour,
+            tolerance=tolerance,
+            vertex_budget=option.vertex_budget,
+        )
+        metrics = self.metrics
+        metrics.contour_count += 1
+        metrics.vertices_before += vertices_before
+        metrics.vertices_after += vertices_after
+        metrics.simplify_time += time.perf_counter() - start_time
+
     @classmethod
     def contour_label(cls, ax, contour, style: ContourLabelStyle):
         kwargs = dict(
@@ -152,6 +449,14 @@ class Layer:
             manual=style.manual,
             zorder=style.zorder,
         )
+        if style.engine != "clabel":
+            kwargs.update(
+                engine=style.engine,
+                label_spacing=style.label_spacing,
+                min_distance=style.min_distance,
+                area_size=style.area_size,
+                max_labels_per_area=style.max_labels_per_area,
+            )
 
         labels = add_contour_label(
             ax,
@@ -160,6 +465,35 @@ class Layer:
         )
         return labels
 
+    def image(self, data: xr.DataArray, style: ImageStyle, **kwargs) -> matplotlib.image.AxesImage:
+        """
+        Draw a field on a regular grid as an image, see ``graph.add_image``.
+        """
+        kwargs.update(self._get_image_options(style))
+        return add_image(
+            self.ax,
+            field=data,
+            projection=self.projection,
+            pixel_size=style.pixel_size,
+            **kwargs
+        )
+
+    def update_image(
+            self,
+            image: matplotlib.image.AxesImage,
+            data: xr.DataArray,
+            style: ImageStyle,
+    ) -> matplotlib.image.AxesImage:
+        """
+        Update image created by ``image`` with a new field on the same grid.
+        """
+        return update_image_data(image, field=data, projection=self.projection, pixel_size=style.pixel_size)
+
+    @classmethod
+    def _get_image_options(cls, style: ImageStyle) -> dict:
+        _, cmap, norm = style.get_colormap_norm()
+        return dict(interpolation=style.interpolation, alpha=style.alpha, cmap=cmap, norm=norm)
+
     def barb(self, x: xr.DataArray, y: xr.DataArray, style: BarbStyle, **kwargs) -> matplotlib.quiver.Barbs:
         additional_kwargs = dict()
         if self.projection is not None:
@@ -181,3 +515,44 @@ class Layer:
         )
         return barb
 
+    def quiver(self, x: xr.DataArray, y: xr.DataArray, style: QuiverStyle, **kwargs) -> matplotlib.quiver.Quiver:
+        """
+        Draw wind arrows, see ``graph.add_quiver``.
+        """
+        return add_quiver(
+            self.ax,
+            x_field=x,
+            y_field=y,
+            projection=self.projection,
+            regrid_shape=style.regrid_shape,
+            color=style.color,
+            scale=style.scale,
+            width=style.width,
+            headwidth=style.headwidth,
+            headlength=style.headlength,
+            headaxislength=style.headaxislength,
+            pivot=style.pivot,
+            **kwargs
+        )
+
+    def streamline(self, x: xr.DataArray, y: xr.DataArray, style: StreamlineStyle, **kwargs) -> StreamlineSet:
+        """
+        Draw streamlines, see ``graph.add_streamline``.
+        """
+        return add_streamline(
+            self.ax,
+            x_field=x,
+            y_field=y,
+            projection=self.projection,
+            color=style.color,
+            linewidth=style.linewidth,
+            density=style.density,
+            arrowsize=style.arrowsize,
+            arrowstyle=style.arrowstyle,
+            regrid_shape=style.regrid_shape,
+            method=style.method,
+            step_size=style.step_size,
+            max_length=style.max_length,
+            min_length=style.min_length,
+            **kwargs
+        )
@@ -1,13 +1,16 @@
 from dataclasses import dataclass
 from typing import Optional, Tuple, Union, List, Any, Iterable, TYPE_CHECKING
 
+import numpy as np
 import matplotlib.pyplot as plt
 import xarray as xr
 
 from cedarkit.maps.style import Style
+from cedarkit.maps.contour import ContourGeometry, ContourGeneratorOption
 from cedarkit.maps.template import XYTemplate
 
 from .chart import Chart
+from .layer import PathSimplifyOption
 
 
 @dataclass
@@ -79,7 +82,13 @@ class Panel:
         self.charts.append(chart)
         return chart
 
-    def plot(self, data: Union[xr.DataArray, Iterable], style: Style, layer: Optional[List[Any]] = None) -> List[Any]:
+    def plot(
+            self,
+            data: Union[xr.DataArray, Iterable],
+            style: Style,
+            layer: Optional[List[Any]] = None,
+            levels: Optional[Union[List, np.ndarray]] = None,
+    ) -> List[Any]:
         """
         Plot data in charts.
 
@@ -91,22 +100,88 @@ class Panel:
             plot style, ``Layer`` use style to determine which plot method to use.
         layer
             layer index list, data will only be plotted in selected layers, default is all layers in chart.
+        levels
+            contour levels, see ``Chart.plot``.
         Returns
         -------
         List
-            graphs list for each chart.
+            graphs list for each chart. Contour sets keep levels used in plot (``levels`` attribute),
+            see ``get_graph_levels``.
         """
         graphs = []
 
-        if isinstance(data, xr.DataArray):
+        if isinstance(data, (xr.DataArray, ContourGeometry)):
             data = [data]
 
         for i, d in enumerate(data):
-            graph = self.charts[i].plot(data=d, style=style, layer=layer)
+            graph = self.charts[i].plot(data=d, style=style, layer=layer, levels=levels)
             graphs.append(graph)
 
         return graphs
 
+    def update_plot(
+            self,
+            graphs: List[Any],
+            data: Union[xr.DataArray, Iterable],
+            style: Style,
+            layer: Optional[List[Any]] = None
+    ) -> List[Any]:
+        """
+        Update graphs created by ``plot`` with new data in charts.
+
+        Parameters
+        ----------
+        graphs
+            graphs list returned by ``plot``.
+        data
+            iterable data, each ``Chart`` use one data to update.
+        style
+            plot style used in ``plot``.
+        layer
+            layer index list used in ``plot``.
+
+        Returns
+        -------
+        List
+            new graphs list for each chart.
+        """
+        new_graphs = []
+
+        if isinstance(data, (xr.DataArray, ContourGeometry)):
+            data = [data]
+
+        for i, d in enumerate(data):
+            graph = self.charts[i].update_plot(results=graphs[i], data=d, style=style, layer=layer)
+            new_graphs.append(graph)
+
+        return new_graphs
+
+    def set_simplify_option(self, option: Optional[PathSimplifyOption]):
+        """
+        Set contour path simplification option for all layers in all charts.
+        Option is applied to contours plotted after this call.
+
+        Parameters
+        ----------
+        option
+        """
+        for chart in self.charts:
+            for layer in chart.layers:
+                layer.set_simplify_option(option)
+
+    def set_contour_option(self, option: Optional[ContourGeneratorOption]):
+        """
+        Set contourpy generator option for all layers in all charts, such as the threaded algorithm
+        for large fields. Option is applied to contours plotted after this call.
+
+        Parameters
+        ----------
+        option
+        """
+        for chart in self.charts:
+            for layer in chart.layers:
+                layer.set_contour_option(option)
+
     def set_title(self, *args, **kwargs):
         return self.domain.set_title(panel=self, *args, **kwargs)
 
@@ -0,0 +1,363 @@
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional, List, Dict, Any, Iterable, Tuple, Union, TYPE_CHECKING
+
+import numpy as np
+import pandas as pd
+import xarray as xr
+import matplotlib.pyplot as plt
+
+from cedarkit.maps.style import Style, ContourStyle
+from cedarkit.maps.util import GraphTitle
+
+from .chart import get_graph_levels
+from .panel import Panel, Schema
+from .frame_writer import FrameWriter, get_frame_writer
+
+if TYPE_CHECKING:
+    from cedarkit.maps.domains import MapTemplate
+
+
+@dataclass
+class SequencePlot:
+    """
+    A plot in each frame.
+
+    Attributes
+    ----------
+    style
+    layer
+    graphs
+        plot results of the current frame.
+    levels
+        automatic levels used in the current frame. With ``AutoLevelStyle.freeze``, levels of the first frame
+        are used for all frames.
+    """
+    style: Style
+    layer: Optional[List[Any]] = None
+    graphs: Optional[List[Any]] = None
+    levels: Optional[np.ndarray] = None
+
+
+@dataclass
+class SequenceColorbar:
+    style: Union[Style, List[Style]]
+    levels: Optional[List] = None
+    kwargs: Dict[str, Any] = field(default_factory=dict)
+    colorbars: Optional[List[Any]] = None
+    used_levels: Optional[List[Any]] = None
+
+
+class LeadTimeSequence:
+    """
+    Render a forecast lead time sequence on one ``Panel``.
+
+    Figure, map features, axes and colorbars are drawn once. For following frames only plot data
+    (contour paths are replaced in place) and time labels in title are updated.
+
+    Examples
+    --------
+    >>> sequence = LeadTimeSequence(
+    ...     domain=EastAsiaMapTemplate(),
+    ...     graph_name="2m Temperature (C)",
+    ...     system_name="CMA-GFS",
+    ...     start_time=pd.Timestamp("2024-11-09"),
+    ... )
+    >>> sequence.add_plot(style=t_2m_style)
+    >>> sequence.add_colorbar(style=t_2m_style)
+    >>> sequence.save(
+    ...     "t2m.gif",
+    ...     frames=((pd.Timedelta(hours=h), [load_t2m(h)]) for h in range(0, 121, 3)),
+    ...     dpi=150,
+    ... )
+
+    Attributes
+    ----------
+    panel : Panel
+    plots : List[SequencePlot]
+        plots in each frame. Frame data is a list with one item for each plot.
+    """
+    def __init__(
+            self,
+            domain: "MapTemplate",
+            graph_name: str,
+            system_name: str,
+            start_time: pd.Timestamp,
+            schema: Optional[Schema] = None,
+    ):
+        self.domain = domain
+        self.graph_name = graph_name
+        self.system_name = system_name
+        self.start_time = start_time
+
+        self.panel = Panel(domain=domain, schema=schema)
+        self.plots: List[SequencePlot] = []
+        self.colorbars: List[SequenceColorbar] = []
+        self.graph_titles: Dict[pd.Timedelta, GraphTitle] = dict()
+
+        self.frame_count = 0
+        self._crop_box: Optional[Tuple[int, int, int, int]] = None
+
+    @property
+    def fig(self):
+        return self.panel.fig
+
+    @property
+    def title_texts(self) -> Optional[List[Any]]:
+        title = self.panel.charts[0].layers[0].title
+        if title is None:
+            return None
+        return title.texts
+
+    def prepare_titles(self, forecast_times: Iterable[pd.Timedelta]):
+        """
+        Create title labels of all forecast times at once with ``MapTemplate.create_graph_titles``.
+
+        ``save`` calls this method when frames is a list or tuple.
+        """
+        forecast_times = [pd.Timedelta(t) for t in forecast_times]
+        graph_titles = self.domain.create_graph_titles(
+            graph_name=self.graph_name,
+            system_name=self.system_name,
+            start_time=self.start_time,
+            forecast_times=forecast_times,
+        )
+        self.graph_titles.update(zip(forecast_times, graph_titles))
+
+    def add_plot(self, style: Style, layer: Optional[List[Any]] = None) -> int:
+        """
+        Add a plot to each frame.
+
+        Parameters
+        ----------
+        style
+        layer
+            layer index list, see ``Panel.plot``.
+
+        Returns
+        -------
+        int
+            plot index in frame data list.
+        """
+        self.plots.append(SequencePlot(style=style, layer=layer))
+        return len(self.plots) - 1
+
+    def add_colorbar(self, style: Union[Style, List[Style]], levels: Optional[List] = None, **kwargs):
+        """
+        Add colorbars of styles, see ``MapTemplate.add_colorbar``.
+
+        Styles with automatic levels use levels of plots with the same style, so their colorbars are added
+        when the plot is drawn and are drawn again when levels change.
+
+        Returns
+        -------
+        Optional[List]
+            colorbars, or None if levels of plots are not calculated yet.
+        """
+        colorbar = SequenceColorbar(style=style, levels=levels, kwargs=kwargs)
+        self.colorbars.append(colorbar)
+        self._draw_colorbar(colorbar)
+        return colorbar.colorbars
+
+    def draw_frame(self, forecast_time: pd.Timedelta, data: List[Any]):
+        """
+        Plot or update data and title for one frame without rendering.
+
+        Parameters
+        ----------
+        forecast_time
+        data
+            data list for each plot added by ``add_plot``.
+        """
+        if len(data) != len(self.plots):
+            raise ValueError(f"data count {len(data)} is not equal to plot count {len(self.plots)}")
+
+        levels_changed = False
+        for plot, plot_data in zip(self.plots, data):
+            levels = self._get_frame_levels(plot, plot_data)
+            if plot.graphs is not None and levels is not None and not np.array_equal(levels, plot.levels):
+                # contours are updated in place with their levels, plot again with new levels.
+                _remove_graphs(plot.graphs)
+                plot.graphs = None
+            if plot.graphs is None:
+                plot.graphs = self.panel.plot(plot_data, style=plot.style, layer=plot.layer, levels=levels)
+                if _has_auto_levels(plot.style):
+                    plot.levels = get_graph_levels(plot.graphs)
+                    levels_changed = True
+            else:
+                plot.graphs = self.panel.update_plot(
+                    plot.graphs, plot_data, style=plot.style, layer=plot.layer
+                )
+
+        if levels_changed:
+            for colorbar in self.colorbars:
+                self._draw_colorbar(colorbar)
+
+        self.set_title(forecast_time=forecast_time)
+        self.frame_count += 1
+
+    def _get_frame_levels(self, plot: SequencePlot, data: Any) -> Optional[np.ndarray]:
+        """
+        Automatic levels of a frame. None means levels of the style, or levels calculated in ``Panel.plot``
+        for the first frame.
+        """
+        style = plot.style
+        if not _has_auto_levels(style) or plot.graphs is None:
+            return None
+        if style.auto_level_style.freeze:
+            return plot.levels
+        if isinstance(data, (list, tuple)):
+            data = data[0]
+        if not isinstance(data, xr.DataArray):
+            return None
+        return style.get_levels(data, area=self.panel.charts[0].get_visible_area())
+
+    def _draw_colorbar(self, colorbar: SequenceColorbar):
+        styles = colorbar.style if isinstance(colorbar.style, list) else [colorbar.style]
+        if colorbar.levels is None:
+            levels = []
+            for style in styles:
+                current_levels = None
+                if _has_auto_levels(style):
+                    current_levels = next((plot.levels for plot in self.plots if plot.style is style), None)
+                    if current_levels is None:
+                        # plot is not drawn yet.
+                        return
+                levels.append(current_levels)
+        elif isinstance(colorbar.style, list):
+            levels = colorbar.levels
+        else:
+            levels = [colorbar.levels]
+
+        if colorbar.colorbars is not None:
+            if all(np.array_equal(a, b) for a, b in zip(levels, colorbar.used_levels) if a is not None):
+                return
+            for color_bar in colorbar.colorbars:
+                color_bar.remove()
+
+        color_bars = self.panel.add_colorbar(
+            style=colorbar.style,
+            levels=levels if isinstance(colorbar.style, list) else levels[0],
+            **colorbar.kwargs,
+        )
+        if not isinstance(color_bars, list):
+            color_bars = [color_bars]
+        colorbar.colorbars = color_bars
+        colorbar.used_levels = levels
+
+    def set_title(self, forecast_time: pd.Timedelta):
+        """
+        Set title of the frame. Title texts are created for the first frame and updated in place later.
+        """
+        graph_title = self.graph_titles.get(forecast_time)
+        if graph_title is None:
+            graph_title = self.domain.create_graph_title(
+                graph_name=self.graph_name,
+                system_name=self.system_name,
+                start_time=self.start_time,
+                forecast_time=forecast_time,
+            )
+        self.domain.set_graph_title(panel=self.panel, graph_title=graph_title)
+
+    def render_frame(self, forecast_time: pd.Timedelta, data: List[Any], tight: bool = True) -> np.ndarray:
+        """
+        Draw one frame and return its RGBA image.
+
+        Parameters
+        ----------
+        forecast_time
+        data
+        tight
+            crop to the tight bounding box of the first frame, like ``Panel.save`` does.
+            The same box is used for all frames to keep frame size fixed.
+
+        Returns
+        -------
+        np.ndarray
+            RGBA image with shape (height, width, 4).
+        """
+        self.draw_frame(forecast_time=forecast_time, data=data)
+
+        fig = self.fig
+        fig.canvas.draw()
+        image = np.asarray(fig.canvas.buffer_rgba())
+        if tight:
+            if self._crop_box is None:
+                self._crop_box = self._get_crop_box()
+            top, bottom, left, right = self._crop_box
+            image = image[top:bottom, left:right]
+        # canvas buffer is reused for the next frame.
+        return image.copy()
+
+    def save(
+            self,
+            output: Union[str, Path, FrameWriter],
+            frames: Iterable[Tuple[pd.Timedelta, List[Any]]],
+            fps: float = 2,
+            dpi: Optional[float] = None,
+            tight: bool = True,
+    ) -> FrameWriter:
+        """
+        Render frames and write them with a frame writer. Encoding of previous frames runs in background
+        while the next frame is rendered.
+
+        Parameters
+        ----------
+        output
+            output path (see ``get_frame_writer``) or a ``FrameWriter`` object.
+        frames
+            iterable of (forecast_time, data list).
+        fps
+            frames per second for animation formats.
+        dpi
+            figure dpi for rendering, default is dpi in panel schema.
+        tight
+
+        Returns
+        -------
+        FrameWriter
+        """
+        if isinstance(output, FrameWriter):
+            writer = output
+        else:
+            writer = get_frame_writer(output, fps=fps)
+
+        if isinstance(frames, (list, tuple)):
+            self.prepare_titles(forecast_time for forecast_time, _ in frames)
+
+        if dpi is not None:
+            self.fig.set_dpi(dpi)
+            self._crop_box = None
+
+        with writer:
+            for forecast_time, data in frames:
+                image = self.render_frame(forecast_time=forecast_time, data=data, tight=tight)
+                writer.write(image)
+        return writer
+
+    def close(self):
+        plt.close(self.fig)
+
+    def _get_crop_box(self, pad_inches: float = 0.1) -> Tuple[int, int, int, int]:
+        fig = self.fig
+        renderer = fig.canvas.get_renderer()
+        bbox = fig.get_tightbbox(renderer).padded(pad_inches)
+        dpi = fig.dpi
+        width, height = fig.canvas.get_width_height(physical=True)
+        left = max(int(np.floor(bbox.x0 * dpi)), 0)
+        right = min(int(np.ceil(bbox.x1 * dpi)), width)
+        top = max(int(np.floor(height - bbox.y1 * dpi)), 0)
+        bottom = min(int(np.ceil(height - bbox.y0 * dpi)), height)
+        return top, bottom, left, right
+
+
+def _has_auto_levels(style: Style) -> bool:
+    return isinstance(style, ContourStyle) and style.has_auto_levels
+
+
+def _remove_graphs(graphs: List[Any]):
+    for graph in graphs:
+        if isinstance(graph, list):
+            _remove_graphs(graph)
+        else:
+            graph.remove()
@@ -0,0 +1,119 @@
+"""
+Command line interface ``cedarkit-maps``.
+
+.. code-block:: bash
+
+    cedarkit-maps render products.yaml --workers 4
+    cedarkit-maps geometry-cache --output-dir /path/to/cache
+    cedarkit-maps natural-earth /path/to/natural_earth
+"""
+import argparse
+import importlib.resources
+import importlib.util
+import json
+import sys
+from dataclasses import asdict
+from typing import Optional, List
+
+from cedarkit.maps.render import load_manifest, run_manifest, ProductResult
+from cedarkit.maps.map.geometry_cache import convert_shapefiles
+from cedarkit.maps.map.natural_earth import provision_natural_earth, NATURAL_EARTH_SCALES
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="cedarkit-maps", description="A graph tool for CEMC/CMA.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    render_parser = subparsers.add_parser("render", help="render products in a manifest file.")
+    render_parser.add_argument("manifest", help="manifest file (YAML or JSON).")
+    render_parser.add_argument("-w", "--workers", type=int, default=None, help="worker process count.")
+    render_parser.add_argument("-f", "--force", action="store_true", help="render products even if up to date.")
+    render_parser.add_argument("--state", default=None, help="render state file.")
+    render_parser.add_argument("--report", default=None, help="write results to a JSON file.")
+    render_parser.add_argument(
+        "--warmup", action="store_true", help="warm up templates and styles before starting workers.",
+    )
+    render_parser.set_defaults(func=render_command)
+
+    cache_parser = subparsers.add_parser(
+        "geometry-cache",
+        help="convert shapefiles to geometry cache files, default is bundled and CEMC map shapefiles.",
+    )
+    cache_parser.add_argument("paths", nargs="*", help="shapefiles or directories.")
+    cache_parser.add_argument(
+        "-o", "--output-dir", default=None,
+        help="cache directory, set CEDARKIT_MAPS_GEOMETRY_CACHE to use it. Default is next to shapefiles.",
+    )
+    cache_parser.add_argument("--encoding", default=None, help="DBF encoding.")
+    cache_parser.set_defaults(func=geometry_cache_command)
+
+    natural_earth_parser = subparsers.add_parser(
+        "natural-earth",
+        help="provision NaturalEarth shapefiles into a local directory, set CEDARKIT_MAPS_NATURAL_EARTH_DIR to use it.",
+    )
+    natural_earth_parser.add_argument("data_dir", help="local NaturalEarth directory.")
+    natural_earth_parser.add_argument(
+        "--scales", nargs="+", default=NATURAL_EARTH_SCALES, help="NaturalEarth scales.",
+    )
+    natural_earth_parser.add_argument(
+        "--source", default=None,
+        help="copy from a directory with Cartopy's layout, such as Cartopy data_dir. Default is downloading.",
+    )
+    natural_earth_parser.set_defaults(func=natural_earth_command)
+
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+
+def render_command(args: argparse.Namespace) -> int:
+    manifest = load_manifest(args.manifest)
+    if args.state is not None:
+        manifest.state_path = args.state
+
+    results = run_manifest(manifest, workers=args.workers, force=args.force, warmup=args.warmup)
+    print_results(results)
+
+    if args.report is not None:
+        with open(args.report, "w") as f:
+            json.dump([asdict(result) for result in results], f, indent=2)
+
+    failed = [result for result in results if result.status == "failed"]
+    for result in failed:
+        message = result.error.strip().splitlines()[-1]
+        print(f"[{result.name}] failed after {result.attempts} attempts: {message}", file=sys.stderr)
+    return 1 if len(failed) > 0 else 0
+
+
+def geometry_cache_command(args: argparse.Namespace) -> int:
+    if len(args.paths) > 0:
+        groups = [(args.paths, args.encoding)]
+    else:
+        groups = [([importlib.resources.files("cedarkit.maps") / "resources/map"], None)]
+        if importlib.util.find_spec("cemc_meda_data") is not None:
+            groups.append(([importlib.resources.files("cemc_meda_data") / "resources/maps"], "GBK"))
+
+    for paths, encoding in groups:
+        for path in convert_shapefiles(paths, cache_dir=args.output_dir, encoding=encoding):
+            print(path)
+    return 0
+
+
+def natural_earth_command(args: argparse.Namespace) -> int:
+    for path in provision_natural_earth(args.data_dir, scales=args.scales, source_dir=args.source):
+        print(path)
+    return 0
+
+
+def print_results(results: List[ProductResult]):
+    print(f"{'product':<24} {'status':<9} {'tries':>5} {'load':>7} {'plot':>7} {'save':>7} {'total':>7}")
+    for r in results:
+        print(
+            f"{r.name:<24} {r.status:<9} {r.attempts:>5} "
+            f"{r.load_time:>7.2f} {r.plot_time:>7.2f} {r.save_time:>7.2f} {r.total_time:>7.2f}"
+        )
+    counts = {status: sum(r.status == status for r in results) for status in ("rendered", "skipped", "failed")}
+    print(", ".join(f"{count} {status}" for status, count in counts.items()))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,9 +1,12 @@
+import functools
 import importlib.resources
+import itertools
 import re
-from typing import Optional, List
+from typing import Optional, List, Any, Tuple
 
 import numpy as np
 import pandas as pd
+import matplotlib as mpl
 import matplotlib.colors as mcolors
 
 
@@ -52,11 +55,11 @@ def get_ncl_colormap(
 
     colors = []
     if index[0] == -1:
-        colors = [face_color]
+        colors = [mcolors.to_rgba(face_color)]
         index = index[1:]
-    raw_colors = raw_colormap(index)
-    colors.extend(raw_colors)
-    color_map = mcolors.ListedColormap(colors)
+    colors.extend(raw_colormap(index))
+    # one (n, 4) array instead of a list of small arrays.
+    color_map = mcolors.ListedColormap(np.array(colors, dtype=float))
     return color_map
 
 
@@ -73,6 +76,18 @@ def _get_raw_ncl_colormap(name) -> Optional[mcolors.ListedColormap]:
     -------
     matplotlib.colors.ListedColormap
     """
+    rgbs = _read_ncl_colormap_file(name)
+    if rgbs is None:
+        return None
+    return mcolors.ListedColormap(rgbs, name)
+
+
+@functools.lru_cache(maxsize=None)
+def _read_ncl_colormap_file(name) -> Optional[np.ndarray]:
+    """
+    Read RGB array (n, 3) of a NCL colormap file once for each process.
+    The array is read-only and shared by all colormaps created from the file.
+    """
     color_map_path = None
 
     ref = importlib.resources.files("cedarkit.maps") / "resources/colormap/ncl"
@@ -93,8 +108,8 @@ def _get_raw_ncl_colormap(name) -> Optional[mcolors.ListedColormap]:
         buff = f.read()
         r = prog.findall(buff)
         rgbs = np.asarray(r, dtype="i4") / 255
-        color_map = mcolors.ListedColormap(rgbs, name)
-        return color_map
+        rgbs.flags.writeable = False
+        return rgbs
 
 
 def generate_colormap_using_ncl_colors(color_names: List[str], name: str) -> mcolors.ListedColormap:
@@ -123,7 +138,80 @@ def generate_colormap_using_ncl_colors(color_names: List[str], name: str) -> mco
                 rgbs.append([1, 1, 1, 1])
                 continue
             color_record = df[df["name"] == color_name].iloc[0]
-            rgbs.append(color_record[["R", "G", "B"]].values/255)
+            rgbs.append([*(color_record[["R", "G", "B"]].values / 255), 1])
 
-        color_map = mcolors.ListedColormap(rgbs, name)
+        color_map = mcolors.ListedColormap(np.array(rgbs, dtype=float), name)
         return color_map
+
+
+def get_continuous_cmap(cmap: Optional[Any]) -> mcolors.Colormap:
+    """
+    Get continuous colormap used with ``vmin`` and ``vmax``, such as image styles without levels.
+
+    Parameters
+    ----------
+    cmap
+        colormap, colormap name or color list. Default is ``rcParams["image.cmap"]``.
+
+    Returns
+    -------
+    mcolors.Colormap
+    """
+    if isinstance(cmap, (list, tuple)):
+        return mcolors.ListedColormap(list(cmap))
+    return mpl.colormaps.get_cmap(cmap)
+
+
+def get_discrete_cmap(
+        cmap: Optional[Any],
+        levels: np.ndarray,
+        extend: str = "both",
+) -> Tuple[mcolors.Colormap, mcolors.BoundaryNorm]:
+    """
+    Build discrete colormap and norm for filled contours in the same way as ``xarray`` contourf plot,
+    so that contours drawn by ``graph.add_contour_geometry`` have the same colors as ``graph.add_contourf``.
+    Styles cache the result, see ``style.ContourStyle.get_colormap_norm``.
+
+    Parameters
+    ----------
+    cmap
+        colormap, colormap name, color name or color list. Default is ``rcParams["image.cmap"]``.
+        A color list is repeated or truncated to the number of colors.
+    levels
+    extend
+
+    Returns
+    -------
+    Tuple[mcolors.Colormap, mcolors.BoundaryNorm]
+    """
+    if len(levels) == 1:
+        levels = [levels[0], levels[0]]
+    ext_n = {"both": 2, "min": 1, "max": 1}.get(extend, 0)
+    n_colors = len(levels) + ext_n - 1
+
+    if cmap is None:
+        cmap = mpl.rcParams["image.cmap"]
+    colors_index = np.linspace(0, 1, n_colors)
+    if isinstance(cmap, (list, tuple)):
+        # expand or truncate color list to n_colors
+        colors = mcolors.ListedColormap(list(itertools.islice(itertools.cycle(cmap), n_colors)))(colors_index)
+    elif isinstance(cmap, str):
+        if cmap in mpl.colormaps:
+            colors = mpl.colormaps[cmap](colors_index)
+        else:
+            # a single color name
+            colors = mcolors.ListedColormap([cmap] * n_colors)(colors_index)
+    else:
+        colors = cmap(colors_index)
+
+    new_cmap, norm = mcolors.from_levels_and_colors(levels, colors, extend=extend)
+    if isinstance(cmap, mcolors.Colormap):
+        # keep bad, under and over colors set on the colormap.
+        under = cmap(-np.inf)
+        if under == cmap(0):
+            under = None
+        over = cmap(np.inf)
+        if over == cmap(cmap.N - 1):
+            over = None
+        new_cmap = new_cmap.with_extremes(bad=cmap(np.nan), under=under, over=over)
+    return new_cmap, norm
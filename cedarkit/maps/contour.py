@@ -0,0 +1,711 @@
+"""
+Contour path generation using contourpy directly.
+
+Paths generated here are identical to those created by ``matplotlib.contour.QuadContourSet``,
+so they can replace paths of an existing contour set or build new contour artists without re-running
+the whole matplotlib/xarray plotting pipeline.
+
+``ContourGeometry`` keeps contourpy output in data coordinates (lon/lat for map fields), which can be
+exported (see ``cedarkit.maps.export``) and drawn without contouring again.
+"""
+from dataclasses import dataclass
+from typing import List, Optional, Tuple, Dict, Any, Union
+
+import numpy as np
+import numpy.ma as ma
+import xarray as xr
+import matplotlib as mpl
+import matplotlib.path as mpath
+import contourpy
+import shapely
+
+
+def get_field_xyz(field: xr.DataArray) -> Tuple[np.ndarray, np.ndarray, ma.MaskedArray]:
+    """
+    Get x, y coordinates and masked values from a 2D field.
+    The last dimension is x (longitude) and the second last dimension is y (latitude).
+
+    Parameters
+    ----------
+    field
+
+    Returns
+    -------
+    Tuple[np.ndarray, np.ndarray, ma.MaskedArray]
+    """
+    x = np.asarray(field[field.dims[-1]].values, dtype=float)
+    y = np.asarray(field[field.dims[-2]].values, dtype=float)
+    z = ma.masked_invalid(np.asarray(field.values), copy=False)
+    return x, y, z
+
+
+def get_extended_levels(levels: np.ndarray, extend: str = "neither") -> np.ndarray:
+    """
+    Add extended levels as ``matplotlib.contour.ContourSet`` does for filled contours.
+    """
+    levels = list(levels)
+    if extend in ("both", "min"):
+        levels.insert(0, -1e250)
+    if extend in ("both", "max"):
+        levels.append(1e250)
+    return np.asarray(levels, dtype=float)
+
+
+def get_lowers_and_uppers(levels: np.ndarray, zmin: float, extend: str = "neither") -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Lower and upper bounds of each filled contour band.
+    """
+    extended_levels = get_extended_levels(levels, extend=extend)
+    lowers = extended_levels[:-1].copy()
+    if zmin == lowers[0]:
+        # Include minimum values in lowest interval
+        lowers[0] -= 1
+    uppers = extended_levels[1:]
+    return lowers, uppers
+
+
+@dataclass
+class ContourGeneratorOption:
+    """
+    contourpy contour generator options.
+
+    Chunking splits the grid into chunks which are contoured separately. Contour lines and polygons are
+    split at chunk boundaries. Contour lines look the same, but antialiased filled contours may show faint
+    seams along chunk boundaries. The ``threaded`` algorithm contours chunks in several threads.
+
+    Attributes
+    ----------
+    algorithm
+        contourpy algorithm name: serial, threaded, mpl2014 or mpl2005. Default is ``rcParams["contour.algorithm"]``.
+    corner_mask
+        default is ``rcParams["contour.corner_mask"]``, or False for mpl2005.
+    chunk_size
+        chunk size in (y, x) directions, or the same size in both directions.
+    chunk_count
+        chunk count in (y, x) directions, or the same count in both directions.
+    total_chunk_count
+        total chunk count. Only one of ``chunk_size``, ``chunk_count`` and ``total_chunk_count`` should be set.
+        If none of them is set, the threaded algorithm uses one chunk for each thread.
+    thread_count
+        thread count of the threaded algorithm, 0 for all available cores (``contourpy.max_threads()``).
+    """
+    algorithm: Optional[str] = None
+    corner_mask: Optional[bool] = None
+    chunk_size: Optional[Union[int, Tuple[int, int]]] = None
+    chunk_count: Optional[Union[int, Tuple[int, int]]] = None
+    total_chunk_count: Optional[int] = None
+    thread_count: int = 0
+
+    def get_generator_kwargs(self) -> Dict[str, Any]:
+        """
+        Keyword arguments for ``contourpy.contour_generator``.
+        """
+        algorithm = self.algorithm
+        if algorithm is None:
+            algorithm = mpl.rcParams["contour.algorithm"]
+        corner_mask = self.corner_mask
+        if corner_mask is None:
+            corner_mask = False if algorithm == "mpl2005" else mpl.rcParams["contour.corner_mask"]
+
+        kwargs = dict(name=algorithm, corner_mask=corner_mask)
+        if self.chunk_size is not None:
+            kwargs["chunk_size"] = self.chunk_size
+        elif self.chunk_count is not None:
+            kwargs["chunk_count"] = self.chunk_count
+        elif self.total_chunk_count is not None:
+            kwargs["total_chunk_count"] = self.total_chunk_count
+
+        if algorithm == "threaded":
+            thread_count = self.thread_count
+            if thread_count <= 0:
+                thread_count = contourpy.max_threads()
+            kwargs["thread_count"] = thread_count
+            if self.chunk_size is None and self.chunk_count is None and self.total_chunk_count is None:
+                # threads work on chunks, a single chunk is contoured in one thread.
+                kwargs["total_chunk_count"] = thread_count
+        return kwargs
+
+
+def create_contour_generator(
+        x: np.ndarray,
+        y: np.ndarray,
+        z: ma.MaskedArray,
+        algorithm: Optional[str] = None,
+        corner_mask: Optional[bool] = None,
+        chunk_size: int = 0,
+        option: Optional[ContourGeneratorOption] = None,
+) -> contourpy.ContourGenerator:
+    """
+    Create contourpy contour generator with the same options as matplotlib.
+
+    Parameters
+    ----------
+    x
+    y
+    z
+    algorithm
+        contourpy algorithm name, default is ``rcParams["contour.algorithm"]``.
+    corner_mask
+        default is ``rcParams["contour.corner_mask"]``, or False for mpl2005.
+    chunk_size
+    option
+        generator options. ``algorithm``, ``corner_mask`` and ``chunk_size`` are ignored if set.
+
+    Returns
+    -------
+    contourpy.ContourGenerator
+    """
+    if option is None:
+        option = ContourGeneratorOption(algorithm=algorithm, corner_mask=corner_mask, chunk_size=chunk_size)
+
+    return contourpy.contour_generator(
+        x, y, z,
+        line_type=contourpy.LineType.SeparateCode,
+        fill_type=contourpy.FillType.OuterCode,
+        **option.get_generator_kwargs(),
+    )
+
+
+@dataclass
+class ContourGeometry:
+    """
+    Contour lines or filled contour polygons of a field, in field coordinates.
+
+    Segments and kinds are the same as ``allsegs`` and ``allkinds`` of ``matplotlib.contour.ContourSet``:
+
+    * filled: one item for each level band, each polygon is an array of vertices of its outer ring and holes.
+    * lines: one item for each level, each line is an array of vertices.
+
+    Attributes
+    ----------
+    levels
+        contour levels without extended levels.
+    filled
+    extend
+        "neither", "min", "max" or "both". Bands below the first level or above the last level are added
+        for filled contours.
+    segments
+        vertices list of each level or level band.
+    kinds
+        path codes list of each level or level band.
+    """
+    levels: np.ndarray
+    filled: bool
+    extend: str
+    segments: List[List[np.ndarray]]
+    kinds: List[List[np.ndarray]]
+
+    @property
+    def extended_levels(self) -> np.ndarray:
+        if self.filled:
+            return get_extended_levels(self.levels, extend=self.extend)
+        return np.asarray(self.levels, dtype=float)
+
+    @property
+    def paths(self) -> List[mpath.Path]:
+        """
+        One compound path for each level or level band, same as paths of ``ContourSet``.
+        """
+        empty_path = mpath.Path(np.empty((0, 2)))
+        return [
+            mpath.Path(np.concatenate(vs), np.concatenate(cs)) if len(vs) else empty_path
+            for vs, cs in zip(self.segments, self.kinds)
+        ]
+
+    @property
+    def is_empty(self) -> bool:
+        return all(len(segments) == 0 for segments in self.segments)
+
+    def select(
+            self,
+            extent: Tuple[float, float, float, float],
+            x_period: Optional[float] = None,
+    ) -> "ContourGeometry":
+        """
+        Contour geometry with only lines and polygons whose bounding boxes intersect ``extent``.
+        Paths are not cut, so the result is drawn the same as the whole geometry in a map box with this extent.
+
+        Parameters
+        ----------
+        extent
+            (x_min, x_max, y_min, y_max) in geometry coordinates.
+        x_period
+            period of x coordinates, such as 360 for longitudes. Paths intersecting ``extent`` shifted by
+            one period are also kept, such as paths of a 0..360 field in a map box with negative longitudes.
+
+        Returns
+        -------
+        ContourGeometry
+        """
+        x_min, x_max, y_min, y_max = extent
+        x_shifts = [0] if x_period is None else [0, -x_period, x_period]
+        segments = []
+        kinds = []
+        for level_segments, level_kinds in zip(self.segments, self.kinds):
+            if len(level_segments) == 0:
+                segments.append(level_segments)
+                kinds.append(level_kinds)
+                continue
+            starts = np.cumsum([0] + [len(vertices) for vertices in level_segments[:-1]])
+            vertices = np.concatenate(level_segments)
+            lower = np.minimum.reduceat(vertices, starts)
+            upper = np.maximum.reduceat(vertices, starts)
+            mask = (lower[:, 1] <= y_max) & (upper[:, 1] >= y_min)
+            x_mask = np.zeros(len(mask), dtype=bool)
+            for x_shift in x_shifts:
+                x_mask |= (lower[:, 0] <= x_max + x_shift) & (upper[:, 0] >= x_min + x_shift)
+            keep = np.flatnonzero(mask & x_mask)
+            segments.append([level_segments[i] for i in keep])
+            kinds.append([level_kinds[i] for i in keep])
+        return ContourGeometry(
+            levels=self.levels,
+            filled=self.filled,
+            extend=self.extend,
+            segments=segments,
+            kinds=kinds,
+        )
+
+    def get_properties(self, index: int) -> Dict[str, Any]:
+        """
+        Feature properties of a level (``level``) or level band (``lower`` and ``upper``).
+        Infinite bounds of extended bands are None.
+        """
+        levels = self.extended_levels
+        if not self.filled:
+            return dict(index=index, level=float(levels[index]))
+        lower = float(levels[index])
+        upper = float(levels[index + 1])
+        return dict(
+            index=index,
+            lower=None if abs(lower) >= 1e250 else lower,
+            upper=None if abs(upper) >= 1e250 else upper,
+        )
+
+    def to_shapely(self) -> List[Optional["shapely.Geometry"]]:
+        """
+        Convert to shapely geometries, one ``MultiPolygon`` (filled) or ``MultiLineString`` (lines)
+        for each level or level band. Levels without contours are None.
+
+        Returns
+        -------
+        List[Optional[shapely.Geometry]]
+        """
+        return [
+            _to_shapely(segments, kinds, filled=self.filled) if len(segments) > 0 else None
+            for segments, kinds in zip(self.segments, self.kinds)
+        ]
+
+    def to_features(self) -> List[Tuple["shapely.Geometry", Dict[str, Any]]]:
+        """
+        Geometry and properties of each non-empty level or level band.
+
+        Returns
+        -------
+        List[Tuple[shapely.Geometry, Dict[str, Any]]]
+        """
+        return [
+            (geometry, self.get_properties(index))
+            for index, geometry in enumerate(self.to_shapely())
+            if geometry is not None
+        ]
+
+
+def _to_shapely(segments: List[np.ndarray], kinds: List[np.ndarray], filled: bool) -> "shapely.Geometry":
+    if not filled:
+        line_ids = np.repeat(np.arange(len(segments)), [len(vertices) for vertices in segments])
+        lines = shapely.linestrings(np.concatenate(segments), indices=line_ids)
+        return shapely.MultiLineString(list(lines))
+
+    polygons = []
+    for vertices, codes in zip(segments, kinds):
+        starts = np.flatnonzero(codes == mpath.Path.MOVETO)
+        rings = np.split(vertices, starts[1:])
+        polygons.append(shapely.Polygon(rings[0], rings[1:]))
+    return shapely.MultiPolygon(polygons)
+
+
+def generate_contour_geometry(
+        x: np.ndarray,
+        y: np.ndarray,
+        z: ma.MaskedArray,
+        levels: np.ndarray,
+        filled: bool,
+        extend: str = "neither",
+        algorithm: Optional[str] = None,
+        corner_mask: Optional[bool] = None,
+        chunk_size: int = 0,
+        option: Optional[ContourGeneratorOption] = None,
+) -> ContourGeometry:
+    """
+    Generate contour lines for each level or filled contours for each level band.
+
+    Parameters
+    ----------
+    x
+    y
+    z
+    levels
+        contour levels without extended levels.
+    filled
+    extend
+        "neither", "min", "max" or "both". Only used for filled contours.
+    algorithm
+    corner_mask
+    chunk_size
+    option
+        contour generator options, see ``create_contour_generator``.
+
+    Returns
+    -------
+    ContourGeometry
+    """
+    generator = create_contour_generator(
+        x, y, z,
+        algorithm=algorithm,
+        corner_mask=corner_mask,
+        chunk_size=chunk_size,
+        option=option,
+    )
+
+    if filled:
+        zmin = z.min()
+        zmin = np.nan if zmin is ma.masked else float(zmin)
+        lowers, uppers = get_lowers_and_uppers(levels, zmin=zmin, extend=extend)
+        vertices_and_codes = list(map(generator.create_filled_contour, lowers, uppers))
+    else:
+        extend = "neither"
+        vertices_and_codes = list(map(generator.create_contour, levels))
+
+    return ContourGeometry(
+        levels=np.asarray(levels, dtype=float),
+        filled=filled,
+        extend=extend,
+        segments=[vs for vs, _ in vertices_and_codes],
+        kinds=[cs for _, cs in vertices_and_codes],
+    )
+
+
+def compute_contour_geometry(
+        field: xr.DataArray,
+        levels: np.ndarray,
+        filled: bool,
+        extend: str = "both",
+        algorithm: Optional[str] = None,
+        corner_mask: Optional[bool] = None,
+        option: Optional[ContourGeneratorOption] = None,
+) -> ContourGeometry:
+    """
+    Compute contour geometry of a 2D field without any axes. Default ``extend`` is the same as ``add_contourf``.
+
+    Parameters
+    ----------
+    field
+    levels
+    filled
+    extend
+    algorithm
+    corner_mask
+    option
+        contour generator options, see ``create_contour_generator``.
+
+    Returns
+    -------
+    ContourGeometry
+    """
+    x, y, z = get_field_xyz(field)
+    return generate_contour_geometry(
+        x, y, z,
+        levels=np.asarray(levels, dtype=float),
+        filled=filled,
+        extend=extend,
+        algorithm=algorithm,
+        corner_mask=corner_mask,
+        option=option,
+    )
+
+
+def generate_contour_paths(
+        x: np.ndarray,
+        y: np.ndarray,
+        z: ma.MaskedArray,
+        levels: np.ndarray,
+        filled: bool,
+        extend: str = "neither",
+        algorithm: Optional[str] = None,
+        corner_mask: Optional[bool] = None,
+        chunk_size: int = 0,
+        option: Optional[ContourGeneratorOption] = None,
+) -> List[mpath.Path]:
+    """
+    Generate one compound path for each contour level (lines) or each level band (filled).
+    See ``generate_contour_geometry`` for parameters.
+
+    Returns
+    -------
+    List[mpath.Path]
+    """
+    return generate_contour_geometry(
+        x, y, z,
+        levels=levels,
+        filled=filled,
+        extend=extend,
+        algorithm=algorithm,
+        corner_mask=corner_mask,
+        chunk_size=chunk_size,
+        option=option,
+    ).paths
+
+
+def count_vertices(paths: List[mpath.Path]) -> int:
+    """
+    Total vertex count of paths.
+    """
+    return sum(len(path.vertices) for path in paths)
+
+
+def simplify_path(path: mpath.Path, tolerance: float) -> mpath.Path:
+    """
+    Simplify each line or ring in a contour path with Douglas-Peucker algorithm (``shapely.simplify``).
+
+    Lines are separated by MOVETO codes, and closed rings ending with CLOSEPOLY are kept closed.
+    Rings collapsed to less than 4 vertices are removed, which are smaller than ``tolerance``.
+
+    Parameters
+    ----------
+    path
+    tolerance
+        max distance between original and simplified lines, in path coordinates.
+
+    Returns
+    -------
+    mpath.Path
+    """
+    vertices = path.vertices
+    codes = path.codes
+    if len(vertices) < 3 or tolerance <= 0:
+        return path
+    if codes is None:
+        codes = np.full(len(vertices), mpath.Path.LINETO, dtype=mpath.Path.code_type)
+        codes[0] = mpath.Path.MOVETO
+
+    starts = np.flatnonzero(codes == mpath.Path.MOVETO)
+    if len(starts) == 0 or starts[0] != 0:
+        starts = np.insert(starts, 0, 0)
+    sizes = np.diff(np.append(starts, len(vertices)))
+    closed = codes[np.append(starts[1:], len(vertices)) - 1] == mpath.Path.CLOSEPOLY
+
+    # shapely line strings need at least 2 points, single points are kept unchanged.
+    valid = sizes >= 2
+    part_ids = np.repeat(np.arange(len(sizes)), sizes)
+    valid_vertex = valid[part_ids]
+    lines = shapely.linestrings(vertices[valid_vertex], indices=part_ids[valid_vertex])
+    simplified = shapely.simplify(lines, tolerance, preserve_topology=False)
+    new_vertices, line_index = shapely.get_coordinates(simplified, return_index=True)
+    new_sizes = np.bincount(line_index, minlength=len(lines))
+
+    valid_parts = np.flatnonzero(valid)
+    keep = (new_sizes >= 4) | ((new_sizes >= 2) & ~closed[valid_parts])
+    vertex_keep = keep[line_index]
+    new_vertices = new_vertices[vertex_keep]
+    new_sizes = new_sizes[keep]
+    new_closed = closed[valid_parts][keep]
+
+    new_codes = np.full(len(new_vertices), mpath.Path.LINETO, dtype=mpath.Path.code_type)
+    ends = np.cumsum(new_sizes)
+    new_codes[ends - new_sizes] = mpath.Path.MOVETO
+    new_codes[ends[new_closed] - 1] = mpath.Path.CLOSEPOLY
+
+    single = np.flatnonzero(~valid)
+    if len(single) > 0:
+        new_vertices = np.concatenate([new_vertices, vertices[starts[single]]])
+        new_codes = np.concatenate([new_codes, np.full(len(single), mpath.Path.MOVETO, dtype=mpath.Path.code_type)])
+
+    if len(new_vertices) == 0:
+        return mpath.Path(np.empty((0, 2)))
+    return mpath.Path(new_vertices, new_codes)
+
+
+def simplify_filled_paths(paths: List[mpath.Path], tolerance: float) -> List[mpath.Path]:
+    """
+    Simplify filled contour paths of all level bands together, so that edges shared by adjacent bands
+    stay shared and no gaps or overlaps are created.
+
+    Bands are converted to polygons and simplified as a polygonal coverage (``shapely.coverage_simplify``,
+    shapely 2.1 or later), and the outer boundary of all bands is kept. With older shapely, each polygon
+    is simplified with ``preserve_topology=True``, which keeps each band valid but may not keep shared edges.
+    Islands with area less than ``tolerance ** 2`` are removed from their bands, and the holes around them
+    in surrounding bands are filled.
+
+    Parameters
+    ----------
+    paths
+        one compound path for each level band.
+    tolerance
+        simplification tolerance in path coordinates.
+
+    Returns
+    -------
+    List[mpath.Path]
+    """
+    if tolerance <= 0:
+        return list(paths)
+    bands = [_get_path_rings(path) for path in paths]
+
+    # small islands and the holes around them, matched by ring bounds. Unmatched small rings are kept,
+    # such as polygons at field boundary and holes around masked areas.
+    min_area = tolerance ** 2
+    small_rings = [set(), set()]
+    band_keys = []
+    for band in bands:
+        if band is None:
+            band_keys.append(None)
+            continue
+        rings, shells, _ = band
+        small = shapely.area(shapely.polygons(rings)) < min_area
+        keys = [tuple(bounds) if is_small else None for bounds, is_small in zip(shapely.bounds(rings), small)]
+        for key, is_shell in zip(keys, shells):
+            if key is not None:
+                small_rings[int(is_shell)].add(key)
+        band_keys.append(keys)
+    removed = small_rings[0] & small_rings[1]
+
+    simplified = list(paths)
+    non_empty = []
+    polygons = []
+    for index, (band, keys) in enumerate(zip(bands, band_keys)):
+        if band is None:
+            continue
+        band_polygons = _get_polygons(*band[:2], [key is not None and key in removed for key in keys])
+        if len(band_polygons) == 0:
+            simplified[index] = mpath.Path(np.empty((0, 2)))
+        else:
+            non_empty.append(index)
+            polygons.append(shapely.MultiPolygon(band_polygons))
+    if len(non_empty) == 0:
+        return simplified
+
+    geometries = np.array(polygons, dtype=object)
+    if hasattr(shapely, "coverage_simplify"):
+        # keep outer boundary of the field
+        geometries = shapely.coverage_simplify(geometries, tolerance, simplify_boundary=False)
+    else:
+        geometries = shapely.simplify(geometries, tolerance, preserve_topology=True)
+
+    for index, geometry in zip(non_empty, geometries):
+        simplified[index] = _polygons_to_path(geometry, exterior_ccw=bands[index][2])
+    return simplified
+
+
+def _get_path_rings(path: mpath.Path) -> Optional[Tuple[np.ndarray, np.ndarray, bool]]:
+    """
+    Rings of a filled contour path, whether each ring is an exterior ring, and whether exterior rings are
+    counterclockwise. Each exterior ring is followed by its holes, which have the opposite orientation.
+    None if the path has no rings.
+    """
+    vertices = path.vertices
+    codes = path.codes
+    if len(vertices) == 0 or codes is None:
+        return None
+    ring_ids = np.cumsum(codes == mpath.Path.MOVETO) - 1
+    # vertices of CLOSEPOLY are ignored by matplotlib
+    points = codes != mpath.Path.CLOSEPOLY
+    sizes = np.bincount(ring_ids[points], minlength=ring_ids[-1] + 1)
+    points &= (sizes >= 3)[ring_ids]
+    if not np.any(points):
+        return None
+    rings = shapely.linearrings(vertices[points], indices=ring_ids[points])
+    ccw = shapely.is_ccw(rings)
+    return rings, ccw == ccw[0], bool(ccw[0])
+
+
+def _get_polygons(rings: np.ndarray, shells: np.ndarray, removed: List[bool]) -> List[shapely.Polygon]:
+    """
+    Polygons of rings from ``_get_path_rings``. Removed exterior rings are removed with their holes.
+    """
+    polygons = []
+    shell = None
+    holes = []
+    for ring, is_shell, is_removed in zip(rings, shells, removed):
+        if is_shell:
+            if shell is not None:
+                polygons.append(shapely.Polygon(shell, holes))
+            shell = None if is_removed else ring
+            holes = []
+        elif shell is not None and not is_removed:
+            holes.append(ring)
+    if shell is not None:
+        polygons.append(shapely.Polygon(shell, holes))
+    return polygons
+
+
+def _polygons_to_path(geometry: shapely.Geometry, exterior_ccw: bool) -> mpath.Path:
+    polygons = shapely.get_parts(geometry)
+    polygons = polygons[~shapely.is_empty(polygons)]
+    if len(polygons) == 0:
+        return mpath.Path(np.empty((0, 2)))
+    polygons = [shapely.geometry.polygon.orient(polygon, sign=1.0 if exterior_ccw else -1.0) for polygon in polygons]
+    vertices, ring_index = shapely.get_coordinates(shapely.get_rings(polygons), return_index=True)
+    sizes = np.bincount(ring_index)
+    keep = sizes >= 4
+    vertices = vertices[keep[ring_index]]
+    sizes = sizes[keep]
+    if len(vertices) == 0:
+        return mpath.Path(np.empty((0, 2)))
+
+    codes = np.full(len(vertices), mpath.Path.LINETO, dtype=mpath.Path.code_type)
+    ends = np.cumsum(sizes)
+    codes[ends - sizes] = mpath.Path.MOVETO
+    codes[ends - 1] = mpath.Path.CLOSEPOLY
+    return mpath.Path(vertices, codes)
+
+
+def simplify_paths(
+        paths: List[mpath.Path],
+        tolerance: float,
+        vertex_budget: Optional[int] = None,
+        max_iterations: int = 8,
+        filled: bool = False,
+) -> Tuple[List[mpath.Path], float]:
+    """
+    Simplify contour paths with ``tolerance``. If ``vertex_budget`` is set, tolerance is doubled until
+    total vertex count is within budget, ``max_iterations`` is reached, or doubling tolerance removes
+    less than 1% of vertices. Original paths are simplified with the new tolerance in each iteration,
+    so errors don't accumulate.
+
+    Parameters
+    ----------
+    paths
+    tolerance
+    vertex_budget
+        max total vertex count.
+    max_iterations
+    filled
+        paths are filled contour level bands, which are simplified together, see ``simplify_filled_paths``.
+        Otherwise each line or ring is simplified separately, see ``simplify_path``.
+
+    Returns
+    -------
+    Tuple[List[mpath.Path], float]
+        simplified paths and the tolerance used.
+    """
+    def simplify(tolerance: float) -> List[mpath.Path]:
+        if filled:
+            return simplify_filled_paths(paths, tolerance)
+        return [simplify_path(path, tolerance) for path in paths]
+
+    simplified = simplify(tolerance)
+    vertex_count = count_vertices(simplified)
+    iteration = 1
+    while (
+            vertex_budget is not None
+            and vertex_count > vertex_budget
+            and iteration < max_iterations
+    ):
+        new_simplified = simplify(tolerance * 2)
+        new_vertex_count = count_vertices(new_simplified)
+        if new_vertex_count > vertex_count * 0.99:
+            break
+        simplified, vertex_count = new_simplified, new_vertex_count
+        tolerance *= 2
+        iteration += 1
+    return simplified, tolerance
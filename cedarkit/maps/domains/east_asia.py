@@ -4,7 +4,7 @@ import numpy as np
 from cartopy import crs as ccrs
 
 from cedarkit.maps.chart.layer import Layer
-from cedarkit.maps.map import get_map_loader_class, MapType, MapLoader
+from cedarkit.maps.map import get_map_loader_class, get_map_loader, MapType, MapLoader
 from cedarkit.maps.util import (
     AxesRect,
     AreaRange,
@@ -112,14 +112,14 @@ class EastAsiaMapTemplate(MapTemplate):
         """
         create map loader and map painter.
         """
-        self.main_map_loader = self.map_loader_class(map_type=MapType.Portrait)
-        self.sub_map_loader = self.map_loader_class(map_type=MapType.SouthChinaSea)
+        self.main_map_loader = get_map_loader(MapType.Portrait, map_loader_class=self.map_loader_class)
+        self.sub_map_loader = get_map_loader(MapType.SouthChinaSea, map_loader_class=self.map_loader_class)
 
         self.main_map_painter = MapPainter(
             map_loader=self.main_map_loader,
             coastline_config=MapFeatureConfig(
                 loader=dict(
-                    scale="50m",
+                    scale="auto",
                     style=dict(
                         linewidth=0.5,
                         # zorder=50
@@ -129,7 +129,7 @@ class EastAsiaMapTemplate(MapTemplate):
             ),
             lakes_config=MapFeatureConfig(
                 loader=dict(
-                    scale="50m",
+                    scale="auto",
                     style=dict(
                         linewidth=0.25,
                         facecolor='none',
@@ -155,7 +155,7 @@ class EastAsiaMapTemplate(MapTemplate):
             map_loader=self.sub_map_loader,
             coastline_config=MapFeatureConfig(
                 loader=dict(
-                    scale="50m",
+                    scale="auto",
                     style=dict(
                         linewidth=0.25,
                         # zorder=50
@@ -1,4 +1,4 @@
-from typing import TYPE_CHECKING
+from typing import Optional, List, TYPE_CHECKING
 
 import numpy as np
 import pandas as pd
@@ -150,7 +150,7 @@ class EnsCNMapTemplate(MapTemplate):
         add_common_map_feature(
             ax,
             coastline=dict(
-                scale="50m",
+                scale="auto",
                 style=dict(
                     linewidth=0.5,
                     # zorder=50
@@ -269,15 +269,19 @@ class EnsCNMapTemplate(MapTemplate):
             color="black",
         )
 
-    def add_colorbar(self, panel: "Panel", style: ContourStyle):
+    def add_colorbar(self, panel: "Panel", style: ContourStyle, levels: Optional[List] = None):
         ax = panel.main_box_ax
 
         #  (left, bottom, width, height)
         colorbar_box = [1.05, 0.02, 0.02, 1]
 
+        if levels is None:
+            levels = style.levels
+        _, colormap, norm = style.get_colormap_norm(levels)
         graph_colorbar = GraphColorbar(
-            colormap=style.colors,
-            levels=style.levels,
+            colormap=colormap,
+            levels=levels,
+            norm=norm,
             box=colorbar_box,
         )
 
@@ -1,11 +1,11 @@
-from typing import Optional, TYPE_CHECKING
+from typing import Optional, List, Union, TYPE_CHECKING
 
 import numpy as np
 import pandas as pd
 from cartopy import crs as ccrs
 
 from cedarkit.maps.chart import Layer
-from cedarkit.maps.map import get_map_loader_class, MapType, MapLoader
+from cedarkit.maps.map import get_map_loader_class, get_map_loader, MapType, MapLoader
 from cedarkit.maps.util import (
     AxesRect,
     GraphTitle,
@@ -87,13 +87,13 @@ class GlobalMapTemplate(MapTemplate):
         # )
 
     def load_map(self):
-        self.main_map_loader = self.map_loader_class(map_type=MapType.Portrait)
+        self.main_map_loader = get_map_loader(MapType.Portrait, map_loader_class=self.map_loader_class)
 
         self.main_map_painter = MapPainter(
             map_loader=self.main_map_loader,
             coastline_config=MapFeatureConfig(
                 loader=dict(
-                    scale="50m",
+                    scale="auto",
                     style=dict(
                         linewidth=0.5,
                         # zorder=50
@@ -103,7 +103,7 @@ class GlobalMapTemplate(MapTemplate):
             ),
             land_config=MapFeatureConfig(
                 loader=dict(
-                    scale="50m",
+                    scale="auto",
                     style=dict(
                         zorder=-1
                     )
@@ -200,17 +200,16 @@ class GlobalMapTemplate(MapTemplate):
             left=True,
         )
 
-    def set_title(
+    def create_graph_title(
             self,
-            panel: "Panel",
             graph_name: str,
             system_name: str,
             start_time: pd.Timestamp,
             forecast_time: pd.Timedelta
-    ):
+    ) -> GraphTitle:
         """
-        设置图表标题。
-        
+        生成图表标题文本。
+
         GlobalMapTemplate 使用不同的标题格式，重写基类方法。
         """
         graph_title = GraphTitle()
@@ -221,7 +220,29 @@ class GlobalMapTemplate(MapTemplate):
         graph_title.top_left_label = f"{start_time_label} UTC Forecast t+{forecast_hour:03d}"
         graph_title.main_title_label = graph_name
 
-        self._add_title_to_panel(panel=panel, graph_title=graph_title)
+        return graph_title
+
+    def create_graph_titles(
+            self,
+            graph_name: str,
+            system_name: str,
+            start_time: pd.Timestamp,
+            forecast_times: Union[pd.TimedeltaIndex, List[pd.Timedelta]],
+    ) -> List[GraphTitle]:
+        """
+        批量生成图表标题文本，格式与 ``create_graph_title`` 相同。
+        """
+        forecast_times = pd.TimedeltaIndex(forecast_times)
+        start_time_label = start_time.strftime("%Y%m%d%H")
+        forecast_hours = np.trunc(forecast_times / pd.Timedelta(hours=1)).astype(int)
+        return [
+            GraphTitle(
+                top_left_label=f"{start_time_label} UTC Forecast t+{forecast_hour:03d}",
+                top_right_label=system_name,
+                main_title_label=graph_name,
+            )
+            for forecast_hour in forecast_hours
+        ]
 
 
 class GlobalAreaMapTemplate(GlobalMapTemplate):
@@ -236,14 +257,14 @@ class GlobalAreaMapTemplate(GlobalMapTemplate):
         self.main_yticks_interval = 10
 
     def load_map(self):
-        self.main_map_loader = self.map_loader_class(map_type=self.main_map_type)
-        self.china_map = self.map_loader_class(map_type=MapType.Portrait)
+        self.main_map_loader = get_map_loader(self.main_map_type, map_loader_class=self.map_loader_class)
+        self.china_map = get_map_loader(MapType.Portrait, map_loader_class=self.map_loader_class)
 
         self.main_map_painter = MapPainter(
             map_loader=self.main_map_loader,
             coastline_config=MapFeatureConfig(
                 loader=dict(
-                    scale="50m",
+                    scale="auto",
                     style=dict(
                         linewidth=0.5,
                         # zorder=50
@@ -1,10 +1,11 @@
 from typing import List, Optional, Union, Tuple, TYPE_CHECKING
 
 import pandas as pd
+import matplotlib.text
 import cartopy.crs as ccrs
 
-from cedarkit.maps.style import ContourStyle
-from cedarkit.maps.util import AreaRange, GraphTitle, fill_graph_title
+from cedarkit.maps.style import ContourStyle, ImageStyle
+from cedarkit.maps.util import AreaRange, GraphTitle, fill_graph_title, fill_graph_titles
 from cedarkit.maps.template import XYTemplate
 
 if TYPE_CHECKING:
@@ -98,6 +99,44 @@ class MapTemplate(XYTemplate):
             起报时间
         forecast_time : pd.Timedelta
             预报时效
+
+        Returns
+        -------
+        List[matplotlib.text.Text]
+            标题文本对象列表
+        """
+        graph_title = self.create_graph_title(
+            graph_name=graph_name,
+            system_name=system_name,
+            start_time=start_time,
+            forecast_time=forecast_time,
+        )
+        return self._add_title_to_panel(panel=panel, graph_title=graph_title)
+
+    def create_graph_title(
+            self,
+            graph_name: str,
+            system_name: str,
+            start_time: pd.Timestamp,
+            forecast_time: pd.Timedelta
+    ) -> GraphTitle:
+        """
+        生成图表标题文本，不包含位置信息。
+
+        Parameters
+        ----------
+        graph_name : str
+            图表名称
+        system_name : str
+            系统名称
+        start_time : pd.Timestamp
+            起报时间
+        forecast_time : pd.Timedelta
+            预报时效
+
+        Returns
+        -------
+        GraphTitle
         """
         graph_title = GraphTitle()
         fill_graph_title(
@@ -107,15 +146,70 @@ class MapTemplate(XYTemplate):
             start_time=start_time,
             forecast_time=forecast_time,
         )
-        self._add_title_to_panel(panel=panel, graph_title=graph_title)
+        return graph_title
 
-    def _add_title_to_panel(self, panel: "Panel", graph_title: GraphTitle):
-        self.axes_component_painter.add_title(
+    def create_graph_titles(
+            self,
+            graph_name: str,
+            system_name: str,
+            start_time: pd.Timestamp,
+            forecast_times: Union[pd.TimedeltaIndex, List[pd.Timedelta]],
+    ) -> List[GraphTitle]:
+        """
+        批量生成多个预报时效的图表标题文本，时间标签一次性计算。结果与逐个调用 ``create_graph_title`` 相同。
+
+        Parameters
+        ----------
+        graph_name : str
+            图表名称
+        system_name : str
+            系统名称
+        start_time : pd.Timestamp
+            起报时间
+        forecast_times : Union[pd.TimedeltaIndex, List[pd.Timedelta]]
+            预报时效列表
+
+        Returns
+        -------
+        List[GraphTitle]
+        """
+        return fill_graph_titles(
+            graph_name=graph_name,
+            system_name=system_name,
+            start_time=start_time,
+            forecast_times=forecast_times,
+        )
+
+    def set_graph_title(self, panel: "Panel", graph_title: GraphTitle) -> List[matplotlib.text.Text]:
+        """
+        使用已生成的标题文本设置图表标题。面板已有标题时只更新文本内容，不添加新的文本对象。
+
+        Parameters
+        ----------
+        panel : Panel
+            面板对象
+        graph_title : GraphTitle
+            标题文本，见 ``create_graph_title`` 和 ``create_graph_titles``
+
+        Returns
+        -------
+        List[matplotlib.text.Text]
+            标题文本对象列表
+        """
+        return self._add_title_to_panel(panel=panel, graph_title=graph_title)
+
+    def _add_title_to_panel(self, panel: "Panel", graph_title: GraphTitle) -> List[matplotlib.text.Text]:
+        return self.axes_component_painter.add_title(
             layer=panel.charts[0].layers[0],
             graph_title=graph_title
         )
 
-    def add_colorbar(self, panel: "Panel", style: Union[ContourStyle, List[ContourStyle]]):
+    def add_colorbar(
+            self,
+            panel: "Panel",
+            style: Union[ContourStyle, ImageStyle, List[Union[ContourStyle, ImageStyle]]],
+            levels: Optional[List] = None,
+    ):
         """
         添加色标。
         
@@ -123,8 +217,11 @@ class MapTemplate(XYTemplate):
         ----------
         panel : Panel
             面板对象
-        style : Union[ContourStyle, List[ContourStyle]]
-            等值线样式，用于确定色标的颜色和级别
+        style : Union[ContourStyle, ImageStyle, List[Union[ContourStyle, ImageStyle]]]
+            等值线或栅格样式，用于确定色标的颜色和级别
+        levels : Optional[List]
+            色标级别，自动级别样式需要设置，例如绘图结果的级别（见 ``chart.get_graph_levels``），
+            样式列表对应级别列表。默认使用样式的 ``levels``
             
         Returns
         -------
@@ -134,6 +231,7 @@ class MapTemplate(XYTemplate):
         color_bars = self.axes_component_painter.add_colorbar(
             layer=panel.charts[0].layers[0],
             style=style,
+            levels=levels,
         )
         return color_bars
 
@@ -5,7 +5,7 @@ from cartopy import crs as ccrs
 import matplotlib.path as mpath
 
 from cedarkit.maps.chart import Layer
-from cedarkit.maps.map import get_map_loader_class, MapType, MapLoader
+from cedarkit.maps.map import get_map_loader_class, get_map_loader, MapType, MapLoader
 from cedarkit.maps.util import (
     AxesRect,
     AreaRange,
@@ -81,13 +81,13 @@ class NorthPolarMapTemplate(MapTemplate):
         )
 
     def load_map(self):
-        self.main_map_loader = self.map_loader_class(map_type=MapType.Portrait)
+        self.main_map_loader = get_map_loader(MapType.Portrait, map_loader_class=self.map_loader_class)
 
         self.main_map_painter = MapPainter(
             map_loader=self.main_map_loader,
             coastline_config=MapFeatureConfig(
                 loader=dict(
-                    scale="50m",
+                    scale="auto",
                     style=dict(
                         linewidth=0.5,
                         # zorder=50
@@ -97,7 +97,7 @@ class NorthPolarMapTemplate(MapTemplate):
             ),
             lakes_config=MapFeatureConfig(
                 loader=dict(
-                    scale="50m",
+                    scale="auto",
                     style=dict(
                         linewidth=0.25,
                         facecolor='none',
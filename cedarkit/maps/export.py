@@ -0,0 +1,215 @@
+"""
+Export contour geometry (``contour.ContourGeometry``) in lon/lat to vector formats.
+
+* GeoJSON: no additional dependency.
+* FlatGeobuf: requires ``pyogrio``.
+* Mapbox Vector Tile (MVT): requires ``mapbox-vector-tile``.
+
+Optional packages can be installed with ``pip install cedarkit-maps[export]``.
+
+Each non-empty level band (filled contours) or level (contour lines) is one feature with properties:
+
+* filled: ``index``, ``lower``, ``upper`` (None for extended bands)
+* lines: ``index``, ``level``
+"""
+import json
+from pathlib import Path
+from typing import Dict, Any, Union, Optional, Tuple, List
+
+import numpy as np
+import shapely
+import shapely.geometry
+
+from cedarkit.maps.contour import ContourGeometry
+
+
+WEB_MERCATOR_RADIUS = 6378137.0
+WEB_MERCATOR_MAX_LATITUDE = 85.0511287798066
+
+
+def to_geojson(geometry: ContourGeometry, precision: Optional[int] = 4) -> Dict[str, Any]:
+    """
+    Convert contour geometry to a GeoJSON FeatureCollection dict.
+
+    Parameters
+    ----------
+    geometry
+    precision
+        decimal count of coordinates, no rounding if None.
+
+    Returns
+    -------
+    Dict[str, Any]
+    """
+    features = []
+    for shape, properties in geometry.to_features():
+        if precision is not None:
+            shape = shapely.transform(shape, lambda coords: np.round(coords, precision))
+        features.append(dict(
+            type="Feature",
+            geometry=shapely.geometry.mapping(shape),
+            properties=properties,
+        ))
+    return dict(type="FeatureCollection", features=features)
+
+
+def write_geojson(geometry: ContourGeometry, path: Union[str, Path], precision: Optional[int] = 4):
+    """
+    Write contour geometry to a GeoJSON file.
+
+    Parameters
+    ----------
+    geometry
+    path
+    precision
+        decimal count of coordinates.
+    """
+    with open(path, "w") as f:
+        json.dump(to_geojson(geometry, precision=precision), f, separators=(",", ":"))
+
+
+def write_flatgeobuf(geometry: ContourGeometry, path: Union[str, Path], layer: str = "contour"):
+    """
+    Write contour geometry to a FlatGeobuf file with ``pyogrio``.
+
+    Parameters
+    ----------
+    geometry
+    path
+    layer
+        layer name.
+    """
+    try:
+        from pyogrio.raw import write
+    except ImportError as e:
+        raise ImportError("pyogrio is required to write FlatGeobuf, install it with `pip install pyogrio`") from e
+
+    features = geometry.to_features()
+    shapes = [shape for shape, _ in features]
+    properties = [p for _, p in features]
+    if geometry.filled:
+        fields = ["index", "lower", "upper"]
+        geometry_type = "MultiPolygon"
+    else:
+        fields = ["index", "level"]
+        geometry_type = "MultiLineString"
+    field_data = [
+        np.array([np.nan if p[name] is None else p[name] for p in properties], dtype=float)
+        for name in fields
+    ]
+    field_data[0] = field_data[0].astype(np.int32)
+
+    write(
+        str(path),
+        geometry=shapely.to_wkb(np.array(shapes, dtype=object)),
+        field_data=field_data,
+        fields=fields,
+        layer=layer,
+        driver="FlatGeobuf",
+        geometry_type=geometry_type,
+        crs="EPSG:4326",
+    )
+
+
+def get_tile_bounds(z: int, x: int, y: int) -> Tuple[float, float, float, float]:
+    """
+    Bounds (min x, min y, max x, max y) of an XYZ tile in Web Mercator (EPSG:3857) coordinates.
+    """
+    size = 2 * np.pi * WEB_MERCATOR_RADIUS / 2 ** z
+    origin = np.pi * WEB_MERCATOR_RADIUS
+    return (
+        -origin + x * size,
+        origin - (y + 1) * size,
+        -origin + (x + 1) * size,
+        origin - y * size,
+    )
+
+
+def lonlat_to_web_mercator(coords: np.ndarray) -> np.ndarray:
+    """
+    Project (lon, lat) coordinates to Web Mercator. Latitudes are clipped to the valid range of Web Mercator.
+    """
+    lon = coords[:, 0]
+    lat = np.clip(coords[:, 1], -WEB_MERCATOR_MAX_LATITUDE, WEB_MERCATOR_MAX_LATITUDE)
+    x = WEB_MERCATOR_RADIUS * np.deg2rad(lon)
+    y = WEB_MERCATOR_RADIUS * np.log(np.tan(np.pi / 4 + np.deg2rad(lat) / 2))
+    return np.column_stack([x, y])
+
+
+def project_features(
+        geometry: ContourGeometry,
+) -> List[Tuple["shapely.Geometry", Dict[str, Any]]]:
+    """
+    Features of contour geometry in Web Mercator coordinates. Projected features can be reused for all tiles.
+    """
+    return [
+        (shapely.transform(shape, lonlat_to_web_mercator), properties)
+        for shape, properties in geometry.to_features()
+    ]
+
+
+def encode_mvt(
+        geometry: Union[ContourGeometry, List[Tuple["shapely.Geometry", Dict[str, Any]]]],
+        z: int,
+        x: int,
+        y: int,
+        layer: str = "contour",
+        extent: int = 4096,
+        buffer: int = 64,
+) -> bytes:
+    """
+    Encode contour geometry in one XYZ tile as a Mapbox Vector Tile with ``mapbox-vector-tile``.
+
+    Parameters
+    ----------
+    geometry
+        contour geometry, or features projected by ``project_features`` to encode many tiles.
+    z
+    x
+    y
+    layer
+        layer name in tile.
+    extent
+        tile extent in tile coordinates.
+    buffer
+        buffer around tile in tile coordinates.
+
+    Returns
+    -------
+    bytes
+    """
+    try:
+        import mapbox_vector_tile
+    except ImportError as e:
+        raise ImportError(
+            "mapbox-vector-tile is required to encode MVT, install it with `pip install mapbox-vector-tile`"
+        ) from e
+
+    if isinstance(geometry, ContourGeometry):
+        features = project_features(geometry)
+    else:
+        features = geometry
+
+    bounds = get_tile_bounds(z, x, y)
+    margin = (bounds[2] - bounds[0]) * buffer / extent
+    clip_bounds = (bounds[0] - margin, bounds[1] - margin, bounds[2] + margin, bounds[3] + margin)
+
+    origin = np.array(bounds[:2])
+    scale = extent / (bounds[2] - bounds[0])
+
+    tile_features = []
+    for shape, properties in features:
+        clipped = shapely.clip_by_rect(shape, *clip_bounds)
+        if clipped.is_empty:
+            continue
+        # tile coordinates with y axis up, flipped by the encoder.
+        tile_shape = shapely.transform(clipped, lambda coords: (coords - origin) * scale)
+        tile_features.append(dict(
+            geometry=tile_shape,
+            properties={key: value for key, value in properties.items() if value is not None},
+        ))
+
+    return mapbox_vector_tile.encode(
+        [dict(name=layer, features=tile_features)],
+        default_options=dict(extents=extent),
+    )
@@ -1,11 +1,38 @@
-from typing import Dict, Optional, Tuple, Any
+from typing import Dict, Optional, Tuple, Any, Union, List
 
 import xarray as xr
 import numpy as np
+import matplotlib.artist
 import matplotlib.axes
+import matplotlib.colors
 import matplotlib.contour
+import matplotlib.image
+import matplotlib.collections
+import matplotlib.patches
 import matplotlib.quiver
+import matplotlib.transforms
 import cartopy.crs as ccrs
+import cartopy.mpl.contour
+import cartopy.mpl.geoaxes
+
+from cedarkit.maps.contour import (
+    ContourGeometry,
+    ContourGeneratorOption,
+    get_field_xyz,
+    generate_contour_paths,
+    simplify_paths,
+    count_vertices,
+)
+from cedarkit.maps.label import add_contour_label_by_grid
+from cedarkit.maps.colormap import get_discrete_cmap
+from cedarkit.maps.reproject import (
+    ReprojectionCache,
+    ReprojectionIndex,
+    VectorReprojection,
+    RegularGrid,
+    get_default_cache,
+)
+from cedarkit.maps.streamline import get_streamline_integrator
 
 
 def add_contourf(
@@ -31,13 +58,19 @@ def add_contourf(
     y_invert
         invert Y axis, specially for high profile plots.
     **kwargs
+        options for ``xarray.DataArray.plot.contourf``. With a ``BoundaryNorm`` in ``norm`` (and its ``cmap``),
+        xarray uses them directly instead of building a discrete colormap, see ``colormap.get_discrete_cmap``.
 
     Returns
     -------
     matplotlib.contour.QuadContourSet
     """
     # TODO: need change
-    if isinstance(levels, np.ndarray):
+    if kwargs.get("norm") is not None:
+        # vmin and vmax are set in norm.
+        min_level = None
+        max_level = None
+    elif isinstance(levels, np.ndarray):
         min_level = min(levels)
         max_level = max(levels)
     else:
@@ -126,6 +159,177 @@ def add_contour(
     return c
 
 
+def add_contour_geometry(
+        ax: matplotlib.axes.Axes,
+        geometry: ContourGeometry,
+        projection: Optional[ccrs.Projection] = None,
+        cmap: Optional[Any] = None,
+        colors: Optional[Any] = None,
+        linewidths: Optional[Any] = None,
+        linestyles: Optional[Any] = "solid",
+        norm: Optional[matplotlib.colors.BoundaryNorm] = None,
+        **kwargs,
+) -> matplotlib.contour.ContourSet:
+    """
+    Draw precomputed contour geometry, see ``contour.compute_contour_geometry``.
+
+    The contour set is the same as the one created by ``add_contourf`` (filled) or ``add_contour`` (lines)
+    with the same field and levels, without contouring again.
+
+    Parameters
+    ----------
+    ax
+    geometry
+    projection
+        projection of geometry coordinates.
+    cmap
+        colormap of filled contours.
+    colors
+        colors of contour lines.
+    linewidths
+    linestyles
+    norm
+        norm of filled contours built with ``cmap`` by ``colormap.get_discrete_cmap``. ``cmap`` is used as is if set.
+    **kwargs
+        other options for ``matplotlib.contour.ContourSet``.
+
+    Returns
+    -------
+    matplotlib.contour.ContourSet
+    """
+    segments = geometry.segments
+    kinds = geometry.kinds
+    if geometry.is_empty:
+        # ContourSet requires at least one vertex, paths are replaced after creation.
+        segments = [[np.zeros((1, 2))]] + segments[1:]
+        kinds = [[np.array([1], dtype=np.uint8)]] + kinds[1:]
+
+    if geometry.filled:
+        if norm is None:
+            cmap, norm = get_discrete_cmap(cmap, levels=geometry.levels, extend=geometry.extend)
+        contour = matplotlib.contour.ContourSet(
+            ax,
+            geometry.extended_levels,
+            segments,
+            kinds,
+            filled=True,
+            cmap=cmap,
+            norm=norm,
+            transform=projection,
+            **kwargs,
+        )
+    else:
+        contour = matplotlib.contour.ContourSet(
+            ax,
+            geometry.levels,
+            segments,
+            kinds,
+            filled=False,
+            colors=colors,
+            linewidths=linewidths,
+            linestyles=linestyles,
+            transform=projection,
+            **kwargs,
+        )
+
+    if geometry.filled:
+        # same levels and extend as ``QuadContourSet``, extended levels are kept in ``_levels`` for each band.
+        contour.levels = np.asarray(geometry.levels, dtype=float)
+        contour.extend = geometry.extend
+    if geometry.is_empty:
+        contour.set_paths(geometry.paths)
+    if isinstance(ax, cartopy.mpl.geoaxes.GeoAxes):
+        # same as GeoAxes.contour, so that labels are placed in projected coordinates.
+        contour.__class__ = cartopy.mpl.contour.GeoContourSet
+    return contour
+
+
+def update_contour_data(
+        contour: matplotlib.contour.ContourSet,
+        field: Union[xr.DataArray, ContourGeometry],
+        algorithm: Optional[str] = None,
+        corner_mask: Optional[bool] = None,
+        transform: Optional[matplotlib.transforms.Transform] = None,
+        option: Optional[ContourGeneratorOption] = None,
+) -> matplotlib.contour.ContourSet:
+    """
+    Replace paths of an existing contour set with contours of a new field on the same grid.
+
+    Levels, colors, transform and other artist properties are kept, so figure and map can be reused
+    across frames without creating new artists. Existing contour labels are removed because they are
+    located on old paths, use ``add_contour_label`` to label the new contours.
+
+    Parameters
+    ----------
+    contour
+        contour set created by ``add_contourf`` or ``add_contour``.
+    field
+        new data field, or contour geometry computed with the same levels.
+    algorithm
+        contourpy algorithm, default is ``rcParams["contour.algorithm"]``.
+    corner_mask
+    transform
+        transform from field coordinates to display. Labeling contours on GeoAxes (``clabel`` or
+        ``add_contour_label_by_grid``) projects paths and changes transform of the contour set,
+        so the original transform should be set again.
+    option
+        contour generator options, see ``contour.create_contour_generator``.
+
+    Returns
+    -------
+    matplotlib.contour.ContourSet
+    """
+    if isinstance(field, ContourGeometry):
+        paths = field.paths
+    else:
+        x, y, z = get_field_xyz(field)
+        paths = generate_contour_paths(
+            x, y, z,
+            levels=contour.levels,
+            filled=contour.filled,
+            extend=contour.extend,
+            algorithm=algorithm,
+            corner_mask=corner_mask,
+            option=option,
+        )
+    while len(contour.labelTexts) > 0:
+        contour.pop_label()
+    if transform is not None:
+        contour.set_transform(transform)
+    contour.set_paths(paths)
+    return contour
+
+
+def simplify_contour(
+        contour: matplotlib.contour.ContourSet,
+        tolerance: float,
+        vertex_budget: Optional[int] = None,
+) -> Tuple[int, int, float]:
+    """
+    Simplify paths of a contour set in place, see ``contour.simplify_paths``.
+
+    Parameters
+    ----------
+    contour
+    tolerance
+        tolerance in path coordinates.
+    vertex_budget
+        max total vertex count of the contour set.
+
+    Returns
+    -------
+    Tuple[int, int, float]
+        vertex count before and after simplification, and the tolerance used.
+    """
+    paths = contour.get_paths()
+    vertices_before = count_vertices(paths)
+    paths, tolerance = simplify_paths(
+        paths, tolerance=tolerance, vertex_budget=vertex_budget, filled=contour.filled,
+    )
+    contour.set_paths(paths)
+    return vertices_before, count_vertices(paths), tolerance
+
+
 def add_contour_label(
         ax: matplotlib.axes.Axes,
         contour: matplotlib.contour.QuadContourSet,
@@ -134,6 +338,7 @@ def add_contour_label(
         inline: bool = True,
         fmt="{:.0f}".format,
         background_color: Optional[Any] = None,
+        engine: str = "clabel",
         **kwargs,
 ):
     """
@@ -148,12 +353,33 @@ def add_contour_label(
     inline
     fmt
     background_color
+    engine
+        label placement engine.
+
+        * clabel: ``ax.clabel``
+        * grid: ``add_contour_label_by_grid``, options such as ``label_spacing`` are passed by ``kwargs``.
+
     **kwargs
 
     Returns
     -------
 
     """
+    if engine == "grid":
+        if manual:
+            raise ValueError("manual is not supported by grid engine")
+        return add_contour_label_by_grid(
+            ax,
+            contour=contour,
+            fontsize=fontsize,
+            inline=inline,
+            fmt=fmt,
+            background_color=background_color,
+            **kwargs
+        )
+    elif engine != "clabel":
+        raise ValueError(f"engine is not supported: {engine}")
+
     labels = ax.clabel(
         contour,
         fontsize=fontsize,
@@ -180,6 +406,7 @@ def add_barb(
         barbcolor: str = "red",
         flagcolor: str = "red",
         barb_increments: Optional[Dict] = None,
+        cache: Optional[ReprojectionCache] = None,
         **kwargs
 ) -> matplotlib.quiver.Barbs:
     """
@@ -199,11 +426,32 @@ def add_barb(
     barbcolor
     flagcolor
     barb_increments
+    cache
+        reprojection cache for barbs regridded by ``regrid_shape`` on GeoAxes, default is
+        ``reproject.get_default_cache()``.
 
     Returns
     -------
     matplotlib.quiver.Barbs
     """
+    if kwargs.get("regrid_shape") is not None and kwargs.get("target_extent") is None:
+        # same point grid and linear interpolation as cartopy, with interpolation weights and vector rotations cached.
+        vectors = get_vector_grid(ax, x_field, projection, regrid_shape=kwargs["regrid_shape"], cache=cache)
+        if vectors is not None:
+            kwargs.pop("regrid_shape")
+            u, v = vectors.apply(x_field.values, y_field.values)
+            return ax.barbs(
+                vectors.x, vectors.y, u, v,
+                barb_increments=barb_increments,
+                length=length,
+                linewidth=linewidth,
+                pivot=pivot,
+                barbcolor=barbcolor,
+                flagcolor=flagcolor,
+                transform=ax.projection,
+                **kwargs
+            )
+
     x_dim_name = x_field.dims[-1]   # longitude
     y_dim_name = x_field.dims[-2]   # latitude
 
@@ -233,3 +481,384 @@ def add_barb(
     )
 
     return barb
+
+
+def get_vector_grid(
+        ax: matplotlib.axes.Axes,
+        field: xr.DataArray,
+        projection: Optional[ccrs.Projection],
+        regrid_shape: Union[int, Tuple[int, int]],
+        cache: Optional[ReprojectionCache] = None,
+) -> Optional[VectorReprojection]:
+    """
+    Get cached point grid of vector plots covering the map extent of a GeoAxes.
+
+    Parameters
+    ----------
+    ax
+    field
+        vector component field.
+    projection
+        projection of field coordinates.
+    regrid_shape
+        see ``get_regrid_shape``.
+    cache
+        default is ``reproject.get_default_cache()``.
+
+    Returns
+    -------
+    Optional[VectorReprojection]
+        None if ``ax`` is not a GeoAxes or field is not on a regular grid.
+    """
+    if projection is None or not isinstance(ax, cartopy.mpl.geoaxes.GeoAxes):
+        return None
+    try:
+        grid = RegularGrid.from_field(field)
+    except ValueError:
+        return None
+    if cache is None:
+        cache = get_default_cache()
+    extent = ax.get_extent()
+    y_dim, x_dim = field.dims[-2:]
+    return cache.get_vectors(
+        grid, projection, ax.projection,
+        extent=extent,
+        shape=get_regrid_shape(regrid_shape, extent),
+        coordinates=(field[x_dim].values, field[y_dim].values),
+    )
+
+
+def get_regrid_shape(
+        regrid_shape: Union[int, Tuple[int, int]],
+        extent: Tuple[float, float, float, float],
+) -> Tuple[int, int]:
+    """
+    Point grid shape (rows, columns) of vector plots, same as cartopy's ``regrid_shape``:
+    an int is the point count of the shorter side, a tuple is (columns, rows).
+    """
+    if isinstance(regrid_shape, (tuple, list)):
+        return int(regrid_shape[1]), int(regrid_shape[0])
+    size = int(regrid_shape)
+    x_range = extent[1] - extent[0]
+    y_range = extent[3] - extent[2]
+    if x_range >= y_range:
+        return size, int(size * x_range / y_range)
+    return int(size * y_range / x_range), size
+
+
+def get_image_index(
+        ax: matplotlib.axes.Axes,
+        field: xr.DataArray,
+        projection: ccrs.Projection,
+        pixel_size: float = 1.0,
+        cache: Optional[ReprojectionCache] = None,
+) -> ReprojectionIndex:
+    """
+    Get cached reprojection index from field grid to a raster covering the map extent of a GeoAxes.
+
+    Parameters
+    ----------
+    ax
+        GeoAxes with map area set.
+    field
+        field on a regular grid.
+    projection
+        projection of field coordinates.
+    pixel_size
+        raster pixel size in figure pixels.
+    cache
+        default is ``reproject.get_default_cache()``.
+
+    Returns
+    -------
+    ReprojectionIndex
+    """
+    if cache is None:
+        cache = get_default_cache()
+    extent = ax.get_extent()
+    shape = (
+        max(1, int(round(ax.bbox.height / pixel_size))),
+        max(1, int(round(ax.bbox.width / pixel_size))),
+    )
+    return cache.get(RegularGrid.from_field(field), projection, ax.projection, extent=extent, shape=shape)
+
+
+def add_image(
+        ax: matplotlib.axes.Axes,
+        field: xr.DataArray,
+        projection: Optional[ccrs.Projection] = None,
+        cmap: Optional[Any] = None,
+        norm: Optional[matplotlib.colors.Normalize] = None,
+        pixel_size: float = 1.0,
+        cache: Optional[ReprojectionCache] = None,
+        **kwargs
+) -> matplotlib.image.AxesImage:
+    """
+    Draw a field on a regular grid as an image.
+
+    On GeoAxes, the field is reprojected to map projection with a cached index (see ``get_image_index``),
+    so cartopy does not warp the image.
+
+    Parameters
+    ----------
+    ax
+    field
+    projection
+        projection of field coordinates, field coordinates are axes data coordinates if not set.
+    cmap
+    norm
+    pixel_size
+        raster pixel size in figure pixels.
+    cache
+    **kwargs
+        other options for ``imshow``, such as ``vmin``, ``vmax``, ``alpha`` and ``interpolation``.
+
+    Returns
+    -------
+    matplotlib.image.AxesImage
+    """
+    # keep aspect of map box.
+    kwargs.setdefault("aspect", ax.get_aspect())
+    if projection is None or not isinstance(ax, cartopy.mpl.geoaxes.GeoAxes):
+        values, extent = _get_grid_image(field)
+        return ax.imshow(values, extent=extent, origin="lower", cmap=cmap, norm=norm, **kwargs)
+
+    index = get_image_index(ax, field, projection=projection, pixel_size=pixel_size, cache=cache)
+    return ax.imshow(
+        index.apply(field.values),
+        extent=index.extent,
+        origin="lower",
+        transform=ax.projection,
+        cmap=cmap,
+        norm=norm,
+        **kwargs
+    )
+
+
+def update_image_data(
+        image: matplotlib.image.AxesImage,
+        field: xr.DataArray,
+        projection: Optional[ccrs.Projection] = None,
+        pixel_size: float = 1.0,
+        cache: Optional[ReprojectionCache] = None,
+) -> matplotlib.image.AxesImage:
+    """
+    Replace data of an image created by ``add_image`` with a new field on the same grid.
+    Only the cached index gather runs.
+    """
+    ax = image.axes
+    if projection is None or not isinstance(ax, cartopy.mpl.geoaxes.GeoAxes):
+        values, _ = _get_grid_image(field)
+        image.set_data(values)
+        return image
+
+    index = get_image_index(ax, field, projection=projection, pixel_size=pixel_size, cache=cache)
+    image.set_data(index.apply(field.values))
+    return image
+
+
+def _get_grid_image(field: xr.DataArray) -> Tuple[np.ndarray, Tuple[float, float, float, float]]:
+    """
+    Field values with rows from bottom to top and columns from left to right, and image extent.
+    """
+    grid = RegularGrid.from_field(field)
+    values = field.values
+    if grid.dx < 0:
+        values = values[:, ::-1]
+    if grid.dy < 0:
+        values = values[::-1, :]
+    return values, grid.extent
+
+
+def add_quiver(
+        ax: matplotlib.axes.Axes,
+        x_field: xr.DataArray,
+        y_field: xr.DataArray,
+        projection: Optional[ccrs.Projection] = None,
+        regrid_shape: Union[int, Tuple[int, int]] = 20,
+        cache: Optional[ReprojectionCache] = None,
+        **kwargs
+) -> matplotlib.quiver.Quiver:
+    """
+    Draw wind arrows thinned to a regular point grid.
+
+    On GeoAxes, arrows are placed on a cached point grid in map projection (see ``get_vector_grid``).
+    Otherwise, fields are thinned by stride so that the shorter side has about ``regrid_shape`` arrows.
+
+    Parameters
+    ----------
+    ax
+    x_field
+        eastward component.
+    y_field
+        northward component.
+    projection
+    regrid_shape
+    cache
+    **kwargs
+        options for ``quiver``.
+
+    Returns
+    -------
+    matplotlib.quiver.Quiver
+    """
+    vectors = get_vector_grid(ax, x_field, projection, regrid_shape=regrid_shape, cache=cache)
+    if vectors is not None:
+        u, v = vectors.apply(x_field.values, y_field.values)
+        return ax.quiver(vectors.x, vectors.y, u, v, transform=ax.projection, **kwargs)
+
+    x_dim_name = x_field.dims[-1]
+    y_dim_name = x_field.dims[-2]
+    stride = _get_stride(x_field.shape, regrid_shape)
+    x_field = x_field[::stride[0], ::stride[1]]
+    y_field = y_field[::stride[0], ::stride[1]]
+    if projection is not None:
+        kwargs["transform"] = projection
+    return ax.quiver(x_field[x_dim_name].values, x_field[y_dim_name].values, x_field.values, y_field.values, **kwargs)
+
+
+def _get_stride(shape: Tuple[int, ...], regrid_shape: Union[int, Tuple[int, int]]) -> Tuple[int, int]:
+    rows, columns = shape[-2:]
+    if isinstance(regrid_shape, (tuple, list)):
+        return max(1, rows // int(regrid_shape[1])), max(1, columns // int(regrid_shape[0]))
+    step = max(1, min(rows, columns) // int(regrid_shape))
+    return step, step
+
+
+class StreamlineSet:
+    """
+    Artists of streamlines created by ``add_streamline``.
+
+    Attributes
+    ----------
+    lines
+        streamlines.
+    arrows
+        arrow artists.
+    """
+    def __init__(self, lines: matplotlib.collections.LineCollection, arrows: List[matplotlib.artist.Artist]):
+        self.lines = lines
+        self.arrows = arrows
+
+    def remove(self):
+        self.lines.remove()
+        for arrow in self.arrows:
+            arrow.remove()
+
+
+def add_streamline(
+        ax: matplotlib.axes.Axes,
+        x_field: xr.DataArray,
+        y_field: xr.DataArray,
+        projection: Optional[ccrs.Projection] = None,
+        color: Any = "black",
+        linewidth: float = 0.5,
+        density: Union[float, Tuple[float, float]] = 1.0,
+        arrowsize: float = 1.0,
+        arrowstyle: str = "-|>",
+        regrid_shape: Union[int, Tuple[int, int]] = 100,
+        method: str = "vectorized",
+        step_size: float = 0.5,
+        max_length: float = 4.0,
+        min_length: float = 0.1,
+        cache: Optional[ReprojectionCache] = None,
+        **kwargs
+) -> StreamlineSet:
+    """
+    Draw streamlines.
+
+    On GeoAxes, vectors are regridded to a cached point grid in map projection. With ``method="vectorized"``,
+    streamlines are integrated by a cached ``streamline.StreamlineIntegrator``, otherwise by ``Axes.streamplot``.
+    ``Axes.streamplot`` on data coordinates is used for other axes.
+
+    Parameters
+    ----------
+    ax
+    x_field
+        eastward component.
+    y_field
+        northward component.
+    projection
+    color
+    linewidth
+    density
+    arrowsize
+    arrowstyle
+    regrid_shape
+    method
+        "vectorized" or "matplotlib".
+    step_size
+    max_length
+    min_length
+    cache
+    **kwargs
+        other options for streamline ``LineCollection``, such as ``zorder``.
+
+    Returns
+    -------
+    StreamlineSet
+    """
+    vectors = get_vector_grid(ax, x_field, projection, regrid_shape=regrid_shape, cache=cache)
+    if vectors is None or method != "vectorized":
+        if vectors is not None:
+            u, v = vectors.apply(x_field.values, y_field.values)
+            x, y = vectors.x[0], vectors.y[:, 0]
+            kwargs["transform"] = ax.projection
+        else:
+            x, y = x_field[x_field.dims[-1]].values, x_field[x_field.dims[-2]].values
+            u, v = x_field.values, y_field.values
+            if y[0] > y[-1]:
+                # streamplot requires increasing coordinates.
+                y, u, v = y[::-1], u[::-1], v[::-1]
+            if projection is not None:
+                kwargs["transform"] = projection
+        patch_count = len(ax.patches)
+        result = ax.streamplot(
+            x, y, u, v,
+            color=color,
+            linewidth=linewidth,
+            density=density,
+            arrowsize=arrowsize,
+            arrowstyle=arrowstyle,
+            maxlength=max_length,
+            minlength=min_length,
+            **kwargs
+        )
+        # arrows are added to axes as separate patches.
+        return StreamlineSet(result.lines, list(ax.patches[patch_count:]))
+
+    integrator = get_streamline_integrator(
+        RegularGrid.from_field(x_field), projection, ax.projection,
+        extent=ax.get_extent(),
+        shape=get_regrid_shape(regrid_shape, ax.get_extent()),
+        density=density,
+        step_size=step_size,
+        max_length=max_length,
+        min_length=min_length,
+        cache=cache,
+    )
+    streamlines = integrator.integrate(x_field.values, y_field.values)
+
+    lines = matplotlib.collections.LineCollection(
+        [streamline.points for streamline in streamlines],
+        colors=color,
+        linewidths=linewidth,
+        transform=ax.transData,
+        **kwargs
+    )
+    ax.add_collection(lines, autolim=False)
+
+    arrows = []
+    for streamline in streamlines:
+        arrow = matplotlib.patches.FancyArrowPatch(
+            streamline.arrow[0], streamline.arrow[1],
+            arrowstyle=arrowstyle,
+            mutation_scale=10 * arrowsize,
+            color=color,
+            linewidth=linewidth,
+            transform=ax.transData,
+            zorder=lines.get_zorder(),
+        )
+        ax.add_patch(arrow)
+        arrows.append(arrow)
+    return StreamlineSet(lines, arrows)
@@ -0,0 +1,409 @@
+"""
+Contour label placement engine.
+
+``matplotlib.contour.ContourLabeler.clabel`` walks every vertex of every contour path to find label positions
+and measures label text with a renderer one label at a time. This module places labels on decimated paths in
+display space with vectorized candidate generation, and uses a spatial hash grid to reject overlapping labels:
+
+1. Paths of each level are transformed to display coordinates once and split into lines.
+2. Candidate positions are sampled along each line every ``label_spacing`` points, keeping relatively straight parts.
+3. Candidates are accepted in order of line length if no accepted label is within ``min_distance`` (checked with
+   a grid of ``min_distance`` cells), and at most ``max_labels_per_area`` labels of one level are in each
+   ``area_size`` cell.
+4. Label texts are created in one batch with shared font properties. Label widths are measured once per text.
+
+Created labels are registered in the contour set like ``clabel`` does, so ``ContourSet.pop_label`` and
+``graph.update_contour_data`` remove them.
+"""
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+import numpy as np
+import matplotlib.axes
+import matplotlib.colors as mcolors
+import matplotlib.contour
+import matplotlib.path as mpath
+import matplotlib.transforms
+import matplotlib.ticker as mticker
+from matplotlib.font_manager import FontProperties
+from matplotlib.text import Text
+
+
+def add_contour_label_by_grid(
+        ax: matplotlib.axes.Axes,
+        contour: matplotlib.contour.ContourSet,
+        levels: Optional[Union[List, np.ndarray]] = None,
+        fontsize: Optional[Union[str, float]] = 7,
+        fmt: Optional[Union[mticker.Formatter, str, Callable, Dict]] = None,
+        colors: Optional[Any] = None,
+        background_color: Optional[Any] = None,
+        inline: bool = True,
+        inline_spacing: float = 5,
+        zorder: Optional[float] = None,
+        label_spacing: float = 50,
+        min_distance: float = 40,
+        area_size: float = 120,
+        max_labels_per_area: int = 1,
+        decimate: float = 1,
+) -> List[Text]:
+    """
+    Add contour labels with grid based placement, a faster alternative of ``ax.clabel``.
+
+    Parameters
+    ----------
+    ax
+    contour
+        line contour set.
+    levels
+        levels to be labeled, default is all levels.
+    fontsize
+    fmt
+        label format, same as ``fmt`` in ``clabel``.
+    colors
+        label colors, default is line color of each level.
+    background_color
+        background box color of labels.
+    inline
+        remove line segments under labels.
+    inline_spacing
+        space in pixels left on each side of labels when ``inline`` is True.
+    zorder
+    label_spacing
+        distance in points between label candidates along a line.
+    min_distance
+        min distance in points between two labels of all levels. Label width is used if it is larger.
+    area_size
+        cell size in points for ``max_labels_per_area``.
+    max_labels_per_area
+        max label count of one level in each ``area_size`` cell.
+    decimate
+        min distance in pixels between neighbouring vertices used for placement.
+
+    Returns
+    -------
+    List[Text]
+        created labels.
+    """
+    fig = ax.get_figure()
+    points_to_pixels = fig.dpi / 72.0
+    label_spacing = label_spacing * points_to_pixels
+    min_distance = min_distance * points_to_pixels
+    area_size = area_size * points_to_pixels
+
+    if fmt is None:
+        fmt = mticker.ScalarFormatter(useOffset=False)
+        fmt.create_dummy_axis()
+
+    indices, label_levels = _get_label_indices(contour, levels)
+    # ContourLabeler.get_text uses labelLevelList for formatters.
+    contour.labelLevelList = label_levels
+    contour.labelIndiceList = indices
+    font_properties = FontProperties(size=fontsize)
+    if zorder is None:
+        zorder = 2 + contour.get_zorder()
+    label_colors = _get_label_colors(contour, indices, colors)
+    bbox = None
+    if background_color is not None:
+        bbox = dict(facecolor=background_color, edgecolor="none", pad=0.5)
+
+    renderer = fig.canvas.get_renderer()
+    width_cache: Dict[str, float] = dict()
+
+    _project_contour_paths(ax, contour)
+    transform = contour.get_transform()
+    clip_path = ax.patch.get_path().transformed(ax.patch.get_transform())
+    if len(clip_path.vertices) == 0:
+        clip_path = None
+    grid = _LabelGrid(cell_size=min_distance)
+    paths = list(contour.get_paths())
+
+    placed = []  # (index in indices, x, y, rotation)
+    for label_index, level_index in enumerate(indices):
+        text = contour.get_text(label_levels[label_index], fmt)
+        if text not in width_cache:
+            width_cache[text] = renderer.get_text_width_height_descent(text, font_properties, ismath=False)[0]
+        label_width = width_cache[text]
+        distance = max(min_distance, 1.2 * label_width)
+
+        path = paths[level_index]
+        if len(path.vertices) == 0:
+            continue
+        lines = _split_path(path, transform, min_length=1.5 * label_width)
+        lines.sort(key=lambda item: -item[2][-1])
+
+        area_counts: Dict[Tuple[int, int], int] = dict()
+        cuts: Dict[int, List[float]] = dict()
+        for line_index, (_, display, lengths, _) in enumerate(lines):
+            candidates = _get_label_candidates(display, lengths, label_width, label_spacing, decimate)
+            if len(candidates) == 0:
+                continue
+            positions, xys, rotations = candidates
+            inside = _is_inside(ax, clip_path, xys, margin=label_width / 2)
+            for position, (x, y), rotation in zip(positions[inside], xys[inside], rotations[inside]):
+                area_key = (int(x // area_size), int(y // area_size))
+                if area_counts.get(area_key, 0) >= max_labels_per_area:
+                    continue
+                if grid.is_near(x, y, distance):
+                    continue
+                grid.add(x, y)
+                area_counts[area_key] = area_counts.get(area_key, 0) + 1
+                placed.append((label_index, x, y, rotation))
+                cuts.setdefault(line_index, []).append(position)
+
+        if inline and len(cuts) > 0:
+            paths[level_index] = _cut_path(
+                path, lines, cuts, half_width=label_width / 2 + inline_spacing
+            )
+
+    if inline:
+        contour.set_paths(paths)
+
+    if len(placed) == 0:
+        return []
+
+    placed_array = np.array([(x, y) for _, x, y, _ in placed])
+    data_xys = ax.transData.inverted().transform(placed_array)
+    labels = []
+    for (label_index, _, _, rotation), (data_x, data_y) in zip(placed, data_xys):
+        level = label_levels[label_index]
+        label = Text(
+            data_x, data_y,
+            text=contour.get_text(level, fmt),
+            rotation=rotation,
+            horizontalalignment="center",
+            verticalalignment="center",
+            zorder=zorder,
+            color=label_colors[label_index],
+            fontproperties=font_properties,
+            clip_box=ax.bbox,
+            bbox=bbox,
+        )
+        ax.add_artist(label)
+        contour.labelTexts.append(label)
+        contour.labelCValues.append(contour.cvalues[indices[label_index]])
+        labels.append(label)
+    return labels
+
+
+def _project_contour_paths(ax: matplotlib.axes.Axes, contour: matplotlib.contour.ContourSet):
+    """
+    Project contour paths to axes data coordinates like ``GeoContourSet.clabel`` does, so paths split at map
+    boundaries are labeled separately and cut paths are drawn without projecting again.
+    """
+    data_transform = ax.transData
+    to_data = contour.get_transform() - data_transform
+    if to_data.is_affine and to_data == matplotlib.transforms.IdentityTransform():
+        return
+    contour.set_paths([to_data.transform_path(path) for path in contour.get_paths()])
+    contour.set_transform(data_transform)
+
+
+def _is_inside(ax: matplotlib.axes.Axes, clip_path: Optional[mpath.Path], xys: np.ndarray, margin: float) -> np.ndarray:
+    """
+    Whether label centers are inside axes box (with margin) and axes patch in display coordinates.
+    """
+    bbox = ax.bbox
+    inside = (
+        (xys[:, 0] >= bbox.x0 + margin) & (xys[:, 0] <= bbox.x1 - margin)
+        & (xys[:, 1] >= bbox.y0 + margin) & (xys[:, 1] <= bbox.y1 - margin)
+    )
+    if clip_path is not None:
+        inside &= clip_path.contains_points(xys)
+    return inside
+
+
+class _LabelGrid:
+    """
+    Spatial hash grid of label positions in display coordinates.
+    """
+    def __init__(self, cell_size: float):
+        self.cell_size = max(cell_size, 1.0)
+        self.cells: Dict[Tuple[int, int], List[Tuple[float, float]]] = dict()
+
+    def add(self, x: float, y: float):
+        key = (int(x // self.cell_size), int(y // self.cell_size))
+        self.cells.setdefault(key, []).append((x, y))
+
+    def is_near(self, x: float, y: float, distance: float) -> bool:
+        reach = int(np.ceil(distance / self.cell_size))
+        cx, cy = int(x // self.cell_size), int(y // self.cell_size)
+        threshold = distance * distance
+        for i in range(cx - reach, cx + reach + 1):
+            for j in range(cy - reach, cy + reach + 1):
+                for px, py in self.cells.get((i, j), ()):
+                    if (px - x) ** 2 + (py - y) ** 2 < threshold:
+                        return True
+        return False
+
+
+def _get_label_indices(
+        contour: matplotlib.contour.ContourSet,
+        levels: Optional[Union[List, np.ndarray]]
+) -> Tuple[List[int], List[float]]:
+    if levels is None:
+        return list(range(len(contour.levels))), list(contour.levels)
+    levels = list(levels)
+    indices = [i for i, level in enumerate(contour.levels) if level in levels]
+    return indices, [contour.levels[i] for i in indices]
+
+
+def _get_label_colors(
+        contour: matplotlib.contour.ContourSet,
+        indices: List[int],
+        colors: Optional[Any]
+) -> np.ndarray:
+    if colors is None:
+        line_colors = contour.get_edgecolor()
+        if len(line_colors) == 0:
+            line_colors = mcolors.to_rgba_array("black")
+        return np.array([line_colors[i % len(line_colors)] for i in indices])
+    colors = mcolors.to_rgba_array(colors)
+    return np.array([colors[i % len(colors)] for i in range(len(indices))])
+
+
+def _split_path(
+        path: mpath.Path,
+        transform,
+        min_length: float,
+) -> List[Tuple[np.ndarray, np.ndarray, np.ndarray, slice]]:
+    """
+    Split path into lines and keep lines longer than ``min_length`` in display coordinates.
+
+    Returns
+    -------
+    List[Tuple[np.ndarray, np.ndarray, np.ndarray, slice]]
+        (source vertices, display vertices, cumulative display lengths, vertex slice in path) of each line.
+    """
+    vertices = path.vertices
+    codes = path.codes
+    display = transform.transform(vertices)
+    finite = np.isfinite(display).all(axis=1)
+
+    starts = np.zeros(len(vertices), dtype=bool)
+    if codes is not None:
+        starts |= codes == mpath.Path.MOVETO
+    starts[0] = True
+    # non-finite points split lines too.
+    starts[1:] |= ~finite[:-1] | ~finite[1:]
+    boundaries = np.append(np.flatnonzero(starts), len(vertices))
+
+    steps = np.hypot(*np.diff(display, axis=0).T)
+    steps = np.where(starts[1:], 0.0, steps)
+    # lengths of all lines at once, to skip short lines without building their arrays.
+    cumulative = np.concatenate([[0], np.nancumsum(steps)])
+    line_lengths = cumulative[boundaries[1:] - 1] - cumulative[boundaries[:-1]]
+
+    lines = []
+    for index in np.flatnonzero(line_lengths >= min_length):
+        begin, end = boundaries[index], boundaries[index + 1]
+        if not finite[begin]:
+            continue
+        lengths = cumulative[begin:end] - cumulative[begin]
+        lines.append((vertices[begin:end], display[begin:end], lengths, slice(begin, end)))
+    return lines
+
+
+def _get_label_candidates(
+        display: np.ndarray,
+        lengths: np.ndarray,
+        label_width: float,
+        label_spacing: float,
+        decimate: float,
+):
+    """
+    Candidate label positions (arc lengths), display coordinates and rotations on one line.
+    """
+    total_length = lengths[-1]
+    if decimate > 0:
+        keep = np.concatenate([[True], np.diff(np.floor(lengths / decimate)) > 0])
+        keep[-1] = True
+        display = display[keep]
+        lengths = lengths[keep]
+
+    if total_length < label_spacing:
+        positions = np.array([total_length / 2])
+    else:
+        count = int(total_length // label_spacing)
+        offset = (total_length - (count - 1) * label_spacing) / 2
+        positions = offset + np.arange(count) * label_spacing
+
+    half_width = label_width / 2
+    positions = positions[(positions >= half_width) & (positions <= total_length - half_width)]
+    if len(positions) == 0:
+        return []
+
+    def point_at(arc):
+        return np.column_stack([
+            np.interp(arc, lengths, display[:, 0]),
+            np.interp(arc, lengths, display[:, 1]),
+        ])
+
+    centers = point_at(positions)
+    start_points = point_at(positions - half_width)
+    end_points = point_at(positions + half_width)
+    delta = end_points - start_points
+
+    # keep relatively straight parts: chord length is close to label width.
+    straight = np.hypot(delta[:, 0], delta[:, 1]) > 0.8 * label_width
+
+    rotations = np.degrees(np.arctan2(delta[:, 1], delta[:, 0]))
+    rotations = (rotations + 90) % 180 - 90
+    return positions[straight], centers[straight], rotations[straight]
+
+
+def _cut_path(
+        path: mpath.Path,
+        lines: List[Tuple[np.ndarray, np.ndarray, np.ndarray, slice]],
+        cuts: Dict[int, List[float]],
+        half_width: float,
+) -> mpath.Path:
+    """
+    Rebuild path with segments under labels removed. Lines without labels are kept unchanged.
+    """
+    codes = path.codes
+    if codes is None:
+        codes = np.full(len(path.vertices), mpath.Path.LINETO, dtype=mpath.Path.code_type)
+        codes[0] = mpath.Path.MOVETO
+
+    keep = np.ones(len(path.vertices), dtype=bool)
+    extra_vertices = []
+    extra_codes = []
+    for line_index, positions in cuts.items():
+        source, _, lengths, line_slice = lines[line_index]
+        keep[line_slice] = False
+
+        intervals = sorted((p - half_width, p + half_width) for p in positions)
+        pieces = []
+        start = 0.0
+        for low, high in intervals:
+            if low > start:
+                pieces.append((start, low))
+            start = max(start, high)
+        if start < lengths[-1]:
+            pieces.append((start, lengths[-1]))
+
+        for low, high in pieces:
+            inner = (lengths > low) & (lengths < high)
+            piece = np.concatenate([
+                _interp_source(low, lengths, source),
+                source[inner],
+                _interp_source(high, lengths, source),
+            ])
+            extra_vertices.append(piece)
+            piece_codes = np.full(len(piece), mpath.Path.LINETO, dtype=mpath.Path.code_type)
+            piece_codes[0] = mpath.Path.MOVETO
+            extra_codes.append(piece_codes)
+
+    return mpath.Path(
+        np.concatenate([path.vertices[keep], *extra_vertices]),
+        np.concatenate([codes[keep], *extra_codes]),
+    )
+
+
+def _interp_source(position: float, lengths: np.ndarray, source: np.ndarray) -> np.ndarray:
+    """
+    Source coordinates at arc length position, interpolated linearly between neighbouring vertices.
+    """
+    return np.array([[
+        np.interp(position, lengths, source[:, 0]),
+        np.interp(position, lengths, source[:, 1]),
+    ]])
@@ -1,10 +1,15 @@
 import importlib
+import threading
 from enum import Enum
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple, Type
 
 import cartopy.feature as cfeature
 import matplotlib.axes
 
+from cedarkit.maps.util import AreaRange
+from .geometry import get_map_resolution, get_natural_earth_scale
+from .natural_earth import get_natural_earth_dir, create_natural_earth_feature
+
 
 DEFAULT_MAP_LOADER_PACKAGE = "cedarkit.maps.map.default"
 
@@ -18,39 +23,81 @@ class MapType(Enum):
 class MapLoader:
     """
     Load map features from map resources (such as Cartopy and shapefiles).
+
+    If ``area`` is set in feature methods, features only contain geometries intersecting the area,
+    which are clipped to the area (see ``cedarkit.maps.map.geometry``).
+
+    If ``resolution`` (map resolution in degrees per pixel) is set in feature methods, level of detail
+    of geometries is selected for the resolution, such as NaturalEarth scale or simplified geometries.
     """
     def __init__(self, map_type: MapType = MapType.Portrait, **kwargs):
         self.map_type = map_type
         self.kwargs = kwargs
 
-    def coastline(self, scale: Optional[str] = None, style: Optional[Dict] = None) -> List[cfeature.Feature]:
+    def coastline(
+            self,
+            scale: Optional[str] = None,
+            style: Optional[Dict] = None,
+            area: Optional[AreaRange] = None,
+            resolution: Optional[float] = None,
+    ) -> List[cfeature.Feature]:
         ...
 
-    def land(self, scale: Optional[str] = None, style: Optional[Dict] = None) -> List[cfeature.Feature]:
+    def land(
+            self,
+            scale: Optional[str] = None,
+            style: Optional[Dict] = None,
+            area: Optional[AreaRange] = None,
+            resolution: Optional[float] = None,
+    ) -> List[cfeature.Feature]:
         ...
 
-    def rivers(self, scale: Optional[str] = None, style: Optional[Dict] = None) -> List[cfeature.Feature]:
+    def rivers(
+            self,
+            scale: Optional[str] = None,
+            style: Optional[Dict] = None,
+            area: Optional[AreaRange] = None,
+            resolution: Optional[float] = None,
+    ) -> List[cfeature.Feature]:
         ...
 
-    def lakes(self, scale: Optional[str] = None, style: Optional[Dict] = None) -> List[cfeature.Feature]:
+    def lakes(
+            self,
+            scale: Optional[str] = None,
+            style: Optional[Dict] = None,
+            area: Optional[AreaRange] = None,
+            resolution: Optional[float] = None,
+    ) -> List[cfeature.Feature]:
         ...
 
-    def china_coastline(self) -> List[cfeature.Feature]:
+    def china_coastline(
+            self, area: Optional[AreaRange] = None, resolution: Optional[float] = None
+    ) -> List[cfeature.Feature]:
         ...
 
-    def china_borders(self) -> List[cfeature.Feature]:
+    def china_borders(
+            self, area: Optional[AreaRange] = None, resolution: Optional[float] = None
+    ) -> List[cfeature.Feature]:
         ...
 
-    def china_provinces(self) -> List[cfeature.Feature]:
+    def china_provinces(
+            self, area: Optional[AreaRange] = None, resolution: Optional[float] = None
+    ) -> List[cfeature.Feature]:
         ...
 
-    def china_rivers(self) -> List[cfeature.Feature]:
+    def china_rivers(
+            self, area: Optional[AreaRange] = None, resolution: Optional[float] = None
+    ) -> List[cfeature.Feature]:
         ...
 
-    def china_nine_lines(self) -> List[cfeature.Feature]:
+    def china_nine_lines(
+            self, area: Optional[AreaRange] = None, resolution: Optional[float] = None
+    ) -> List[cfeature.Feature]:
         ...
 
-    def global_borders(self) -> List[cfeature.Feature]:
+    def global_borders(
+            self, area: Optional[AreaRange] = None, resolution: Optional[float] = None
+    ) -> List[cfeature.Feature]:
         ...
 
 
@@ -72,17 +119,79 @@ def set_default_map_loader_package(map_package: str):
     return map_package
 
 
-def get_map_loader_class(map_loader_package: Optional[str] = None):
+_map_loader_classes: Dict[str, Type[MapLoader]] = dict()
+_map_loaders: Dict[Tuple, MapLoader] = dict()
+_map_loaders_lock = threading.Lock()
+
+
+def get_map_loader_class(map_loader_package: Optional[str] = None) -> Type[MapLoader]:
     """
-    get map loader class object.
+    get map loader class object. Map loader package is imported once.
     """
     if map_loader_package is None:
         map_loader_package = DEFAULT_MAP_LOADER_PACKAGE
-    package = importlib.import_module(map_loader_package)
-    return package.map_class
+    map_loader_class = _map_loader_classes.get(map_loader_package)
+    if map_loader_class is None:
+        package = importlib.import_module(map_loader_package)
+        map_loader_class = package.map_class
+        with _map_loaders_lock:
+            _map_loader_classes[map_loader_package] = map_loader_class
+    return map_loader_class
+
+
+def get_map_loader(
+        map_type: MapType = MapType.Portrait,
+        map_loader_package: Optional[str] = None,
+        map_loader_class: Optional[Type[MapLoader]] = None,
+        **kwargs,
+) -> MapLoader:
+    """
+    获取进程内共享的地图加载器，同一加载器类、地图类型和参数只创建一次，可在多线程中调用。
+
+    共享的加载器不应被修改（例如 ``CemcMapLoader.update_style``），需要修改时请直接创建加载器对象。
+
+    Parameters
+    ----------
+    map_type
+        地图类型
+    map_loader_package
+        地图包字符串，例如 ``cedarkit.maps.map.default``，默认为 ``DEFAULT_MAP_LOADER_PACKAGE``
+    map_loader_class
+        地图加载器类，设置后忽略 ``map_loader_package``
+    kwargs
+        加载器参数，需要可哈希
+
+    Returns
+    -------
+    MapLoader
+    """
+    if map_loader_class is None:
+        map_loader_class = get_map_loader_class(map_loader_package)
+    key = (map_loader_class, map_type, tuple(sorted(kwargs.items())))
+    map_loader = _map_loaders.get(key)
+    if map_loader is None:
+        with _map_loaders_lock:
+            map_loader = _map_loaders.get(key)
+            if map_loader is None:
+                map_loader = map_loader_class(map_type=map_type, **kwargs)
+                _map_loaders[key] = map_loader
+    return map_loader
+
+
+def clear_map_loaders():
+    """
+    清空共享的地图加载器和加载器类，用于修改地图包之后重新加载。
+    """
+    with _map_loaders_lock:
+        _map_loaders.clear()
+        _map_loader_classes.clear()
 
 
-def get_china_map(map_package: Optional[str] = None) -> List[cfeature.Feature]:
+def get_china_map(
+        map_package: Optional[str] = None,
+        area: Optional[AreaRange] = None,
+        resolution: Optional[float] = None,
+) -> List[cfeature.Feature]:
     """
     中国区域
 
@@ -90,6 +199,10 @@ def get_china_map(map_package: Optional[str] = None) -> List[cfeature.Feature]:
     ----------
     map_package
         地图包字符串，例如 ``meda.map.default``
+    area
+        地图区域，仅加载区域内的要素
+    resolution
+        地图分辨率（度/像素），用于简化要素
     Returns
     -------
 
@@ -97,10 +210,14 @@ def get_china_map(map_package: Optional[str] = None) -> List[cfeature.Feature]:
     if map_package is None:
         map_package = DEFAULT_MAP_LOADER_PACKAGE
     package = importlib.import_module(map_package)
-    return package.get_china_map()
+    return package.get_china_map(area=area, resolution=resolution)
 
 
-def get_china_nine_map(map_package=None) -> List[cfeature.Feature]:
+def get_china_nine_map(
+        map_package=None,
+        area: Optional[AreaRange] = None,
+        resolution: Optional[float] = None,
+) -> List[cfeature.Feature]:
     """
     九段线
 
@@ -108,6 +225,10 @@ def get_china_nine_map(map_package=None) -> List[cfeature.Feature]:
     ----------
     map_package
         地图包名，例如 ``meda.map.default`` 表示 meda 自带的地图包
+    area
+        地图区域，仅加载区域内的要素
+    resolution
+        地图分辨率（度/像素），用于简化要素
 
     Returns
     -------
@@ -116,7 +237,7 @@ def get_china_nine_map(map_package=None) -> List[cfeature.Feature]:
     if map_package is None:
         map_package = DEFAULT_MAP_LOADER_PACKAGE
     package = importlib.import_module(map_package)
-    return package.get_china_nine_map()
+    return package.get_china_nine_map(area=area, resolution=resolution)
 
 
 def add_common_map_feature(
@@ -134,7 +255,7 @@ def add_common_map_feature(
     ----------
     ax
     coastline
-        海岸线
+        海岸线，scale 为 "auto" 时根据地图分辨率选择
 
         {
             "scale": "50m",
@@ -172,5 +293,12 @@ def add_common_map_feature(
 
 def _add_feature(ax: matplotlib.axes.Axes, config: Dict, feature_item: cfeature.NaturalEarthFeature):
     scale = config.get("scale", "50m")
+    if scale == "auto":
+        resolution = get_map_resolution(ax)
+        scale = "50m" if resolution is None else get_natural_earth_scale(resolution)
     style = config.get("style", dict())
-    ax.add_feature(feature_item.with_scale(scale), **style)
+    if get_natural_earth_dir() is not None:
+        feature = create_natural_earth_feature(feature_item.category, feature_item.name, scale, **feature_item.kwargs)
+    else:
+        feature = feature_item.with_scale(scale)
+    ax.add_feature(feature, **style)
@@ -11,12 +11,13 @@ import importlib.resources
 from pathlib import Path
 from typing import Dict, List, Optional
 
-from cartopy.io.shapereader import Reader
 import cartopy.feature as cfeature
 import cartopy.crs as ccrs
 
+from cedarkit.maps.util import AreaRange
 from . import MapType
 from .default import DefaultMapLoader
+from .geometry import get_geometry_index, get_simplify_tolerance
 
 
 MAP_PACKAGE_NAME = "cemc_meda_data"
@@ -78,19 +79,32 @@ class CemcMapLoader(DefaultMapLoader):
     def update_style(self, name: str, style: Dict):
         self.style[name].update(style)
 
-    def coastline(self, scale: Optional[str] = None, style: Optional[Dict] = None) -> List[cfeature.Feature]:
-        features = super().coastline(scale=scale, style=style)
+    def coastline(
+            self,
+            scale: Optional[str] = None,
+            style: Optional[Dict] = None,
+            area: Optional[AreaRange] = None,
+            resolution: Optional[float] = None,
+    ) -> List[cfeature.Feature]:
+        features = super().coastline(scale=scale, style=style, area=area, resolution=resolution)
         return features
 
-    def china_coastline(self, style: Optional[Dict] = None) -> List[cfeature.Feature]:
+    def china_coastline(
+            self,
+            style: Optional[Dict] = None,
+            area: Optional[AreaRange] = None,
+            resolution: Optional[float] = None,
+    ) -> List[cfeature.Feature]:
         shape_names = [
             dict(name="HAX", type="h"),         # 海岸线
             dict(name="HFCP_NH", type="h"),     # 南海岛屿岸线
         ]
-        features = self.get_features(shape_names)
+        features = self.get_features(shape_names, area=area, resolution=resolution)
         return features
 
-    def china_borders(self) -> List[cfeature.Feature]:
+    def china_borders(
+            self, area: Optional[AreaRange] = None, resolution: Optional[float] = None
+    ) -> List[cfeature.Feature]:
         shape_names = [
             dict(name="BOUL_G", type="g"),      # 陆地国界
         ]
@@ -98,39 +112,47 @@ class CemcMapLoader(DefaultMapLoader):
             shape_names.append(
                 dict(name="BOUL_GU", type="gu"),    # 未定国界
             )
-        features = self.get_features(shape_names)
+        features = self.get_features(shape_names, area=area, resolution=resolution)
 
         return features
 
-    def china_provinces(self) -> List[cfeature.Feature]:
+    def china_provinces(
+            self, area: Optional[AreaRange] = None, resolution: Optional[float] = None
+    ) -> List[cfeature.Feature]:
         shape_names = [
             dict(name="BOUL_S", type="s"),      # 省界
             dict(name="BOUL_S2", type="s2"),    # 特别行政区界
         ]
-        features = self.get_features(shape_names)
+        features = self.get_features(shape_names, area=area, resolution=resolution)
 
         return features
 
-    def china_rivers(self) -> List[cfeature.Feature]:
+    def china_rivers(
+            self, area: Optional[AreaRange] = None, resolution: Optional[float] = None
+    ) -> List[cfeature.Feature]:
         features = []
 
         if self.map_type == MapType.Portrait:
             shape_names = [
                 dict(name="HYDL", type="r"),        # 主要河流
             ]
-            features = self.get_features(shape_names)
+            features = self.get_features(shape_names, area=area, resolution=resolution)
 
         return features
 
-    def china_nine_lines(self) -> List[cfeature.Feature]:
+    def china_nine_lines(
+            self, area: Optional[AreaRange] = None, resolution: Optional[float] = None
+    ) -> List[cfeature.Feature]:
         shape_names = [
             dict(name="BOUL_JDX", type="g"),    # 南海断续线
         ]
-        features = self.get_features(shape_names)
+        features = self.get_features(shape_names, area=area, resolution=resolution)
 
         return features
 
-    def global_borders(self) -> List[cfeature.Feature]:
+    def global_borders(
+            self, area: Optional[AreaRange] = None, resolution: Optional[float] = None
+    ) -> List[cfeature.Feature]:
         shape_names = [
             dict(name="BOUL_G", type="g"),    # 国界
             dict(name="BOUL_Gwd", type="gwd"),    # 未定国界
@@ -140,10 +162,34 @@ class CemcMapLoader(DefaultMapLoader):
         return features
 
     def get_features(
-            self, shape_names: List[Dict], projection: Optional[ccrs.Projection] = None
+            self,
+            shape_names: List[Dict],
+            projection: Optional[ccrs.Projection] = None,
+            area: Optional[AreaRange] = None,
+            resolution: Optional[float] = None,
     ) -> List[cfeature.Feature]:
+        """
+        Load features from shapefiles in ``resource_base``.
+
+        Parameters
+        ----------
+        shape_names
+            shapefile name and style type of each feature.
+        projection
+            projection of shapefile geometries.
+        area
+            only geometries in area are loaded, in ``projection`` coordinates.
+        resolution
+            map resolution in degrees per pixel, geometries are simplified for the resolution.
+            Only used for geographic ``projection``.
+
+        Returns
+        -------
+        List[cfeature.Feature]
+        """
         if projection is None:
             projection = self.projection
+        tolerance = get_simplify_tolerance(resolution) if isinstance(projection, ccrs.PlateCarree) else 0
 
         features = []
         for shape_item in shape_names:
@@ -151,10 +197,10 @@ class CemcMapLoader(DefaultMapLoader):
             feature_type = shape_item["type"]
 
             shape_file_name = Path(self.resource_base, f"{shape_name}.shp")
-            reader = Reader(shape_file_name, encoding="GBK")
+            geometries = get_geometry_index(shape_file_name, encoding="GBK").query(area, tolerance=tolerance)
             feature_style = self.style[feature_type]
             feature = cfeature.ShapelyFeature(
-                reader.geometries(),
+                geometries,
                 projection,
                 facecolor="none",
                 **feature_style
@@ -171,8 +217,11 @@ class CemcMapLoader(DefaultMapLoader):
 map_class = CemcMapLoader
 
 
-def get_china_map() -> List[cfeature.Feature]:
+def get_china_map(
+        area: Optional[AreaRange] = None, resolution: Optional[float] = None
+) -> List[cfeature.Feature]:
     projection = ccrs.PlateCarree()
+    tolerance = get_simplify_tolerance(resolution)
     shape_names = [
         dict(name="BOUL_G", type="g"),      # 陆地国界
         dict(name="BOUL_JDX", type="g"),    # 南海断续线
@@ -190,10 +239,10 @@ def get_china_map() -> List[cfeature.Feature]:
 
         ref = importlib.resources.files(MAP_PACKAGE_NAME) / f"resources/maps/portrait/{shape_name}.shp"
         with importlib.resources.as_file(ref) as shape_file_name:
-            reader = Reader(shape_file_name, encoding="GBK")
+            geometries = get_geometry_index(shape_file_name, encoding="GBK").query(area, tolerance=tolerance)
             feature_style = get_map_feature_style(map_type)
             feature = cfeature.ShapelyFeature(
-                reader.geometries(),
+                geometries,
                 projection,
                 facecolor="none",
                 **feature_style
@@ -203,8 +252,11 @@ def get_china_map() -> List[cfeature.Feature]:
     return features
 
 
-def get_china_nine_map() -> List[cfeature.Feature]:
+def get_china_nine_map(
+        area: Optional[AreaRange] = None, resolution: Optional[float] = None
+) -> List[cfeature.Feature]:
     projection = ccrs.PlateCarree()
+    tolerance = get_simplify_tolerance(resolution)
     shape_names = [
         dict(name="BOUL_G", type="g"),      # 陆地国界
         dict(name="BOUL_JDX", type="g"),    # 南海断续线
@@ -220,10 +272,10 @@ def get_china_nine_map() -> List[cfeature.Feature]:
 
         ref = importlib.resources.files(MAP_PACKAGE_NAME) / f"resources/maps/landscape/NANHAI/{shape_name}.shp"
         with importlib.resources.as_file(ref) as shape_file_name:
-            reader = Reader(shape_file_name, encoding="GBK")
+            geometries = get_geometry_index(shape_file_name, encoding="GBK").query(area, tolerance=tolerance)
             feature_style = get_map_feature_style(map_type)
             feature = cfeature.ShapelyFeature(
-                reader.geometries(),
+                geometries,
                 projection,
                 facecolor="none",
                 **feature_style
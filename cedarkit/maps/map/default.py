@@ -8,19 +8,54 @@ from typing import List, Dict, Optional
 
 import cartopy.crs as ccrs
 import cartopy.feature as cfeature
-from cartopy.io.shapereader import Reader
 
+from cedarkit.maps.util import AreaRange
 from . import MapType, MapLoader
+from .geometry import get_geometry_index, get_natural_earth_scale, get_simplify_tolerance
+from .natural_earth import create_natural_earth_feature
+
+
+# NaturalEarth scale used for "auto" scale if map resolution is unknown.
+DEFAULT_NATURAL_EARTH_SCALE = "50m"
 
 
 class DefaultMapLoader(MapLoader):
+    """
+    Map loader with NaturalEarth features and china-shapefiles.
+
+    NaturalEarth scale "auto" selects scale from map resolution (see ``geometry.get_natural_earth_scale``).
+
+    Options
+    -------
+    natural_earth_dir
+        local NaturalEarth directory, NaturalEarth features are never downloaded if set (see ``natural_earth``).
+    """
     def __init__(self, map_type: MapType = MapType.Portrait, **kwargs):
         super().__init__(map_type=map_type, **kwargs)
-        self.default_scale = "50m"
-
-    def coastline(self, scale: Optional[str] = None, style: Optional[Dict] = None) -> List[cfeature.Feature]:
+        self.default_scale = "auto"
+        self.natural_earth_dir = kwargs.get("natural_earth_dir", None)
+
+    def get_scale(self, scale: Optional[str] = None, resolution: Optional[float] = None) -> str:
+        """
+        NaturalEarth scale for a feature, ``default_scale`` if not set.
+        "auto" is resolved with map ``resolution``, or ``DEFAULT_NATURAL_EARTH_SCALE`` if resolution is not set.
+        """
         if scale is None:
             scale = self.default_scale
+        if scale != "auto":
+            return scale
+        if resolution is None:
+            return DEFAULT_NATURAL_EARTH_SCALE
+        return get_natural_earth_scale(resolution)
+
+    def coastline(
+            self,
+            scale: Optional[str] = None,
+            style: Optional[Dict] = None,
+            area: Optional[AreaRange] = None,
+            resolution: Optional[float] = None,
+    ) -> List[cfeature.Feature]:
+        scale = self.get_scale(scale, resolution=resolution)
         feature_style = dict(
             edgecolor='black',
             facecolor='never',
@@ -28,32 +63,38 @@ class DefaultMapLoader(MapLoader):
         if style is not None:
             feature_style.update(style)
 
-        f = cfeature.NaturalEarthFeature(
-            'physical', 'coastline',
-            scale,
-            **feature_style
+        f = get_natural_earth_feature(
+            'physical', 'coastline', scale, area=area, data_dir=self.natural_earth_dir, **feature_style
         )
         return [f]
 
-    def land(self, scale: Optional[str] = None, style: Optional[Dict] = None) -> List[cfeature.Feature]:
-        if scale is None:
-            scale = self.default_scale
+    def land(
+            self,
+            scale: Optional[str] = None,
+            style: Optional[Dict] = None,
+            area: Optional[AreaRange] = None,
+            resolution: Optional[float] = None,
+    ) -> List[cfeature.Feature]:
+        scale = self.get_scale(scale, resolution=resolution)
         feature_style = dict(
             facecolor='lightgrey',
         )
         if style is not None:
             feature_style.update(style)
 
-        f = cfeature.NaturalEarthFeature(
-            'physical', 'land',
-            scale,
-            **feature_style
+        f = get_natural_earth_feature(
+            'physical', 'land', scale, area=area, data_dir=self.natural_earth_dir, **feature_style
         )
         return [f]
 
-    def rivers(self, scale: Optional[str] = None, style: Optional[Dict] = None) -> List[cfeature.Feature]:
-        if scale is None:
-            scale = self.default_scale
+    def rivers(
+            self,
+            scale: Optional[str] = None,
+            style: Optional[Dict] = None,
+            area: Optional[AreaRange] = None,
+            resolution: Optional[float] = None,
+    ) -> List[cfeature.Feature]:
+        scale = self.get_scale(scale, resolution=resolution)
         feature_style = dict(
             edgecolor=cfeature.COLORS['water'],
             facecolor='never',
@@ -61,16 +102,19 @@ class DefaultMapLoader(MapLoader):
         if style is not None:
             feature_style.update(style)
 
-        f = cfeature.NaturalEarthFeature(
-            'physical', 'rivers_lake_centerlines',
-            scale,
-            **feature_style
+        f = get_natural_earth_feature(
+            'physical', 'rivers_lake_centerlines', scale, area=area, data_dir=self.natural_earth_dir, **feature_style
         )
         return [f]
 
-    def lakes(self, scale: Optional[str] = None, style: Optional[Dict] = None) -> List[cfeature.Feature]:
-        if scale is None:
-            scale = self.default_scale
+    def lakes(
+            self,
+            scale: Optional[str] = None,
+            style: Optional[Dict] = None,
+            area: Optional[AreaRange] = None,
+            resolution: Optional[float] = None,
+    ) -> List[cfeature.Feature]:
+        scale = self.get_scale(scale, resolution=resolution)
         feature_style = dict(
             edgecolor='none',
             facecolor=cfeature.COLORS['water'],
@@ -78,62 +122,89 @@ class DefaultMapLoader(MapLoader):
         if style is not None:
             feature_style.update(style)
 
-        f = cfeature.NaturalEarthFeature(
-            'physical', 'lakes',
-            scale,
-            **feature_style
+        f = get_natural_earth_feature(
+            'physical', 'lakes', scale, area=area, data_dir=self.natural_earth_dir, **feature_style
         )
         return [f]
 
-    def china_coastline(self) -> List[cfeature.Feature]:
+    def china_coastline(
+            self, area: Optional[AreaRange] = None, resolution: Optional[float] = None
+    ) -> List[cfeature.Feature]:
         return list()
 
-    def china_borders(self) -> List[cfeature.Feature]:
-        return get_china_map()
+    def china_borders(
+            self, area: Optional[AreaRange] = None, resolution: Optional[float] = None
+    ) -> List[cfeature.Feature]:
+        return get_china_map(area=area, resolution=resolution)
 
-    def china_provinces(self) -> List[cfeature.Feature]:
+    def china_provinces(
+            self, area: Optional[AreaRange] = None, resolution: Optional[float] = None
+    ) -> List[cfeature.Feature]:
         return list()
 
-    def china_rivers(self) -> List[cfeature.Feature]:
+    def china_rivers(
+            self, area: Optional[AreaRange] = None, resolution: Optional[float] = None
+    ) -> List[cfeature.Feature]:
         return list()
 
-    def china_nine_lines(self) -> List[cfeature.Feature]:
-        return get_china_nine_map()
+    def china_nine_lines(
+            self, area: Optional[AreaRange] = None, resolution: Optional[float] = None
+    ) -> List[cfeature.Feature]:
+        return get_china_nine_map(area=area, resolution=resolution)
 
-    def global_borders(self) -> List[cfeature.Feature]:
+    def global_borders(
+            self, area: Optional[AreaRange] = None, resolution: Optional[float] = None
+    ) -> List[cfeature.Feature]:
         return list()
 
 
 map_class = DefaultMapLoader
 
 
-def get_china_map():
+def get_natural_earth_feature(
+        category: str,
+        name: str,
+        scale: str,
+        area: Optional[AreaRange] = None,
+        data_dir: Optional[str] = None,
+        **kwargs
+) -> cfeature.Feature:
+    """
+    NaturalEarth feature. If ``area`` is set, only geometries in the area are loaded from the indexed shapefile.
+    If local NaturalEarth directory is set, see ``natural_earth.create_natural_earth_feature``.
+    """
+    return create_natural_earth_feature(category, name, scale, area=area, data_dir=data_dir, **kwargs)
+
+
+def get_china_map(area: Optional[AreaRange] = None, resolution: Optional[float] = None):
     ref = importlib.resources.files("cedarkit.maps") / "resources/map/china-shapefiles/shapefiles/china.shp"
     with importlib.resources.as_file(ref) as china_shape_file:
-        china_shape_reader = Reader(china_shape_file)
-
-        projection = ccrs.PlateCarree()
-        cn_feature = cfeature.ShapelyFeature(
-            china_shape_reader.geometries(),
-            projection,
-            edgecolor='k',
-            facecolor='none'
+        geometries = get_geometry_index(china_shape_file).query(
+            area, tolerance=get_simplify_tolerance(resolution)
         )
 
+    projection = ccrs.PlateCarree()
+    cn_feature = cfeature.ShapelyFeature(
+        geometries,
+        projection,
+        edgecolor='k',
+        facecolor='none'
+    )
     return [cn_feature]
 
 
-def get_china_nine_map():
+def get_china_nine_map(area: Optional[AreaRange] = None, resolution: Optional[float] = None):
     ref = importlib.resources.files("cedarkit.maps") / "resources/map/china-shapefiles/shapefiles/china_nine_dotted_line.shp"
     with importlib.resources.as_file(ref) as china_nine_dotted_shape_file:
-        china_nine_dotted_shape_reader = Reader(china_nine_dotted_shape_file)
-
-        projection = ccrs.PlateCarree()
-        nine_feature = cfeature.ShapelyFeature(
-            china_nine_dotted_shape_reader.geometries(),
-            projection,
-            edgecolor='k',
-            facecolor='none'
+        geometries = get_geometry_index(china_nine_dotted_shape_file).query(
+            area, tolerance=get_simplify_tolerance(resolution)
         )
 
+    projection = ccrs.PlateCarree()
+    nine_feature = cfeature.ShapelyFeature(
+        geometries,
+        projection,
+        edgecolor='k',
+        facecolor='none'
+    )
     return [nine_feature]
@@ -0,0 +1,290 @@
+"""
+Spatial index of shapefile geometries.
+
+Each shapefile is read once into a ``GeometryIndex`` with a ``shapely.STRtree``.
+Map loaders query the index with the map area of a layer, and create features with only the intersecting
+geometries clipped to the area, instead of adding all geometries and intersecting them on every draw.
+
+Level of detail is selected by map resolution (degrees per pixel) of a layer:
+
+* NaturalEarth scale, see ``get_natural_earth_scale``.
+* simplified geometries with a tolerance of a fraction of a pixel, see ``get_simplify_tolerance``.
+  Tolerances are rounded down to powers of 2, so that simplified geometries are shared by similar maps.
+
+Before forking worker processes, indexes can be frozen into flat arrays (``freeze_geometry_indexes``),
+whose memory pages stay shared with workers.
+"""
+import math
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Optional, Tuple, Union, List
+
+import numpy as np
+import shapely
+import cartopy.crs as ccrs
+import matplotlib.axes
+from cartopy.mpl.geoaxes import GeoAxes
+
+from cedarkit.maps.util import AreaRange
+from .geometry_cache import read_shapefile_geometries
+
+
+class GeometryIndex:
+    """
+    Geometries of a shapefile with a STRtree index.
+
+    After ``freeze``, geometries are kept in flat arrays (WKB buffer, offsets and bounds) instead of
+    shapely objects and STRtree, which stay shared between forked processes (see ``freeze``).
+
+    Parameters
+    ----------
+    geometries
+        shapely geometry array.
+    max_cache_size
+        max count of cached query results.
+    """
+    def __init__(self, geometries: np.ndarray, max_cache_size: int = 16):
+        self.geometries: Optional[np.ndarray] = np.asarray(geometries, dtype=object)
+        self.tree: Optional[shapely.STRtree] = shapely.STRtree(self.geometries)
+        self.max_cache_size = max_cache_size
+        self._simplified: Dict[float, np.ndarray] = dict()
+        self._results: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+        # flat layout after freeze
+        self._wkb: Optional[np.ndarray] = None
+        self._wkb_offsets: Optional[np.ndarray] = None
+        self._bounds: Optional[np.ndarray] = None
+
+    @classmethod
+    def from_file(cls, file_path: Union[str, Path], encoding: Optional[str] = None) -> "GeometryIndex":
+        """
+        Create index of a shapefile, using geometry cache file if available (see ``geometry_cache``).
+        """
+        return cls(read_shapefile_geometries(file_path, encoding=encoding))
+
+    def __len__(self) -> int:
+        if self.geometries is None:
+            return len(self._bounds)
+        return len(self.geometries)
+
+    @property
+    def frozen(self) -> bool:
+        return self.geometries is None
+
+    def freeze(self):
+        """
+        Convert geometries to flat arrays, and drop shapely objects, STRtree and simplified geometries.
+        Cached query results are kept.
+
+        Reference count updates of many small Python objects dirty memory pages shared by forked processes.
+        Flat arrays are a few large buffers, whose pages stay shared. Queries on a frozen index
+        select geometries by bounds and create shapely objects only for selected geometries.
+        """
+        with self._lock:
+            if self.geometries is None:
+                return
+            wkb = shapely.to_wkb(self.geometries)
+            offsets = np.zeros(len(wkb) + 1, dtype=np.int64)
+            offsets[1:] = np.cumsum([len(item) for item in wkb])
+            self._wkb = np.frombuffer(b"".join(wkb), dtype=np.uint8)
+            self._wkb_offsets = offsets
+            self._bounds = shapely.bounds(self.geometries)
+            self.geometries = None
+            self.tree = None
+            self._simplified.clear()
+
+    def _get_flat_geometries(self, index: np.ndarray) -> np.ndarray:
+        data = self._wkb
+        offsets = self._wkb_offsets
+        wkb = np.empty(len(index), dtype=object)
+        wkb[:] = [data[offsets[i]:offsets[i + 1]].tobytes() for i in index]
+        return shapely.from_wkb(wkb)
+
+    def get_geometries(self, tolerance: float = 0) -> np.ndarray:
+        """
+        All geometries simplified with ``tolerance``, in the same order as ``geometries``.
+        """
+        if tolerance <= 0 and self.geometries is not None:
+            return self.geometries
+        with self._lock:
+            geometries = self._simplified.get(tolerance)
+        if geometries is None:
+            if self.geometries is None:
+                geometries = self._get_flat_geometries(np.arange(len(self)))
+            else:
+                geometries = self.geometries
+            if tolerance > 0:
+                geometries = shapely.simplify(geometries, tolerance, preserve_topology=True)
+            with self._lock:
+                self._simplified[tolerance] = geometries
+        return geometries
+
+    def query(self, area: Optional[AreaRange] = None, margin: float = 0.05, tolerance: float = 0) -> np.ndarray:
+        """
+        Geometries intersecting ``area``, clipped to ``area`` extended by ``margin``.
+
+        Parameters
+        ----------
+        area
+            map area in geometry coordinates. All geometries are returned if not set.
+        margin
+            extension of clip box, in fraction of area width and height. Polygon edges created by clipping
+            are outside the map area.
+        tolerance
+            simplification tolerance in geometry coordinates, see ``get_simplify_tolerance``.
+
+        Returns
+        -------
+        np.ndarray
+            shapely geometry array.
+        """
+        if area is None:
+            return self.get_geometries(tolerance)
+        box = get_clip_box(area, margin=margin)
+        key = (box, tolerance)
+        with self._lock:
+            result = self._results.get(key)
+            if result is not None:
+                self._results.move_to_end(key)
+                return result
+
+        if self.geometries is None:
+            geometries = self._query_flat(box, tolerance)
+        else:
+            index = self.tree.query(shapely.box(*box), predicate="intersects")
+            geometries = self.get_geometries(tolerance)[np.sort(index)]
+        geometries = shapely.clip_by_rect(geometries, *box)
+        result = geometries[~shapely.is_empty(geometries)]
+
+        with self._lock:
+            self._results[key] = result
+            while len(self._results) > self.max_cache_size:
+                self._results.popitem(last=False)
+        return result
+
+    def _query_flat(self, box: Tuple[float, float, float, float], tolerance: float) -> np.ndarray:
+        x_min, y_min, x_max, y_max = box
+        bounds = self._bounds
+        index = np.flatnonzero(
+            (bounds[:, 0] <= x_max) & (bounds[:, 2] >= x_min) & (bounds[:, 1] <= y_max) & (bounds[:, 3] >= y_min)
+        )
+        geometries = self._get_flat_geometries(index)
+        geometries = geometries[shapely.intersects(geometries, shapely.box(*box))]
+        if tolerance > 0:
+            geometries = shapely.simplify(geometries, tolerance, preserve_topology=True)
+        return geometries
+
+
+# length of one degree at the equator
+METERS_PER_DEGREE = 111320.0
+
+# max map resolution (degrees per pixel) of each NaturalEarth scale, from fine to coarse.
+NATURAL_EARTH_SCALES: List[Tuple[str, float]] = [
+    ("10m", 0.01),
+    ("50m", 0.05),
+    ("110m", math.inf),
+]
+
+
+def get_map_resolution(ax: matplotlib.axes.Axes) -> Optional[float]:
+    """
+    Map resolution of a map axes in degrees per pixel at figure dpi.
+    Projection coordinates other than ``PlateCarree`` are converted from meters with degree length at the equator.
+    None if ``ax`` is not a ``GeoAxes``.
+    """
+    if not isinstance(ax, GeoAxes):
+        return None
+    x0, x1, y0, y1 = ax.get_extent()
+    resolution = min(abs(x1 - x0) / ax.bbox.width, abs(y1 - y0) / ax.bbox.height)
+    if not isinstance(ax.projection, ccrs.PlateCarree):
+        resolution = resolution / METERS_PER_DEGREE
+    return resolution
+
+
+def get_natural_earth_scale(resolution: float) -> str:
+    """
+    Coarsest NaturalEarth scale for a map resolution (degrees per pixel).
+    """
+    for scale, max_resolution in NATURAL_EARTH_SCALES:
+        if resolution <= max_resolution:
+            return scale
+    return NATURAL_EARTH_SCALES[-1][0]
+
+
+def get_simplify_tolerance(resolution: Optional[float], pixel_fraction: float = 0.5) -> float:
+    """
+    Simplification tolerance for a map resolution, ``pixel_fraction`` of a pixel rounded down to a power of 2.
+
+    Parameters
+    ----------
+    resolution
+        degrees per pixel. No simplification if not set.
+    pixel_fraction
+
+    Returns
+    -------
+    float
+        tolerance in degrees, 0 for no simplification.
+    """
+    if resolution is None or resolution <= 0:
+        return 0
+    return 2.0 ** math.floor(math.log2(resolution * pixel_fraction))
+
+
+def get_clip_box(area: AreaRange, margin: float = 0.05) -> Tuple[float, float, float, float]:
+    """
+    Clip box (x_min, y_min, x_max, y_max) of area extended by ``margin``, rounded so that
+    nearly equal areas share cached results.
+    """
+    x_margin = (area.end_longitude - area.start_longitude) * margin
+    y_margin = (area.end_latitude - area.start_latitude) * margin
+    return (
+        round(area.start_longitude - x_margin, 3),
+        round(area.start_latitude - y_margin, 3),
+        round(area.end_longitude + x_margin, 3),
+        round(area.end_latitude + y_margin, 3),
+    )
+
+
+_geometry_indexes: Dict[Tuple[str, Optional[str]], GeometryIndex] = dict()
+_geometry_indexes_lock = threading.Lock()
+
+
+def get_geometry_index(file_path: Union[str, Path], encoding: Optional[str] = None) -> GeometryIndex:
+    """
+    Get ``GeometryIndex`` of a shapefile, which is loaded once for each process.
+
+    Parameters
+    ----------
+    file_path
+    encoding
+        DBF encoding, such as GBK for CEMC shapefiles.
+
+    Returns
+    -------
+    GeometryIndex
+    """
+    key = (str(file_path), encoding)
+    with _geometry_indexes_lock:
+        index = _geometry_indexes.get(key)
+        if index is None:
+            index = GeometryIndex.from_file(file_path, encoding=encoding)
+            _geometry_indexes[key] = index
+    return index
+
+
+def freeze_geometry_indexes():
+    """
+    Freeze all loaded geometry indexes, see ``GeometryIndex.freeze``.
+    """
+    with _geometry_indexes_lock:
+        indexes = list(_geometry_indexes.values())
+    for index in indexes:
+        index.freeze()
+
+
+def clear_geometry_indexes():
+    with _geometry_indexes_lock:
+        _geometry_indexes.clear()
@@ -0,0 +1,260 @@
+"""
+Binary geometry cache of shapefiles.
+
+Reading a shapefile with ``cartopy.io.shapereader.Reader`` decodes records and builds geometries one by one in Python.
+A geometry cache file stores all geometries of a shapefile as WKB in one file, which is memory-mapped and
+loaded with vectorized ``shapely.from_wkb``. Pages of a cache file are shared by all processes mapping it.
+
+File layout (little endian)::
+
+    magic       8 bytes, b"CKGEOM01"
+    header size uint64
+    header      JSON (geometry count, source shapefile size and mtime), padded to 8 bytes
+    offsets     int64 array (count + 1), WKB start offset of each geometry in data
+    data        WKB bytes
+
+A cache file is used only if source shapefile's size and mtime are the same as in header.
+
+Cache files are found in ``CEDARKIT_MAPS_GEOMETRY_CACHE`` directory (see ``get_geometry_cache_path``),
+or next to shapefiles with ``.geom`` suffix. Create them with ``convert_shapefile`` or command line:
+
+.. code-block:: bash
+
+    cedarkit-maps geometry-cache --output-dir /path/to/cache
+"""
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Optional, Union, Dict, List
+
+import numpy as np
+import shapely
+from cartopy.io.shapereader import Reader
+
+
+GEOMETRY_CACHE_ENV = "CEDARKIT_MAPS_GEOMETRY_CACHE"
+
+GEOMETRY_CACHE_SUFFIX = ".geom"
+
+MAGIC = b"CKGEOM01"
+
+
+def get_source_stamp(file_path: Union[str, Path]) -> Dict:
+    stat = os.stat(file_path)
+    return dict(source_size=stat.st_size, source_mtime=stat.st_mtime_ns)
+
+
+def get_geometry_cache_path(file_path: Union[str, Path], cache_dir: Optional[Union[str, Path]] = None) -> Path:
+    """
+    Cache file path of a shapefile.
+
+    Parameters
+    ----------
+    file_path
+        shapefile path.
+    cache_dir
+        cache directory, file name contains hash of shapefile's absolute path. Default is next to the shapefile.
+
+    Returns
+    -------
+    Path
+    """
+    file_path = Path(file_path)
+    if cache_dir is None:
+        return file_path.with_suffix(GEOMETRY_CACHE_SUFFIX)
+    digest = hashlib.sha1(str(file_path.resolve()).encode("utf-8")).hexdigest()[:12]
+    return Path(cache_dir, f"{file_path.stem}-{digest}{GEOMETRY_CACHE_SUFFIX}")
+
+
+def find_geometry_cache(file_path: Union[str, Path]) -> Optional[Path]:
+    """
+    Existing cache file of a shapefile, in ``CEDARKIT_MAPS_GEOMETRY_CACHE`` directory or next to the shapefile.
+    """
+    cache_dir = os.environ.get(GEOMETRY_CACHE_ENV, "")
+    candidates = []
+    if cache_dir != "":
+        candidates.append(get_geometry_cache_path(file_path, cache_dir=cache_dir))
+    candidates.append(get_geometry_cache_path(file_path))
+    for path in candidates:
+        if path.is_file():
+            return path
+    return None
+
+
+def write_geometry_cache(
+        geometries: np.ndarray,
+        output_path: Union[str, Path],
+        source: Optional[Union[str, Path]] = None,
+):
+    """
+    Write geometries to a cache file.
+
+    Parameters
+    ----------
+    geometries
+        shapely geometry array.
+    output_path
+    source
+        source shapefile, whose size and mtime are checked when reading.
+    """
+    wkb = shapely.to_wkb(np.asarray(geometries, dtype=object))
+    offsets = np.zeros(len(wkb) + 1, dtype="<i8")
+    offsets[1:] = np.cumsum([len(item) for item in wkb])
+
+    header = dict(count=len(wkb))
+    if source is not None:
+        header.update(get_source_stamp(source))
+    header = json.dumps(header).encode("utf-8")
+    header += b" " * (-len(header) % 8)
+
+    output_path = Path(output_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    # write to a temporary file and rename, so that other processes never map a partial file.
+    temp_path = output_path.with_name(f".{output_path.name}.{os.getpid()}")
+    with open(temp_path, "wb") as f:
+        f.write(MAGIC)
+        f.write(np.uint64(len(header)).astype("<u8").tobytes())
+        f.write(header)
+        f.write(offsets.tobytes())
+        f.write(b"".join(wkb))
+    os.replace(temp_path, output_path)
+
+
+def read_geometry_cache(
+        cache_path: Union[str, Path],
+        source: Optional[Union[str, Path]] = None,
+) -> Optional[np.ndarray]:
+    """
+    Read geometries from a memory-mapped cache file.
+
+    Parameters
+    ----------
+    cache_path
+    source
+        source shapefile. None is returned if the cache file is not created from the current source.
+
+    Returns
+    -------
+    Optional[np.ndarray]
+        shapely geometry array, or None if cache file is invalid or out of date.
+    """
+    buffer = np.memmap(cache_path, dtype=np.uint8, mode="r")
+    if buffer[:len(MAGIC)].tobytes() != MAGIC:
+        return None
+    position = len(MAGIC)
+    header_size = int(buffer[position:position + 8].view("<u8")[0])
+    position += 8
+    header = json.loads(buffer[position:position + header_size].tobytes())
+    position += header_size
+    if source is not None:
+        stamp = get_source_stamp(source)
+        if any(header.get(key) != value for key, value in stamp.items()):
+            return None
+
+    count = header["count"]
+    offsets = buffer[position:position + (count + 1) * 8].view("<i8")
+    data = buffer[position + (count + 1) * 8:]
+    wkb = np.empty(count, dtype=object)
+    wkb[:] = [data[start:end].tobytes() for start, end in zip(offsets[:-1], offsets[1:])]
+    return shapely.from_wkb(wkb)
+
+
+def read_shapefile_geometries(file_path: Union[str, Path], encoding: Optional[str] = None) -> np.ndarray:
+    """
+    Non-empty geometries of a shapefile, from its cache file if it is up to date.
+
+    Parameters
+    ----------
+    file_path
+    encoding
+        DBF encoding, only used when reading shapefile.
+
+    Returns
+    -------
+    np.ndarray
+        shapely geometry array.
+    """
+    cache_path = find_geometry_cache(file_path)
+    if cache_path is not None:
+        geometries = read_geometry_cache(cache_path, source=file_path)
+        if geometries is not None:
+            return geometries
+
+    return _read_shapefile(file_path, encoding=encoding)
+
+
+def _read_shapefile(file_path: Union[str, Path], encoding: Optional[str] = None) -> np.ndarray:
+    kwargs = dict()
+    if encoding is not None:
+        kwargs["encoding"] = encoding
+    reader = Reader(file_path, **kwargs)
+    geometries = np.array([g for g in reader.geometries() if g is not None and not g.is_empty], dtype=object)
+    reader.close()
+    return geometries
+
+
+def convert_shapefile(
+        file_path: Union[str, Path],
+        output_path: Optional[Union[str, Path]] = None,
+        encoding: Optional[str] = None,
+) -> Path:
+    """
+    Convert a shapefile to a geometry cache file.
+
+    Parameters
+    ----------
+    file_path
+    output_path
+        default is ``get_geometry_cache_path`` with ``CEDARKIT_MAPS_GEOMETRY_CACHE`` directory if set.
+    encoding
+        DBF encoding.
+
+    Returns
+    -------
+    Path
+        cache file path.
+    """
+    if output_path is None:
+        cache_dir = os.environ.get(GEOMETRY_CACHE_ENV, "")
+        output_path = get_geometry_cache_path(file_path, cache_dir=cache_dir if cache_dir != "" else None)
+    geometries = _read_shapefile(file_path, encoding=encoding)
+    write_geometry_cache(geometries, output_path, source=file_path)
+    return Path(output_path)
+
+
+def convert_shapefiles(
+        paths: List[Union[str, Path]],
+        cache_dir: Optional[Union[str, Path]] = None,
+        encoding: Optional[str] = None,
+) -> List[Path]:
+    """
+    Convert shapefiles, or all shapefiles in directories recursively, to geometry cache files.
+
+    Parameters
+    ----------
+    paths
+        shapefiles or directories.
+    cache_dir
+        output directory, see ``get_geometry_cache_path``.
+    encoding
+
+    Returns
+    -------
+    List[Path]
+        cache file paths.
+    """
+    shapefiles = []
+    for path in paths:
+        path = Path(path)
+        if path.is_dir():
+            shapefiles.extend(sorted(path.rglob("*.shp")))
+        else:
+            shapefiles.append(path)
+    results = []
+    for file_path in shapefiles:
+        output_path = None
+        if cache_dir is not None:
+            output_path = get_geometry_cache_path(file_path, cache_dir=cache_dir)
+        results.append(convert_shapefile(file_path, output_path=output_path, encoding=encoding))
+    return results
@@ -0,0 +1,202 @@
+"""
+NaturalEarth data in a local directory.
+
+By default NaturalEarth shapefiles are found by ``cartopy.io.shapereader.natural_earth``,
+which downloads missing files. If a local NaturalEarth directory is configured, with ``natural_earth_dir``
+option of map loaders or ``CEDARKIT_MAPS_NATURAL_EARTH_DIR`` environment variable,
+all NaturalEarth features are loaded from the directory and missing files raise ``FileNotFoundError``.
+
+The directory uses Cartopy's layout (``shapefiles/natural_earth/{category}/ne_{scale}_{name}.shp``),
+so it can also be used as Cartopy's ``data_dir``. Provision it on a machine with network access,
+or from an existing Cartopy data directory, with ``provision_natural_earth`` or command line:
+
+.. code-block:: bash
+
+    cedarkit-maps natural-earth /path/to/natural_earth
+    cedarkit-maps natural-earth /path/to/natural_earth --source ~/.local/share/cartopy
+
+Geometry cache files (see ``geometry_cache``) are created for provisioned shapefiles.
+"""
+import os
+import shutil
+from pathlib import Path
+from typing import Optional, Union, List, Tuple
+
+import cartopy.crs as ccrs
+import cartopy.feature as cfeature
+from cartopy.io import shapereader
+
+from cedarkit.maps.util import AreaRange
+from .geometry import get_geometry_index
+from .geometry_cache import convert_shapefile, get_geometry_cache_path
+
+
+NATURAL_EARTH_DIR_ENV = "CEDARKIT_MAPS_NATURAL_EARTH_DIR"
+
+# (category, name) of NaturalEarth features used by map loaders and ``add_common_map_feature``.
+NATURAL_EARTH_FEATURES: List[Tuple[str, str]] = [
+    ("physical", "coastline"),
+    ("physical", "land"),
+    ("physical", "ocean"),
+    ("physical", "lakes"),
+    ("physical", "rivers_lake_centerlines"),
+]
+
+NATURAL_EARTH_SCALES: List[str] = ["10m", "50m", "110m"]
+
+SHAPEFILE_SUFFIXES = (".shp", ".shx", ".dbf", ".prj", ".cpg")
+
+
+def get_natural_earth_dir(data_dir: Optional[Union[str, Path]] = None) -> Optional[Path]:
+    """
+    Local NaturalEarth directory, ``data_dir`` or ``CEDARKIT_MAPS_NATURAL_EARTH_DIR``.
+    None if neither is set, and Cartopy's data directory (with downloading) is used.
+    """
+    if data_dir is None:
+        data_dir = os.environ.get(NATURAL_EARTH_DIR_ENV, "")
+        if data_dir == "":
+            return None
+    return Path(data_dir)
+
+
+def get_natural_earth_path(category: str, name: str, scale: str, data_dir: Union[str, Path]) -> Path:
+    return Path(data_dir, "shapefiles", "natural_earth", category, f"ne_{scale}_{name}.shp")
+
+
+def natural_earth_shapefile(
+        category: str,
+        name: str,
+        scale: str,
+        data_dir: Optional[Union[str, Path]] = None,
+) -> Path:
+    """
+    Path of a NaturalEarth shapefile.
+
+    Parameters
+    ----------
+    category
+    name
+    scale
+    data_dir
+        local NaturalEarth directory, see ``get_natural_earth_dir``.
+
+    Returns
+    -------
+    Path
+
+    Raises
+    ------
+    FileNotFoundError
+        the shapefile is not in local NaturalEarth directory.
+    """
+    data_dir = get_natural_earth_dir(data_dir)
+    if data_dir is None:
+        return Path(shapereader.natural_earth(resolution=scale, category=category, name=name))
+    file_path = get_natural_earth_path(category, name, scale, data_dir)
+    if not file_path.is_file():
+        raise FileNotFoundError(
+            f"NaturalEarth shapefile is not found: {file_path}, "
+            f"provision it with `cedarkit-maps natural-earth {data_dir}`."
+        )
+    return file_path
+
+
+def create_natural_earth_feature(
+        category: str,
+        name: str,
+        scale: str,
+        area: Optional[AreaRange] = None,
+        data_dir: Optional[Union[str, Path]] = None,
+        **kwargs
+) -> cfeature.Feature:
+    """
+    NaturalEarth feature with geometries from indexed shapefile.
+
+    Without ``area`` and local NaturalEarth directory, Cartopy's ``NaturalEarthFeature`` is returned.
+
+    Parameters
+    ----------
+    category
+    name
+    scale
+    area
+        only geometries in the area are loaded.
+    data_dir
+        local NaturalEarth directory, see ``get_natural_earth_dir``.
+    kwargs
+        feature style.
+
+    Returns
+    -------
+    cfeature.Feature
+    """
+    data_dir = get_natural_earth_dir(data_dir)
+    if area is None and data_dir is None:
+        return cfeature.NaturalEarthFeature(category, name, scale, **kwargs)
+    file_path = natural_earth_shapefile(category, name, scale, data_dir=data_dir)
+    geometries = get_geometry_index(file_path).query(area)
+    return cfeature.ShapelyFeature(geometries, ccrs.PlateCarree(), **kwargs)
+
+
+def provision_natural_earth(
+        data_dir: Union[str, Path],
+        scales: Optional[List[str]] = None,
+        features: Optional[List[Tuple[str, str]]] = None,
+        source_dir: Optional[Union[str, Path]] = None,
+        geometry_cache: bool = True,
+) -> List[Path]:
+    """
+    Copy or download NaturalEarth shapefiles into a local directory. Existing shapefiles are kept.
+
+    Parameters
+    ----------
+    data_dir
+        local NaturalEarth directory.
+    scales
+        default is ``NATURAL_EARTH_SCALES``.
+    features
+        (category, name) list, default is ``NATURAL_EARTH_FEATURES``.
+    source_dir
+        directory with the same layout to copy from, such as Cartopy's ``data_dir``.
+        Shapefiles are downloaded if not set.
+    geometry_cache
+        create geometry cache files next to shapefiles.
+
+    Returns
+    -------
+    List[Path]
+        shapefile paths.
+    """
+    if scales is None:
+        scales = NATURAL_EARTH_SCALES
+    if features is None:
+        features = NATURAL_EARTH_FEATURES
+
+    file_paths = []
+    for category, name in features:
+        for scale in scales:
+            file_path = get_natural_earth_path(category, name, scale, data_dir)
+            if not file_path.is_file():
+                if source_dir is not None:
+                    _copy_shapefile(get_natural_earth_path(category, name, scale, source_dir), file_path)
+                else:
+                    _download_shapefile(category, name, scale, file_path)
+            if geometry_cache:
+                convert_shapefile(file_path, output_path=get_geometry_cache_path(file_path))
+            file_paths.append(file_path)
+    return file_paths
+
+
+def _copy_shapefile(source_path: Path, file_path: Path):
+    if not source_path.is_file():
+        raise FileNotFoundError(f"NaturalEarth shapefile is not found: {source_path}")
+    file_path.parent.mkdir(parents=True, exist_ok=True)
+    for suffix in SHAPEFILE_SUFFIXES:
+        source_file = source_path.with_suffix(suffix)
+        if source_file.is_file():
+            shutil.copy2(source_file, file_path.with_suffix(suffix))
+
+
+def _download_shapefile(category: str, name: str, scale: str, file_path: Path):
+    downloader = shapereader.NEShpDownloader(target_path_template=str(file_path))
+    downloader.path(dict(category=category, name=name, resolution=scale))
@@ -1,15 +1,18 @@
 from dataclasses import dataclass
-from typing import Tuple, Union, List, Literal
+from typing import Tuple, Union, List, Literal, Optional
+
+import matplotlib.text
 
 from cedarkit.maps.chart import Layer
 from cedarkit.maps.util import (
     draw_map_box,
     GraphTitle,
     set_map_box_title,
+    MapBoxTitle,
     GraphColorbar,
     add_map_box_colorbar,
 )
-from cedarkit.maps.style import ContourStyle
+from cedarkit.maps.style import ContourStyle, ImageStyle
 
 
 @dataclass
@@ -38,7 +41,13 @@ class AxesComponentPainter:
             top_right_point=self.map_box_option.top_right_point,
         )
 
-    def add_title(self, layer: Layer, graph_title: GraphTitle):
+    def add_title(self, layer: Layer, graph_title: GraphTitle) -> List[matplotlib.text.Text]:
+        """
+        Add title texts to layer, or update strings of existing title texts in ``layer.title``.
+        """
+        if layer.title is not None:
+            return layer.title.update(graph_title).texts
+
         graph_title.left = self.map_box_option.bottom_left_point[0]
         graph_title.bottom = self.map_box_option.bottom_left_point[1] - 0.005
         graph_title.top = self.map_box_option.top_right_point[1]
@@ -46,21 +55,46 @@ class AxesComponentPainter:
         graph_title.main_pos = (0.5, 1.05)
 
         ax = layer.ax
-        set_map_box_title(
+        texts = set_map_box_title(
             ax,
             graph_title=graph_title,
         )
-
-    def add_colorbar(self, layer: Layer, style: Union[ContourStyle, List[ContourStyle]]):
+        layer.title = MapBoxTitle(*texts)
+        return texts
+
+    def add_colorbar(
+            self,
+            layer: Layer,
+            style: Union[ContourStyle, ImageStyle, List[Union[ContourStyle, ImageStyle]]],
+            levels: Optional[List] = None,
+    ):
+        """
+        Add colorbars of styles.
+
+        Parameters
+        ----------
+        layer
+        style
+            a style or a style list, one colorbar for each style.
+        levels
+            levels of each colorbar, a level list for one style or a list of level lists (or None) for a style list.
+            Levels are required for styles with automatic levels, such as levels of plot results
+            (see ``chart.get_graph_levels``). Default is ``levels`` of styles.
+        """
         color_bar_option = self.color_bar_option
         if color_bar_option.orientation == "vertical":
-            self.add_colorbar_vertical(layer=layer, style=style)
+            return self.add_colorbar_vertical(layer=layer, style=style, levels=levels)
         elif color_bar_option.orientation == "horizontal":
-            self.add_colorbar_horizontal(layer=layer, style=style)
+            return self.add_colorbar_horizontal(layer=layer, style=style, levels=levels)
         else:
             raise NotImplemented("horizontal is not supported")
 
-    def add_colorbar_vertical(self, layer: Layer, style: Union[ContourStyle, List[ContourStyle]]):
+    def add_colorbar_vertical(
+            self,
+            layer: Layer,
+            style: Union[ContourStyle, ImageStyle, List[Union[ContourStyle, ImageStyle]]],
+            levels: Optional[List] = None,
+    ):
         """
                                  |  | left_padding_to_map_box_right_bound
                                     ---
@@ -80,8 +114,7 @@ class AxesComponentPainter:
         ax = layer.ax
         color_bar_option = self.color_bar_option
 
-        if isinstance(style, ContourStyle):
-            style = [style]
+        style, levels = _get_colorbar_styles_and_levels(style, levels)
         count = len(style)
 
         total_height = color_bar_option.top_right_point[1] - color_bar_option.bottom_left_point[1]
@@ -96,16 +129,20 @@ class AxesComponentPainter:
 
         color_bars = []
 
-        for index, current_style in enumerate(style):
+        for index, (current_style, current_levels) in enumerate(zip(style, levels)):
             colorbar_box = [
                 color_bar_option.bottom_left_point[0],
                 color_bar_option.bottom_left_point[1] + index * height,
                 width, height - height_padding
             ]
 
+            if current_levels is None:
+                current_levels = current_style.levels
+            _, colormap, norm = current_style.get_colormap_norm(current_levels)
             graph_colorbar = GraphColorbar(
-                colormap=current_style.colors,
-                levels=current_style.levels,
+                colormap=colormap,
+                levels=current_levels,
+                norm=norm,
                 box=colorbar_box,
             )
 
@@ -126,7 +163,12 @@ class AxesComponentPainter:
             color_bars.append(color_bar)
         return color_bars
 
-    def add_colorbar_horizontal(self, layer: Layer, style: Union[ContourStyle, List[ContourStyle]]):
+    def add_colorbar_horizontal(
+            self,
+            layer: Layer,
+            style: Union[ContourStyle, ImageStyle, List[Union[ContourStyle, ImageStyle]]],
+            levels: Optional[List] = None,
+    ):
         """
                                  |  | left_padding_to_map_box_right_bound
 
@@ -149,8 +191,7 @@ class AxesComponentPainter:
         ax = layer.ax
         color_bar_option = self.color_bar_option
 
-        if isinstance(style, ContourStyle):
-            style = [style]
+        style, levels = _get_colorbar_styles_and_levels(style, levels)
         count = len(style)
 
         height = color_bar_option.top_right_point[1] - color_bar_option.bottom_left_point[1]
@@ -165,16 +206,20 @@ class AxesComponentPainter:
 
         color_bars = []
 
-        for index, current_style in enumerate(style):
+        for index, (current_style, current_levels) in enumerate(zip(style, levels)):
             colorbar_box = [
                 color_bar_option.bottom_left_point[0] + index * width,
                 color_bar_option.bottom_left_point[1],
                 width - width_padding, height
             ]
 
+            if current_levels is None:
+                current_levels = current_style.levels
+            _, colormap, norm = current_style.get_colormap_norm(current_levels)
             graph_colorbar = GraphColorbar(
-                colormap=current_style.colors,
-                levels=current_style.levels,
+                colormap=colormap,
+                levels=current_levels,
+                norm=norm,
                 box=colorbar_box,
                 orientation="horizontal",
             )
@@ -196,3 +241,16 @@ class AxesComponentPainter:
             color_bars.append(color_bar)
 
         return color_bars
+
+
+def _get_colorbar_styles_and_levels(
+        style: Union[ContourStyle, ImageStyle, List[Union[ContourStyle, ImageStyle]]],
+        levels: Optional[List] = None,
+) -> Tuple[List[Union[ContourStyle, ImageStyle]], List[Optional[List]]]:
+    if isinstance(style, (ContourStyle, ImageStyle)):
+        return [style], [levels]
+    if levels is None:
+        levels = [None] * len(style)
+    if len(levels) != len(style):
+        raise ValueError(f"levels count {len(levels)} is not equal to style count {len(style)}")
+    return style, levels
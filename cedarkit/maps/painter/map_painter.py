@@ -1,10 +1,20 @@
 import warnings
 
-from typing import TYPE_CHECKING, Dict, Optional
+from typing import TYPE_CHECKING, Dict, Optional, List, Tuple
 from dataclasses import dataclass, field
 
+import numpy as np
+import shapely
+import cartopy.crs as ccrs
+import cartopy.feature as cfeature
+from cartopy.mpl.geoaxes import GeoAxes
+from cartopy.mpl.path import shapely_to_path
+from matplotlib.collections import PathCollection
+from matplotlib.path import Path
+
 from cedarkit.maps.map import MapLoader
-from cedarkit.maps.util import add_map_info_text
+from cedarkit.maps.map.geometry import get_map_resolution
+from cedarkit.maps.util import AreaRange, add_map_info_text
 
 if TYPE_CHECKING:
     from cedarkit.maps.chart import Layer
@@ -35,6 +45,15 @@ class MapInfo:
 class MapPainter:
     """
     Paint map on Layer, including map features and map info text.
+
+    Attributes
+    ----------
+    level_of_detail
+        select level of detail of map features from map resolution of each layer (see ``get_layer_resolution``),
+        such as NaturalEarth scale for "auto" scale and simplified shapefile geometries.
+    batch_features
+        add map features as batched path collections (see ``add_batched_features``) instead of
+        one ``FeatureArtist`` for each feature.
     """
     map_loader: MapLoader
     coastline_config: MapFeatureConfig = field(default_factory=MapFeatureConfig)
@@ -48,75 +67,168 @@ class MapPainter:
     china_nine_lines_config: MapFeatureConfig = field(default_factory=MapFeatureConfig)
     global_borders_config: MapFeatureConfig = field(default_factory=MapFeatureConfig)
     map_info: Optional[MapInfo] = None
+    level_of_detail: bool = True
+    batch_features: bool = False
 
     def render_layer(self, layer: "Layer"):
         """
         Render map on layer according to configs.
+        Only map features in the layer's map area are loaded if the area is available (see ``get_layer_area``),
+        with level of detail for the layer's map resolution (see ``get_layer_resolution``).
 
         Parameters
         ----------
         layer
         """
+        features = self.get_features(area=self.get_layer_area(layer), resolution=self.get_layer_resolution(layer))
+        self.add_features_to_layer(layer=layer, features=features, batch=self.batch_features)
+
+    def get_features(
+            self, area: Optional[AreaRange] = None, resolution: Optional[float] = None
+    ) -> List[cfeature.Feature]:
+        """
+        Load map features to be rendered according to configs, in render order.
+
+        Features can be loaded once and added to many layers with ``add_features_to_layer``,
+        so that geometries cached in features are reused.
+
+        Parameters
+        ----------
+        area
+            only geometries intersecting the area are loaded, clipped to the area. All geometries are loaded if not set.
+        resolution
+            map resolution in degrees per pixel, used to select level of detail. Default level is used if not set.
+
+        Returns
+        -------
+        List[cfeature.Feature]
+        """
+        features = []
         if self.coastline_config.render:
-            self.coastline(layer=layer)
+            features.extend(self.map_loader.coastline(
+                **self.coastline_config.loader, area=area, resolution=resolution
+            ))
         if self.land_config.render:
-            self.land(layer=layer)
+            features.extend(self.map_loader.land(
+                **self.land_config.loader, area=area, resolution=resolution
+            ))
         if self.rivers_config.render:
-            self.rivers(layer=layer)
+            features.extend(self.map_loader.rivers(
+                **self.rivers_config.loader, area=area, resolution=resolution
+            ))
         if self.lakes_config.render:
-            self.lakes(layer=layer)
+            features.extend(self.map_loader.lakes(
+                **self.coastline_config.loader, area=area, resolution=resolution
+            ))
         if self.china_coastline_config.render:
-            self.china_coastline(layer=layer)
+            features.extend(self.map_loader.china_coastline(area=area, resolution=resolution))
         if self.china_borders_config.render:
-            self.china_borders(layer=layer)
+            features.extend(self.map_loader.china_borders(area=area, resolution=resolution))
         if self.china_provinces_config.render:
-            self.china_provinces(layer=layer)
+            features.extend(self.map_loader.china_provinces(area=area, resolution=resolution))
         if self.china_rivers_config.render:
-            self.china_rivers(layer=layer)
+            features.extend(self.map_loader.china_rivers(area=area, resolution=resolution))
         if self.china_nine_lines_config.render:
-            self.china_nine_lines(layer=layer)
+            features.extend(self.map_loader.china_nine_lines(area=area, resolution=resolution))
         if self.global_borders_config.render:
-            self.global_borders(layer=layer)
+            features.extend(self.map_loader.global_borders(area=area, resolution=resolution))
+        return features
+
+    @classmethod
+    def get_layer_area(cls, layer: "Layer") -> Optional[AreaRange]:
+        """
+        Map area of a layer in longitude and latitude, which is used to select map geometries.
+        None if the layer's map is not in ``PlateCarree`` coordinates.
+        """
+        if layer.projection != ccrs.PlateCarree():
+            return None
+        extent = layer.get_data_extent()
+        if extent is None:
+            return None
+        return AreaRange.from_tuple(extent)
+
+    def get_layer_resolution(self, layer: "Layer") -> Optional[float]:
+        """
+        Map resolution of a layer in degrees per pixel, see ``cedarkit.maps.map.geometry.get_map_resolution``.
+        None if ``level_of_detail`` is disabled or the layer is not a map.
+        """
+        if not self.level_of_detail:
+            return None
+        return get_map_resolution(layer.ax)
 
     def coastline(self, layer: "Layer"):
-        fs = self.map_loader.coastline(**self.coastline_config.loader)
-        self.add_features_to_layer(layer=layer, features=fs)
+        fs = self.map_loader.coastline(
+            **self.coastline_config.loader,
+            area=self.get_layer_area(layer),
+            resolution=self.get_layer_resolution(layer),
+        )
+        self.add_features_to_layer(layer=layer, features=fs, batch=self.batch_features)
 
     def land(self, layer: "Layer"):
-        fs = self.map_loader.land(**self.land_config.loader)
-        self.add_features_to_layer(layer=layer, features=fs)
+        fs = self.map_loader.land(
+            **self.land_config.loader,
+            area=self.get_layer_area(layer),
+            resolution=self.get_layer_resolution(layer),
+        )
+        self.add_features_to_layer(layer=layer, features=fs, batch=self.batch_features)
 
     def rivers(self, layer: "Layer"):
-        fs = self.map_loader.rivers(**self.rivers_config.loader)
-        self.add_features_to_layer(layer=layer, features=fs)
+        fs = self.map_loader.rivers(
+            **self.rivers_config.loader,
+            area=self.get_layer_area(layer),
+            resolution=self.get_layer_resolution(layer),
+        )
+        self.add_features_to_layer(layer=layer, features=fs, batch=self.batch_features)
 
     def lakes(self, layer: "Layer"):
-        fs = self.map_loader.lakes(**self.coastline_config.loader)
-        self.add_features_to_layer(layer=layer, features=fs)
+        fs = self.map_loader.lakes(
+            **self.coastline_config.loader,
+            area=self.get_layer_area(layer),
+            resolution=self.get_layer_resolution(layer),
+        )
+        self.add_features_to_layer(layer=layer, features=fs, batch=self.batch_features)
 
     def china_coastline(self, layer: "Layer"):
-        fs = self.map_loader.china_coastline()
-        self.add_features_to_layer(layer=layer, features=fs)
+        fs = self.map_loader.china_coastline(
+            area=self.get_layer_area(layer),
+            resolution=self.get_layer_resolution(layer),
+        )
+        self.add_features_to_layer(layer=layer, features=fs, batch=self.batch_features)
 
     def china_borders(self, layer: "Layer"):
-        fs = self.map_loader.china_borders()
-        self.add_features_to_layer(layer=layer, features=fs)
+        fs = self.map_loader.china_borders(
+            area=self.get_layer_area(layer),
+            resolution=self.get_layer_resolution(layer),
+        )
+        self.add_features_to_layer(layer=layer, features=fs, batch=self.batch_features)
 
     def china_provinces(self, layer: "Layer"):
-        fs = self.map_loader.china_provinces()
-        self.add_features_to_layer(layer=layer, features=fs)
+        fs = self.map_loader.china_provinces(
+            area=self.get_layer_area(layer),
+            resolution=self.get_layer_resolution(layer),
+        )
+        self.add_features_to_layer(layer=layer, features=fs, batch=self.batch_features)
 
     def china_rivers(self, layer: "Layer"):
-        fs = self.map_loader.china_rivers()
-        self.add_features_to_layer(layer=layer, features=fs)
+        fs = self.map_loader.china_rivers(
+            area=self.get_layer_area(layer),
+            resolution=self.get_layer_resolution(layer),
+        )
+        self.add_features_to_layer(layer=layer, features=fs, batch=self.batch_features)
 
     def china_nine_lines(self, layer: "Layer"):
-        fs = self.map_loader.china_nine_lines()
-        self.add_features_to_layer(layer=layer, features=fs)
+        fs = self.map_loader.china_nine_lines(
+            area=self.get_layer_area(layer),
+            resolution=self.get_layer_resolution(layer),
+        )
+        self.add_features_to_layer(layer=layer, features=fs, batch=self.batch_features)
 
     def global_borders(self, layer: "Layer"):
-        fs = self.map_loader.global_borders()
-        self.add_features_to_layer(layer=layer, features=fs)
+        fs = self.map_loader.global_borders(
+            area=self.get_layer_area(layer),
+            resolution=self.get_layer_resolution(layer),
+        )
+        self.add_features_to_layer(layer=layer, features=fs, batch=self.batch_features)
 
     def add_map_info(self, layer: "Layer"):
         """
@@ -139,7 +251,7 @@ class MapPainter:
         )
 
     @classmethod
-    def add_features_to_layer(cls, layer: "Layer", features):
+    def add_features_to_layer(cls, layer: "Layer", features, batch: bool = False):
         """
         Add map features to layer.
 
@@ -147,8 +259,13 @@ class MapPainter:
         ----------
         layer
         features
+        batch
+            add features with ``add_batched_features``.
         """
         ax = layer.ax
+        if batch:
+            add_batched_features(ax, features)
+            return
         for f in features:
             ax.add_feature(
                 f,
@@ -156,3 +273,63 @@ class MapPainter:
             )
 
 
+def add_batched_features(
+        ax: GeoAxes, features: List[cfeature.Feature], margin: float = 0.05
+) -> List[PathCollection]:
+    """
+    Add map features to a map axes as a few ``PathCollection``.
+
+    Geometries of all features are projected and clipped to the map extent (extended by ``margin``) once,
+    and paths of consecutive features with the same style are grouped into one collection,
+    instead of one ``FeatureArtist`` for each feature, which projects and clips geometries on every draw.
+    Only consecutive features are grouped, so features are drawn in the same order as ``FeatureArtist``.
+    Styles follow ``FeatureArtist``: feature style with default zorder 1.5, and facecolor "never" means "none".
+
+    Parameters
+    ----------
+    ax
+    features
+    margin
+        extension of clip box, in fraction of map extent width and height.
+
+    Returns
+    -------
+    List[PathCollection]
+        collections in drawing order.
+    """
+    x0, x1, y0, y1 = ax.get_extent()
+    x_margin = (x1 - x0) * margin
+    y_margin = (y1 - y0) * margin
+    box = (x0 - x_margin, y0 - y_margin, x1 + x_margin, y1 + y_margin)
+
+    # (style key, style, paths) of runs of consecutive features with the same style
+    groups: List[Tuple[Tuple, Dict, List[Path]]] = []
+    for feature in features:
+        style = dict(zorder=1.5)
+        style.update(feature.kwargs)
+        if isinstance(style.get("facecolor"), str) and style["facecolor"] == "never":
+            style["facecolor"] = "none"
+        if isinstance(feature, cfeature.ShapelyFeature):
+            geometries = list(feature.geometries())
+        else:
+            geometries = list(feature.intersecting_geometries(ax.get_extent(feature.crs)))
+        if ax.projection != feature.crs:
+            geometries = [ax.projection.project_geometry(g, feature.crs) for g in geometries]
+        geometries = shapely.clip_by_rect(np.array(geometries, dtype=object), *box)
+        paths = [shapely_to_path(g) for g in geometries if not g.is_empty]
+
+        key = tuple(sorted((name, repr(value)) for name, value in style.items()))
+        if len(groups) > 0 and groups[-1][0] == key:
+            groups[-1][2].extend(paths)
+        else:
+            groups.append((key, style, paths))
+
+    collections = []
+    for _, style, paths in groups:
+        if len(paths) == 0:
+            continue
+        collection = PathCollection(paths, transform=ax.transData, **style)
+        collection.set_clip_path(ax.patch)
+        ax.add_collection(collection, autolim=False)
+        collections.append(collection)
+    return collections
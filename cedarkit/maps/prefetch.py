@@ -0,0 +1,209 @@
+"""
+Prefetch fields for a list of products.
+
+Products of one forecast cycle often share variables (such as MSLP used in several charts) and plot on
+templates whose areas overlap. ``PrefetchPlanner`` collects the union of required variables and sub-regions
+so that each variable-region is read only once, and ``FieldPrefetcher`` serves every product from in-memory
+views of the loaded subsets.
+"""
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Tuple, Union, TYPE_CHECKING
+
+import xarray as xr
+
+from cedarkit.maps.util import AreaRange, select_area
+
+if TYPE_CHECKING:
+    from cedarkit.maps.domains import MapTemplate
+
+
+@dataclass
+class ProductRequest:
+    """
+    Data requirements of one product.
+
+    Attributes
+    ----------
+    name
+        product name, such as ``t2m``.
+    variables
+        variable names required by the product, such as ``["msl", "10u", "10v"]``.
+    domains
+        templates or area ranges the product is plotted on. ``MapTemplate.total_area()`` is used for templates.
+    """
+    name: str
+    variables: List[str]
+    domains: List[Union["MapTemplate", AreaRange]] = field(default_factory=list)
+
+    def areas(self) -> List[AreaRange]:
+        areas = []
+        for domain in self.domains:
+            if isinstance(domain, AreaRange):
+                areas.append(domain)
+            else:
+                areas.append(domain.total_area())
+        return areas
+
+
+@dataclass
+class PrefetchPlan:
+    """
+    Variable-regions to be read.
+
+    Attributes
+    ----------
+    regions
+        merged regions for each variable. Regions of one variable do not intersect each other.
+    margin
+        margin in degrees added around each requested area.
+    """
+    regions: Dict[str, List[AreaRange]] = field(default_factory=dict)
+    margin: float = 0.0
+
+    def subsets(self) -> List[Tuple[str, AreaRange]]:
+        """
+        All (variable, region) pairs, which is also the count of read operations.
+        """
+        return [(variable, region) for variable, regions in self.regions.items() for region in regions]
+
+    def find_region(self, variable: str, area: AreaRange) -> AreaRange:
+        """
+        Find the planned region covering ``area`` for ``variable``. Longitudes of ``area`` may use
+        either [-180, 180] or [0, 360] convention.
+        """
+        if variable not in self.regions:
+            raise KeyError(f"variable is not in plan: {variable}")
+        for region in self.regions[variable]:
+            if region.contains(area):
+                return region
+        raise ValueError(f"area is not covered by plan for variable {variable}: {area}")
+
+
+class PrefetchPlanner:
+    """
+    Merge data requirements of products into a ``PrefetchPlan``.
+
+    Requested areas (expanded by ``margin``) of one variable are merged while they intersect,
+    so one read is planned for each group of overlapping areas. Longitudes are normalized
+    (see ``AreaRange.normalize_longitude``), so areas in [-180, 180] and [0, 360] conventions are merged.
+    """
+    def __init__(self, products: List[ProductRequest], margin: float = 1.0):
+        self.products = products
+        self.margin = margin
+
+    def plan(self) -> PrefetchPlan:
+        requested: Dict[str, List[AreaRange]] = dict()
+        for product in self.products:
+            areas = [area.expand(self.margin).normalize_longitude() for area in product.areas()]
+            for variable in product.variables:
+                requested.setdefault(variable, []).extend(areas)
+
+        regions = {variable: merge_areas(areas) for variable, areas in requested.items()}
+        return PrefetchPlan(regions=regions, margin=self.margin)
+
+
+def merge_areas(areas: List[AreaRange]) -> List[AreaRange]:
+    """
+    Merge intersecting area ranges into their bounding boxes until no two ranges intersect.
+    Longitudes are compared on the circle, see ``AreaRange.intersects`` and ``AreaRange.union``.
+
+    Parameters
+    ----------
+    areas
+
+    Returns
+    -------
+    List[AreaRange]
+    """
+    merged = list(areas)
+    changed = True
+    while changed:
+        changed = False
+        result = []
+        for area in merged:
+            for index, current in enumerate(result):
+                if current.intersects(area):
+                    result[index] = current.union(area)
+                    changed = True
+                    break
+            else:
+                result.append(area)
+        merged = result
+    return merged
+
+
+FieldLoader = Callable[[str, AreaRange], xr.DataArray]
+
+
+class FieldPrefetcher:
+    """
+    Read each variable-region in a ``PrefetchPlan`` once and serve products from in-memory views.
+
+    Parameters
+    ----------
+    plan
+    loader
+        function ``loader(variable, area) -> xr.DataArray`` to read one variable-region.
+        The loader may return a larger field, which is subset by area after loading.
+    max_workers
+        thread count for loading. Loads run sequentially if not set.
+
+    Examples
+    --------
+    >>> planner = PrefetchPlanner(products=[
+    ...     ProductRequest(name="t2m", variables=["2t"], domains=[EastAsiaMapTemplate(), NorthPolarMapTemplate()]),
+    ...     ProductRequest(name="mslp", variables=["msl"], domains=[EastAsiaMapTemplate()]),
+    ... ])
+    >>> prefetcher = FieldPrefetcher(plan=planner.plan(), loader=load_field)
+    >>> prefetcher.load()
+    >>> field = prefetcher.get_field("2t", EastAsiaMapTemplate().total_area())
+    """
+    def __init__(self, plan: PrefetchPlan, loader: FieldLoader, max_workers: Optional[int] = None):
+        self.plan = plan
+        self.loader = loader
+        self.max_workers = max_workers
+        self.fields: Dict[Tuple[str, Tuple[float, float, float, float]], xr.DataArray] = dict()
+
+    def load(self) -> "FieldPrefetcher":
+        subsets = [s for s in self.plan.subsets() if self._key(*s) not in self.fields]
+        if self.max_workers is None:
+            results = [self._load_subset(subset) for subset in subsets]
+        else:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                results = list(executor.map(self._load_subset, subsets))
+
+        for (variable, region), data in zip(subsets, results):
+            self.fields[self._key(variable, region)] = data
+        return self
+
+    def get_field(self, variable: str, area: AreaRange) -> xr.DataArray:
+        """
+        Get field of ``variable`` in ``area`` (expanded by plan margin) from loaded subsets.
+        """
+        area = area.expand(self.plan.margin)
+        region = self.plan.find_region(variable, area)
+        key = self._key(variable, region)
+        if key not in self.fields:
+            self.fields[key] = self._load_subset((variable, region))
+        return select_area(self.fields[key], area)
+
+    def get_product_fields(self, product: ProductRequest, domain_index: int = 0) -> Dict[str, xr.DataArray]:
+        """
+        Get all fields required by one product on one of its domains.
+        """
+        area = product.areas()[domain_index]
+        return {variable: self.get_field(variable, area) for variable in product.variables}
+
+    def clear(self):
+        self.fields.clear()
+
+    def _load_subset(self, subset: Tuple[str, AreaRange]) -> xr.DataArray:
+        variable, region = subset
+        data = self.loader(variable, region)
+        data = select_area(data, region)
+        return data.load()
+
+    @staticmethod
+    def _key(variable: str, region: AreaRange) -> Tuple[str, Tuple[float, float, float, float]]:
+        return variable, region.to_tuple()
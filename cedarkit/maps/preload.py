@@ -0,0 +1,185 @@
+"""
+Warm up caches of templates and styles, such as at render worker start.
+
+The first figure of a template is much slower than later ones: modules are imported, shapefiles are read
+and indexed, map geometries are projected to paths, fonts are loaded and colormaps are parsed.
+``warmup`` creates and draws an empty panel of each template and builds colormaps of each style,
+so that these costs are paid once before forking workers or serving requests.
+
+.. code-block:: python
+
+    import cedarkit.maps
+
+    report = cedarkit.maps.warmup(templates=["east_asia", "cn_area"], styles=["t2m", "mslp"])
+    print(report)
+
+Before forking worker processes, call ``prepare_fork`` to keep caches shared with workers (copy-on-write):
+geometry indexes are converted to flat arrays (see ``map.geometry.GeometryIndex.freeze``), and loaded objects are
+moved to the permanent generation with ``gc.freeze``, so that garbage collections in workers don't write to their pages.
+"""
+import gc
+import importlib
+import time
+from dataclasses import dataclass, field
+from typing import List, Optional, Union, Type, TYPE_CHECKING
+
+import matplotlib.pyplot as plt
+
+if TYPE_CHECKING:
+    from cedarkit.maps.domains import MapTemplate
+    from cedarkit.maps.style import Style
+
+
+# modules imported by render workers.
+WARMUP_MODULES = [
+    "cedarkit.maps.chart",
+    "cedarkit.maps.domains",
+    "cedarkit.maps.graph",
+    "cedarkit.maps.contour",
+    "cedarkit.maps.style.registry",
+    "cedarkit.maps.render",
+]
+
+
+@dataclass
+class WarmupStep:
+    """
+    Attributes
+    ----------
+    kind
+        "imports", "template" or "style".
+    name
+    create_time
+        seconds to import modules, create template panel or resolve style.
+    draw_time
+        seconds to draw template panel, or to build style colormap.
+    """
+    kind: str
+    name: str
+    create_time: float = 0
+    draw_time: float = 0
+
+    @property
+    def total_time(self) -> float:
+        return self.create_time + self.draw_time
+
+
+@dataclass
+class WarmupReport:
+    steps: List[WarmupStep] = field(default_factory=list)
+
+    @property
+    def total_time(self) -> float:
+        return sum(step.total_time for step in self.steps)
+
+    def __str__(self) -> str:
+        lines = [f"{'kind':<9} {'name':<32} {'create':>7} {'draw':>7} {'total':>7}"]
+        for step in self.steps:
+            lines.append(
+                f"{step.kind:<9} {step.name:<32} "
+                f"{step.create_time:>7.2f} {step.draw_time:>7.2f} {step.total_time:>7.2f}"
+            )
+        lines.append(f"{'total':<42} {'':>7} {'':>7} {self.total_time:>7.2f}")
+        return "\n".join(lines)
+
+
+def warmup(
+        templates: Optional[List[Union[str, Type["MapTemplate"], "MapTemplate"]]] = None,
+        styles: Optional[List[Union[str, "Style"]]] = None,
+) -> WarmupReport:
+    """
+    Preload caches used by templates and styles.
+
+    For each template, an empty panel is created and drawn, which loads map loaders, geometry indexes,
+    projected feature paths, gridlines and fonts. Caches are process-wide and kept after the panel is closed.
+
+    Parameters
+    ----------
+    templates
+        template names in ``render.TEMPLATE_NAMES`` or import paths (such as ``cedarkit.maps.domains:CnAreaMapTemplate``),
+        template classes or template objects.
+    styles
+        style references (see ``render.resolve_style``) or style objects.
+        Colormaps and norms of filled contour and image styles are built.
+
+    Returns
+    -------
+    WarmupReport
+        time of each step.
+    """
+    report = WarmupReport()
+
+    start_time = time.perf_counter()
+    for module_name in WARMUP_MODULES:
+        importlib.import_module(module_name)
+    import_time = time.perf_counter() - start_time
+    report.steps.append(WarmupStep(kind="imports", name="cedarkit.maps", create_time=import_time))
+
+    for template in templates or []:
+        report.steps.append(_warmup_template(template))
+
+    for style in styles or []:
+        report.steps.append(_warmup_style(style))
+
+    return report
+
+
+def _warmup_template(template: Union[str, Type["MapTemplate"], "MapTemplate"]) -> WarmupStep:
+    from cedarkit.maps.chart import Panel
+    from cedarkit.maps.render import create_template
+
+    start_time = time.perf_counter()
+    if isinstance(template, str):
+        name = template
+        template = create_template(template)
+    elif isinstance(template, type):
+        name = template.__name__
+        template = template()
+    else:
+        name = type(template).__name__
+    panel = Panel(domain=template)
+    create_time = time.perf_counter() - start_time
+
+    start_time = time.perf_counter()
+    panel.fig.canvas.draw()
+    draw_time = time.perf_counter() - start_time
+    plt.close(panel.fig)
+    return WarmupStep(kind="template", name=name, create_time=create_time, draw_time=draw_time)
+
+
+def _warmup_style(style: Union[str, "Style"]) -> WarmupStep:
+    from cedarkit.maps.render import resolve_style
+    from cedarkit.maps.style import ContourStyle, ImageStyle
+
+    start_time = time.perf_counter()
+    if isinstance(style, str):
+        name = style
+        style = resolve_style(style)
+    else:
+        name = type(style).__name__
+    create_time = time.perf_counter() - start_time
+
+    start_time = time.perf_counter()
+    if isinstance(style, (ContourStyle, ImageStyle)) and style.levels is not None:
+        if isinstance(style, ImageStyle) or style.fill:
+            style.get_colormap_norm()
+    draw_time = time.perf_counter() - start_time
+    return WarmupStep(kind="style", name=name, create_time=create_time, draw_time=draw_time)
+
+
+def prepare_fork(gc_freeze: bool = True):
+    """
+    Prepare loaded caches to be shared with forked worker processes.
+
+    Parameters
+    ----------
+    gc_freeze
+        collect garbage and freeze all tracked objects with ``gc.freeze``.
+        Call ``gc.unfreeze`` in parent process if it keeps loading templates after forking.
+    """
+    from cedarkit.maps.map.geometry import freeze_geometry_indexes
+
+    freeze_geometry_indexes()
+    if gc_freeze:
+        gc.collect()
+        gc.freeze()
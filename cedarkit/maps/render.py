@@ -0,0 +1,638 @@
+"""
+Batch rendering of products described by a manifest file (YAML or JSON).
+
+Example manifest:
+
+.. code-block:: yaml
+
+    workers: 4
+    retries: 1
+    defaults:
+      template: east_asia
+      dpi: 150
+      title:
+        system_name: CMA-GFS
+        start_time: 2024-11-09 00:00
+    products:
+      - name: t2m_024
+        style: myproducts.styles:t2m_style  # or registered style name, or styles.yaml#t2m
+        field:
+          path: data/gfs_024.nc
+          variable: t2m
+        title:
+          graph_name: 2m Temperature (C)
+          forecast_time: 24h
+        output: output/t2m_024.png
+      - name: wind_850_024
+        template: cn_area
+        area: [100, 125, 20, 40]
+        plots:
+          - style: myproducts.styles:t850_style
+            field: {path: data/gfs_024.nc, variable: t, sel: {level: 850}}
+          - style: myproducts.styles:wind_style
+            field:
+              - {path: data/gfs_024.nc, variable: u, sel: {level: 850}}
+              - {path: data/gfs_024.nc, variable: v, sel: {level: 850}}
+        colorbar: false
+        output: output/wind_850_024.png
+
+Items in ``defaults`` are used for products without these items (``title`` is merged).
+Relative paths are relative to the manifest file.
+
+A product is skipped if its output exists and neither the product config nor its input files changed since
+the last render. Input files are compared by modification time and size, and by SHA-256 hash when modification
+time changes. Render states are saved in a state file (default is ``<manifest>.state.json``).
+"""
+import gc
+import hashlib
+import importlib
+import json
+import os
+import multiprocessing
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field, asdict
+from pathlib import Path
+from typing import Optional, List, Dict, Any, Union, Tuple, TYPE_CHECKING
+
+import pandas as pd
+import xarray as xr
+import matplotlib.pyplot as plt
+
+from cedarkit.maps.style import Style, ContourStyle, ImageStyle
+from cedarkit.maps.style.registry import get_style, load_registered_style, parse_style_reference
+from cedarkit.maps.util import AreaRange
+from cedarkit.maps.chart import Panel, get_graph_levels
+
+if TYPE_CHECKING:
+    from cedarkit.maps.preload import WarmupReport
+
+
+TEMPLATE_NAMES = {
+    "east_asia": "cedarkit.maps.domains:EastAsiaMapTemplate",
+    "cn_area": "cedarkit.maps.domains:CnAreaMapTemplate",
+    "north_polar": "cedarkit.maps.domains:NorthPolarMapTemplate",
+    "europe_asia": "cedarkit.maps.domains:EuropeAsiaMapTemplate",
+    "global": "cedarkit.maps.domains:GlobalMapTemplate",
+    "global_area": "cedarkit.maps.domains:GlobalAreaMapTemplate",
+}
+
+
+@dataclass
+class FieldSource:
+    """
+    Where to load one field.
+
+    Attributes
+    ----------
+    path
+        data file opened with ``xarray.open_dataset``.
+    variable
+        variable name in dataset.
+    engine
+        xarray engine, such as ``netcdf4`` or ``cfgrib``.
+    sel
+        options for ``DataArray.sel``.
+    isel
+        options for ``DataArray.isel``.
+    loader
+        import path of a load function (``module:function``) which is called with ``options`` and returns
+        a ``DataArray``. ``path`` is passed to the function if set.
+    options
+    inputs
+        additional input files to check whether output is up to date, mostly used with ``loader``.
+    """
+    path: Optional[str] = None
+    variable: Optional[str] = None
+    engine: Optional[str] = None
+    sel: Optional[Dict[str, Any]] = None
+    isel: Optional[Dict[str, Any]] = None
+    loader: Optional[str] = None
+    options: Dict[str, Any] = field(default_factory=dict)
+    inputs: List[str] = field(default_factory=list)
+
+    def input_paths(self) -> List[str]:
+        paths = list(self.inputs)
+        if self.path is not None:
+            paths.insert(0, self.path)
+        return paths
+
+    def load(self) -> xr.DataArray:
+        if self.loader is not None:
+            function = import_object(self.loader)
+            kwargs = dict(self.options)
+            if self.path is not None:
+                kwargs["path"] = self.path
+            return self._select(function(**kwargs))
+
+        if self.path is None or self.variable is None:
+            raise ValueError("path and variable are required without loader")
+        with xr.open_dataset(self.path, engine=self.engine, **self.options) as ds:
+            return self._select(ds[self.variable]).load()
+
+    def _select(self, data: xr.DataArray) -> xr.DataArray:
+        if self.isel is not None:
+            data = data.isel(self.isel)
+        if self.sel is not None:
+            data = data.sel(self.sel)
+        return data
+
+
+@dataclass
+class PlotItem:
+    """
+    One plot in a product, ``field`` is a list for plots requiring several fields (such as barbs).
+    """
+    style: str
+    field: Union[FieldSource, List[FieldSource]]
+
+    def sources(self) -> List[FieldSource]:
+        if isinstance(self.field, list):
+            return self.field
+        return [self.field]
+
+
+@dataclass
+class ProductTitle:
+    graph_name: str = ""
+    system_name: str = ""
+    start_time: Optional[str] = None
+    forecast_time: Optional[str] = None
+
+
+@dataclass
+class RenderProduct:
+    """
+    A product to be rendered into one image.
+
+    Attributes
+    ----------
+    name
+    template
+        template name in ``TEMPLATE_NAMES`` or import path of a template class.
+    output
+        output image path.
+    plots
+    area
+        map area (start longitude, end longitude, start latitude, end latitude), default is template's area.
+    title
+    colorbar
+        add colorbar of filled contour styles.
+    dpi
+    retries
+        retry count if rendering fails.
+    """
+    name: str
+    template: str
+    output: str
+    plots: List[PlotItem]
+    area: Optional[Tuple[float, float, float, float]] = None
+    title: Optional[ProductTitle] = None
+    colorbar: bool = True
+    dpi: Optional[float] = None
+    retries: int = 0
+
+    def input_paths(self) -> List[str]:
+        paths = []
+        for plot in self.plots:
+            style_path, _ = parse_style_reference(plot.style)
+            if style_path is not None and style_path not in paths:
+                paths.append(style_path)
+            for source in plot.sources():
+                for path in source.input_paths():
+                    if path not in paths:
+                        paths.append(path)
+        return paths
+
+    def config_hash(self) -> str:
+        config = json.dumps(asdict(self), sort_keys=True, default=str)
+        return hashlib.sha256(config.encode()).hexdigest()
+
+
+@dataclass
+class RenderManifest:
+    products: List[RenderProduct]
+    workers: int = 1
+    state_path: Optional[str] = None
+
+
+@dataclass
+class ProductResult:
+    """
+    Render result of one product. Times are in seconds.
+
+    Attributes
+    ----------
+    status
+        "rendered", "skipped" or "failed".
+    """
+    name: str
+    output: str
+    status: str
+    attempts: int = 0
+    load_time: float = 0.0
+    plot_time: float = 0.0
+    save_time: float = 0.0
+    total_time: float = 0.0
+    error: Optional[str] = None
+    stamp: Optional[Dict[str, Any]] = None
+
+
+def import_object(path: str) -> Any:
+    """
+    Import object from a path like ``package.module:name``.
+    """
+    module_name, _, attribute = path.partition(":")
+    if attribute == "":
+        raise ValueError(f"import path should be module:name, got {path}")
+    obj = importlib.import_module(module_name)
+    for name in attribute.split("."):
+        obj = getattr(obj, name)
+    return obj
+
+
+def resolve_style(reference: str) -> Style:
+    """
+    Get style from a reference, which is one of:
+
+    * style name in the default style registry, such as ``mslp``
+    * style file and style name, such as ``styles/products.yaml#t2m``
+    * import path, such as ``myproducts.styles:t2m_style``
+    """
+    path, name = parse_style_reference(reference)
+    if path is not None:
+        return load_registered_style(name, str(Path(path).resolve()))
+    if ":" not in reference:
+        return get_style(reference)
+
+    style = import_object(reference)
+    if callable(style) and not isinstance(style, Style):
+        style = style()
+    return style
+
+
+def create_template(name: str, area: Optional[Tuple[float, float, float, float]] = None):
+    template_class = import_object(TEMPLATE_NAMES.get(name, name))
+    if area is None:
+        return template_class()
+    return template_class(area=AreaRange.from_tuple(tuple(area)))
+
+
+# -----------------
+# Manifest parsing
+# -----------------
+
+def load_manifest(path: Union[str, Path]) -> RenderManifest:
+    """
+    Load manifest from a YAML (requires ``pyyaml``) or JSON file.
+
+    Parameters
+    ----------
+    path
+
+    Returns
+    -------
+    RenderManifest
+    """
+    path = Path(path)
+    with open(path) as f:
+        if path.suffix.lower() in (".yaml", ".yml"):
+            try:
+                import yaml
+            except ImportError as e:
+                raise ImportError("pyyaml is required to load YAML manifest, install it with `pip install pyyaml`") from e
+            config = yaml.safe_load(f)
+        else:
+            config = json.load(f)
+
+    manifest = parse_manifest(config, base_dir=path.parent)
+    if manifest.state_path is None:
+        manifest.state_path = str(path.with_name(path.stem + ".state.json"))
+    return manifest
+
+
+def parse_manifest(config: Dict[str, Any], base_dir: Optional[Path] = None) -> RenderManifest:
+    """
+    Create manifest from a config dict, see module docs for the format.
+    """
+    defaults = config.get("defaults", dict())
+    retries = config.get("retries", 0)
+    products = []
+    for item in config["products"]:
+        item = {**defaults, **item}
+        if "title" in defaults and "title" in item:
+            item["title"] = {**defaults["title"], **item["title"]}
+        item.setdefault("retries", retries)
+        products.append(_parse_product(item, base_dir=base_dir))
+
+    state_path = config.get("state")
+    if state_path is not None:
+        state_path = _resolve_path(state_path, base_dir)
+    return RenderManifest(
+        products=products,
+        workers=config.get("workers", 1),
+        state_path=state_path,
+    )
+
+
+def _parse_product(item: Dict[str, Any], base_dir: Optional[Path]) -> RenderProduct:
+    if "plots" in item:
+        plots = item["plots"]
+    else:
+        plots = [dict(style=item["style"], field=item["field"])]
+
+    title = item.get("title")
+    if title is not None:
+        title = ProductTitle(**{key: str(value) for key, value in title.items()})
+
+    area = item.get("area")
+    return RenderProduct(
+        name=item.get("name", Path(item["output"]).stem),
+        template=item["template"],
+        output=_resolve_path(item["output"], base_dir),
+        plots=[
+            PlotItem(style=_parse_style(plot["style"], base_dir), field=_parse_field(plot["field"], base_dir))
+            for plot in plots
+        ],
+        area=tuple(area) if area is not None else None,
+        title=title,
+        colorbar=item.get("colorbar", True),
+        dpi=item.get("dpi"),
+        retries=item.get("retries", 0),
+    )
+
+
+def _parse_style(reference: str, base_dir: Optional[Path]) -> str:
+    path, name = parse_style_reference(reference)
+    if path is None:
+        return reference
+    return f"{_resolve_path(path, base_dir)}#{name}"
+
+
+def _parse_field(item: Union[Dict, List], base_dir: Optional[Path]) -> Union[FieldSource, List[FieldSource]]:
+    if isinstance(item, list):
+        return [_parse_field(i, base_dir) for i in item]
+    source = FieldSource(**item)
+    if source.path is not None:
+        source.path = _resolve_path(source.path, base_dir)
+    source.inputs = [_resolve_path(p, base_dir) for p in source.inputs]
+    return source
+
+
+def _resolve_path(path: str, base_dir: Optional[Path]) -> str:
+    path = Path(path)
+    if base_dir is not None and not path.is_absolute():
+        path = base_dir / path
+    return str(path)
+
+
+# -----------------
+# Up-to-date check
+# -----------------
+
+def file_hash(path: Union[str, Path], chunk_size: int = 1 << 20) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(chunk_size):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+# SHA-256 of input files keyed by (path, mtime, size), shared by products with the same input files.
+_file_hashes: Dict[Tuple[str, float, int], str] = dict()
+
+
+def get_file_hash(path: Union[str, Path], stat: Optional[os.stat_result] = None) -> str:
+    """
+    SHA-256 of a file, which is hashed once for each modification time and size in a process.
+    Hashes computed before forking workers are shared with workers.
+    """
+    if stat is None:
+        stat = Path(path).stat()
+    key = (str(path), stat.st_mtime, stat.st_size)
+    digest = _file_hashes.get(key)
+    if digest is None:
+        digest = file_hash(path)
+        _file_hashes[key] = digest
+    return digest
+
+
+def get_product_stamp(product: RenderProduct) -> Dict[str, Any]:
+    """
+    Config hash and (mtime, size, SHA-256) of input files of a product.
+    """
+    inputs = dict()
+    for path in product.input_paths():
+        stat = Path(path).stat()
+        inputs[path] = dict(mtime=stat.st_mtime, size=stat.st_size, sha256=get_file_hash(path, stat))
+    return dict(config=product.config_hash(), inputs=inputs)
+
+
+def is_up_to_date(product: RenderProduct, stamp: Optional[Dict[str, Any]]) -> bool:
+    """
+    Check whether output of a product is up to date with the stamp saved in last render.
+    Input files are hashed only when their modification time or size changes. Stamp is updated with
+    new modification times if file contents are not changed.
+    """
+    if stamp is None or not Path(product.output).exists():
+        return False
+    if stamp.get("config") != product.config_hash():
+        return False
+
+    inputs = stamp.get("inputs", dict())
+    paths = product.input_paths()
+    if set(paths) != set(inputs):
+        return False
+    for path in paths:
+        input_path = Path(path)
+        if not input_path.exists():
+            return False
+        stat = input_path.stat()
+        record = inputs[path]
+        if stat.st_mtime == record["mtime"] and stat.st_size == record["size"]:
+            continue
+        if stat.st_size != record["size"] or get_file_hash(path, stat) != record["sha256"]:
+            return False
+        record["mtime"] = stat.st_mtime
+    return True
+
+
+def load_state(path: Optional[Union[str, Path]]) -> Dict[str, Any]:
+    if path is None or not Path(path).exists():
+        return dict()
+    with open(path) as f:
+        return json.load(f)
+
+
+def save_state(path: Optional[Union[str, Path]], state: Dict[str, Any]):
+    if path is None:
+        return
+    tmp_path = Path(str(path) + ".tmp")
+    with open(tmp_path, "w") as f:
+        json.dump(state, f, indent=2)
+    tmp_path.replace(path)
+
+
+# -----------------
+# Rendering
+# -----------------
+
+def render_product(product: RenderProduct) -> ProductResult:
+    """
+    Render one product with retries. Errors are caught and returned in result.
+
+    Parameters
+    ----------
+    product
+
+    Returns
+    -------
+    ProductResult
+    """
+    result = ProductResult(name=product.name, output=product.output, status="failed")
+    start_time = time.perf_counter()
+    while result.attempts <= product.retries:
+        result.attempts += 1
+        try:
+            if result.stamp is None:
+                # input files are not hashed again for retries.
+                result.stamp = get_product_stamp(product)
+            _render_product_once(product, result)
+            result.status = "rendered"
+            result.error = None
+            break
+        except Exception:
+            result.error = traceback.format_exc()
+        finally:
+            plt.close("all")
+    result.total_time = time.perf_counter() - start_time
+    return result
+
+
+def _render_product_once(product: RenderProduct, result: ProductResult):
+    start_time = time.perf_counter()
+    plots = []
+    for plot in product.plots:
+        data = [source.load() for source in plot.sources()]
+        plots.append((resolve_style(plot.style), data[0] if len(data) == 1 else data))
+    result.load_time = time.perf_counter() - start_time
+
+    start_time = time.perf_counter()
+    domain = create_template(product.template, product.area)
+    panel = Panel(domain=domain)
+    colorbar_styles = []
+    colorbar_levels = []
+    for style, data in plots:
+        graphs = panel.plot([data], style=style)
+        if isinstance(style, ContourStyle) and style.fill:
+            colorbar_styles.append(style)
+            # automatic levels are kept in plot results, not in shared styles.
+            colorbar_levels.append(get_graph_levels(graphs) if style.has_auto_levels else None)
+        elif isinstance(style, ImageStyle) and style.levels is not None:
+            colorbar_styles.append(style)
+            colorbar_levels.append(None)
+
+    title = product.title
+    if title is not None:
+        panel.set_title(
+            graph_name=title.graph_name,
+            system_name=title.system_name,
+            start_time=pd.Timestamp(title.start_time),
+            forecast_time=pd.Timedelta(title.forecast_time),
+        )
+    if product.colorbar and len(colorbar_styles) > 0:
+        panel.add_colorbar(style=colorbar_styles, levels=colorbar_levels)
+    result.plot_time = time.perf_counter() - start_time
+
+    start_time = time.perf_counter()
+    Path(product.output).parent.mkdir(parents=True, exist_ok=True)
+    plt.figure(panel.fig.number)
+    panel.save(product.output, dpi=product.dpi)
+    result.save_time = time.perf_counter() - start_time
+
+
+def warmup_products(products: List[RenderProduct]) -> "WarmupReport":
+    """
+    Warm up templates (with product areas) and styles used by products, see ``preload.warmup``.
+    """
+    from cedarkit.maps.preload import warmup
+
+    templates = dict()
+    styles = []
+    for product in products:
+        key = (product.template, product.area)
+        if key not in templates:
+            templates[key] = create_template(product.template, product.area)
+        for plot in product.plots:
+            if plot.style not in styles:
+                styles.append(plot.style)
+    return warmup(templates=list(templates.values()), styles=styles)
+
+
+def run_manifest(
+        manifest: RenderManifest,
+        workers: Optional[int] = None,
+        force: bool = False,
+        warmup: bool = False,
+) -> List[ProductResult]:
+    """
+    Render all products in manifest with a process pool and save render states.
+
+    Parameters
+    ----------
+    manifest
+    workers
+        worker process count, default is ``manifest.workers``. Products are rendered in current process
+        if ``workers`` is 1.
+    force
+        render all products even if they are up to date.
+    warmup
+        warm up templates and styles of pending products in current process before rendering (see ``warmup_products``),
+        so that forked workers start with loaded caches. With more than one worker, caches are prepared to stay shared
+        with workers (see ``preload.prepare_fork``) and workers are forked.
+
+    Returns
+    -------
+    List[ProductResult]
+        results in the same order as products.
+    """
+    if workers is None:
+        workers = manifest.workers
+    state = load_state(manifest.state_path)
+
+    results: Dict[int, ProductResult] = dict()
+    pending = []
+    for index, product in enumerate(manifest.products):
+        if not force and is_up_to_date(product, state.get(product.output)):
+            results[index] = ProductResult(name=product.name, output=product.output, status="skipped")
+        else:
+            pending.append(index)
+
+    if warmup and len(pending) > 0:
+        warmup_products([manifest.products[index] for index in pending])
+
+    if workers <= 1 or len(pending) <= 1:
+        rendered = [render_product(manifest.products[index]) for index in pending]
+    else:
+        mp_context = None
+        if warmup and "fork" in multiprocessing.get_all_start_methods():
+            from cedarkit.maps.preload import prepare_fork
+            prepare_fork()
+            mp_context = multiprocessing.get_context("fork")
+        try:
+            with ProcessPoolExecutor(max_workers=workers, mp_context=mp_context) as executor:
+                rendered = list(executor.map(render_product, [manifest.products[index] for index in pending]))
+        finally:
+            if mp_context is not None:
+                gc.unfreeze()
+
+    for index, result in zip(pending, rendered):
+        results[index] = result
+        if result.status == "rendered":
+            state[result.output] = result.stamp
+        else:
+            state.pop(result.output, None)
+    save_state(manifest.state_path, state)
+
+    return [results[index] for index in range(len(manifest.products))]
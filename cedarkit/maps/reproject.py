@@ -0,0 +1,463 @@
+"""
+Reproject fields on regular grids to map projection with cached nearest neighbour indices.
+
+The mapping from target pixels (or vector plot points) to source grid points only depends on the source grid,
+projections, target extent and raster shape. It is calculated once with ``cartopy`` and cached, so each field
+on the same grid is reprojected by a fancy-indexing gather instead of transforming every data point again.
+
+* rasters: ``ReprojectionIndex``, used by ``graph.add_image``.
+* vectors: ``VectorReprojection``, a regular point grid with linear interpolation weights, used by ``graph.add_barb``.
+"""
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional, Tuple, Hashable, Union
+
+import numpy as np
+import xarray as xr
+import cartopy.crs as ccrs
+
+
+@dataclass(frozen=True)
+class RegularGrid:
+    """
+    Regular grid of a 2D field, coordinates are grid cell centers.
+
+    Attributes
+    ----------
+    x0
+        first x coordinate.
+    dx
+        x spacing, may be negative.
+    nx
+    y0
+    dy
+    ny
+    """
+    x0: float
+    dx: float
+    nx: int
+    y0: float
+    dy: float
+    ny: int
+
+    @classmethod
+    def from_field(cls, field: xr.DataArray) -> "RegularGrid":
+        """
+        Create grid from a field with dims (y, x) and regular 1D coordinates.
+        """
+        y_dim, x_dim = field.dims[-2:]
+        x0, dx, nx = _get_regular_coordinate(field[x_dim].values, x_dim)
+        y0, dy, ny = _get_regular_coordinate(field[y_dim].values, y_dim)
+        return cls(x0=x0, dx=dx, nx=nx, y0=y0, dy=dy, ny=ny)
+
+    @property
+    def extent(self) -> Tuple[float, float, float, float]:
+        """
+        Extent (x0, x1, y0, y1) of grid cells.
+        """
+        x = (self.x0 - self.dx / 2, self.x0 + (self.nx - 0.5) * self.dx)
+        y = (self.y0 - self.dy / 2, self.y0 + (self.ny - 0.5) * self.dy)
+        return min(x), max(x), min(y), max(y)
+
+    @property
+    def is_periodic(self) -> bool:
+        """
+        Whether the grid covers 360 degrees of longitude.
+        """
+        return abs(abs(self.dx) * self.nx - 360) < abs(self.dx) * 1e-3
+
+
+def _get_regular_coordinate(values: np.ndarray, name: str) -> Tuple[float, float, int]:
+    values = np.asarray(values, dtype=float)
+    if values.ndim != 1 or len(values) < 2:
+        raise ValueError(f"coordinate {name} should be 1D with at least 2 values")
+    step = (values[-1] - values[0]) / (len(values) - 1)
+    if not np.allclose(np.diff(values), step, rtol=1e-4, atol=1e-8):
+        raise ValueError(f"coordinate {name} is not regular")
+    return float(values[0]), float(step), len(values)
+
+
+@dataclass
+class ReprojectionIndex:
+    """
+    Source grid point of each target pixel, rows from bottom to top.
+
+    Attributes
+    ----------
+    shape
+        target raster shape (rows, columns).
+    extent
+        target extent (x0, x1, y0, y1) in target projection.
+    index
+        flat index in source field for each target pixel, shape is ``shape``.
+    mask
+        target pixels outside of source grid.
+    """
+    shape: Tuple[int, int]
+    extent: Tuple[float, float, float, float]
+    index: np.ndarray
+    mask: np.ndarray
+
+    def apply(self, values: np.ndarray, fill_value: float = np.nan) -> np.ndarray:
+        """
+        Gather source values (shape (ny, nx)) into target raster.
+
+        Parameters
+        ----------
+        values
+        fill_value
+            value of pixels outside of source grid.
+
+        Returns
+        -------
+        np.ndarray
+        """
+        raster = np.take(np.ravel(values), self.index)
+        if self.mask.any():
+            if not np.issubdtype(raster.dtype, np.floating):
+                raster = raster.astype(float)
+            raster[self.mask] = fill_value
+        return raster
+
+
+def compute_reprojection_index(
+        grid: RegularGrid,
+        source_crs: ccrs.CRS,
+        target_crs: ccrs.CRS,
+        extent: Tuple[float, float, float, float],
+        shape: Tuple[int, int],
+) -> ReprojectionIndex:
+    """
+    Calculate nearest source grid point of each target pixel center.
+
+    Parameters
+    ----------
+    grid
+    source_crs
+        projection of grid coordinates.
+    target_crs
+    extent
+        target extent (x0, x1, y0, y1).
+    shape
+        target shape (rows, columns).
+
+    Returns
+    -------
+    ReprojectionIndex
+    """
+    rows, columns = shape
+    x0, x1, y0, y1 = extent
+    x = x0 + (np.arange(columns) + 0.5) * (x1 - x0) / columns
+    y = y0 + (np.arange(rows) + 0.5) * (y1 - y0) / rows
+    xx, yy = np.meshgrid(x, y)
+
+    index, mask = _compute_source_index(grid, source_crs, target_crs, xx, yy)
+    return ReprojectionIndex(shape=(rows, columns), extent=tuple(extent), index=index, mask=mask)
+
+
+def _compute_source_index(
+        grid: RegularGrid,
+        source_crs: ccrs.CRS,
+        target_crs: ccrs.CRS,
+        xx: np.ndarray,
+        yy: np.ndarray,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Flat index of nearest source grid point and outside mask for target points.
+    """
+    if source_crs == target_crs:
+        sx, sy = xx, yy
+    else:
+        points = source_crs.transform_points(target_crs, xx, yy)
+        sx, sy = points[..., 0], points[..., 1]
+
+    with np.errstate(invalid="ignore"):
+        if isinstance(source_crs, (ccrs.PlateCarree, ccrs.Geodetic)):
+            # longitude distance from the first grid point along grid direction, in [-dx/2, 360 - dx/2).
+            step = abs(grid.dx)
+            distance = np.mod((sx - grid.x0) * np.sign(grid.dx) + step / 2, 360) - step / 2
+            i = np.floor(distance / step + 0.5)
+        else:
+            i = np.floor((sx - grid.x0) / grid.dx + 0.5)
+        j = np.floor((sy - grid.y0) / grid.dy + 0.5)
+    mask = ~(np.isfinite(i) & np.isfinite(j))
+    i = np.where(mask, 0, i).astype(np.intp)
+    j = np.where(mask, 0, j).astype(np.intp)
+    if grid.is_periodic:
+        i = np.mod(i, grid.nx)
+    mask |= (i < 0) | (i >= grid.nx) | (j < 0) | (j >= grid.ny)
+
+    index = np.where(mask, 0, j * grid.nx + i)
+    return index, mask
+
+
+@dataclass
+class VectorReprojection:
+    """
+    Regular point grid in target projection for vector plots (such as barbs), with linear interpolation weights
+    of source grid points.
+
+    Vectors are the same as cartopy's ``regrid_shape`` (``cartopy.vector_transform.vector_scalar_to_grid``):
+    linear interpolation on the Delaunay triangulation of source grid points, then ``CRS.transform_vectors``
+    at the points, so barbs are equal to ``GeoAxes.barbs`` with ``regrid_shape``. The triangulation is only
+    calculated once for each cached item.
+
+    Attributes
+    ----------
+    x
+        target x coordinates of points, shape (rows, columns).
+    y
+    source_x
+        source x coordinates of points.
+    source_y
+    index
+        flat index in source field of the three triangle vertices of each point, shape (3, rows, columns).
+    weights
+        barycentric weights of triangle vertices, shape (3, rows, columns).
+    mask
+        points outside of source grid.
+    source_crs
+    target_crs
+        None if vectors are not transformed (same projection).
+    """
+    x: np.ndarray
+    y: np.ndarray
+    source_x: np.ndarray
+    source_y: np.ndarray
+    index: np.ndarray
+    weights: np.ndarray
+    mask: np.ndarray
+    source_crs: ccrs.CRS
+    target_crs: Optional[ccrs.CRS] = None
+
+    def interpolate(self, values: np.ndarray) -> np.ndarray:
+        """
+        Interpolate source values (shape (ny, nx)) to the point grid, NaN for points outside of source grid.
+        """
+        values = np.ravel(values)
+        w0, w1, w2 = self.weights
+        i0, i1, i2 = self.index
+        # same order of operations as ``scipy.interpolate.LinearNDInterpolator``.
+        result = w0 * np.take(values, i0) + w1 * np.take(values, i1) + w2 * np.take(values, i2)
+        result = result.astype(float)
+        result[self.mask] = np.nan
+        return result
+
+    def apply(self, u: np.ndarray, v: np.ndarray) -> Tuple[np.ma.MaskedArray, np.ma.MaskedArray]:
+        """
+        Interpolate source vectors (eastward and northward components) and transform them to target projection.
+        Vector magnitudes are kept.
+
+        Returns
+        -------
+        Tuple[np.ma.MaskedArray, np.ma.MaskedArray]
+            target x and y components.
+        """
+        u = self.interpolate(u)
+        v = self.interpolate(v)
+        mask = self.mask | ~np.isfinite(u) | ~np.isfinite(v)
+        if self.target_crs is not None:
+            with np.errstate(invalid="ignore"):
+                u, v = self.target_crs.transform_vectors(self.source_crs, self.source_x, self.source_y, u, v)
+        return np.ma.masked_array(u, mask=mask), np.ma.masked_array(v, mask=mask)
+
+
+def compute_vector_reprojection(
+        grid: RegularGrid,
+        source_crs: ccrs.CRS,
+        target_crs: ccrs.CRS,
+        extent: Tuple[float, float, float, float],
+        shape: Tuple[int, int],
+        coordinates: Optional[Tuple[np.ndarray, np.ndarray]] = None,
+) -> VectorReprojection:
+    """
+    Calculate a regular point grid covering target extent (edges included, same as cartopy's ``regrid_shape``),
+    and linear interpolation weights of source grid points.
+
+    Parameters
+    ----------
+    grid
+    source_crs
+        projection of grid coordinates, vector components are eastward and northward in this projection.
+    target_crs
+    extent
+        target extent (x0, x1, y0, y1).
+    shape
+        point grid shape (rows, columns).
+    coordinates
+        1D x and y coordinates of the field, default is calculated from ``grid``. Triangulation of a regular grid
+        depends on rounding of coordinates, so field coordinates should be used to get the same result as cartopy.
+
+    Returns
+    -------
+    VectorReprojection
+    """
+    from scipy.spatial import Delaunay
+
+    if coordinates is None:
+        coordinates = (grid.x0 + np.arange(grid.nx) * grid.dx, grid.y0 + np.arange(grid.ny) * grid.dy)
+    grid_x, grid_y = np.meshgrid(np.asarray(coordinates[0], dtype=float), np.asarray(coordinates[1], dtype=float))
+
+    rows, columns = shape
+    x0, x1, y0, y1 = extent
+    unit_x, unit_y = np.meshgrid(np.linspace(0, 1, columns), np.linspace(0, 1, rows))
+    xx = unit_x * (x1 - x0) + x0
+    yy = unit_y * (y1 - y0) + y0
+
+    # points in source projection, normalized in the same way as ``cartopy.vector_transform``.
+    if source_crs == target_crs:
+        sx, sy = xx, yy
+        points = np.column_stack([(grid_x.ravel() - x0) / (x1 - x0), (grid_y.ravel() - y0) / (y1 - y0)])
+        targets = np.stack([unit_x, unit_y], axis=-1)
+    else:
+        points = source_crs.transform_points(target_crs, xx, yy)
+        sx, sy = points[..., 0], points[..., 1]
+        valid_x, valid_y = sx[np.isfinite(sx)], sy[np.isfinite(sy)]
+        source_x0, source_y0 = valid_x.min(), valid_y.min()
+        source_x_range, source_y_range = valid_x.max() - source_x0, valid_y.max() - source_y0
+        # wrap source points into the source domain, such as longitude in [-180, 180].
+        points = source_crs.transform_points(source_crs, grid_x, grid_y)
+        points = np.column_stack([
+            (points[..., 0].ravel() - source_x0) / source_x_range,
+            (points[..., 1].ravel() - source_y0) / source_y_range,
+        ])
+        targets = np.stack([(sx - source_x0) / source_x_range, (sy - source_y0) / source_y_range], axis=-1)
+
+    triangulation = Delaunay(points)
+    mask = ~np.isfinite(targets).all(axis=-1)
+    targets = np.where(mask[..., np.newaxis], 0, targets)
+    simplex = triangulation.find_simplex(targets)
+    mask |= simplex < 0
+    simplex = np.where(mask, 0, simplex)
+
+    # barycentric coordinates in the same order of operations as ``scipy.interpolate.LinearNDInterpolator``.
+    transform = triangulation.transform[simplex]
+    offset = targets - transform[..., 2, :]
+    w0 = transform[..., 0, 0] * offset[..., 0] + transform[..., 0, 1] * offset[..., 1]
+    w1 = transform[..., 1, 0] * offset[..., 0] + transform[..., 1, 1] * offset[..., 1]
+    w2 = 1.0 - w0 - w1
+    weights = np.where(mask, 0, np.stack([w0, w1, w2]))
+    index = np.moveaxis(triangulation.simplices[simplex], -1, 0)
+
+    return VectorReprojection(
+        x=xx, y=yy, source_x=sx, source_y=sy, index=index, weights=weights, mask=mask,
+        source_crs=source_crs, target_crs=None if source_crs == target_crs else target_crs,
+    )
+
+
+class ReprojectionCache:
+    """
+    LRU cache of reprojections by (kind, source grid, projections, target extent, target shape).
+
+    Raster indices (``ReprojectionIndex``), vector point grids (``VectorReprojection``) and other items
+    created from them (such as ``streamline.StreamlineIntegrator``) are cached, so plots on the same grid
+    reuse them across fields and lead times.
+
+    Attributes
+    ----------
+    max_size
+        max item count.
+    hits
+    misses
+    """
+    def __init__(self, max_size: int = 32):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._items: "OrderedDict[Hashable, Union[ReprojectionIndex, VectorReprojection]]" = OrderedDict()
+
+    def __len__(self):
+        return len(self._items)
+
+    def get(
+            self,
+            grid: RegularGrid,
+            source_crs: ccrs.CRS,
+            target_crs: ccrs.CRS,
+            extent: Tuple[float, float, float, float],
+            shape: Tuple[int, int],
+    ) -> ReprojectionIndex:
+        """
+        Get cached raster index or calculate it with ``compute_reprojection_index``.
+        """
+        return self.get_item(compute_reprojection_index, grid, source_crs, target_crs, extent, shape)
+
+    def get_vectors(
+            self,
+            grid: RegularGrid,
+            source_crs: ccrs.CRS,
+            target_crs: ccrs.CRS,
+            extent: Tuple[float, float, float, float],
+            shape: Tuple[int, int],
+            coordinates: Optional[Tuple[np.ndarray, np.ndarray]] = None,
+    ) -> VectorReprojection:
+        """
+        Get cached vector point grid or calculate it with ``compute_vector_reprojection``.
+        """
+        return self.get_item(
+            compute_vector_reprojection, grid, source_crs, target_crs, extent, shape, coordinates=coordinates,
+        )
+
+    def get_item(self, function, grid, source_crs, target_crs, extent, shape, *args, **kwargs):
+        """
+        Get cached result of ``function(grid, source_crs, target_crs, extent, shape, *args, **kwargs)``.
+        ``args`` are part of the cache key and should be hashable. ``kwargs`` are not part of the cache key.
+        """
+        extent = tuple(float(v) for v in extent)
+        shape = (int(shape[0]), int(shape[1]))
+        # extent is rounded in cache key only, items are calculated with the exact extent.
+        key = (function, grid, source_crs, target_crs, tuple(np.round(extent, 6)), shape) + args
+        item = self._items.get(key)
+        if item is not None:
+            self._items.move_to_end(key)
+            self.hits += 1
+            return item
+
+        self.misses += 1
+        item = function(grid, source_crs, target_crs, extent, shape, *args, **kwargs)
+        self._items[key] = item
+        while len(self._items) > self.max_size:
+            self._items.popitem(last=False)
+        return item
+
+    def clear(self):
+        self._items.clear()
+
+
+_default_cache = ReprojectionCache()
+
+
+def get_default_cache() -> ReprojectionCache:
+    return _default_cache
+
+
+def reproject_field(
+        field: xr.DataArray,
+        source_crs: ccrs.CRS,
+        target_crs: ccrs.CRS,
+        extent: Tuple[float, float, float, float],
+        shape: Tuple[int, int],
+        cache: Optional[ReprojectionCache] = None,
+) -> Tuple[np.ndarray, ReprojectionIndex]:
+    """
+    Reproject a field on a regular grid to a target raster with a cached index.
+
+    Parameters
+    ----------
+    field
+    source_crs
+    target_crs
+    extent
+    shape
+    cache
+        default is ``get_default_cache()``.
+
+    Returns
+    -------
+    Tuple[np.ndarray, ReprojectionIndex]
+        raster with rows from bottom to top, and the index used.
+    """
+    if cache is None:
+        cache = _default_cache
+    index = cache.get(RegularGrid.from_field(field), source_crs, target_crs, extent=extent, shape=shape)
+    return index.apply(field.values), index
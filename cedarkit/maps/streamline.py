@@ -0,0 +1,292 @@
+"""
+Streamlines integrated for all seeds at once with numpy.
+
+Vectors are regridded to a regular point grid in map projection (``reproject.VectorReprojection``).
+Streamlines are integrated in axes coordinates (0-1 for both axes) with unit speed and RK2 steps,
+like ``matplotlib.pyplot.streamplot``. An occupancy grid (``30 * density`` cells for each axis) keeps
+streamlines apart: a streamline stops when it enters a cell used by another streamline.
+
+Seeds are occupancy cell centers inside source grid. They are processed in 4 interleaved batches,
+and all seeds in one batch are integrated together. Seeds only depend on the point grid, so
+``StreamlineIntegrator`` is cached with reprojections and reused for all fields on the same grid.
+"""
+from dataclasses import dataclass
+from typing import List, Tuple, Union, Optional
+
+import numpy as np
+import cartopy.crs as ccrs
+
+from cedarkit.maps.reproject import (
+    RegularGrid,
+    VectorReprojection,
+    ReprojectionCache,
+    get_default_cache,
+)
+
+
+@dataclass
+class Streamline:
+    """
+    A streamline in target projection coordinates.
+
+    Attributes
+    ----------
+    points
+        (n, 2) array.
+    arrow
+        arrow start and end points (2, 2) at the middle of streamline.
+    """
+    points: np.ndarray
+    arrow: np.ndarray
+
+
+class StreamlineIntegrator:
+    """
+    Streamline integrator for vectors on a cached point grid.
+
+    Parameters
+    ----------
+    vectors
+        point grid, see ``reproject.compute_vector_reprojection``.
+    density
+        occupancy grid density, a float or (x density, y density).
+    step_size
+        integration step in point grid cells.
+    max_length
+        max streamline length in each direction in axes coordinates.
+    min_length
+        streamlines shorter than ``min_length`` (in axes coordinates) are dropped.
+    """
+    def __init__(
+            self,
+            vectors: VectorReprojection,
+            density: Union[float, Tuple[float, float]] = 1.0,
+            step_size: float = 0.5,
+            max_length: float = 4.0,
+            min_length: float = 0.1,
+    ):
+        self.vectors = vectors
+        if isinstance(density, (tuple, list)):
+            density_x, density_y = density
+        else:
+            density_x = density_y = density
+        self.occupancy_shape = (max(1, int(30 * density_y)), max(1, int(30 * density_x)))
+        rows, columns = vectors.x.shape
+        self.step = step_size / max(rows - 1, columns - 1, 1)
+        self.max_steps = int(np.ceil(max_length / self.step))
+        self.min_length = min_length
+        self.seed_batches = self._create_seeds()
+
+    @classmethod
+    def create(
+            cls,
+            grid: RegularGrid,
+            source_crs: ccrs.CRS,
+            target_crs: ccrs.CRS,
+            extent: Tuple[float, float, float, float],
+            shape: Tuple[int, int],
+            density: Union[float, Tuple[float, float]],
+            step_size: float,
+            max_length: float,
+            min_length: float,
+            cache: ReprojectionCache,
+    ) -> "StreamlineIntegrator":
+        """
+        Create integrator for vectors on ``grid``, see ``get_streamline_integrator``.
+        """
+        vectors = cache.get_vectors(grid, source_crs, target_crs, extent=extent, shape=shape)
+        return cls(vectors, density=density, step_size=step_size, max_length=max_length, min_length=min_length)
+
+    def _create_seeds(self) -> List[np.ndarray]:
+        """
+        Seed points (n, 2) in axes coordinates of each batch.
+        """
+        cell_rows, cell_columns = self.occupancy_shape
+        rows, columns = self.vectors.x.shape
+        batches = []
+        for row_offset, column_offset in ((0, 0), (1, 1), (0, 1), (1, 0)):
+            cell_y, cell_x = np.meshgrid(
+                np.arange(row_offset, cell_rows, 2),
+                np.arange(column_offset, cell_columns, 2),
+                indexing="ij",
+            )
+            px = (cell_x.ravel() + 0.5) / cell_columns
+            py = (cell_y.ravel() + 0.5) / cell_rows
+            i = np.round(px * (columns - 1)).astype(int)
+            j = np.round(py * (rows - 1)).astype(int)
+            valid = ~self.vectors.mask[j, i]
+            batches.append(np.column_stack([px[valid], py[valid]]))
+        return batches
+
+    def integrate(self, u: np.ndarray, v: np.ndarray) -> List[Streamline]:
+        """
+        Integrate streamlines of a vector field on source grid (eastward and northward components).
+
+        Returns
+        -------
+        List[Streamline]
+        """
+        vectors = self.vectors
+        target_u, target_v = vectors.apply(u, v)
+        x0, x1 = vectors.x[0, 0], vectors.x[0, -1]
+        y0, y1 = vectors.y[0, 0], vectors.y[-1, 0]
+        # velocity in axes coordinates
+        velocity = np.stack([target_u.filled(np.nan) / (x1 - x0), target_v.filled(np.nan) / (y1 - y0)], axis=-1)
+
+        owner = np.full(self.occupancy_shape, -1, dtype=np.intp)
+        streamlines = []
+        seed_start = 0
+        for seeds in self.seed_batches:
+            if len(seeds) == 0:
+                continue
+            cells = self._get_cells(seeds)
+            free = owner.flat[cells] == -1
+            seeds = seeds[free]
+            ids = np.arange(len(seeds)) + seed_start
+            seed_start += len(seeds)
+            owner.flat[cells[free]] = ids
+
+            if len(seeds) == 0:
+                continue
+
+            forward = self._integrate_batch(seeds, ids, 1, velocity, owner)
+            backward = self._integrate_batch(seeds, ids, -1, velocity, owner)
+            used = np.zeros(owner.size, dtype=bool)
+            for index, seed_id in enumerate(ids):
+                forward_points = self._truncate(forward[:, index], seed_id, owner)
+                backward_points = self._truncate(backward[:, index], seed_id, owner)
+                points = np.concatenate([backward_points[:0:-1], forward_points])
+                streamline = self._create_streamline(points)
+                if streamline is not None:
+                    streamlines.append(streamline)
+                    used[self._get_cells(points)] = True
+            # release cells of truncated parts and dropped streamlines for later batches.
+            owner.flat[(owner.ravel() >= ids[0]) & ~used] = -1
+        return streamlines
+
+    def _truncate(self, points: np.ndarray, seed_id: int, owner: np.ndarray) -> np.ndarray:
+        """
+        Points of one trajectory before the first cell taken by a streamline with higher priority.
+        """
+        points = points[np.isfinite(points[:, 0])]
+        lost = np.flatnonzero(owner.flat[self._get_cells(points)] != seed_id)
+        if len(lost) > 0:
+            points = points[:lost[0]]
+        return points
+
+    def _get_cells(self, points: np.ndarray) -> np.ndarray:
+        cell_rows, cell_columns = self.occupancy_shape
+        cx = np.minimum(np.maximum(points[:, 0] * cell_columns, 0).astype(np.intp), cell_columns - 1)
+        cy = np.minimum(np.maximum(points[:, 1] * cell_rows, 0).astype(np.intp), cell_rows - 1)
+        return cy * cell_columns + cx
+
+    def _interpolate(self, points: np.ndarray, velocity: np.ndarray) -> np.ndarray:
+        """
+        Unit direction at points with bilinear interpolation, NaN outside or for invalid vectors.
+
+        ``velocity`` is a (rows, columns, 2) array in axes coordinates.
+        """
+        rows, columns = velocity.shape[:2]
+        inside = np.all((points >= 0) & (points <= 1), axis=1)
+        fx = np.where(inside, points[:, 0], 0) * (columns - 1)
+        fy = np.where(inside, points[:, 1], 0) * (rows - 1)
+        i = np.minimum(fx.astype(np.intp), columns - 2)
+        j = np.minimum(fy.astype(np.intp), rows - 2)
+        tx = (fx - i)[:, np.newaxis]
+        ty = (fy - j)[:, np.newaxis]
+
+        direction = (
+            (velocity[j, i] * (1 - tx) + velocity[j, i + 1] * tx) * (1 - ty)
+            + (velocity[j + 1, i] * (1 - tx) + velocity[j + 1, i + 1] * tx) * ty
+        )
+        with np.errstate(invalid="ignore", divide="ignore"):
+            speed = np.hypot(direction[:, 0], direction[:, 1])
+            direction = direction / speed[:, np.newaxis]
+        direction[~inside | (speed == 0)] = np.nan
+        return direction
+
+    def _integrate_batch(
+            self,
+            seeds: np.ndarray,
+            ids: np.ndarray,
+            sign: int,
+            velocity: np.ndarray,
+            owner: np.ndarray,
+    ) -> np.ndarray:
+        """
+        Integrate all seeds in one direction. Returns points (steps + 1, seeds, 2), NaN after stop.
+        """
+        h = self.step * sign
+        trajectories = np.full((self.max_steps + 1, len(seeds), 2), np.nan)
+        trajectories[0] = seeds
+        position = seeds.copy()
+        active = np.arange(len(seeds))
+        for step in range(1, self.max_steps + 1):
+            p = position[active]
+            k1 = self._interpolate(p, velocity)
+            k2 = self._interpolate(p + 0.5 * h * k1, velocity)
+            new_position = p + h * k2
+            valid = np.all((new_position >= 0) & (new_position <= 1), axis=1)
+
+            seed_ids = ids[active]
+            # stop if current cell is taken by a streamline with higher priority.
+            valid &= owner.flat[self._get_cells(p)] == seed_ids
+
+            cells = self._get_cells(np.where(valid[:, np.newaxis], new_position, 0))
+            cell_owner = owner.flat[cells]
+            # streamlines in the same batch are prioritized by seed id, like sequential seeding.
+            valid &= (cell_owner == -1) | (cell_owner >= seed_ids)
+            order = np.argsort(-seed_ids[valid], kind="stable")
+            owner.flat[cells[valid][order]] = seed_ids[valid][order]
+            valid &= owner.flat[cells] == seed_ids
+
+            active = active[valid]
+            if len(active) == 0:
+                break
+            position[active] = new_position[valid]
+            trajectories[step, active] = new_position[valid]
+        return trajectories
+
+    def _create_streamline(self, points: np.ndarray) -> Optional[Streamline]:
+        if len(points) < 2:
+            return None
+        segment_lengths = np.hypot(*np.diff(points, axis=0).T)
+        cumulative = np.cumsum(segment_lengths)
+        if cumulative[-1] < self.min_length:
+            return None
+        middle = np.searchsorted(cumulative, cumulative[-1] / 2)
+        middle = min(middle, len(points) - 2)
+
+        vectors = self.vectors
+        x0, x1 = vectors.x[0, 0], vectors.x[0, -1]
+        y0, y1 = vectors.y[0, 0], vectors.y[-1, 0]
+        scale = np.array([x1 - x0, y1 - y0])
+        offset = np.array([x0, y0])
+        points = points * scale + offset
+        return Streamline(points=points, arrow=points[middle:middle + 2])
+
+
+def get_streamline_integrator(
+        grid: RegularGrid,
+        source_crs: ccrs.CRS,
+        target_crs: ccrs.CRS,
+        extent: Tuple[float, float, float, float],
+        shape: Tuple[int, int],
+        density: Union[float, Tuple[float, float]] = 1.0,
+        step_size: float = 0.5,
+        max_length: float = 4.0,
+        min_length: float = 0.1,
+        cache: Optional[ReprojectionCache] = None,
+) -> StreamlineIntegrator:
+    """
+    Get cached ``StreamlineIntegrator`` for a source grid and map extent.
+    """
+    if cache is None:
+        cache = get_default_cache()
+    if isinstance(density, list):
+        density = tuple(density)
+    return cache.get_item(
+        StreamlineIntegrator.create,
+        grid, source_crs, target_crs, extent, shape,
+        density, step_size, max_length, min_length, cache,
+    )
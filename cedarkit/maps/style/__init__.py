@@ -1,11 +1,17 @@
-from dataclasses import dataclass
-from typing import Union, Optional, List, Dict, Callable, Any
+import copy
+from dataclasses import dataclass, field
+from typing import Union, Optional, List, Dict, Callable, Any, Tuple
 
 import numpy as np
 import matplotlib.colors as mcolors
 import matplotlib.ticker as mticker
 
+from cedarkit.maps.calculate import calculate_levels_robust
+from cedarkit.maps.colormap import get_discrete_cmap, get_continuous_cmap
 
+
+# Built-in parameter names and style definitions, which are registered in the default style registry
+# with styles in ``resources/style/default.json``. See ``cedarkit.maps.style.registry``.
 PARAMETER_MAP = {
     "2t": "t2m",
 }
@@ -18,7 +24,8 @@ PLOT_STYLE = dict(
             name="temp_19lev"
         ),
         contour=dict(
-            levels=np.append(np.arange(-30, 40, 4), 40)
+            levels=np.append(np.arange(-30, 40, 4), 40),
+            fill=True,
         )
     )
 )
@@ -26,7 +33,36 @@ PLOT_STYLE = dict(
 
 @dataclass
 class Style:
-    ...
+    """
+    Base class of plot styles.
+
+    Styles returned by a style registry (see ``cedarkit.maps.style.registry``) are shared and should not be
+    changed. Built-in styles and styles loaded from style files in the default registry are pickled as
+    a reference (name and definition file), so sending them to worker processes is cheap and each worker
+    resolves them once. Other styles are pickled by value. Copies made by ``copy.copy`` or ``copy.deepcopy``
+    are normal styles which can be changed.
+    """
+    def __reduce_ex__(self, protocol):
+        if "_registry_reference" in self.__dict__:
+            from cedarkit.maps.style.registry import load_registered_style, is_registered_style
+            if is_registered_style(self):
+                return load_registered_style, self.__dict__["_registry_reference"]
+            return copy.copy(self).__reduce_ex__(protocol)
+        return super().__reduce_ex__(protocol)
+
+    def __copy__(self):
+        new_style = self.__class__.__new__(self.__class__)
+        new_style.__dict__.update(self.__dict__)
+        new_style.__dict__.pop("_registry_reference", None)
+        return new_style
+
+    def __deepcopy__(self, memo):
+        new_style = self.__class__.__new__(self.__class__)
+        memo[id(self)] = new_style
+        for key, value in self.__dict__.items():
+            if key != "_registry_reference":
+                new_style.__dict__[key] = copy.deepcopy(value, memo)
+        return new_style
 
 
 @dataclass
@@ -38,6 +74,15 @@ class ColorbarStyle(Style):
 
 @dataclass
 class ContourLabelStyle(Style):
+    """
+    Contour label style.
+
+    ``engine`` selects label placement method:
+
+    * clabel: ``matplotlib.axes.Axes.clabel``.
+    * grid: ``label.add_contour_label_by_grid``, a faster placement using ``label_spacing``, ``min_distance``,
+      ``area_size`` and ``max_labels_per_area`` (distances in points). ``manual`` is not supported.
+    """
     levels: Optional[Union[List, np.ndarray]] = None
     fontsize: Optional[Union[str, float]] = None
     inline: bool = True
@@ -47,6 +92,41 @@ class ContourLabelStyle(Style):
     background_color: Optional[Any] = None
     manual: bool = False
     zorder: Optional[float] = None
+    engine: str = "clabel"
+    label_spacing: float = 50
+    min_distance: float = 40
+    area_size: float = 120
+    max_labels_per_area: int = 1
+
+
+@dataclass
+class AutoLevelStyle(Style):
+    """
+    Automatic contour levels from estimated percentiles of plot data, see ``calculate.calculate_levels_robust``.
+
+    Attributes
+    ----------
+    lower_percentile
+    upper_percentile
+    max_count
+        max level count.
+    outside
+        whether levels cover the percentile range.
+    method
+        quantile estimation method, "sample" or "histogram".
+    sample_size
+    bins
+    freeze
+        use levels calculated from the first frame for all lead times in ``chart.LeadTimeSequence``.
+    """
+    lower_percentile: float = 2
+    upper_percentile: float = 98
+    max_count: int = 16
+    outside: bool = True
+    method: str = "sample"
+    sample_size: int = 100000
+    bins: int = 1024
+    freeze: bool = False
 
 
 @dataclass
@@ -59,6 +139,225 @@ class ContourStyle(Style):
     label: bool = False
     label_style: Optional[ContourLabelStyle] = None
     colorbar_style: Optional[ColorbarStyle] = None
+    auto_level_style: Optional[AutoLevelStyle] = None
+
+    _colormap_norms: Dict[Tuple[bytes, str], Tuple[Any, np.ndarray, mcolors.Colormap, mcolors.BoundaryNorm]] = field(
+        default_factory=dict, init=False, repr=False, compare=False,
+    )
+
+    def get_levels(self, data: Optional[Any] = None, area: Optional[Any] = None) -> Optional[Union[List, np.ndarray]]:
+        """
+        Get contour levels. ``levels`` is returned if set, otherwise automatic levels are calculated from ``data``
+        with ``auto_level_style``, or None is returned without ``data``.
+
+        Automatic levels are not saved in the style, because styles may be shared by many plots (see ``Style``).
+        They are returned with plot results (``levels`` of contour sets), and should be passed to colorbars.
+
+        Parameters
+        ----------
+        data
+            plot field.
+        area
+            visible area of plot, ``AreaRange``.
+
+        Returns
+        -------
+        Optional[Union[List, np.ndarray]]
+        """
+        if self.levels is not None or self.auto_level_style is None or data is None:
+            return self.levels
+
+        auto_level_style = self.auto_level_style
+        return calculate_levels_robust(
+            data,
+            lower_percentile=auto_level_style.lower_percentile,
+            upper_percentile=auto_level_style.upper_percentile,
+            max_count=auto_level_style.max_count,
+            outside=auto_level_style.outside,
+            method=auto_level_style.method,
+            sample_size=auto_level_style.sample_size,
+            bins=auto_level_style.bins,
+            area=area,
+        )
+
+    @property
+    def has_auto_levels(self) -> bool:
+        """
+        Whether levels are calculated from plot data.
+        """
+        return self.levels is None and self.auto_level_style is not None
+
+    def get_colormap_norm(
+            self,
+            levels: Optional[Union[List, np.ndarray]] = None,
+            extend: str = "both",
+    ) -> Tuple[np.ndarray, mcolors.Colormap, mcolors.BoundaryNorm]:
+        """
+        Get level array, discrete colormap and norm of filled contours built from ``colors``,
+        see ``colormap.get_discrete_cmap``.
+
+        They are built at the first call and cached for each level list, so filled contours and colorbars
+        of the same style share the same objects. Cache is rebuilt if ``colors`` is replaced.
+
+        Parameters
+        ----------
+        levels
+            default is ``levels`` of the style, which is required for styles with automatic levels.
+        extend
+
+        Returns
+        -------
+        Tuple[np.ndarray, mcolors.Colormap, mcolors.BoundaryNorm]
+            levels, colormap and norm.
+        """
+        if levels is None:
+            levels = self.levels
+        if levels is None:
+            raise ValueError("levels should be set for styles without levels, such as levels of plot results")
+        return _get_cached_colormap_norm(self._colormap_norms, self.colors, levels=levels, extend=extend)
+
+
+@dataclass
+class ImageStyle(Style):
+    """
+    Raster style for dense fields (such as radar mosaics) drawn with ``imshow``.
+
+    Fields on regular grids are reprojected to map projection rasters with cached indices,
+    see ``cedarkit.maps.reproject``.
+
+    Attributes
+    ----------
+    colors
+        colormap, colormap name or color list.
+    levels
+        discrete color levels, same as filled contours. ``vmin`` and ``vmax`` are used if not set.
+    vmin
+    vmax
+    alpha
+    interpolation
+        ``imshow`` interpolation.
+    pixel_size
+        raster pixel size in figure pixels.
+    colorbar_style
+    """
+    colors: Optional[Union[str, List, mcolors.Colormap]] = None
+    levels: Optional[Union[List, np.ndarray]] = None
+    vmin: Optional[float] = None
+    vmax: Optional[float] = None
+    alpha: Optional[float] = None
+    interpolation: str = "nearest"
+    pixel_size: float = 1.0
+    colorbar_style: Optional[ColorbarStyle] = None
+
+    _colormap_norms: Dict[Tuple[bytes, str], Tuple[Any, np.ndarray, mcolors.Colormap, mcolors.BoundaryNorm]] = field(
+        default_factory=dict, init=False, repr=False, compare=False,
+    )
+
+    def get_levels(self, data: Optional[Any] = None, area: Optional[Any] = None) -> Optional[Union[List, np.ndarray]]:
+        return self.levels
+
+    def get_colormap_norm(
+            self,
+            levels: Optional[Union[List, np.ndarray]] = None,
+            extend: str = "both",
+    ) -> Tuple[Optional[np.ndarray], mcolors.Colormap, mcolors.Normalize]:
+        """
+        Get cached level array, discrete colormap and norm, see ``ContourStyle.get_colormap_norm``.
+
+        Without levels, a continuous colormap and a new ``Normalize`` with ``vmin`` and ``vmax`` are returned,
+        and the level array is None.
+        """
+        if levels is None:
+            levels = self.levels
+        if levels is None:
+            return None, get_continuous_cmap(self.colors), mcolors.Normalize(vmin=self.vmin, vmax=self.vmax)
+        return _get_cached_colormap_norm(self._colormap_norms, self.colors, levels=levels, extend=extend)
+
+
+@dataclass
+class QuiverStyle(Style):
+    """
+    Wind arrow style. Arrows are thinned to a regular point grid in map projection.
+
+    Attributes
+    ----------
+    color
+    scale
+        ``quiver`` scale, data units per arrow length unit.
+    width
+    headwidth
+    headlength
+    headaxislength
+    pivot
+    regrid_shape
+        point count on the shorter side of map box, or (columns, rows), same as cartopy.
+    """
+    color: Any = "black"
+    scale: Optional[float] = None
+    width: Optional[float] = None
+    headwidth: float = 3
+    headlength: float = 5
+    headaxislength: float = 4.5
+    pivot: str = "middle"
+    regrid_shape: Union[int, Tuple[int, int]] = 20
+
+
+@dataclass
+class StreamlineStyle(Style):
+    """
+    Streamline style.
+
+    Attributes
+    ----------
+    color
+    linewidth
+    density
+        streamline density, same as ``streamplot``. A float or (x density, y density).
+    arrowsize
+    arrowstyle
+    regrid_shape
+        point grid of vectors in map projection, see ``QuiverStyle.regrid_shape``.
+    method
+        * vectorized: ``streamline.StreamlineIntegrator``, seeds are cached and integrated together.
+        * matplotlib: ``Axes.streamplot`` on the regridded vectors.
+    step_size
+        integration step in point grid cells (vectorized method).
+    max_length
+        max streamline length in each direction in axes coordinates.
+    min_length
+        min streamline length in axes coordinates.
+    """
+    color: Any = "black"
+    linewidth: float = 0.5
+    density: Union[float, Tuple[float, float]] = 1.0
+    arrowsize: float = 1.0
+    arrowstyle: str = "-|>"
+    regrid_shape: Union[int, Tuple[int, int]] = 100
+    method: str = "vectorized"
+    step_size: float = 0.5
+    max_length: float = 4.0
+    min_length: float = 0.1
+
+
+def _get_cached_colormap_norm(
+        cache: Dict,
+        colors: Any,
+        levels: Union[List, np.ndarray],
+        extend: str,
+) -> Tuple[np.ndarray, mcolors.Colormap, mcolors.BoundaryNorm]:
+    levels = np.asarray(levels, dtype=float)
+    key = (levels.tobytes(), extend)
+    item = cache.get(key)
+    if item is not None and item[0] is colors:
+        return item[1:]
+
+    if len(cache) >= 32:
+        # automatic levels change with data.
+        cache.clear()
+    levels.flags.writeable = False
+    cmap, norm = get_discrete_cmap(colors, levels=levels, extend=extend)
+    cache[key] = (colors, levels, cmap, norm)
+    return levels, cmap, norm
 
 
 @dataclass
@@ -0,0 +1,350 @@
+"""
+Style registry: named plot styles loaded from declarative style files (JSON, or YAML with ``pyyaml``).
+
+Style file format:
+
+.. code-block:: yaml
+
+    styles:
+      t2m:
+        type: contour               # contour (default), barb, image, quiver or streamline
+        fill: true
+        levels: {start: -30, stop: 40, step: 4, append: [40]}   # or a level list
+        colormap: {category: ncl, name: temp_19lev}
+        colorbar_style: {label: "C"}
+      mslp:
+        levels: {start: 960, stop: 1065, step: 2.5}
+        colors: blue
+        linewidths: 0.5
+        label: true
+        label_style: {fontsize: 5, fmt: "%1.0f", engine: grid}
+    parameters:
+      2t: t2m
+
+Colormap categories:
+
+* ``ncl``: NCL colormap file, options ``name``, ``index``, ``count``, ``spread_start``, ``spread_end``.
+  See ``colormap.get_ncl_colormap``.
+* ``ncl_colors``: NCL named colors, options ``name`` and ``colors``.
+* ``matplotlib``: registered matplotlib colormap ``name``.
+* ``colors``: ``colors`` list of any matplotlib color specs.
+
+Other items are fields of the style class, nested styles (``label_style``, ``colorbar_style``,
+``auto_level_style``) are dicts. Legacy definitions in ``PLOT_STYLE`` (``contour`` dict) are also supported.
+
+The default registry contains ``PLOT_STYLE``, ``PARAMETER_MAP``, built-in ``resources/style/default.json`` and
+style files in ``CEDARKIT_MAPS_STYLE_PATH`` (separated by ``os.pathsep``). Styles are resolved (colormaps built)
+once and cached, so ``get_style`` returns the same object for the same name.
+"""
+import importlib.resources
+import json
+import os
+from pathlib import Path
+from typing import Optional, Dict, Any, List, Union, Tuple
+
+import numpy as np
+import matplotlib as mpl
+import matplotlib.colors as mcolors
+
+from cedarkit.maps.colormap import get_ncl_colormap, generate_colormap_using_ncl_colors
+from cedarkit.maps.style import (
+    Style,
+    ContourStyle,
+    BarbStyle,
+    ImageStyle,
+    QuiverStyle,
+    StreamlineStyle,
+    ContourLabelStyle,
+    ColorbarStyle,
+    AutoLevelStyle,
+    PLOT_STYLE,
+    PARAMETER_MAP,
+)
+
+
+STYLE_PATH_ENV = "CEDARKIT_MAPS_STYLE_PATH"
+
+# source of built-in styles in the default registry.
+BUILTIN_SOURCE = "<builtin>"
+
+STYLE_TYPES = dict(
+    contour=ContourStyle,
+    barb=BarbStyle,
+    image=ImageStyle,
+    quiver=QuiverStyle,
+    streamline=StreamlineStyle,
+)
+
+NESTED_STYLES = dict(
+    label_style=ContourLabelStyle,
+    colorbar_style=ColorbarStyle,
+    auto_level_style=AutoLevelStyle,
+)
+
+
+class StyleRegistry:
+    """
+    Named style definitions and their resolved styles.
+
+    Attributes
+    ----------
+    parameters
+        parameter name to style name, such as ``{"2t": "t2m"}``.
+    """
+    def __init__(self):
+        self._definitions: Dict[str, Dict[str, Any]] = dict()
+        self._sources: Dict[str, Optional[str]] = dict()
+        self._styles: Dict[str, Style] = dict()
+        self._colormaps: Dict[str, mcolors.Colormap] = dict()
+        self.parameters: Dict[str, str] = dict()
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._definitions
+
+    def names(self) -> List[str]:
+        return list(self._definitions)
+
+    def register(self, name: str, definition: Dict[str, Any], source: Optional[str] = None):
+        """
+        Register a style definition. Cached style with the same name is removed.
+
+        Parameters
+        ----------
+        name
+        definition
+        source
+            style file path of the definition, which is used to resolve pickled styles in other processes.
+            Styles without source are pickled by value.
+        """
+        self._definitions[name] = definition
+        self._sources[name] = source
+        self._styles.pop(name, None)
+
+    def load(self, path: Union[str, Path]) -> List[str]:
+        """
+        Load styles and parameters from a style file.
+
+        Parameters
+        ----------
+        path
+
+        Returns
+        -------
+        List[str]
+            loaded style names.
+        """
+        path = Path(path)
+        config = _load_file(path)
+        source = str(path.resolve())
+        styles = config.get("styles", dict())
+        for name, definition in styles.items():
+            self.register(name, definition, source=source)
+        self.parameters.update(config.get("parameters", dict()))
+        return list(styles)
+
+    def get(self, name: str) -> Style:
+        """
+        Get resolved style by name. Styles are resolved once and cached.
+        """
+        style = self._styles.get(name)
+        if style is not None:
+            return style
+        if name not in self._definitions:
+            raise KeyError(f"style is not registered: {name}")
+
+        style = build_style(self._definitions[name], colormap_cache=self._colormaps)
+        source = self._sources[name]
+        if source is not None and self is _default_registry:
+            # only styles of the default registry can be resolved in other processes.
+            style.__dict__["_registry_reference"] = (name, source)
+        self._styles[name] = style
+        return style
+
+    def get_by_parameter(self, parameter: str) -> Style:
+        """
+        Get style for a parameter name using ``parameters``, or the style with the same name.
+        """
+        return self.get(self.parameters.get(parameter, parameter))
+
+    def clear_cache(self):
+        self._styles.clear()
+        self._colormaps.clear()
+
+
+_default_registry: Optional[StyleRegistry] = None
+
+
+def get_default_registry() -> StyleRegistry:
+    """
+    Default registry, created at the first call. See module docs for its styles.
+    """
+    global _default_registry
+    if _default_registry is None:
+        registry = StyleRegistry()
+        _default_registry = registry
+        for name, definition in PLOT_STYLE.items():
+            registry.register(name, definition, source=BUILTIN_SOURCE)
+        registry.parameters.update(PARAMETER_MAP)
+        ref = importlib.resources.files("cedarkit.maps") / "resources/style/default.json"
+        with importlib.resources.as_file(ref) as path:
+            config = _load_file(path)
+        for name, definition in config["styles"].items():
+            registry.register(name, definition, source=BUILTIN_SOURCE)
+        registry.parameters.update(config.get("parameters", dict()))
+        for path in os.environ.get(STYLE_PATH_ENV, "").split(os.pathsep):
+            if path != "":
+                registry.load(path)
+    return _default_registry
+
+
+def get_style(name: str) -> Style:
+    """
+    Get a style from the default registry. The returned style is shared, use ``copy.copy`` to change it.
+    """
+    return get_default_registry().get(name)
+
+
+def load_styles(path: Union[str, Path]) -> List[str]:
+    """
+    Load a style file into the default registry.
+    """
+    return get_default_registry().load(path)
+
+
+def load_registered_style(name: str, source: str) -> Style:
+    """
+    Resolve a pickled registry style in the default registry, loading its style file
+    if the style is not registered from this file.
+    """
+    registry = get_default_registry()
+    if source != BUILTIN_SOURCE and registry._sources.get(name) != source:
+        registry.load(source)
+    return registry.get(name)
+
+
+def is_registered_style(style: Style) -> bool:
+    """
+    Whether ``style`` is the current style of its name in the default registry, so it can be pickled as a reference.
+    """
+    reference = style.__dict__.get("_registry_reference")
+    if reference is None or _default_registry is None:
+        return False
+    name, source = reference
+    return _default_registry._styles.get(name) is style and _default_registry._sources.get(name) == source
+
+
+# ----------------
+# Build styles
+# ----------------
+
+def build_style(definition: Dict[str, Any], colormap_cache: Optional[Dict[str, mcolors.Colormap]] = None) -> Style:
+    """
+    Create a style from a definition dict.
+
+    Parameters
+    ----------
+    definition
+    colormap_cache
+        colormaps built by previous calls, keyed by colormap definition.
+
+    Returns
+    -------
+    Style
+    """
+    definition = dict(definition)
+    # legacy PLOT_STYLE definition
+    definition.update(definition.pop("contour", dict()))
+
+    style_class = STYLE_TYPES[definition.pop("type", "contour")]
+    kwargs = dict()
+    for key, value in definition.items():
+        if key == "colormap":
+            kwargs["colors"] = build_colormap(value, cache=colormap_cache)
+        elif key == "levels" or key == "label_levels":
+            kwargs[key] = build_levels(value)
+        elif key in NESTED_STYLES:
+            kwargs[key] = _build_nested_style(NESTED_STYLES[key], value)
+        else:
+            kwargs[key] = value
+    return style_class(**kwargs)
+
+
+def _build_nested_style(style_class, definition: Dict[str, Any]) -> Style:
+    kwargs = dict(definition)
+    for key in ("levels", "label_levels"):
+        if key in kwargs:
+            kwargs[key] = build_levels(kwargs[key])
+    return style_class(**kwargs)
+
+
+def build_levels(definition: Union[List, np.ndarray, Dict[str, Any]]) -> np.ndarray:
+    """
+    Create levels from a list, or a dict with ``start``, ``stop``, ``step`` (``numpy.arange``) and
+    optional ``prepend`` and ``append`` lists.
+    """
+    if not isinstance(definition, dict):
+        return np.asarray(definition)
+    levels = np.arange(definition["start"], definition["stop"], definition["step"])
+    return np.concatenate([
+        np.asarray(definition.get("prepend", []), dtype=levels.dtype),
+        levels,
+        np.asarray(definition.get("append", []), dtype=levels.dtype),
+    ])
+
+
+def build_colormap(
+        definition: Union[str, Dict[str, Any]],
+        cache: Optional[Dict[str, mcolors.Colormap]] = None,
+) -> mcolors.Colormap:
+    """
+    Create colormap from a definition, see module docs. A string is a matplotlib colormap name.
+    """
+    if isinstance(definition, str):
+        definition = dict(category="matplotlib", name=definition)
+
+    key = json.dumps(definition, sort_keys=True, default=str)
+    if cache is not None and key in cache:
+        return cache[key]
+
+    options = dict(definition)
+    category = options.pop("category", "colors")
+    if category == "ncl":
+        name = options.pop("name")
+        if "index" in options:
+            options["index"] = np.asarray(options["index"])
+        colormap = get_ncl_colormap(name, **options)
+        if colormap is None:
+            raise ValueError(f"ncl colormap is not found: {name}")
+    elif category == "ncl_colors":
+        colormap = generate_colormap_using_ncl_colors(options["colors"], name=options.get("name", "colors"))
+    elif category == "matplotlib":
+        colormap = mpl.colormaps[options["name"]]
+    elif category == "colors":
+        colormap = mcolors.ListedColormap(options["colors"], name=options.get("name", "colors"))
+    else:
+        raise ValueError(f"colormap category is not supported: {category}")
+
+    if cache is not None:
+        cache[key] = colormap
+    return colormap
+
+
+def _load_file(path: Path) -> Dict[str, Any]:
+    with open(path) as f:
+        if path.suffix.lower() in (".yaml", ".yml"):
+            try:
+                import yaml
+            except ImportError as e:
+                raise ImportError("pyyaml is required to load YAML style file, install it with `pip install pyyaml`") from e
+            return yaml.safe_load(f)
+        return json.load(f)
+
+
+def parse_style_reference(reference: str) -> Tuple[Optional[str], str]:
+    """
+    Split a style reference ``file.yaml#name`` into file path and style name.
+    """
+    path, sep, name = reference.rpartition("#")
+    if sep == "":
+        return None, reference
+    return path, name
@@ -0,0 +1,415 @@
+"""
+Render Web Mercator XYZ tiles (slippy map tiles) of a field.
+
+Field is contoured once for each zoom level with ``ContourStyle``. The contour geometry is projected to
+Web Mercator once and drawn with ``Layer`` together with map features from ``MapPainter``, then tiles are
+rasterized in parallel worker processes. Each worker adds map features once, replaces contours when zoom level
+changes and only changes axes limits for each tile, so map feature geometries and their projected paths are
+reused across tiles.
+
+Examples
+--------
+>>> renderer = TileRenderer.from_template(EastAsiaMapTemplate(), style=t_2m_style)
+>>> report = renderer.render(t_2m_field, output_dir="tiles/t2m", zooms=range(3, 7))
+"""
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional, List, Tuple, Dict, Iterable, Union, TYPE_CHECKING
+
+import numpy as np
+import xarray as xr
+import matplotlib.figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+import cartopy.crs as ccrs
+import cartopy.feature as cfeature
+from PIL import Image
+
+from cedarkit.maps.style import ContourStyle
+from cedarkit.maps.util import AreaRange, select_area
+from cedarkit.maps.contour import ContourGeometry, compute_contour_geometry
+from cedarkit.maps.export import get_tile_bounds, lonlat_to_web_mercator, WEB_MERCATOR_MAX_LATITUDE
+from cedarkit.maps.chart import Layer
+
+if TYPE_CHECKING:
+    from cedarkit.maps.domains import MapTemplate
+    from cedarkit.maps.painter.map_painter import MapPainter
+
+
+Tile = Tuple[int, int, int]
+
+
+@dataclass
+class TileRenderReport:
+    """
+    Result of ``TileRenderer.render``.
+
+    Attributes
+    ----------
+    paths
+        output paths of rendered tiles.
+    skipped
+        count of tiles skipped because all data in tile is missing.
+    contour_times
+        time in seconds to select tiles and compute contours for each zoom level.
+    render_time
+        time in seconds to rasterize and write all tiles.
+    """
+    paths: List[Path] = field(default_factory=list)
+    skipped: int = 0
+    contour_times: Dict[int, float] = field(default_factory=dict)
+    render_time: float = 0.0
+
+
+def get_tile_range(area: AreaRange, zoom: int) -> Tuple[int, int, int, int]:
+    """
+    XYZ tile index range (x_min, x_max, y_min, y_max) covering an area in [-180, 180] longitude.
+    """
+    n = 2 ** zoom
+
+    def tile_x(lon):
+        return int(np.clip(np.floor((lon + 180) / 360 * n), 0, n - 1))
+
+    def tile_y(lat):
+        lat = np.deg2rad(np.clip(lat, -WEB_MERCATOR_MAX_LATITUDE, WEB_MERCATOR_MAX_LATITUDE))
+        y = (1 - np.log(np.tan(lat) + 1 / np.cos(lat)) / np.pi) / 2 * n
+        return int(np.clip(np.floor(y), 0, n - 1))
+
+    return (
+        tile_x(area.start_longitude),
+        tile_x(area.end_longitude),
+        tile_y(area.end_latitude),
+        tile_y(area.start_latitude),
+    )
+
+
+def get_tile_area(z: int, x: int, y: int) -> AreaRange:
+    """
+    Longitude and latitude range of an XYZ tile.
+    """
+    n = 2 ** z
+
+    def tile_lat(ty):
+        return float(np.rad2deg(np.arctan(np.sinh(np.pi * (1 - 2 * ty / n)))))
+
+    return AreaRange(
+        start_longitude=x / n * 360 - 180,
+        end_longitude=(x + 1) / n * 360 - 180,
+        start_latitude=tile_lat(y + 1),
+        end_latitude=tile_lat(y),
+    )
+
+
+def project_geometry(geometry: ContourGeometry) -> ContourGeometry:
+    """
+    Project contour geometry from lon/lat to Web Mercator coordinates.
+    """
+    return ContourGeometry(
+        levels=geometry.levels,
+        filled=geometry.filled,
+        extend=geometry.extend,
+        segments=[[lonlat_to_web_mercator(vertices) for vertices in segments] for segments in geometry.segments],
+        kinds=geometry.kinds,
+    )
+
+
+def coarsen_field(field: xr.DataArray, resolution: float) -> xr.DataArray:
+    """
+    Subsample field so that grid spacing is close to but not larger than ``resolution`` (degrees).
+    """
+    lon = field[field.dims[-1]].values
+    lat = field[field.dims[-2]].values
+    spacing = min(abs(lon[1] - lon[0]), abs(lat[1] - lat[0]))
+    step = max(int(resolution // spacing), 1)
+    if step == 1:
+        return field
+    return field.isel({field.dims[-1]: slice(None, None, step), field.dims[-2]: slice(None, None, step)})
+
+
+class _ValidDataIndex:
+    """
+    Summed-area table of valid (not missing) data points, to check whether a tile has any data in O(1).
+    """
+    def __init__(self, field: xr.DataArray):
+        lon = field[field.dims[-1]].values
+        lat = field[field.dims[-2]].values
+        valid = np.isfinite(np.asarray(field.values, dtype=float))
+        if lat[0] > lat[-1]:
+            lat = lat[::-1]
+            valid = valid[::-1]
+        self.lon = lon
+        self.lat = lat
+        table = np.zeros((len(lat) + 1, len(lon) + 1), dtype=np.int64)
+        table[1:, 1:] = valid.cumsum(axis=0).cumsum(axis=1)
+        self.table = table
+
+    def has_data(self, area: AreaRange) -> bool:
+        x0 = np.searchsorted(self.lon, area.start_longitude, side="left")
+        x1 = np.searchsorted(self.lon, area.end_longitude, side="right")
+        y0 = np.searchsorted(self.lat, area.start_latitude, side="left")
+        y1 = np.searchsorted(self.lat, area.end_latitude, side="right")
+        if x1 <= x0 or y1 <= y0:
+            return False
+        table = self.table
+        count = table[y1, x1] - table[y0, x1] - table[y1, x0] + table[y0, x0]
+        return count > 0
+
+
+class TileRenderer:
+    """
+    Render Web Mercator XYZ tiles with ``Layer``, ``ContourStyle`` and ``MapPainter``.
+
+    Parameters
+    ----------
+    style
+        contour style. Levels are calculated once for all zoom levels.
+    map_painter
+        map features painted on tiles, no map features if None.
+    area
+        area to render, default is the whole field.
+    tile_size
+        tile size in pixels.
+    fill_value
+        values equal to ``fill_value`` are treated as missing values besides NaN.
+    max_workers
+        worker process count, default is CPU count. Tiles are rendered in current process if ``max_workers`` <= 1.
+    """
+    def __init__(
+            self,
+            style: ContourStyle,
+            map_painter: Optional["MapPainter"] = None,
+            area: Optional[AreaRange] = None,
+            tile_size: int = 256,
+            fill_value: Optional[float] = None,
+            max_workers: Optional[int] = None,
+    ):
+        self.style = style
+        self.map_painter = map_painter
+        self.area = area
+        self.tile_size = tile_size
+        self.fill_value = fill_value
+        self.max_workers = max_workers
+
+        self._features: Optional[List[cfeature.Feature]] = None
+
+    @classmethod
+    def from_template(cls, domain: "MapTemplate", style: ContourStyle, **kwargs) -> "TileRenderer":
+        """
+        Create renderer with main map painter and area of a map template.
+        """
+        if domain.main_map_painter is None:
+            domain.load_map()
+        kwargs.setdefault("area", domain.area)
+        return cls(style=style, map_painter=domain.main_map_painter, **kwargs)
+
+    def get_features(self) -> List[cfeature.Feature]:
+        """
+        Map features loaded once and shared by all tiles.
+        """
+        if self._features is None:
+            if self.map_painter is None:
+                self._features = []
+            else:
+                self._features = self.map_painter.get_features()
+        return self._features
+
+    def prepare_field(self, field: xr.DataArray) -> xr.DataArray:
+        if self.fill_value is not None:
+            field = field.where(field != self.fill_value)
+        if self.area is not None:
+            field = select_area(field, self.area)
+        return field
+
+    def get_field_area(self, field: xr.DataArray) -> AreaRange:
+        if self.area is not None:
+            return self.area
+        lon = field[field.dims[-1]].values
+        lat = field[field.dims[-2]].values
+        return AreaRange(float(lon.min()), float(lon.max()), float(lat.min()), float(lat.max()))
+
+    def compute_zoom_geometry(self, field: xr.DataArray, zoom: int, levels: np.ndarray) -> ContourGeometry:
+        """
+        Contour field once for a zoom level, on a grid coarsened to the pixel size of the zoom level.
+        The result is in Web Mercator coordinates.
+        """
+        resolution = 360 / (self.tile_size * 2 ** zoom)
+        zoom_field = coarsen_field(field, resolution=resolution)
+        geometry = compute_contour_geometry(
+            zoom_field,
+            levels=levels,
+            filled=self.style.fill,
+            extend="both" if self.style.fill else "neither",
+        )
+        return project_geometry(geometry)
+
+    def get_tiles(self, field: xr.DataArray, zoom: int) -> Tuple[List[Tile], int]:
+        """
+        Tiles to be rendered in a zoom level and count of tiles skipped because they have no valid data.
+        """
+        x_min, x_max, y_min, y_max = get_tile_range(self.get_field_area(field), zoom)
+        index = _ValidDataIndex(field)
+        tiles = []
+        skipped = 0
+        for x in range(x_min, x_max + 1):
+            for y in range(y_min, y_max + 1):
+                if index.has_data(get_tile_area(zoom, x, y)):
+                    tiles.append((zoom, x, y))
+                else:
+                    skipped += 1
+        return tiles, skipped
+
+    def render(
+            self,
+            field: xr.DataArray,
+            output_dir: Union[str, Path],
+            zooms: Iterable[int],
+            pattern: str = "{z}/{x}/{y}.png",
+    ) -> TileRenderReport:
+        """
+        Render tiles of all zoom levels to ``output_dir``.
+
+        Parameters
+        ----------
+        field
+            2D lat/lon field with longitude in [-180, 180].
+        output_dir
+        zooms
+            zoom levels.
+        pattern
+            tile path pattern in ``output_dir`` with ``z``, ``x`` and ``y`` fields.
+
+        Returns
+        -------
+        TileRenderReport
+        """
+        output_dir = Path(output_dir)
+        field = self.prepare_field(field)
+        levels = np.asarray(self.style.get_levels(field), dtype=float)
+
+        report = TileRenderReport()
+        geometries: Dict[int, ContourGeometry] = dict()
+        tiles: List[Tile] = []
+        for zoom in zooms:
+            start_time = time.perf_counter()
+            zoom_tiles, skipped = self.get_tiles(field, zoom)
+            report.skipped += skipped
+            if len(zoom_tiles) > 0:
+                geometries[zoom] = self.compute_zoom_geometry(field, zoom=zoom, levels=levels)
+                tiles.extend(zoom_tiles)
+            report.contour_times[zoom] = time.perf_counter() - start_time
+
+        paths = [output_dir / pattern.format(z=z, x=x, y=y) for z, x, y in tiles]
+        for path in set(p.parent for p in paths):
+            path.mkdir(parents=True, exist_ok=True)
+
+        start_time = time.perf_counter()
+        self._render_tiles(geometries, tiles, paths)
+        report.render_time = time.perf_counter() - start_time
+        report.paths = paths
+        return report
+
+    def _render_tiles(self, geometries: Dict[int, ContourGeometry], tiles: List[Tile], paths: List[Path]):
+        if len(tiles) == 0:
+            return
+        workers = self.max_workers if self.max_workers is not None else os.cpu_count()
+        _init_worker(self, geometries)
+        if workers is None or workers <= 1:
+            for tile, path in zip(tiles, paths):
+                _render_tile(tile, path)
+            return
+
+        # Draw one tile before starting workers: map features are loaded and projected paths of map
+        # features are cached in current process, which are shared by forked workers.
+        _worker_state.get_canvas(tiles[0][0])
+        _worker_state.renderer.render_tile(_worker_state.canvas, _worker_state.layer, tiles[0])
+
+        with ProcessPoolExecutor(
+                max_workers=workers,
+                initializer=_init_worker,
+                initargs=(self, geometries),
+        ) as executor:
+            chunk_size = max(len(tiles) // (4 * workers), 1)
+            # tiles are sorted by zoom level, so each worker seldom changes contours.
+            list(executor.map(_render_tile, tiles, paths, chunksize=chunk_size))
+
+    def create_tile_canvas(self) -> Tuple[FigureCanvasAgg, Layer]:
+        """
+        Create a transparent figure filled with one Web Mercator axes, and draw map features on it.
+        Tiles are rendered by changing axes limits.
+        """
+        dpi = 100
+        fig = matplotlib.figure.Figure(figsize=(self.tile_size / dpi, self.tile_size / dpi), dpi=dpi)
+        canvas = FigureCanvasAgg(fig)
+        fig.patch.set_alpha(0)
+        ax = fig.add_axes((0, 0, 1, 1), projection=ccrs.Mercator.GOOGLE)
+        ax.set_axis_off()
+        ax.patch.set_alpha(0)
+
+        # contour geometry is already in axes coordinates.
+        layer = Layer(projection=None)
+        layer.set_axes(ax)
+        for feature in self.get_features():
+            ax.add_feature(feature)
+        return canvas, layer
+
+    def render_tile(self, canvas: FigureCanvasAgg, layer: Layer, tile: Tile) -> np.ndarray:
+        """
+        Rasterize one tile on a canvas created by ``create_tile_canvas``.
+
+        Returns
+        -------
+        np.ndarray
+            RGBA image with shape (tile_size, tile_size, 4).
+        """
+        x0, y0, x1, y1 = get_tile_bounds(*tile)
+        layer.ax.set_xlim(x0, x1)
+        layer.ax.set_ylim(y0, y1)
+        canvas.draw()
+        return np.asarray(canvas.buffer_rgba()).copy()
+
+
+class _TileWorkerState:
+    """
+    Canvas of a worker process. Map features are drawn once, and contours are replaced when zoom level changes.
+    """
+    def __init__(self, renderer: TileRenderer, geometries: Dict[int, ContourGeometry]):
+        self.renderer = renderer
+        self.geometries = geometries
+        self.canvas: Optional[FigureCanvasAgg] = None
+        self.layer: Optional[Layer] = None
+        self.contour = None
+        self.zoom: Optional[int] = None
+
+    def get_canvas(self, zoom: int) -> Tuple[FigureCanvasAgg, Layer]:
+        if self.canvas is None:
+            self.canvas, self.layer = self.renderer.create_tile_canvas()
+        if zoom != self.zoom:
+            if self.contour is not None:
+                self.contour.remove()
+            self.contour = self.layer.plot_contour_geometry(
+                geometry=self.geometries[zoom],
+                style=self.renderer.style,
+            )
+            self.zoom = zoom
+        return self.canvas, self.layer
+
+
+_worker_state: Optional[_TileWorkerState] = None
+
+
+def _init_worker(renderer: TileRenderer, geometries: Dict[int, ContourGeometry]):
+    global _worker_state
+    if _worker_state is not None and _worker_state.renderer is renderer:
+        # forked from current process, reuse canvas drawn before fork.
+        _worker_state.geometries = geometries
+        return
+    _worker_state = _TileWorkerState(renderer, geometries)
+
+
+def _render_tile(tile: Tile, path: Path) -> Path:
+    canvas, layer = _worker_state.get_canvas(tile[0])
+    image = _worker_state.renderer.render_tile(canvas, layer, tile)
+    Image.fromarray(image).save(path, format="png")
+    return path
@@ -1,8 +1,9 @@
-from typing import List, Optional, Tuple
+from typing import List, Optional, Tuple, Union
 from dataclasses import dataclass
 
 import numpy as np
 import pandas as pd
+import xarray as xr
 import matplotlib as mpl
 import matplotlib.axes
 import matplotlib.figure
@@ -39,6 +40,95 @@ class AreaRange:
     def from_tuple(cls, area: Tuple[float, float, float, float]) -> 'AreaRange':
         return cls(area[0], area[1], area[2], area[3])
 
+    @property
+    def longitude_span(self) -> float:
+        return self.end_longitude - self.start_longitude
+
+    @property
+    def is_global(self) -> bool:
+        """
+        Whether the area covers all longitudes.
+        """
+        return self.longitude_span >= 360
+
+    def normalize_longitude(self) -> 'AreaRange':
+        """
+        Area range with start longitude in [-180, 180). End longitude may be larger than 180 if the area crosses
+        the dateline. Global areas are (-180, 180).
+        """
+        if self.is_global:
+            start_longitude, end_longitude = -180, 180
+        else:
+            start_longitude = (self.start_longitude + 180) % 360 - 180
+            end_longitude = start_longitude + self.longitude_span
+        return AreaRange(
+            start_longitude=start_longitude,
+            end_longitude=end_longitude,
+            start_latitude=self.start_latitude,
+            end_latitude=self.end_latitude,
+        )
+
+    def intersects(self, other: 'AreaRange') -> bool:
+        """
+        Check whether two area ranges overlap (touching edges are treated as overlap).
+        Longitudes are compared on the circle, so [-180, 180] and [0, 360] conventions can be mixed.
+        """
+        if not (self.start_latitude <= other.end_latitude and other.start_latitude <= self.end_latitude):
+            return False
+        if self.is_global or other.is_global:
+            return True
+        offset = self._longitude_offset(other)
+        return offset <= self.longitude_span or offset + other.longitude_span >= 360
+
+    def contains(self, other: 'AreaRange') -> bool:
+        """
+        Check whether ``other`` is inside this area range. Longitudes are compared on the circle.
+        """
+        if not (self.start_latitude <= other.start_latitude and other.end_latitude <= self.end_latitude):
+            return False
+        if self.is_global:
+            return True
+        return self._longitude_offset(other) + other.longitude_span <= self.longitude_span
+
+    def union(self, other: 'AreaRange') -> 'AreaRange':
+        """
+        Bounding box of two area ranges. The shorter longitude range covering both areas on the circle is used,
+        starting from the start longitude of one of them.
+        """
+        start_latitude = min(self.start_latitude, other.start_latitude)
+        end_latitude = max(self.end_latitude, other.end_latitude)
+        candidates = []
+        for first, second in ((self, other), (other, self)):
+            if first.is_global:
+                span = 360
+            else:
+                span = max(first.longitude_span, first._longitude_offset(second) + second.longitude_span)
+            candidates.append((min(span, 360), first.start_longitude))
+        span, start_longitude = min(candidates, key=lambda item: item[0])
+        return AreaRange(
+            start_longitude=start_longitude,
+            end_longitude=start_longitude + span,
+            start_latitude=start_latitude,
+            end_latitude=end_latitude,
+        )
+
+    def _longitude_offset(self, other: 'AreaRange') -> float:
+        """
+        Longitude distance from start of this area eastward to start of ``other``, in [0, 360).
+        """
+        return (other.start_longitude - self.start_longitude) % 360
+
+    def expand(self, margin: float) -> 'AreaRange':
+        """
+        Expand area range by ``margin`` degrees in each direction. Latitudes are clipped to [-90, 90].
+        """
+        return AreaRange(
+            start_longitude=self.start_longitude - margin,
+            end_longitude=self.end_longitude + margin,
+            start_latitude=max(self.start_latitude - margin, -90),
+            end_latitude=min(self.end_latitude + margin, 90),
+        )
+
 
 # -----------------
 # Layout
@@ -393,6 +483,177 @@ def set_map_box_title(
     return [top_left_text, top_right_text, bottom_left_text, bottom_right_text, main_title_text]
 
 
+def update_map_box_title(
+        texts: List[Optional[matplotlib.text.Text]],
+        graph_title: GraphTitle,
+) -> List[Optional[matplotlib.text.Text]]:
+    """
+    Update strings of title texts created by ``set_map_box_title`` without adding new artists.
+    Texts whose string is not changed are not touched, so they are not marked stale.
+
+    Parameters
+    ----------
+    texts
+        text list returned by ``set_map_box_title``.
+    graph_title
+        new title labels. Positions in ``graph_title`` are ignored.
+
+    Returns
+    -------
+    List[Optional[matplotlib.text.Text]]
+    """
+    labels = [
+        graph_title.top_left_label,
+        graph_title.top_right_label,
+        graph_title.bottom_left_label,
+        graph_title.bottom_right_label,
+        graph_title.main_title_label,
+    ]
+    for text, label in zip(texts, labels):
+        if text is None:
+            continue
+        label = "" if label is None else label
+        if text.get_text() != label:
+            text.set_text(label)
+    return texts
+
+
+@dataclass
+class MapBoxTitle:
+    """
+    Title texts of a map box created by ``set_map_box_title``.
+
+    The object is kept in ``Layer.title`` so titles of a reused figure are updated in place
+    instead of adding new text artists.
+    """
+    top_left_text: Optional[matplotlib.text.Text] = None
+    top_right_text: Optional[matplotlib.text.Text] = None
+    bottom_left_text: Optional[matplotlib.text.Text] = None
+    bottom_right_text: Optional[matplotlib.text.Text] = None
+    main_title_text: Optional[matplotlib.text.Text] = None
+
+    @property
+    def texts(self) -> List[Optional[matplotlib.text.Text]]:
+        return [
+            self.top_left_text,
+            self.top_right_text,
+            self.bottom_left_text,
+            self.bottom_right_text,
+            self.main_title_text,
+        ]
+
+    def update(self, graph_title: GraphTitle) -> "MapBoxTitle":
+        """
+        Update strings of existing texts. Labels without text artists are ignored.
+        """
+        update_map_box_title(self.texts, graph_title=graph_title)
+        return self
+
+    def remove(self):
+        for text in self.texts:
+            if text is not None:
+                text.remove()
+
+
+@dataclass
+class GraphTimeLabels:
+    """
+    Time labels of titles for a forecast lead time sequence, see ``get_graph_time_labels``.
+    """
+    utc_start_time_label: str
+    cst_start_time_label: str
+    forecast_time_labels: np.ndarray
+    utc_valid_time_labels: np.ndarray
+    cst_valid_time_labels: np.ndarray
+
+
+def format_hour_labels(times: pd.DatetimeIndex) -> np.ndarray:
+    """
+    Format times as ``YYYYMMDDHH`` strings in one pass, same as ``strftime('%Y%m%d%H')``.
+
+    Parameters
+    ----------
+    times
+
+    Returns
+    -------
+    np.ndarray
+    """
+    if times.tz is not None:
+        return np.asarray(times.strftime('%Y%m%d%H'))
+    labels = np.datetime_as_string(times.values.astype("datetime64[h]"), unit="h")
+    labels = np.char.replace(labels, "-", "")
+    return np.char.replace(labels, "T", "")
+
+
+def get_graph_time_labels(
+        start_time: pd.Timestamp,
+        forecast_times: Union[pd.TimedeltaIndex, List[pd.Timedelta]],
+) -> GraphTimeLabels:
+    """
+    Compute time labels used by ``fill_graph_title`` for all forecast times at once.
+
+    Parameters
+    ----------
+    start_time
+    forecast_times
+
+    Returns
+    -------
+    GraphTimeLabels
+    """
+    forecast_times = pd.TimedeltaIndex(forecast_times)
+    cst_offset = pd.Timedelta(hours=8)
+    valid_times = start_time + forecast_times
+    forecast_hours = np.trunc(forecast_times / pd.Timedelta(hours=1)).astype(int)
+    return GraphTimeLabels(
+        utc_start_time_label=start_time.strftime('%Y%m%d%H'),
+        cst_start_time_label=(start_time + cst_offset).strftime('%Y%m%d%H'),
+        forecast_time_labels=np.char.zfill(np.asarray(forecast_hours).astype(str), 2),
+        utc_valid_time_labels=format_hour_labels(valid_times),
+        cst_valid_time_labels=format_hour_labels(valid_times + cst_offset),
+    )
+
+
+def fill_graph_titles(
+        graph_name: str,
+        system_name: str,
+        start_time: pd.Timestamp,
+        forecast_times: Union[pd.TimedeltaIndex, List[pd.Timedelta]],
+) -> List[GraphTitle]:
+    """
+    Create ``GraphTitle`` objects for a forecast lead time sequence, same as calling ``fill_graph_title``
+    for each forecast time. Time labels are computed with ``get_graph_time_labels``.
+
+    Parameters
+    ----------
+    graph_name
+    system_name
+    start_time
+    forecast_times
+
+    Returns
+    -------
+    List[GraphTitle]
+    """
+    time_labels = get_graph_time_labels(start_time=start_time, forecast_times=forecast_times)
+    utc_start_time_label = time_labels.utc_start_time_label
+    cst_start_time_label = time_labels.cst_start_time_label
+    graph_titles = []
+    for forecast_time_label, utc_valid_time_label, cst_valid_time_label in zip(
+            time_labels.forecast_time_labels,
+            time_labels.utc_valid_time_labels,
+            time_labels.cst_valid_time_labels,
+    ):
+        graph_titles.append(GraphTitle(
+            top_left_label=graph_name,
+            top_right_label=system_name,
+            bottom_left_label=f"{utc_start_time_label}+{forecast_time_label}h\n{cst_start_time_label}+{forecast_time_label}h",
+            bottom_right_label=f"{utc_valid_time_label}(UTC)\n{cst_valid_time_label}(CST)",
+        ))
+    return graph_titles
+
+
 def fill_graph_title_pos_by_map_type(graph_title: GraphTitle, map_type: str = "east_asia") -> GraphTitle:
     """
     为特定底图类型设置四角标题位置
@@ -586,6 +847,7 @@ class GraphColorbar:
     label_loc: Optional[str] = None
     label_levels: Optional[List] = None
     orientation: str = "vertical"
+    norm: Optional[mcolors.Normalize] = None
 
 
 def add_map_box_colorbar(
@@ -625,14 +887,17 @@ def add_map_box_colorbar(
     else:
         raise ValueError(f"either ax or fig should be provided.")
 
-    norm = mcolors.BoundaryNorm(levels, colormap.N, extend="both")
+    norm = graph_colorbar.norm
+    if norm is None:
+        norm = mcolors.BoundaryNorm(levels, colormap.N, extend="both")
+    # colorbar without levels uses a continuous norm, such as image styles with vmin and vmax.
     cbar = cax.get_figure().colorbar(
         mpl.cm.ScalarMappable(norm=norm, cmap=colormap),
         cax=cax,
         orientation=orientation,
         spacing='uniform',
         ticks=label_levels,
-        drawedges=True,
+        drawedges=levels is not None,
         extendrect=True,
         extendfrac='auto',  # 延伸相同长度
     )
@@ -644,7 +909,9 @@ def add_map_box_colorbar(
         labelsize=7
     )
     # ticklabs = cbar.ax.get_yticklabels()
-    if orientation == "vertical":
+    if label_levels is None:
+        ...
+    elif orientation == "vertical":
         cbar.ax.set_yticklabels(label_levels, ha='center')
         cbar.ax.yaxis.set_tick_params(pad=7)
     elif orientation == "horizontal":
@@ -769,6 +1036,62 @@ def set_map_box_area(
     return ax
 
 
+def select_area(
+        field: xr.DataArray,
+        area: AreaRange,
+        longitude_name: Optional[str] = None,
+        latitude_name: Optional[str] = None,
+) -> xr.DataArray:
+    """
+    Select subset of a regular lat/lon field within area range.
+
+    Latitude may be ascending or descending. Longitude of the field may use either [-180, 180) or [0, 360)
+    convention; subsets crossing the field's longitude seam are rolled and their longitude coordinate is
+    rewritten to be continuous from ``area.start_longitude``. Contiguous subsets are returned as views.
+
+    Parameters
+    ----------
+    field
+    area
+    longitude_name
+        longitude dimension name, default is the last dimension.
+    latitude_name
+        latitude dimension name, default is the second last dimension.
+
+    Returns
+    -------
+    xr.DataArray
+    """
+    if longitude_name is None:
+        longitude_name = field.dims[-1]
+    if latitude_name is None:
+        latitude_name = field.dims[-2]
+
+    lats = field[latitude_name].values
+    if lats[0] > lats[-1]:
+        lat_slice = slice(area.end_latitude, area.start_latitude)
+    else:
+        lat_slice = slice(area.start_latitude, area.end_latitude)
+    field = field.sel({latitude_name: lat_slice})
+
+    lon_span = area.end_longitude - area.start_longitude
+    if lon_span >= 360:
+        return field
+
+    lons = field[longitude_name].values
+    offset = (lons - area.start_longitude) % 360
+    index = np.flatnonzero(offset <= lon_span)
+    if index.size == 0:
+        raise ValueError(f"area is out of field longitude range: {area}")
+
+    index = index[np.argsort(offset[index], kind="stable")]
+    if index[-1] - index[0] + 1 == index.size and np.all(np.diff(index) > 0):
+        return field.isel({longitude_name: slice(index[0], index[-1] + 1)})
+
+    field = field.isel({longitude_name: index})
+    return field.assign_coords({longitude_name: area.start_longitude + offset[index]})
+
+
 # ----------------------
 # Axis
 # ----------------------
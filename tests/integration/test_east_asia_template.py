@@ -4,8 +4,10 @@ matplotlib.use('Agg')
 import matplotlib.pyplot as plt
 
 from cedarkit.maps.domains import EastAsiaMapTemplate
-from cedarkit.maps.chart import Panel
-from cedarkit.maps.style import ContourStyle
+from cedarkit.maps.chart import Panel, get_graph_levels
+from cedarkit.maps.style import ContourStyle, AutoLevelStyle, ContourLabelStyle, ImageStyle
+from cedarkit.maps.reproject import get_default_cache
+from cedarkit.maps.contour import ContourGeneratorOption
 
 
 class TestEastAsiaMapTemplateContourf:
@@ -96,6 +98,55 @@ class TestEastAsiaMapTemplateContour:
         assert output_path.stat().st_size > 0, "image file should not be empty"
 
 
+    def test_pressure_contour_grid_label(
+        self,
+        east_asia_pressure_field,
+        sample_start_time,
+        sample_forecast_time,
+        output_dir
+    ):
+        """测试网格标注引擎"""
+        style = ContourStyle(
+            colors="blue",
+            levels=np.arange(980, 1045, 5),
+            linewidths=1,
+            fill=False,
+            label=True,
+            label_style=ContourLabelStyle(
+                fontsize=7,
+                fmt="{:.0f}".format,
+                background_color="white",
+                engine="grid",
+            ),
+        )
+        domain = EastAsiaMapTemplate()
+        panel = Panel(domain=domain)
+        graphs = panel.plot(east_asia_pressure_field, style=style)
+
+        contour = graphs[0][0]
+        assert len(contour.labelTexts) > 0
+        label_xys = np.array([label.get_position() for label in contour.labelTexts])
+        distances = np.hypot(*(label_xys[:, None, :] - label_xys[None, :, :]).transpose(2, 0, 1))
+        np.fill_diagonal(distances, np.inf)
+        assert distances.min() > 0.5, "labels should not overlap"
+
+        panel.update_plot(graphs, east_asia_pressure_field + 2, style=style)
+        assert len(contour.labelTexts) > 0
+
+        panel.set_title(
+            graph_name="MSLP (hPa)",
+            system_name="Test-Model",
+            start_time=sample_start_time,
+            forecast_time=sample_forecast_time,
+        )
+
+        output_path = output_dir / "east_asia_pressure_contour_grid_label.png"
+        panel.save(output_path, dpi=150)
+        plt.close()
+
+        assert output_path.exists(), "image file should be created"
+
+
 class TestEastAsiaMapTemplateBarb:
     def test_wind_barb(
         self,
@@ -241,6 +292,48 @@ class TestEastAsiaMapTemplateOptions:
         assert output_path.stat().st_size > 0, "image file should not be empty"
 
 
+    def test_auto_levels(
+        self,
+        east_asia_temperature_field,
+        sample_start_time,
+        sample_forecast_time,
+        output_dir
+    ):
+        """测试按百分位数自动计算等值线层次"""
+        field = east_asia_temperature_field.copy()
+        field[0, 0] = 1000.0
+        style = ContourStyle(
+            colors=matplotlib.colormaps["RdYlBu_r"],
+            fill=True,
+            auto_level_style=AutoLevelStyle(max_count=12),
+        )
+
+        domain = EastAsiaMapTemplate()
+        panel = Panel(domain=domain)
+        graphs = panel.plot(field, style=style)
+
+        levels = get_graph_levels(graphs)
+        assert levels is not None
+        assert style.get_levels() is None
+        assert levels[-1] < 100, "levels should not be affected by outliers"
+        for contour in graphs[0]:
+            np.testing.assert_array_equal(contour.levels, levels)
+
+        panel.set_title(
+            graph_name="2m Temperature (°C)",
+            system_name="Test-Model",
+            start_time=sample_start_time,
+            forecast_time=sample_forecast_time,
+        )
+        panel.add_colorbar(style=style, levels=levels)
+
+        output_path = output_dir / "east_asia_auto_levels.png"
+        panel.save(output_path, dpi=150)
+        plt.close()
+
+        assert output_path.exists(), "image file should be created"
+
+
 class TestEastAsiaMapTemplateEdgeCases:
     
     def test_empty_style_levels(self, east_asia_temperature_field, output_dir):
@@ -290,3 +383,152 @@ class TestEastAsiaMapTemplateEdgeCases:
         
         assert output_path.exists(), "image file should be created"
         assert output_path.stat().st_size > 0, "image file should not be empty"
+
+
+class TestEastAsiaMapTemplateSimplify:
+    def test_simplify_contour(
+        self,
+        east_asia_temperature_field,
+        east_asia_pressure_field,
+        temperature_style,
+        pressure_contour_style,
+        output_dir
+    ):
+        from cedarkit.maps.chart import PathSimplifyOption
+
+        domain = EastAsiaMapTemplate()
+        panel = Panel(domain=domain)
+        panel.set_simplify_option(PathSimplifyOption(tolerance=1.0, vertex_budget=20000, dpi=150))
+        panel.plot(east_asia_temperature_field, style=temperature_style)
+        panel.plot(east_asia_pressure_field, style=pressure_contour_style)
+
+        metrics = panel.charts[0].layers[0].metrics
+        assert metrics.contour_count == 2
+        assert 0 < metrics.vertices_after < metrics.vertices_before
+        assert metrics.vertices_after <= 2 * 20000
+
+        output_path = output_dir / "east_asia_simplify_contour.png"
+        panel.save(output_path, dpi=150)
+        plt.close()
+
+        assert output_path.exists(), "image file should be created"
+
+
+class TestEastAsiaMapTemplateContourOption:
+    def test_threaded_contour(
+        self,
+        east_asia_temperature_field,
+        east_asia_pressure_field,
+        temperature_style,
+        pressure_contour_style,
+        output_dir
+    ):
+        domain = EastAsiaMapTemplate()
+        panel = Panel(domain=domain)
+        panel.set_contour_option(ContourGeneratorOption(algorithm="threaded", thread_count=2))
+        results = panel.plot(east_asia_temperature_field, style=temperature_style)
+        panel.plot(east_asia_pressure_field, style=pressure_contour_style)
+        panel.update_plot(results, east_asia_temperature_field + 2, style=temperature_style)
+
+        output_path = output_dir / "east_asia_threaded_contour.png"
+        panel.save(output_path, dpi=150)
+        plt.close()
+
+        assert output_path.exists(), "image file should be created"
+
+
+class TestEastAsiaMapTemplateGeometry:
+    def test_plot_contour_geometry(
+        self,
+        east_asia_temperature_field,
+        east_asia_pressure_field,
+        temperature_style,
+        pressure_contour_style,
+        output_dir
+    ):
+        domain = EastAsiaMapTemplate()
+        panel = Panel(domain=domain)
+        layer = panel.charts[0].layers[0]
+
+        fill_geometry = layer.compute_contour(east_asia_temperature_field, style=temperature_style)
+        line_geometry = layer.compute_contour(east_asia_pressure_field, style=pressure_contour_style)
+        assert fill_geometry.filled and not line_geometry.filled
+
+        fill_results = panel.plot(fill_geometry, style=temperature_style)
+        line_results = panel.plot(line_geometry, style=pressure_contour_style)
+        assert len(fill_results[0]) == len(panel.charts[0].layers)
+
+        expected = panel.plot(east_asia_temperature_field, style=temperature_style)
+        np.testing.assert_allclose(fill_results[0][0].get_facecolor(), expected[0][0].get_facecolor())
+        for path, expected_path in zip(fill_results[0][0].get_paths(), expected[0][0].get_paths()):
+            np.testing.assert_array_equal(path.vertices, expected_path.vertices)
+        for contour in expected[0]:
+            contour.remove()
+
+        panel.update_plot(line_results, line_geometry, style=pressure_contour_style)
+
+        output_path = output_dir / "east_asia_contour_geometry.png"
+        panel.save(output_path, dpi=150)
+        plt.close()
+
+        assert output_path.exists(), "image file should be created"
+
+    def test_shared_contour(
+        self,
+        east_asia_temperature_field,
+        temperature_style,
+        output_dir
+    ):
+        domain = EastAsiaMapTemplate()
+        panel = Panel(domain=domain)
+        main_layer, sub_layer = panel.charts[0].layers
+
+        results = panel.plot(east_asia_temperature_field, style=temperature_style)
+        main_contour, sub_contour = results[0]
+        np.testing.assert_array_equal(main_contour.levels, sub_contour.levels)
+        main_vertices = sum(len(path.vertices) for path in main_contour.get_paths())
+        sub_vertices = sum(len(path.vertices) for path in sub_contour.get_paths())
+        assert 0 < sub_vertices < main_vertices
+
+        geometry = main_layer.compute_contour(east_asia_temperature_field, style=temperature_style)
+        expected = geometry.select(sub_layer.get_data_extent())
+        for path, expected_path in zip(sub_contour.get_paths(), expected.paths):
+            np.testing.assert_array_equal(path.vertices, expected_path.vertices)
+
+        results = panel.update_plot(results, east_asia_temperature_field + 2, style=temperature_style)
+        assert results[0][1] is sub_contour
+
+        output_path = output_dir / "east_asia_shared_contour.png"
+        panel.save(output_path, dpi=150)
+        plt.close()
+
+        assert output_path.exists(), "image file should be created"
+
+
+class TestEastAsiaMapTemplateImage:
+    def test_image(
+        self,
+        east_asia_temperature_field,
+        temperature_style,
+        output_dir
+    ):
+        style = ImageStyle(colors=temperature_style.colors, levels=temperature_style.levels)
+        cache = get_default_cache()
+        domain = EastAsiaMapTemplate()
+        panel = Panel(domain=domain)
+
+        results = panel.plot(east_asia_temperature_field, style=style)
+        image = results[0][0]
+        assert image.get_array().shape == (round(image.axes.bbox.height), round(image.axes.bbox.width))
+
+        misses = cache.misses
+        results = panel.update_plot(results, east_asia_temperature_field + 5, style=style)
+        assert results[0][0] is image
+        assert cache.misses == misses
+        panel.add_colorbar(style=style)
+
+        output_path = output_dir / "east_asia_temperature_image.png"
+        panel.save(output_path, dpi=150)
+        plt.close()
+
+        assert output_path.exists(), "image file should be created"
@@ -0,0 +1,142 @@
+import numpy as np
+import pandas as pd
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+from PIL import Image
+
+from cedarkit.maps.domains import EastAsiaMapTemplate, GlobalMapTemplate
+from cedarkit.maps.chart import LeadTimeSequence
+from cedarkit.maps.style import ContourStyle, AutoLevelStyle
+
+
+class TestLeadTimeSequence:
+    def test_gif(
+        self,
+        east_asia_temperature_field,
+        east_asia_pressure_field,
+        sample_start_time,
+        temperature_style,
+        pressure_contour_style,
+        output_dir
+    ):
+        sequence = LeadTimeSequence(
+            domain=EastAsiaMapTemplate(),
+            graph_name="2m Temperature (°C)",
+            system_name="Test-Model",
+            start_time=sample_start_time,
+        )
+        sequence.add_plot(style=temperature_style)
+        sequence.add_plot(style=pressure_contour_style)
+        sequence.add_colorbar(style=temperature_style)
+
+        frames = [
+            (pd.Timedelta(hours=hour), [east_asia_temperature_field + hour / 6, east_asia_pressure_field - hour / 6])
+            for hour in range(0, 24, 6)
+        ]
+
+        output_path = output_dir / "east_asia_temperature_sequence.gif"
+        sequence.save(output_path, frames=frames, dpi=50)
+
+        main_ax = sequence.panel.charts[0].layers[0].ax
+        text_count = len(main_ax.texts)
+        collection_count = len(main_ax.collections)
+        sequence.render_frame(forecast_time=pd.Timedelta(hours=24), data=frames[0][1])
+        assert len(main_ax.texts) == text_count
+        assert len(main_ax.collections) == collection_count
+        assert "2024110900+24h" in sequence.title_texts[2].get_text()
+        sequence.close()
+
+        assert sequence.frame_count == 5
+        with Image.open(output_path) as image:
+            assert image.n_frames == 4
+
+    def test_png_series(
+        self,
+        global_temperature_field,
+        sample_start_time,
+        temperature_style,
+        output_dir
+    ):
+        sequence = LeadTimeSequence(
+            domain=GlobalMapTemplate(),
+            graph_name="2m Temperature (°C)",
+            system_name="Test-Model",
+            start_time=sample_start_time,
+        )
+        sequence.add_plot(style=temperature_style)
+
+        frames = (
+            (pd.Timedelta(hours=hour), [global_temperature_field + hour / 6])
+            for hour in range(0, 12, 6)
+        )
+        writer = sequence.save(output_dir / "global_temperature_sequence_{index:03d}.png", frames=frames, dpi=50)
+        sequence.close()
+
+        assert len(writer.paths) == 2
+        sizes = set()
+        for path in writer.paths:
+            assert path.exists()
+            with Image.open(path) as image:
+                sizes.add(image.size)
+        assert len(sizes) == 1
+        assert sequence.title_texts[0].get_text() == "2024110900 UTC Forecast t+006"
+
+    def test_auto_levels(self, east_asia_temperature_field, sample_start_time):
+        frames = [
+            (pd.Timedelta(hours=0), [east_asia_temperature_field]),
+            (pd.Timedelta(hours=6), [east_asia_temperature_field + 20]),
+        ]
+        results = dict()
+        for freeze in (True, False):
+            style = ContourStyle(colors="RdYlBu_r", fill=True, auto_level_style=AutoLevelStyle(freeze=freeze))
+            sequence = LeadTimeSequence(
+                domain=EastAsiaMapTemplate(),
+                graph_name="2m Temperature (°C)",
+                system_name="Test-Model",
+                start_time=sample_start_time,
+            )
+            sequence.add_plot(style=style)
+            assert sequence.add_colorbar(style=style) is None
+
+            sequence.render_frame(*frames[0])
+            first_levels = sequence.plots[0].levels
+            colorbar = sequence.colorbars[0].colorbars[0]
+            np.testing.assert_array_equal(colorbar.norm.boundaries, first_levels)
+            axes_count = len(sequence.fig.axes)
+
+            sequence.render_frame(*frames[1])
+            assert len(sequence.fig.axes) == axes_count
+            levels = sequence.plots[0].levels
+            np.testing.assert_array_equal(sequence.plots[0].graphs[0][0].levels, levels)
+            colorbar = sequence.colorbars[0].colorbars[0]
+            np.testing.assert_array_equal(colorbar.norm.boundaries, levels)
+            # styles are not changed.
+            assert style.get_levels() is None
+            results[freeze] = (first_levels, levels)
+            sequence.close()
+
+        first_levels, levels = results[True]
+        np.testing.assert_array_equal(levels, first_levels)
+        first_levels, levels = results[False]
+        assert levels[0] > first_levels[0]
+
+
+def test_set_title_repeatedly(sample_start_time):
+    from cedarkit.maps.chart import Panel
+
+    domain = EastAsiaMapTemplate()
+    panel = Panel(domain=domain)
+    panel.set_title(
+        graph_name="2m Temperature", system_name="Test-Model",
+        start_time=sample_start_time, forecast_time=pd.Timedelta(hours=0),
+    )
+    ax = panel.charts[0].layers[0].ax
+    text_count = len(ax.texts)
+    texts = panel.set_title(
+        graph_name="2m Temperature", system_name="Test-Model",
+        start_time=sample_start_time, forecast_time=pd.Timedelta(hours=24),
+    )
+    assert len(ax.texts) == text_count
+    assert texts[3].get_text() == "2024111000(UTC)\n2024111008(CST)"
+    plt.close(panel.fig)
@@ -4,6 +4,7 @@ import matplotlib.pyplot as plt
 
 from cedarkit.maps.domains import NorthPolarMapTemplate
 from cedarkit.maps.chart import Panel
+from cedarkit.maps.style import QuiverStyle, StreamlineStyle
 
 
 class TestNorthPolarMapTemplateContourf:
@@ -99,6 +100,40 @@ class TestNorthPolarMapTemplateBarb:
         assert output_path.stat().st_size > 0, "image file should not be empty"
 
 
+class TestNorthPolarMapTemplateVector:
+
+    def test_wind_quiver(self, north_polar_wind_fields, output_dir):
+        domain = NorthPolarMapTemplate()
+        panel = Panel(domain=domain)
+
+        panel.plot([[*north_polar_wind_fields]], style=QuiverStyle(color="blue"))
+
+        output_path = output_dir / "north_polar_wind_quiver.png"
+        panel.save(output_path, dpi=150)
+        plt.close()
+
+        assert output_path.exists(), "image file should be created"
+
+    def test_wind_streamline(self, north_polar_wind_fields, output_dir):
+        domain = NorthPolarMapTemplate()
+        panel = Panel(domain=domain)
+
+        style = StreamlineStyle(color="blue", density=1.5)
+        results = panel.plot([[*north_polar_wind_fields]], style=style)
+        streamlines = results[0][0]
+        assert len(streamlines.arrows) > 0
+
+        u_field, v_field = north_polar_wind_fields
+        results = panel.update_plot(results, [[-u_field, -v_field]], style=style)
+        assert streamlines.lines.axes is None
+
+        output_path = output_dir / "north_polar_wind_streamline.png"
+        panel.save(output_path, dpi=150)
+        plt.close()
+
+        assert output_path.exists(), "image file should be created"
+
+
 class TestNorthPolarMapTemplateCombined:
     
     def test_temperature_with_wind(
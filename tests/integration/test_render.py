@@ -0,0 +1,139 @@
+import gc
+import json
+import os
+
+import numpy as np
+import pytest
+import matplotlib
+import matplotlib.pyplot as plt
+
+from cedarkit.maps.style import ContourStyle
+import cedarkit.maps
+import cedarkit.maps.render
+import cedarkit.maps.map.geometry
+from cedarkit.maps.render import load_manifest, run_manifest, warmup_products, render_product, get_product_stamp
+from cedarkit.maps.cli import main
+
+
+temperature_style = ContourStyle(
+    colors=matplotlib.colormaps["RdYlBu_r"],
+    levels=np.arange(-12, 45, 4),
+    fill=True,
+)
+
+
+def write_manifest(path, data_path, output_path, **kwargs):
+    manifest = dict(
+        defaults=dict(
+            template="east_asia",
+            dpi=50,
+            title=dict(system_name="Test-Model", start_time="2024-11-09 00:00"),
+        ),
+        products=[
+            dict(
+                name="t2m",
+                style="tests.integration.test_render:temperature_style",
+                field=dict(path=str(data_path), variable="t2m"),
+                title=dict(graph_name="2m Temperature", forecast_time="24h"),
+                output=str(output_path),
+                **kwargs,
+            ),
+        ],
+    )
+    with open(path, "w") as f:
+        json.dump(manifest, f)
+
+
+class TestRenderManifest:
+    def test_render_and_skip(self, east_asia_temperature_field, tmp_path):
+        data_path = tmp_path / "t2m.nc"
+        east_asia_temperature_field.to_dataset(name="t2m").to_netcdf(data_path)
+        output_path = tmp_path / "output" / "t2m.png"
+        manifest_path = tmp_path / "products.json"
+        write_manifest(manifest_path, data_path, output_path)
+
+        manifest = load_manifest(manifest_path)
+        results = run_manifest(manifest)
+        assert [r.status for r in results] == ["rendered"]
+        assert output_path.exists()
+        assert results[0].load_time > 0 and results[0].save_time > 0
+
+        # touched input with same content is up to date.
+        os.utime(data_path, (0, 0))
+        assert [r.status for r in run_manifest(load_manifest(manifest_path))] == ["skipped"]
+
+        # config changed
+        write_manifest(manifest_path, data_path, output_path, colorbar=False)
+        assert [r.status for r in run_manifest(load_manifest(manifest_path))] == ["rendered"]
+
+        (east_asia_temperature_field + 1).to_dataset(name="t2m").to_netcdf(data_path)
+        report_path = tmp_path / "report.json"
+        assert main(["render", str(manifest_path), "--report", str(report_path)]) == 0
+        with open(report_path) as f:
+            assert [r["status"] for r in json.load(f)] == ["rendered"]
+        plt.close("all")
+
+    def test_retry_and_fail(self, tmp_path):
+        manifest_path = tmp_path / "products.json"
+        write_manifest(manifest_path, tmp_path / "missing.nc", tmp_path / "missing.png", retries=1)
+        assert main(["render", str(manifest_path)]) == 1
+
+        results = run_manifest(load_manifest(manifest_path))
+        assert results[0].status == "failed"
+        assert results[0].attempts == 2
+        assert "missing.nc" in results[0].error
+
+    def test_hash_inputs_once(self, tmp_path, monkeypatch):
+        data_path = tmp_path / "t2m.nc"
+        # not a netCDF file, so every attempt fails.
+        data_path.write_bytes(b"data")
+        manifest_path = tmp_path / "products.json"
+        write_manifest(manifest_path, data_path, tmp_path / "t2m.png", retries=2)
+        product = load_manifest(manifest_path).products[0]
+
+        hashed = []
+        file_hash = cedarkit.maps.render.file_hash
+        monkeypatch.setattr(cedarkit.maps.render, "file_hash", lambda path: hashed.append(path) or file_hash(path))
+        result = render_product(product)
+        assert result.status == "failed" and result.attempts == 3
+        assert hashed == [str(data_path)]
+
+        # products with the same input file share the hash.
+        assert get_product_stamp(product) == result.stamp
+        assert hashed == [str(data_path)]
+
+    def test_unfreeze_after_pool_error(self, tmp_path, monkeypatch):
+        manifest_path = tmp_path / "products.json"
+        write_manifest(manifest_path, tmp_path / "missing.nc", tmp_path / "missing.png")
+        manifest = load_manifest(manifest_path)
+        manifest.products.append(manifest.products[0])
+
+        class FailingExecutor:
+            def __init__(self, *args, **kwargs):
+                raise RuntimeError("pool error")
+
+        monkeypatch.setattr(cedarkit.maps.render, "warmup_products", lambda products: None)
+        monkeypatch.setattr(cedarkit.maps.map.geometry, "freeze_geometry_indexes", lambda: None)
+        monkeypatch.setattr(cedarkit.maps.render, "ProcessPoolExecutor", FailingExecutor)
+        with pytest.raises(RuntimeError):
+            run_manifest(manifest, workers=2, warmup=True)
+        assert gc.get_freeze_count() == 0
+
+    def test_warmup(self, tmp_path):
+        report = cedarkit.maps.warmup(templates=["cn_area"], styles=["t2m", temperature_style])
+        assert [(step.kind, step.name) for step in report.steps] == [
+            ("imports", "cedarkit.maps"),
+            ("template", "cn_area"),
+            ("style", "t2m"),
+            ("style", "ContourStyle"),
+        ]
+        assert report.steps[1].draw_time > 0
+        assert "cn_area" in str(report)
+        assert temperature_style._colormap_norms
+
+        manifest_path = tmp_path / "products.json"
+        write_manifest(manifest_path, tmp_path / "missing.nc", tmp_path / "missing.png", template="cn_area")
+        report = warmup_products(load_manifest(manifest_path).products)
+        assert [step.name for step in report.steps[1:]] == [
+            "CnAreaMapTemplate", "tests.integration.test_render:temperature_style",
+        ]
@@ -0,0 +1,29 @@
+import numpy as np
+import matplotlib.pyplot as plt
+from PIL import Image
+
+from cedarkit.maps.domains import EastAsiaMapTemplate
+from cedarkit.maps.tile import TileRenderer
+
+
+class TestTileRenderer:
+    def test_render_tiles(self, east_asia_temperature_field, temperature_style, output_dir):
+        field = east_asia_temperature_field.copy()
+        field.values[field.latitude.values > 40, :] = 9999
+
+        renderer = TileRenderer.from_template(
+            EastAsiaMapTemplate(),
+            style=temperature_style,
+            fill_value=9999,
+            max_workers=2,
+        )
+        report = renderer.render(field, output_dir=output_dir / "tiles", zooms=[3, 4])
+
+        assert len(report.paths) > 0
+        assert report.skipped > 0
+        assert set(report.contour_times) == {3, 4}
+        for path in report.paths:
+            assert path.exists()
+        image = np.asarray(Image.open(report.paths[-1]))
+        assert image.shape == (256, 256, 4)
+        plt.close("all")
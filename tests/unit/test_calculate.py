@@ -0,0 +1,114 @@
+import numpy as np
+import pandas as pd
+import xarray as xr
+import pytest
+
+from cedarkit.maps.calculate import (
+    calculate_levels_automatic,
+    calculate_levels_automatic_array,
+    calculate_levels_automatic_for_field,
+    calculate_levels_robust,
+    estimate_quantiles,
+    get_field_min_max,
+)
+from cedarkit.maps.style import ContourStyle, AutoLevelStyle
+from cedarkit.maps.util import AreaRange
+
+
+@pytest.mark.parametrize("outside", [True, False])
+@pytest.mark.parametrize("max_count", [5, 11, 16])
+def test_calculate_levels_automatic_array(outside, max_count):
+    rng = np.random.default_rng(0)
+    min_values = rng.normal(0, 100, 500) * 10.0 ** rng.integers(-3, 4, 500)
+    max_values = min_values + np.abs(rng.normal(0, 50, 500)) * 10.0 ** rng.integers(-3, 4, 500) + 1e-6
+
+    settings = calculate_levels_automatic_array(min_values, max_values, max_count=max_count, outside=outside)
+    assert len(settings) == 500
+    for min_value, max_value, setting in zip(min_values, max_values, settings.to_list()):
+        assert setting == calculate_levels_automatic(min_value, max_value, max_count=max_count, outside=outside)
+
+
+def test_calculate_levels_automatic_array_invalid():
+    settings = calculate_levels_automatic_array([1, np.nan, 5], [0, 3, 6], max_count=10, outside=True)
+    assert np.isnan(settings.step[:2]).all()
+    assert settings[2] == calculate_levels_automatic(5, 6, max_count=10, outside=True)
+
+
+def test_calculate_levels_automatic_for_field():
+    lats = np.arange(60, -0.1, -1.0)
+    lons = np.arange(70, 140.1, 1.0)
+    times = pd.to_timedelta([0, 24, 48], unit="h")
+    values = np.random.default_rng(1).normal(0, 10, (len(times), len(lats), len(lons)))
+    values[:, 0, 0] = 1000
+    field = xr.DataArray(
+        values,
+        coords={"time": times, "latitude": lats, "longitude": lons},
+        dims=["time", "latitude", "longitude"],
+    )
+    area = AreaRange(start_latitude=10, end_latitude=50, start_longitude=80, end_longitude=130)
+
+    settings = calculate_levels_automatic_for_field(field, max_count=16, outside=True, area=area)
+    assert settings.step.shape == (3,)
+    for index in range(len(times)):
+        subset = field.isel(time=index).sel(latitude=slice(50, 10), longitude=slice(80, 130))
+        expected = calculate_levels_automatic(
+            float(subset.min()), float(subset.max()), max_count=16, outside=True
+        )
+        assert settings[index] == expected
+
+
+@pytest.mark.parametrize("dim", [None, "latitude", ["time", "longitude"]])
+def test_get_field_min_max(dim):
+    lats = np.arange(60, -0.1, -1.0)
+    lons = np.arange(70, 140.1, 1.0)
+    times = pd.to_timedelta([0, 24, 48], unit="h")
+    values = np.random.default_rng(2).normal(0, 10, (len(times), len(lats), len(lons)))
+    values[:, 5:20, :] = np.nan
+    values[1] = np.nan
+    field = xr.DataArray(
+        values,
+        coords={"time": times, "latitude": lats, "longitude": lons},
+        dims=["time", "latitude", "longitude"],
+    )
+    reduce_dim = field.dims[-2:] if dim is None else dim
+
+    min_value, max_value = get_field_min_max(field, dim=dim, chunk_size=500)
+    xr.testing.assert_identical(min_value, field.min(dim=reduce_dim, skipna=True))
+    xr.testing.assert_identical(max_value, field.max(dim=reduce_dim, skipna=True))
+
+
+@pytest.mark.parametrize("method", ["sample", "histogram"])
+def test_estimate_quantiles(method):
+    values = np.random.default_rng(2).normal(280, 15, (721, 1440))
+    values[0, :10] = 1.0e6
+    values[10] = np.nan
+    expected = np.nanquantile(values, [0.02, 0.98])
+    result = estimate_quantiles(values, [0.02, 0.98], method=method)
+    np.testing.assert_allclose(result, expected, atol=1.0)
+
+
+def test_calculate_levels_robust():
+    values = np.random.default_rng(3).normal(0, 10, (200, 300))
+    values[0, 0] = 1.0e4
+    levels = calculate_levels_robust(values, max_count=16)
+    assert levels[-1] < 100
+    assert len(levels) <= 16
+    assert calculate_levels_robust(np.full((10, 10), np.nan)) is None
+
+
+def test_contour_style_auto_levels():
+    style = ContourStyle(fill=True, auto_level_style=AutoLevelStyle(freeze=True))
+    assert style.has_auto_levels
+    assert style.get_levels() is None
+    levels = style.get_levels(np.random.default_rng(4).normal(0, 10, (100, 100)))
+    assert levels is not None
+    # automatic levels are not kept in the shared style.
+    assert style.get_levels() is None
+    other_levels = style.get_levels(np.random.default_rng(5).normal(100, 10, (100, 100)))
+    assert other_levels[0] > levels[-1]
+    with pytest.raises(ValueError):
+        style.get_colormap_norm()
+    assert len(style.get_colormap_norm(levels)[0]) == len(levels)
+
+    style = ContourStyle(levels=[1, 2, 3], auto_level_style=AutoLevelStyle())
+    assert style.get_levels(np.zeros((2, 2))) == [1, 2, 3]
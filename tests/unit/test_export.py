@@ -0,0 +1,191 @@
+import json
+
+import numpy as np
+import xarray as xr
+import pytest
+import shapely
+import matplotlib.pyplot as plt
+import cartopy.crs as ccrs
+
+from cedarkit.maps.contour import (
+    ContourGeneratorOption,
+    compute_contour_geometry,
+    get_field_xyz,
+    generate_contour_paths,
+    simplify_paths,
+    count_vertices,
+)
+from cedarkit.maps.chart.layer import Layer
+from cedarkit.maps.export import to_geojson, write_geojson, write_flatgeobuf, encode_mvt
+
+
+@pytest.fixture
+def field():
+    lon = np.arange(70, 140.1, 0.5)
+    lat = np.arange(10, 60.1, 0.5)
+    values = np.sin(lon[np.newaxis, :] / 7) * np.cos(lat[:, np.newaxis] / 5) * 20 + 10
+    return xr.DataArray(values, coords={"lat": lat, "lon": lon}, dims=["lat", "lon"])
+
+
+@pytest.fixture
+def levels():
+    return np.arange(-10, 31, 5)
+
+
+def test_geometry_paths(field, levels):
+    x, y, z = get_field_xyz(field)
+    for filled, extend in ((True, "both"), (False, "neither")):
+        geometry = compute_contour_geometry(field, levels=levels, filled=filled, extend=extend)
+        paths = generate_contour_paths(x, y, z, levels=levels, filled=filled, extend=extend)
+        assert len(geometry.paths) == len(paths)
+        for geometry_path, path in zip(geometry.paths, paths):
+            np.testing.assert_array_equal(geometry_path.vertices, path.vertices)
+
+
+def test_filled_features(field, levels):
+    geometry = compute_contour_geometry(field, levels=levels, filled=True)
+    assert len(geometry.segments) == len(levels) + 1
+
+    features = geometry.to_features()
+    assert len(features) > 0
+    total_area = sum(shape.area for shape, _ in features)
+    assert total_area == pytest.approx(70 * 50, rel=1e-6)
+
+    first = geometry.get_properties(0)
+    assert first["lower"] is None and first["upper"] == levels[0]
+    last = geometry.get_properties(len(levels))
+    assert last["lower"] == levels[-1] and last["upper"] is None
+
+
+def test_geojson(field, levels, tmp_path):
+    geometry = compute_contour_geometry(field, levels=levels, filled=False, extend="neither")
+    collection = to_geojson(geometry, precision=2)
+    assert collection["type"] == "FeatureCollection"
+    feature = collection["features"][0]
+    assert feature["geometry"]["type"] == "MultiLineString"
+    assert set(feature["properties"]) == {"index", "level"}
+
+    path = tmp_path / "contour.geojson"
+    write_geojson(geometry, path, precision=2)
+    with open(path) as f:
+        assert len(json.load(f)["features"]) == len(collection["features"])
+
+
+def test_flatgeobuf(field, levels, tmp_path):
+    pyogrio = pytest.importorskip("pyogrio")
+    geometry = compute_contour_geometry(field, levels=levels, filled=True)
+    path = tmp_path / "contour.fgb"
+    write_flatgeobuf(geometry, path)
+    info = pyogrio.read_info(path)
+    assert info["features"] == len(geometry.to_features())
+
+
+def test_mvt(field, levels):
+    mapbox_vector_tile = pytest.importorskip("mapbox_vector_tile")
+    geometry = compute_contour_geometry(field, levels=levels, filled=True)
+    tile = mapbox_vector_tile.decode(encode_mvt(geometry, z=3, x=6, y=3))
+    assert len(tile["contour"]["features"]) > 0
+    empty_tile = mapbox_vector_tile.decode(encode_mvt(geometry, z=3, x=0, y=0))
+    assert len(empty_tile.get("contour", {"features": []})["features"]) == 0
+
+
+def test_contour_generator_option(field, levels):
+    geometry = compute_contour_geometry(field, levels=levels, filled=True)
+    expected = [shape.area if shape is not None else 0 for shape in geometry.to_shapely()]
+    for option in (
+        ContourGeneratorOption(algorithm="threaded", thread_count=2),
+        ContourGeneratorOption(algorithm="threaded", chunk_count=3),
+        ContourGeneratorOption(algorithm="serial", chunk_size=20),
+    ):
+        chunked = compute_contour_geometry(field, levels=levels, filled=True, option=option)
+        areas = [shape.area if shape is not None else 0 for shape in chunked.to_shapely()]
+        np.testing.assert_allclose(areas, expected)
+
+    kwargs = ContourGeneratorOption(algorithm="threaded", thread_count=2).get_generator_kwargs()
+    assert kwargs["total_chunk_count"] == 2
+    assert "thread_count" not in ContourGeneratorOption(algorithm="serial", thread_count=2).get_generator_kwargs()
+
+
+def test_select(field, levels):
+    for filled in (True, False):
+        geometry = compute_contour_geometry(field, levels=levels, filled=filled)
+        selected = geometry.select((100, 110, 20, 30))
+        assert len(selected.segments) == len(geometry.segments)
+        assert 0 < sum(map(len, selected.segments)) < sum(map(len, geometry.segments))
+        for segments in selected.segments:
+            for vertices in segments:
+                assert vertices[:, 0].max() >= 100 and vertices[:, 0].min() <= 110
+                assert vertices[:, 1].max() >= 20 and vertices[:, 1].min() <= 30
+
+
+def test_select_periodic_longitude():
+    lon = np.arange(0, 360, 1.0)
+    lat = np.arange(-90, 90.1, 1.0)
+    values = np.sin(np.deg2rad(lon[np.newaxis, :]) * 3) * np.cos(np.deg2rad(lat[:, np.newaxis]) * 2) * 20
+    field = xr.DataArray(values, coords={"lat": lat, "lon": lon}, dims=["lat", "lon"])
+    geometry = compute_contour_geometry(field, levels=np.arange(-15, 16, 5), filled=True)
+
+    # contours west of 0 degree are in 330..360 of a 0..360 field.
+    assert sum(map(len, geometry.select((-30, 40, 20, 60)).segments)) < sum(
+        map(len, geometry.select((-30, 40, 20, 60), x_period=360).segments)
+    )
+
+    fig = plt.figure()
+    ax = fig.add_subplot(projection=ccrs.PlateCarree())
+    ax.set_extent([-30, 40, 20, 60], crs=ccrs.PlateCarree())
+    layer = Layer(projection=ccrs.PlateCarree())
+    layer.set_axes(ax)
+    selected = layer.select_contour_geometry(geometry)
+    plt.close(fig)
+
+    west = [vertices for segments in selected.segments for vertices in segments if vertices[:, 0].min() > 180]
+    assert len(west) > 0
+    assert 0 < sum(map(len, selected.segments)) < sum(map(len, geometry.segments))
+
+
+def test_simplify_filled_paths(field, levels):
+    x, y, z = get_field_xyz(field)
+    paths = generate_contour_paths(x, y, z, levels=levels, filled=True, extend="both")
+    domain_area = (x.max() - x.min()) * (y.max() - y.min())
+
+    simplified, tolerance = simplify_paths(paths, tolerance=0.5, filled=True)
+    assert count_vertices(simplified) < count_vertices(paths)
+    assert len(simplified) == len(paths)
+
+    # adjacent bands keep shared edges: no gaps or overlaps.
+    bands = [
+        shapely.MultiPolygon([shapely.Polygon(rings[0], rings[1:]) for rings in _split_polygons(path)])
+        for path in simplified if len(path.vertices)
+    ]
+    assert all(band.is_valid for band in bands)
+    total_area = sum(band.area for band in bands)
+    assert total_area == pytest.approx(domain_area, rel=1e-6)
+    assert shapely.union_all(bands).area == pytest.approx(domain_area, rel=1e-6)
+
+
+def test_simplify_vertex_budget(field, levels):
+    x, y, z = get_field_xyz(field)
+    for filled in (True, False):
+        paths = generate_contour_paths(x, y, z, levels=levels, filled=filled)
+        simplified, tolerance = simplify_paths(paths, tolerance=0.05, vertex_budget=count_vertices(paths) // 4,
+                                               filled=filled)
+        assert tolerance > 0.05
+        # the final tolerance is applied to the original paths.
+        expected, _ = simplify_paths(paths, tolerance=tolerance, filled=filled)
+        for path, expected_path in zip(simplified, expected):
+            np.testing.assert_array_equal(path.vertices, expected_path.vertices)
+
+
+def _split_polygons(path):
+    """
+    Rings of each polygon in a filled contour path, exterior ring followed by holes.
+    """
+    rings = path.to_polygons()
+    ccw = [shapely.is_ccw(shapely.LinearRing(ring)) for ring in rings]
+    polygons = []
+    for ring, ring_ccw in zip(rings, ccw):
+        if ring_ccw == ccw[0]:
+            polygons.append([ring])
+        else:
+            polygons[-1].append(ring)
+    return polygons
@@ -0,0 +1,45 @@
+import sys
+
+import numpy as np
+import pytest
+
+from cedarkit.maps.chart.frame_writer import FFMpegWriter
+
+
+def _create_ffmpeg(tmp_path, code: str):
+    path = tmp_path / "ffmpeg"
+    path.write_text(f"#!{sys.executable}\nimport sys\n{code}\n")
+    path.chmod(0o755)
+    return str(path)
+
+
+def test_ffmpeg_writer(tmp_path):
+    output_path = tmp_path / "output.mp4"
+    ffmpeg_path = _create_ffmpeg(
+        tmp_path,
+        "data = sys.stdin.buffer.read()\n"
+        "open(sys.argv[-1], 'wb').write(data)",
+    )
+    frame = np.zeros((4, 6, 4), dtype=np.uint8)
+    with FFMpegWriter(output_path, ffmpeg_path=ffmpeg_path) as writer:
+        for _ in range(10):
+            writer.write(frame)
+    assert output_path.stat().st_size == frame.nbytes * 10
+
+
+def test_ffmpeg_writer_early_exit(tmp_path):
+    ffmpeg_path = _create_ffmpeg(
+        tmp_path,
+        "sys.stderr.write('Unknown encoder\\n')\n"
+        "sys.exit(1)",
+    )
+    frame = np.zeros((200, 300, 4), dtype=np.uint8)
+    writer = FFMpegWriter(tmp_path / "output.mp4", ffmpeg_path=ffmpeg_path)
+    with pytest.raises(RuntimeError, match="Unknown encoder"):
+        # more frames than queue size, ``write`` should not block.
+        for _ in range(20):
+            writer.write(frame)
+        writer.close()
+    assert writer.process is None
+    # nothing to close after error.
+    writer.close()
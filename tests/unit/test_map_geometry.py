@@ -0,0 +1,129 @@
+import importlib.resources
+
+import numpy as np
+import shapely
+
+from cedarkit.maps.util import AreaRange
+from cedarkit.maps.map.geometry import (
+    GeometryIndex,
+    get_geometry_index,
+    get_natural_earth_scale,
+    get_simplify_tolerance,
+)
+from cedarkit.maps.map.geometry_cache import (
+    GEOMETRY_CACHE_ENV,
+    convert_shapefile,
+    find_geometry_cache,
+    read_geometry_cache,
+    read_shapefile_geometries,
+    write_geometry_cache,
+)
+from cedarkit.maps.map.default import DefaultMapLoader
+
+
+def test_geometry_index_query():
+    geometries = np.array([
+        shapely.box(0, 0, 10, 10),
+        shapely.LineString([(20, 20), (40, 20)]),
+        shapely.Point(50, 50),
+    ], dtype=object)
+    index = GeometryIndex(geometries)
+
+    assert len(index.query()) == 3
+
+    area = AreaRange(start_longitude=5, end_longitude=30, start_latitude=5, end_latitude=25)
+    result = index.query(area, margin=0)
+    assert len(result) == 2
+    assert result[0].equals(shapely.box(5, 5, 10, 10))
+    assert result[1].equals(shapely.LineString([(20, 20), (30, 20)]))
+    assert index.query(area, margin=0) is result
+
+    result = index.query(area, margin=0.2)
+    assert result[1].equals(shapely.LineString([(20, 20), (35, 20)]))
+
+
+def test_china_map_area():
+    ref = importlib.resources.files("cedarkit.maps") / "resources/map/china-shapefiles/shapefiles/china.shp"
+    with importlib.resources.as_file(ref) as file_path:
+        index = get_geometry_index(file_path)
+        assert get_geometry_index(file_path) is index
+
+    area = AreaRange(start_longitude=113, end_longitude=120, start_latitude=36, end_latitude=43)
+    loader = DefaultMapLoader()
+    feature = loader.china_borders(area=area)[0]
+    geometries = list(feature.geometries())
+    assert 0 < len(geometries) < len(index)
+    x_min, y_min, x_max, y_max = shapely.total_bounds(geometries)
+    assert x_min >= 113 - 0.35 and x_max <= 120 + 0.35
+    assert y_min >= 36 - 0.35 and y_max <= 43 + 0.35
+
+
+def test_level_of_detail():
+    assert get_natural_earth_scale(0.005) == "10m"
+    assert get_natural_earth_scale(0.02) == "50m"
+    assert get_natural_earth_scale(0.1) == "110m"
+
+    assert get_simplify_tolerance(None) == 0
+    assert get_simplify_tolerance(0.02) == 2 ** -7
+    assert get_simplify_tolerance(0.04) == 2 ** -6
+
+    loader = DefaultMapLoader()
+    assert loader.get_scale() == "50m"
+    assert loader.get_scale(resolution=0.1) == "110m"
+    assert loader.get_scale("10m", resolution=0.1) == "10m"
+
+    line = shapely.LineString(np.column_stack([np.linspace(0, 10, 101), 0.01 * np.sin(np.arange(101))]))
+    index = GeometryIndex(np.array([line], dtype=object))
+    simplified = index.query(tolerance=0.125)
+    assert len(shapely.get_coordinates(simplified)) < len(shapely.get_coordinates(line))
+    assert index.query(tolerance=0.125) is simplified
+    assert index.query()[0] is line
+
+
+def test_geometry_cache(tmp_path, monkeypatch):
+    ref = importlib.resources.files("cedarkit.maps") / "resources/map/china-shapefiles/shapefiles/china_nine_dotted_line.shp"
+    with importlib.resources.as_file(ref) as file_path:
+        expected = read_shapefile_geometries(file_path)
+
+        monkeypatch.setenv(GEOMETRY_CACHE_ENV, str(tmp_path))
+        assert find_geometry_cache(file_path) is None
+        cache_path = convert_shapefile(file_path)
+        assert cache_path.parent == tmp_path
+        assert find_geometry_cache(file_path) == cache_path
+
+        geometries = read_shapefile_geometries(file_path)
+        assert len(geometries) == len(expected)
+        assert np.all(shapely.equals_exact(geometries, expected, tolerance=0))
+
+        # cache file created from another source is out of date.
+        other_source = tmp_path / "other.shp"
+        other_source.write_bytes(b"shp")
+        write_geometry_cache(expected[:1], cache_path, source=other_source)
+        assert read_geometry_cache(cache_path, source=file_path) is None
+        assert len(read_shapefile_geometries(file_path)) == len(expected)
+
+
+def test_frozen_geometry_index():
+    ref = importlib.resources.files("cedarkit.maps") / "resources/map/china-shapefiles/shapefiles/china.shp"
+    with importlib.resources.as_file(ref) as file_path:
+        geometries = read_shapefile_geometries(file_path)
+    index = GeometryIndex(geometries)
+    frozen = GeometryIndex(geometries)
+    cached_area = AreaRange(start_longitude=70, end_longitude=140, start_latitude=15, end_latitude=55)
+    cached = frozen.query(cached_area)
+
+    frozen.freeze()
+    assert frozen.frozen
+    assert frozen.geometries is None and frozen.tree is None
+    assert len(frozen) == len(index)
+    # cached query results are kept.
+    assert frozen.query(cached_area) is cached
+
+    area = AreaRange(start_longitude=113, end_longitude=120, start_latitude=36, end_latitude=43)
+    for tolerance in (0, 2 ** -6):
+        expected = index.query(area, tolerance=tolerance)
+        result = frozen.query(area, tolerance=tolerance)
+        assert len(result) == len(expected)
+        assert np.all(shapely.equals_exact(result, expected, tolerance=0))
+
+    assert np.all(shapely.equals_exact(frozen.query(), geometries, tolerance=0))
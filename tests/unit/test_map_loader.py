@@ -0,0 +1,61 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+import shapefile
+
+from cedarkit.maps.map import MapType, get_map_loader, get_map_loader_class
+from cedarkit.maps.map.default import DefaultMapLoader
+from cedarkit.maps.map.geometry_cache import find_geometry_cache
+from cedarkit.maps.map.natural_earth import (
+    NATURAL_EARTH_DIR_ENV,
+    get_natural_earth_path,
+    natural_earth_shapefile,
+    provision_natural_earth,
+)
+
+
+def test_map_loader_pool():
+    assert get_map_loader_class("cedarkit.maps.map.default") is DefaultMapLoader
+
+    loader = get_map_loader(MapType.Portrait, map_loader_package="cedarkit.maps.map.default")
+    assert isinstance(loader, DefaultMapLoader)
+    assert loader.map_type == MapType.Portrait
+    assert get_map_loader(MapType.Portrait, map_loader_class=DefaultMapLoader) is loader
+    assert get_map_loader(MapType.SouthChinaSea, map_loader_class=DefaultMapLoader) is not loader
+    assert get_map_loader(MapType.Portrait, map_loader_class=DefaultMapLoader, name="a") is not loader
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        loaders = list(executor.map(
+            lambda _: get_map_loader(MapType.Global, map_loader_class=DefaultMapLoader, name="threads"),
+            range(32),
+        ))
+    assert all(item is loaders[0] for item in loaders)
+
+
+def test_local_natural_earth(tmp_path, monkeypatch):
+    # a small coastline shapefile in Cartopy's layout, so that nothing is downloaded.
+    source_dir = tmp_path / "source"
+    source_path = get_natural_earth_path("physical", "coastline", "110m", source_dir)
+    source_path.parent.mkdir(parents=True)
+    with shapefile.Writer(str(source_path), shapeType=shapefile.POLYLINE) as writer:
+        writer.field("featurecla", "C")
+        writer.line([[(100, 20), (110, 25), (120, 22)]])
+        writer.record("Coastline")
+        writer.line([[(-10, 40), (0, 50)]])
+        writer.record("Coastline")
+
+    data_dir = tmp_path / "natural_earth"
+    paths = provision_natural_earth(
+        data_dir, scales=["110m"], features=[("physical", "coastline")], source_dir=source_dir,
+    )
+    assert paths == [data_dir / "shapefiles/natural_earth/physical/ne_110m_coastline.shp"]
+    assert find_geometry_cache(paths[0]) is not None
+
+    loader = DefaultMapLoader(natural_earth_dir=str(data_dir))
+    feature = loader.coastline(scale="110m")[0]
+    assert len(list(feature.geometries())) == 2
+    with pytest.raises(FileNotFoundError):
+        loader.coastline(scale="50m")
+
+    monkeypatch.setenv(NATURAL_EARTH_DIR_ENV, str(data_dir))
+    assert natural_earth_shapefile("physical", "coastline", "110m") == paths[0]
@@ -0,0 +1,59 @@
+import cartopy.crs as ccrs
+import cartopy.feature as cfeature
+import matplotlib.pyplot as plt
+import matplotlib.colors as mcolors
+import pytest
+import shapely
+
+from cedarkit.maps.chart import Layer
+from cedarkit.maps.painter.axes_component_painter import AxesComponentPainter, MapBoxOption, ColorBarOption
+from cedarkit.maps.painter.map_painter import add_batched_features
+from cedarkit.maps.style import ImageStyle
+
+
+def test_add_batched_features():
+    fig = plt.figure()
+    ax = fig.add_axes((0, 0, 1, 1), projection=ccrs.PlateCarree())
+    ax.set_extent((100, 120, 20, 40), crs=ccrs.PlateCarree())
+
+    line_style = dict(edgecolor="k", facecolor="never", linewidth=0.5)
+    features = [
+        cfeature.ShapelyFeature([shapely.LineString([(90, 30), (110, 30)])], ccrs.PlateCarree(), **line_style),
+        cfeature.ShapelyFeature([shapely.box(105, 25, 110, 30)], ccrs.PlateCarree(), facecolor="lightgrey"),
+        cfeature.ShapelyFeature([shapely.LineString([(110, 35), (115, 35)])], ccrs.PlateCarree(), **line_style),
+        cfeature.ShapelyFeature([shapely.LineString([(110, 38), (115, 38)])], ccrs.PlateCarree(), **line_style),
+    ]
+    collections = add_batched_features(ax, features, margin=0)
+
+    # only consecutive features with the same style are grouped, drawing order is kept.
+    assert [len(collection.get_paths()) for collection in collections] == [1, 1, 2]
+    assert list(ax.collections) == collections
+    lines = collections[0]
+    assert lines.get_zorder() == 1.5
+    assert len(lines.get_facecolor()) == 0
+    # line is clipped to map extent.
+    assert lines.get_paths()[0].vertices[:, 0].min() == 100
+    plt.close(fig)
+
+
+@pytest.mark.parametrize("orientation", ["vertical", "horizontal"])
+def test_add_image_colorbar_without_levels(orientation):
+    fig = plt.figure()
+    layer = Layer(projection=ccrs.PlateCarree())
+    layer.set_axes(fig.add_subplot(projection=ccrs.PlateCarree()))
+    painter = AxesComponentPainter(
+        map_box_option=MapBoxOption(bottom_left_point=(0, 0), top_right_point=(1, 1)),
+        color_bar_option=ColorBarOption(
+            orientation=orientation,
+            bottom_left_point=(1.05, 0),
+            top_right_point=(1.07, 1),
+        ),
+    )
+
+    style = ImageStyle(colors="viridis", vmin=0, vmax=1)
+    (color_bar,) = painter.add_colorbar(layer=layer, style=style)
+
+    assert type(color_bar.norm) is mcolors.Normalize
+    assert (color_bar.norm.vmin, color_bar.norm.vmax) == (0, 1)
+    assert color_bar.cmap.name == "viridis"
+    plt.close(fig)
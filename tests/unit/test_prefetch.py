@@ -0,0 +1,141 @@
+import numpy as np
+import xarray as xr
+import pytest
+
+from cedarkit.maps.util import AreaRange, select_area
+from cedarkit.maps.domains import EastAsiaMapTemplate, NorthPolarMapTemplate
+from cedarkit.maps.prefetch import ProductRequest, PrefetchPlanner, FieldPrefetcher, merge_areas
+
+
+@pytest.fixture
+def global_field():
+    """全球 0-360 经度、纬度递减的模拟场"""
+    lons = np.arange(0, 360, 1.0)
+    lats = np.arange(90, -91, -1.0)
+    data = np.random.rand(len(lats), len(lons))
+    return xr.DataArray(
+        data,
+        dims=["latitude", "longitude"],
+        coords={"latitude": lats, "longitude": lons},
+    )
+
+
+class TestSelectArea:
+    def test_descending_latitude(self, global_field):
+        field = select_area(global_field, AreaRange(70, 140, 15, 55))
+        assert field.latitude.values[0] == 55
+        assert field.latitude.values[-1] == 15
+        assert field.longitude.values[0] == 70
+        assert field.longitude.values[-1] == 140
+
+    def test_negative_longitude(self, global_field):
+        field = select_area(global_field, AreaRange(-10, 10, 0, 10))
+        lons = field.longitude.values
+        assert len(lons) == 21
+        assert lons[0] == -10
+        assert np.all(np.diff(lons) > 0)
+        np.testing.assert_array_equal(
+            field.sel(longitude=-10).values,
+            global_field.sel(longitude=350, latitude=slice(10, 0)).values,
+        )
+
+    def test_global_area(self, global_field):
+        field = select_area(global_field, AreaRange(-180, 180, -90, 90))
+        assert field.shape == global_field.shape
+
+
+class TestPrefetchPlanner:
+    def test_merge_areas(self):
+        areas = merge_areas([
+            AreaRange(0, 10, 0, 10),
+            AreaRange(20, 30, 0, 10),
+            AreaRange(5, 25, 5, 8),
+        ])
+        assert areas == [AreaRange(0, 30, 0, 10)]
+
+    def test_merge_areas_across_dateline(self):
+        areas = merge_areas([
+            AreaRange(170, 200, 0, 40),
+            AreaRange(-175, -150, 10, 30),
+            AreaRange(0, 20, 0, 10),
+        ])
+        assert areas == [AreaRange(170, 210, 0, 40), AreaRange(0, 20, 0, 10)]
+
+    def test_area_range_longitude_wrap(self):
+        area = AreaRange(170, 200, 0, 40)
+        assert area.intersects(AreaRange(-180, -170, 10, 20))
+        assert area.contains(AreaRange(-180, -170, 10, 20))
+        assert not area.contains(AreaRange(-180, -150, 10, 20))
+        assert not area.intersects(AreaRange(-150, -100, 10, 20))
+        assert area.normalize_longitude() == AreaRange(170, 200, 0, 40)
+        assert AreaRange(190, 220, 0, 40).normalize_longitude() == AreaRange(-170, -140, 0, 40)
+        assert AreaRange(-181, 181, -90, 90).normalize_longitude() == AreaRange(-180, 180, -90, 90)
+        assert AreaRange(-10, 10, 0, 10).union(AreaRange(340, 355, 0, 10)) == AreaRange(340, 370, 0, 10)
+
+    def test_plan_union(self):
+        east_asia = EastAsiaMapTemplate()
+        north_polar = NorthPolarMapTemplate()
+        products = [
+            ProductRequest(name="t2m", variables=["2t"], domains=[east_asia, north_polar]),
+            ProductRequest(name="mslp", variables=["msl", "10u", "10v"], domains=[east_asia]),
+            ProductRequest(name="rain", variables=["tp"], domains=[AreaRange(100, 120, 20, 40)]),
+        ]
+        plan = PrefetchPlanner(products=products, margin=0).plan()
+
+        assert set(plan.regions) == {"2t", "msl", "10u", "10v", "tp"}
+        assert len(plan.subsets()) == 5
+        assert plan.regions["2t"][0].contains(north_polar.total_area())
+        assert plan.regions["msl"] == [east_asia.total_area()]
+
+
+class TestFieldPrefetcher:
+    def test_read_once(self, global_field):
+        calls = []
+
+        def loader(variable, area):
+            calls.append((variable, area))
+            return global_field
+
+        products = [
+            ProductRequest(name="t2m", variables=["2t"], domains=[AreaRange(70, 140, 15, 55)]),
+            ProductRequest(name="t2m_cn", variables=["2t"], domains=[AreaRange(110, 120, 30, 40)]),
+            ProductRequest(name="mslp", variables=["msl"], domains=[AreaRange(70, 140, 15, 55)]),
+        ]
+        plan = PrefetchPlanner(products=products, margin=1).plan()
+        prefetcher = FieldPrefetcher(plan=plan, loader=loader, max_workers=2).load()
+        assert len(calls) == 2
+
+        fields = prefetcher.get_product_fields(products[1])
+        field = fields["2t"]
+        assert field.longitude.values[0] == 109
+        assert field.longitude.values[-1] == 121
+        np.testing.assert_array_equal(
+            field.values,
+            global_field.sel(latitude=slice(41, 29), longitude=slice(109, 121)).values,
+        )
+        assert len(calls) == 2
+
+    def test_across_dateline(self, global_field):
+        calls = []
+
+        def loader(variable, area):
+            calls.append((variable, area))
+            return select_area(global_field, area)
+
+        products = [
+            ProductRequest(name="pacific", variables=["2t"], domains=[AreaRange(160, 220, 0, 50)]),
+            ProductRequest(name="pacific_west", variables=["2t"], domains=[AreaRange(-175, -150, 10, 30)]),
+        ]
+        plan = PrefetchPlanner(products=products, margin=1).plan()
+        assert plan.regions["2t"] == [AreaRange(159, 221, -1, 51)]
+        assert plan.find_region("2t", AreaRange(-176, -149, 9, 31)) == AreaRange(159, 221, -1, 51)
+
+        prefetcher = FieldPrefetcher(plan=plan, loader=loader).load()
+        field = prefetcher.get_product_fields(products[1])["2t"]
+        assert len(calls) == 1
+        assert field.longitude.values[0] % 360 == 184
+        assert field.longitude.values[-1] % 360 == 211
+        np.testing.assert_array_equal(
+            field.values,
+            global_field.sel(latitude=slice(31, 9), longitude=slice(184, 211)).values,
+        )
@@ -0,0 +1,130 @@
+import numpy as np
+import xarray as xr
+import cartopy.crs as ccrs
+import pytest
+from cartopy.vector_transform import vector_scalar_to_grid
+
+from cedarkit.maps.reproject import (
+    RegularGrid,
+    ReprojectionCache,
+    compute_reprojection_index,
+    compute_vector_reprojection,
+    reproject_field,
+)
+
+
+def create_field(lon, lat):
+    values = lat[:, np.newaxis] * 1000 + lon[np.newaxis, :]
+    return xr.DataArray(values, coords={"lat": lat, "lon": lon}, dims=["lat", "lon"])
+
+
+def test_regular_grid():
+    field = create_field(np.arange(0, 360, 1.0), np.arange(90, -90.1, -1.0))
+    grid = RegularGrid.from_field(field)
+    assert grid.dy == -1
+    assert grid.is_periodic
+    assert grid.extent == (-0.5, 359.5, -90.5, 90.5)
+
+    with pytest.raises(ValueError):
+        RegularGrid.from_field(create_field(np.array([0, 1, 3.0]), np.arange(0, 10.0)))
+
+
+def test_same_projection_index():
+    field = create_field(np.arange(0, 360, 1.0), np.arange(90, -90.1, -1.0))
+    grid = RegularGrid.from_field(field)
+    index = compute_reprojection_index(
+        grid, ccrs.PlateCarree(), ccrs.PlateCarree(), extent=(-10, 10, 20, 30), shape=(40, 40),
+    )
+    raster = index.apply(field.values)
+    assert not index.mask.any()
+    # rows from bottom to top, longitude is wrapped.
+    assert raster[0, 0] == 20 * 1000 + 350
+    assert raster[-1, -1] == 30 * 1000 + 10
+
+
+def test_stereo_index():
+    lon = np.arange(70, 140.1, 0.5)
+    lat = np.arange(15, 55.1, 0.5)
+    field = create_field(lon, lat)
+    target = ccrs.NorthPolarStereo(central_longitude=110)
+    x0, x1 = -3e6, 3e6
+    y0, y1 = -6e6, 0
+    raster, index = reproject_field(field, ccrs.PlateCarree(), target, extent=(x0, x1, y0, y1), shape=(60, 60))
+    assert index.mask.any() and not index.mask.all()
+
+    # check pixel centers with cartopy.
+    rows, columns = np.nonzero(~index.mask)
+    x = x0 + (columns + 0.5) * (x1 - x0) / 60
+    y = y0 + (rows + 0.5) * (y1 - y0) / 60
+    points = ccrs.PlateCarree().transform_points(target, x, y)
+    expected = field.sel(lon=points[:, 0], lat=points[:, 1], method="nearest")
+    np.testing.assert_array_equal(raster[rows, columns], np.diagonal(expected.values))
+
+
+def test_cache():
+    field = create_field(np.arange(70, 140.1, 0.5), np.arange(15, 55.1, 0.5))
+    cache = ReprojectionCache(max_size=2)
+    _, index = reproject_field(field, ccrs.PlateCarree(), ccrs.Mercator(), (8e6, 1.5e7, 2e6, 7e6), (20, 30), cache=cache)
+    _, index2 = reproject_field(field + 1, ccrs.PlateCarree(), ccrs.Mercator(), (8e6, 1.5e7, 2e6, 7e6), (20, 30), cache=cache)
+    assert index2 is index
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    reproject_field(field, ccrs.PlateCarree(), ccrs.Mercator(), (8e6, 1.5e7, 2e6, 7e6), (40, 60), cache=cache)
+    reproject_field(field, ccrs.PlateCarree(), ccrs.PlateCarree(), (80, 130, 20, 50), (40, 60), cache=cache)
+    assert len(cache) == 2
+
+    grid = RegularGrid.from_field(field)
+    vectors = cache.get_vectors(grid, ccrs.PlateCarree(), ccrs.PlateCarree(), (80, 130, 20, 50), (40, 60))
+    assert cache.get_vectors(grid, ccrs.PlateCarree(), ccrs.PlateCarree(), (80, 130, 20, 50), (40, 60)) is vectors
+    assert cache.get(grid, ccrs.PlateCarree(), ccrs.PlateCarree(), (80, 130, 20, 50), (40, 60)) is not vectors
+
+
+def test_vector_reprojection():
+    lon = np.arange(0, 360, 1.0)
+    lat = np.arange(90, -90.1, -1.0)
+    field = create_field(lon, lat)
+    source = ccrs.PlateCarree()
+    target = ccrs.NorthPolarStereo(central_longitude=110)
+    vectors = compute_vector_reprojection(
+        RegularGrid.from_field(field), source, target, extent=(-4e6, 4e6, -6e6, 1e6), shape=(10, 12),
+    )
+    assert vectors.x.shape == (10, 12)
+    assert vectors.x[0, 0] == -4e6 and vectors.y[-1, -1] == 1e6
+
+    rng = np.random.default_rng(0)
+    u = rng.normal(0, 10, field.shape)
+    v = rng.normal(0, 10, field.shape)
+    target_u, target_v = vectors.apply(u, v)
+
+    # same as cartopy's regrid_shape.
+    lon_2d, lat_2d = np.meshgrid(lon, lat)
+    x, y, expected_u, expected_v = vector_scalar_to_grid(
+        source, target, (12, 10), lon_2d, lat_2d, u, v, target_extent=(-4e6, 4e6, -6e6, 1e6),
+    )
+    np.testing.assert_array_equal(vectors.x, x)
+    np.testing.assert_array_equal(vectors.y, y)
+    np.testing.assert_array_equal(np.ma.getmaskarray(target_u), ~np.isfinite(expected_u))
+    np.testing.assert_allclose(target_u.compressed(), expected_u[np.isfinite(expected_u)], rtol=1e-12)
+    np.testing.assert_allclose(target_v.compressed(), expected_v[np.isfinite(expected_v)], rtol=1e-12)
+
+
+def test_vector_reprojection_same_projection():
+    lon = np.arange(70, 140.1, 0.5)
+    lat = np.arange(15, 55.1, 0.5)
+    field = create_field(lon, lat)
+    rng = np.random.default_rng(1)
+    u = rng.normal(0, 10, field.shape)
+    v = rng.normal(0, 10, field.shape)
+    extent = (80.2, 130.3, 20.1, 50.4)
+    vectors = compute_vector_reprojection(
+        RegularGrid.from_field(field), ccrs.PlateCarree(), ccrs.PlateCarree(), extent=extent, shape=(20, 33),
+        coordinates=(lon, lat),
+    )
+    target_u, target_v = vectors.apply(u, v)
+
+    lon_2d, lat_2d = np.meshgrid(lon, lat)
+    _, _, expected_u, expected_v = vector_scalar_to_grid(
+        ccrs.PlateCarree(), ccrs.PlateCarree(), (33, 20), lon_2d, lat_2d, u, v, target_extent=extent,
+    )
+    np.testing.assert_array_equal(target_u, expected_u)
+    np.testing.assert_array_equal(target_v, expected_v)
@@ -0,0 +1,37 @@
+import numpy as np
+import cartopy.crs as ccrs
+
+from cedarkit.maps.reproject import RegularGrid, ReprojectionCache
+from cedarkit.maps.streamline import StreamlineIntegrator, get_streamline_integrator
+
+from .test_reproject import create_field
+
+
+def test_streamline_integrator():
+    lon = np.arange(70, 140.1, 0.5)
+    lat = np.arange(60, 9.9, -0.5)
+    field = create_field(lon, lat)
+    grid = RegularGrid.from_field(field)
+    cache = ReprojectionCache()
+    args = (grid, ccrs.PlateCarree(), ccrs.PlateCarree(), (80, 130, 20, 50), (60, 100))
+
+    integrator = get_streamline_integrator(*args, cache=cache)
+    assert isinstance(integrator, StreamlineIntegrator)
+    assert get_streamline_integrator(*args, cache=cache) is integrator
+    assert get_streamline_integrator(*args, density=2, cache=cache) is not integrator
+
+    # uniform eastward wind: horizontal streamlines with arrows pointing east.
+    u = np.full(field.shape, 10.0)
+    v = np.zeros(field.shape)
+    streamlines = integrator.integrate(u, v)
+    assert len(streamlines) > 0
+    for streamline in streamlines:
+        np.testing.assert_allclose(streamline.points[:, 1], streamline.points[0, 1])
+        assert np.all(np.diff(streamline.points[:, 0]) > 0)
+        assert streamline.arrow[1, 0] > streamline.arrow[0, 0]
+        assert streamline.points[:, 0].min() >= 80 - 1e-6
+        assert streamline.points[:, 0].max() <= 130 + 1e-6
+
+    # streamlines do not share occupancy cells
+    rows = {round(streamline.points[0, 1], 6) for streamline in streamlines}
+    assert len(rows) == len(streamlines)
@@ -0,0 +1,36 @@
+import numpy as np
+import matplotlib as mpl
+import matplotlib.colors as mcolors
+
+from cedarkit.maps.colormap import get_discrete_cmap
+from cedarkit.maps.style import ContourStyle
+
+
+def test_colormap_norm_cache():
+    style = ContourStyle(colors=mpl.colormaps["viridis"], levels=[0, 5, 10, 20], fill=True)
+
+    levels, cmap, norm = style.get_colormap_norm()
+    np.testing.assert_array_equal(levels, [0, 5, 10, 20])
+    assert levels.dtype == float
+    assert style.get_colormap_norm([0, 5, 10, 20])[2] is norm
+
+    expected_cmap, expected_norm = get_discrete_cmap(style.colors, levels=style.levels, extend="both")
+    values = np.array([-1, 2, 7, 15, 25])
+    np.testing.assert_array_equal(cmap(norm(values)), expected_cmap(expected_norm(values)))
+
+    assert style.get_colormap_norm([0, 10])[2] is not norm
+    assert style.get_colormap_norm(extend="neither")[2] is not norm
+
+    style.colors = mpl.colormaps["plasma"]
+    assert style.get_colormap_norm()[2] is not norm
+
+
+def test_colormap_norm_color_names():
+    # "blue" is a color name, not a registered colormap.
+    style = ContourStyle(colors="blue", levels=[50, 100], fill=True)
+    levels, cmap, norm = style.get_colormap_norm()
+    np.testing.assert_array_equal(cmap(norm([0, 75, 200])), [mcolors.to_rgba("blue")] * 3)
+
+    # color lists are repeated to the number of colors, like xarray.
+    cmap, norm = get_discrete_cmap(["red", "green"], levels=[0, 1, 2, 3], extend="neither")
+    np.testing.assert_array_equal(cmap(norm([0.5, 1.5, 2.5])), mcolors.to_rgba_array(["red", "green", "red"]))
@@ -0,0 +1,142 @@
+import copy
+import json
+import pickle
+
+import numpy as np
+import matplotlib.colors as mcolors
+import pytest
+
+from cedarkit.maps.style import ContourStyle, BarbStyle, ContourLabelStyle
+from cedarkit.maps.style import registry as registry_module
+from cedarkit.maps.style.registry import (
+    StyleRegistry,
+    build_levels,
+    build_style,
+    get_style,
+    get_default_registry,
+    load_styles,
+)
+
+
+@pytest.fixture
+def style_file(tmp_path):
+    path = tmp_path / "styles.json"
+    path.write_text(json.dumps(dict(
+        styles=dict(
+            test_t850=dict(
+                fill=True,
+                levels=dict(start=-20, stop=20, step=4, append=[20]),
+                colormap=dict(category="colors", colors=["blue", "white", "red"]),
+                colorbar_style=dict(label="C"),
+            ),
+        ),
+        parameters=dict(t850="test_t850"),
+    )))
+    return path
+
+
+@pytest.fixture
+def default_registry(monkeypatch):
+    """
+    A new default registry, the original one is restored after the test.
+    """
+    monkeypatch.setattr(registry_module, "_default_registry", None)
+    return get_default_registry()
+
+
+def test_build_levels():
+    np.testing.assert_array_equal(build_levels([1, 2, 3]), [1, 2, 3])
+    np.testing.assert_array_equal(
+        build_levels(dict(start=0, stop=10, step=5, prepend=[-5], append=[10])),
+        [-5, 0, 5, 10],
+    )
+
+
+def test_build_style():
+    style = build_style(dict(
+        levels=[1, 2],
+        colors="blue",
+        label=True,
+        label_style=dict(fontsize=5, fmt="%1.0f"),
+    ))
+    assert isinstance(style, ContourStyle)
+    assert isinstance(style.label_style, ContourLabelStyle)
+    assert style.label_style.fontsize == 5
+
+    style = build_style(dict(type="barb", length=4))
+    assert isinstance(style, BarbStyle)
+    assert style.length == 4
+
+
+def test_default_registry():
+    style = get_style("t2m")
+    assert style.fill
+    assert isinstance(style.colors, mcolors.Colormap)
+    assert get_style("t2m") is style
+    assert get_default_registry().get_by_parameter("2t") is style
+
+    mslp_style = get_default_registry().get_by_parameter("prmsl")
+    assert not mslp_style.fill
+    assert mslp_style.levels[0] == 960
+
+
+def test_shared_colormap():
+    registry = StyleRegistry()
+    definition = dict(levels=[0, 1], colormap=dict(category="colors", colors=["red", "blue"]))
+    registry.register("a", definition)
+    registry.register("b", definition)
+    assert registry.get("a").colors is registry.get("b").colors
+
+
+def test_load(style_file):
+    registry = StyleRegistry()
+    assert registry.load(style_file) == ["test_t850"]
+    style = registry.get_by_parameter("t850")
+    assert style.colorbar_style.label == "C"
+    np.testing.assert_array_equal(style.levels, np.arange(-20, 21, 4))
+
+
+def test_pickle(default_registry, style_file):
+    style = get_style("mslp")
+    data = pickle.dumps(style)
+    assert len(data) < 200
+    assert pickle.loads(data) is style
+
+    load_styles(style_file)
+    style = get_style("test_t850")
+    assert pickle.loads(pickle.dumps(style)) is style
+
+
+def test_pickle_by_value(default_registry):
+    # styles of other registries are not resolved in the default registry.
+    registry = StyleRegistry()
+    registry.register("t2m", dict(fill=False, levels=[1, 2, 3]), source="styles.yaml")
+    restored = pickle.loads(pickle.dumps(registry.get("t2m")))
+    assert restored is not get_style("t2m")
+    assert not restored.fill
+    np.testing.assert_array_equal(restored.levels, [1, 2, 3])
+
+    # styles registered in code can't be resolved in other processes.
+    default_registry.register("test_code", dict(fill=False, levels=[1, 2]))
+    style = get_style("test_code")
+    restored = pickle.loads(pickle.dumps(style))
+    assert restored is not style
+    np.testing.assert_array_equal(restored.levels, [1, 2])
+
+    # a replaced style is no longer the registered style of its name.
+    style = get_style("t2m")
+    default_registry.register("t2m", dict(fill=False, levels=[1, 2]))
+    restored = pickle.loads(pickle.dumps(style))
+    assert restored.fill
+    assert pickle.loads(pickle.dumps(restored)) is not restored
+
+
+def test_copy():
+    style = get_style("t2m")
+    for new_style in (copy.copy(style), copy.deepcopy(style)):
+        assert new_style is not style
+        new_style.fill = False
+        assert style.fill
+        restored = pickle.loads(pickle.dumps(new_style))
+        assert restored is not style
+        assert not restored.fill
@@ -0,0 +1,43 @@
+import numpy as np
+import xarray as xr
+import pytest
+
+from cedarkit.maps.export import get_tile_bounds, lonlat_to_web_mercator
+from cedarkit.maps.tile import get_tile_range, get_tile_area, coarsen_field, _ValidDataIndex
+from cedarkit.maps.util import AreaRange
+
+
+@pytest.mark.parametrize("tile", [(0, 0, 0), (3, 6, 3), (5, 25, 12)])
+def test_tile_area(tile):
+    area = get_tile_area(*tile)
+    x0, y0, x1, y1 = get_tile_bounds(*tile)
+    corners = lonlat_to_web_mercator(np.array([
+        [area.start_longitude, area.start_latitude],
+        [area.end_longitude, area.end_latitude],
+    ]))
+    np.testing.assert_allclose(corners, [[x0, y0], [x1, y1]], atol=1e-6)
+
+    center = AreaRange(
+        start_longitude=(area.start_longitude + area.end_longitude) / 2,
+        end_longitude=(area.start_longitude + area.end_longitude) / 2,
+        start_latitude=(area.start_latitude + area.end_latitude) / 2,
+        end_latitude=(area.start_latitude + area.end_latitude) / 2,
+    )
+    x_min, x_max, y_min, y_max = get_tile_range(center, tile[0])
+    assert (x_min, y_min) == (x_max, y_max) == tile[1:]
+
+
+def test_valid_data_index():
+    lon = np.arange(70, 140.1, 0.5)
+    lat = np.arange(55, 14.9, -0.5)
+    values = np.ones((len(lat), len(lon)))
+    values[lat > 40, :] = np.nan
+    field = xr.DataArray(values, coords={"lat": lat, "lon": lon}, dims=["lat", "lon"])
+
+    index = _ValidDataIndex(field)
+    assert index.has_data(AreaRange(100, 110, 20, 30))
+    assert not index.has_data(AreaRange(100, 110, 45, 55))
+    assert not index.has_data(AreaRange(150, 160, 20, 30))
+
+    coarse = coarsen_field(field, resolution=2.2)
+    assert coarse.shape == ((len(lat) + 3) // 4, (len(lon) + 3) // 4)
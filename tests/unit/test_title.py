@@ -0,0 +1,39 @@
+import pandas as pd
+import pytest
+
+from cedarkit.maps.util import GraphTitle, fill_graph_title, fill_graph_titles, get_graph_time_labels
+
+
+@pytest.fixture
+def forecast_times():
+    return [pd.Timedelta(hours=hour) for hour in (0, 3, 24, 120, 240)] + [pd.Timedelta(minutes=90)]
+
+
+def test_fill_graph_titles(forecast_times):
+    start_time = pd.Timestamp("2024-11-09 12:00:00")
+    graph_titles = fill_graph_titles(
+        graph_name="2m Temperature",
+        system_name="CMA-GFS",
+        start_time=start_time,
+        forecast_times=forecast_times,
+    )
+    assert len(graph_titles) == len(forecast_times)
+    for forecast_time, graph_title in zip(forecast_times, graph_titles):
+        expected = fill_graph_title(
+            GraphTitle(),
+            graph_name="2m Temperature",
+            system_name="CMA-GFS",
+            start_time=start_time,
+            forecast_time=forecast_time,
+        )
+        assert graph_title == expected
+
+
+def test_get_graph_time_labels(forecast_times):
+    time_labels = get_graph_time_labels(pd.Timestamp("2024-11-09 12:00:00"), forecast_times)
+    assert time_labels.utc_start_time_label == "2024110912"
+    assert time_labels.cst_start_time_label == "2024110920"
+    assert list(time_labels.forecast_time_labels) == ["00", "03", "24", "120", "240", "01"]
+    assert list(time_labels.utc_valid_time_labels) == [
+        "2024110912", "2024110915", "2024111012", "2024111412", "2024111912", "2024110913"
+    ]